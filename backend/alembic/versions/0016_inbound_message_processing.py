@@ -0,0 +1,23 @@
+"""Add processing markers to email_messages for the post-sync inbox pipeline."""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0016_inbound_processing"
+down_revision = "0015_sender_contact"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("email_messages", sa.Column("processed_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("email_messages", sa.Column("processing_error", sa.Text, nullable=True))
+    # Messages synced before the pipeline existed are treated as already processed so the
+    # upgrade does not trigger a burst of LLM calls over historic mail.
+    op.execute("UPDATE email_messages SET processed_at = created_at WHERE processed_at IS NULL")
+
+
+def downgrade() -> None:
+    op.drop_column("email_messages", "processing_error")
+    op.drop_column("email_messages", "processed_at")
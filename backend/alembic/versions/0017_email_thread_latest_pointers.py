@@ -0,0 +1,56 @@
+"""Add denormalized latest-message pointers to email_threads."""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "0017_thread_latest_pointers"
+down_revision = "0016_inbound_processing"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("email_threads", sa.Column("latest_message_id", UUID(as_uuid=True), nullable=True))
+    op.add_column("email_threads", sa.Column("latest_inbound_message_id", UUID(as_uuid=True), nullable=True))
+    op.add_column("email_threads", sa.Column("latest_inbound_classification", sa.String(50), nullable=True))
+    op.create_index(
+        "ix_email_threads_latest_inbound_classification",
+        "email_threads",
+        ["latest_inbound_classification"],
+    )
+
+    op.execute(
+        """
+        UPDATE email_threads SET
+            latest_message_id = (
+                SELECT m.id FROM email_messages m
+                WHERE m.thread_id = email_threads.id
+                ORDER BY m.received_at DESC NULLS LAST, m.created_at DESC
+                LIMIT 1
+            ),
+            latest_inbound_message_id = (
+                SELECT m.id FROM email_messages m
+                WHERE m.thread_id = email_threads.id AND m.direction = 'inbound'
+                ORDER BY m.received_at DESC NULLS LAST, m.created_at DESC
+                LIMIT 1
+            )
+        """
+    )
+    op.execute(
+        """
+        UPDATE email_threads SET latest_inbound_classification = (
+            SELECT m.classification FROM email_messages m
+            WHERE m.id = email_threads.latest_inbound_message_id
+        )
+        WHERE latest_inbound_message_id IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_email_threads_latest_inbound_classification", table_name="email_threads")
+    op.drop_column("email_threads", "latest_inbound_classification")
+    op.drop_column("email_threads", "latest_inbound_message_id")
+    op.drop_column("email_threads", "latest_message_id")
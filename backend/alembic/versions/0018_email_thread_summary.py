@@ -0,0 +1,74 @@
+"""Add maintained summary columns and list indexes to email_threads."""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0018_thread_summary"
+down_revision = "0017_thread_latest_pointers"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("email_threads", sa.Column("last_inbound_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("email_threads", sa.Column("last_outbound_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("email_threads", sa.Column("message_count", sa.Integer, nullable=False, server_default="0"))
+    op.add_column("email_threads", sa.Column("needs_reply", sa.Boolean, nullable=False, server_default=sa.false()))
+
+    op.execute(
+        """
+        UPDATE email_threads t SET
+            message_count = s.message_count,
+            last_inbound_at = s.last_inbound_at,
+            last_outbound_at = s.last_outbound_at,
+            last_message_at = COALESCE(s.last_received_at, t.last_message_at)
+        FROM (
+            SELECT
+                thread_id,
+                COUNT(*) AS message_count,
+                MAX(received_at) FILTER (WHERE direction = 'inbound') AS last_inbound_at,
+                MAX(received_at) FILTER (WHERE direction = 'outbound') AS last_outbound_at,
+                MAX(received_at) AS last_received_at
+            FROM email_messages
+            GROUP BY thread_id
+        ) s
+        WHERE s.thread_id = t.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE email_threads SET
+            last_message_at = COALESCE(last_message_at, created_at),
+            needs_reply = (
+                latest_inbound_message_id IS NOT NULL
+                AND latest_message_id = latest_inbound_message_id
+            )
+        """
+    )
+
+    op.create_index(
+        "ix_email_threads_ws_last_message",
+        "email_threads",
+        ["workspace_id", "last_message_at", "id"],
+    )
+    op.create_index(
+        "ix_email_threads_ws_needs_reply_last_message",
+        "email_threads",
+        ["workspace_id", "needs_reply", "last_message_at", "id"],
+    )
+    op.create_index(
+        "ix_email_threads_ws_review_status_last_message",
+        "email_threads",
+        ["workspace_id", "reply_review_status", "last_message_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_email_threads_ws_review_status_last_message", table_name="email_threads")
+    op.drop_index("ix_email_threads_ws_needs_reply_last_message", table_name="email_threads")
+    op.drop_index("ix_email_threads_ws_last_message", table_name="email_threads")
+    op.drop_column("email_threads", "needs_reply")
+    op.drop_column("email_threads", "message_count")
+    op.drop_column("email_threads", "last_outbound_at")
+    op.drop_column("email_threads", "last_inbound_at")
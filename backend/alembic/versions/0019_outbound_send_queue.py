@@ -0,0 +1,53 @@
+"""Add the outbound send queue and per-workspace send limits."""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "0019_outbound_send_queue"
+down_revision = "0018_thread_summary"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "outbound_emails",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("workspace_id", UUID(as_uuid=True), sa.ForeignKey("workspaces.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("draft_id", UUID(as_uuid=True), sa.ForeignKey("email_drafts.id", ondelete="CASCADE"), nullable=False, index=True),
+        sa.Column("lead_id", UUID(as_uuid=True), sa.ForeignKey("leads.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("idempotency_key", sa.String(255), nullable=False, unique=True),
+        sa.Column("status", sa.String(20), nullable=False, server_default="queued"),
+        sa.Column("attempts", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("last_attempt_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.Text, nullable=True),
+        sa.Column("gmail_message_id", sa.String(255), nullable=True),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_outbound_emails_status_next_attempt", "outbound_emails", ["status", "next_attempt_at"])
+    op.create_index("ix_outbound_emails_ws_status", "outbound_emails", ["workspace_id", "status"])
+
+    op.add_column("workspace_automation_settings", sa.Column("daily_send_limit", sa.Integer, nullable=True))
+    op.add_column("workspace_automation_settings", sa.Column("send_window_start_hour", sa.Integer, nullable=True))
+    op.add_column("workspace_automation_settings", sa.Column("send_window_end_hour", sa.Integer, nullable=True))
+    op.add_column("workspace_automation_settings", sa.Column("send_timezone", sa.String(64), nullable=True))
+    op.add_column(
+        "workspace_automation_settings",
+        sa.Column("send_weekdays_only", sa.Boolean, nullable=False, server_default=sa.false()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("workspace_automation_settings", "send_weekdays_only")
+    op.drop_column("workspace_automation_settings", "send_timezone")
+    op.drop_column("workspace_automation_settings", "send_window_end_hour")
+    op.drop_column("workspace_automation_settings", "send_window_start_hour")
+    op.drop_column("workspace_automation_settings", "daily_send_limit")
+    op.drop_index("ix_outbound_emails_ws_status", table_name="outbound_emails")
+    op.drop_index("ix_outbound_emails_status_next_attempt", table_name="outbound_emails")
+    op.drop_table("outbound_emails")
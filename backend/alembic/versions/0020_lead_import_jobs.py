@@ -0,0 +1,42 @@
+"""Add lead_import_jobs for streamed CSV/JSONL lead imports."""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "0020_lead_import_jobs"
+down_revision = "0019_outbound_send_queue"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "lead_import_jobs",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("workspace_id", UUID(as_uuid=True), sa.ForeignKey("workspaces.id", ondelete="CASCADE"), nullable=False, index=True),
+        sa.Column("status", sa.String(20), nullable=False, server_default="pending"),
+        sa.Column("source", sa.String(100), nullable=False),
+        sa.Column("file_format", sa.String(10), nullable=False),
+        sa.Column("filename", sa.String(255), nullable=True),
+        sa.Column("dedupe_by_website", sa.Boolean, nullable=False, server_default=sa.true()),
+        sa.Column("dedupe_by_company_location", sa.Boolean, nullable=False, server_default=sa.true()),
+        sa.Column("upload_path", sa.String(1000), nullable=True),
+        sa.Column("report_path", sa.String(1000), nullable=True),
+        sa.Column("total_bytes", sa.BigInteger, nullable=False, server_default="0"),
+        sa.Column("processed_bytes", sa.BigInteger, nullable=False, server_default="0"),
+        sa.Column("processed_rows", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("imported_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("duplicate_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("error_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("error", sa.Text, nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("lead_import_jobs")
@@ -0,0 +1,110 @@
+"""Add stored dedupe keys to leads, prospects and partner_candidates."""
+from __future__ import annotations
+
+from urllib.parse import urlparse
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0021_dedupe_keys"
+down_revision = "0020_lead_import_jobs"
+branch_labels = None
+depends_on = None
+
+_TABLES = ("leads", "prospects", "partner_candidates")
+# Columns each key is computed from: (website, company, location).
+_SOURCE_COLUMNS = {
+    "leads": ("website_url", "company", "location"),
+    "prospects": ("website_url", "company_name", "address"),
+    "partner_candidates": ("website", "company_name", "location"),
+}
+_BATCH_SIZE = 1000
+
+
+# Key functions as of this revision; app.models.dedupe_keys may change later.
+def _fold(value: str | None) -> str | None:
+    if value is None:
+        return None
+    folded = " ".join(value.split()).casefold()
+    return folded or None
+
+
+def _website_key(url: str | None) -> str | None:
+    cleaned = (url or "").strip()
+    if not cleaned:
+        return None
+    parsed = urlparse(cleaned if "://" in cleaned else f"https://{cleaned}")
+    host = (parsed.hostname or "").casefold()
+    if host.startswith("www."):
+        host = host[4:]
+    if not host:
+        return None
+    if parsed.port and parsed.port not in (80, 443):
+        host = f"{host}:{parsed.port}"
+    path = parsed.path.rstrip("/").casefold()
+    return f"{host}{path}"[:500]
+
+
+def _company_location_key(company: str | None, location: str | None) -> str | None:
+    company_folded = _fold(company)
+    if company_folded is None:
+        return None
+    return f"{company_folded}::{_fold(location) or ''}"[:520]
+
+
+def _backfill_keys(bind: sa.engine.Connection) -> None:
+    for table_name, (website_col, company_col, location_col) in _SOURCE_COLUMNS.items():
+        table = sa.table(
+            table_name,
+            sa.column("id", sa.Uuid(as_uuid=True)),
+            sa.column(website_col, sa.String),
+            sa.column(company_col, sa.String),
+            sa.column(location_col, sa.String),
+            sa.column("website_key", sa.String),
+            sa.column("company_location_key", sa.String),
+        )
+        stmt = (
+            table.update()
+            .where(table.c.id == sa.bindparam("row_id"))
+            .values(website_key=sa.bindparam("w_key"), company_location_key=sa.bindparam("cl_key"))
+        )
+        last_id = None
+        while True:
+            query = sa.select(table.c.id, table.c[website_col], table.c[company_col], table.c[location_col])
+            if last_id is not None:
+                query = query.where(table.c.id > last_id)
+            rows = bind.execute(query.order_by(table.c.id).limit(_BATCH_SIZE)).all()
+            if not rows:
+                break
+            bind.execute(
+                stmt,
+                [
+                    {
+                        "row_id": row_id,
+                        "w_key": _website_key(website),
+                        "cl_key": _company_location_key(company, location),
+                    }
+                    for row_id, website, company, location in rows
+                ],
+            )
+            last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    for table in _TABLES:
+        op.add_column(table, sa.Column("website_key", sa.String(500), nullable=True))
+        op.add_column(table, sa.Column("company_location_key", sa.String(520), nullable=True))
+
+    _backfill_keys(op.get_bind())
+
+    for table in _TABLES:
+        op.create_index(f"ix_{table}_ws_website_key", table, ["workspace_id", "website_key"])
+        op.create_index(f"ix_{table}_ws_company_location_key", table, ["workspace_id", "company_location_key"])
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        op.drop_index(f"ix_{table}_ws_company_location_key", table_name=table)
+        op.drop_index(f"ix_{table}_ws_website_key", table_name=table)
+        op.drop_column(table, "company_location_key")
+        op.drop_column(table, "website_key")
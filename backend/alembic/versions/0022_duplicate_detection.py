@@ -0,0 +1,191 @@
+"""Add duplicate-detection blocking keys and the duplicate_candidates table."""
+from __future__ import annotations
+
+import re
+from urllib.parse import urlparse
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "0022_duplicate_detection"
+down_revision = "0021_dedupe_keys"
+branch_labels = None
+depends_on = None
+
+_TABLES = ("leads", "prospects", "partner_candidates")
+_KEY_COLUMNS = (
+    ("name_key", 255),
+    ("phone_key", 20),
+    ("domain_key", 255),
+    ("locality_block_key", 100),
+)
+# Columns each key is computed from: (website, company, location, phone).
+_SOURCE_COLUMNS = {
+    "leads": ("website_url", "company", "location", "phone"),
+    "prospects": ("website_url", "company_name", "address", "phone"),
+    "partner_candidates": ("website", "company_name", "location", None),
+}
+_BATCH_SIZE = 1000
+
+# Key functions as of this revision; app.models.dedupe_keys may change later.
+_NAME_STOPWORDS = frozenset(
+    {
+        "the", "llc", "inc", "incorporated", "co", "corp", "corporation", "company",
+        "ltd", "limited", "lp", "llp", "pc", "pllc", "plc", "gmbh",
+    }
+)
+_SHARED_HOSTS = frozenset(
+    {
+        "facebook.com", "m.facebook.com", "instagram.com", "linkedin.com", "twitter.com", "x.com",
+        "yelp.com", "google.com", "sites.google.com", "business.site", "linktr.ee", "nextdoor.com",
+        "wixsite.com", "square.site", "godaddysites.com",
+    }
+)
+_ZIP_RE = re.compile(r"\b(\d{5})(?:-\d{4})?\b")
+_NON_ALNUM_RE = re.compile(r"[^0-9a-z]+")
+
+
+def _website_key(url: str | None) -> str | None:
+    cleaned = (url or "").strip()
+    if not cleaned:
+        return None
+    parsed = urlparse(cleaned if "://" in cleaned else f"https://{cleaned}")
+    host = (parsed.hostname or "").casefold()
+    if host.startswith("www."):
+        host = host[4:]
+    if not host:
+        return None
+    if parsed.port and parsed.port not in (80, 443):
+        host = f"{host}:{parsed.port}"
+    path = parsed.path.rstrip("/").casefold()
+    return f"{host}{path}"[:500]
+
+
+def _name_key(company: str | None) -> str | None:
+    folded = (company or "").casefold().replace("'", "").replace("\u2019", "").replace(".", "").replace("&", " and ")
+    tokens = _NON_ALNUM_RE.sub(" ", folded).split()
+    significant = [token for token in tokens if token not in _NAME_STOPWORDS]
+    return " ".join(significant or tokens)[:255] or None
+
+
+def _phone_key(phone: str | None) -> str | None:
+    digits = "".join(ch for ch in phone or "" if ch.isdigit())
+    if len(digits) < 7:
+        return None
+    return digits[-10:]
+
+
+def _domain_key(url: str | None) -> str | None:
+    key = _website_key(url)
+    if key is None:
+        return None
+    host = key.split("/", 1)[0]
+    if host in _SHARED_HOSTS or any(host.endswith(f".{shared}") for shared in _SHARED_HOSTS):
+        return key[:255]
+    return host[:255]
+
+
+def _locality_key(location: str | None) -> str | None:
+    if not location:
+        return None
+    match = _ZIP_RE.search(location)
+    if match:
+        return match.group(1)
+    parts = [part for part in location.split(",") if part.strip()]
+    tail = _NON_ALNUM_RE.sub(" ", " ".join(parts[-2:]).casefold())
+    tokens = [token for token in tail.split() if not token.isdigit()]
+    return " ".join(tokens) or None
+
+
+def _locality_block_key(company: str | None, location: str | None) -> str | None:
+    name = _name_key(company)
+    locality = _locality_key(location)
+    if not name or not locality:
+        return None
+    return f"{locality}|{name.replace(' ', '')[:4]}"[:100]
+
+
+def _backfill_keys(bind: sa.engine.Connection) -> None:
+    for table_name, (website_col, company_col, location_col, phone_col) in _SOURCE_COLUMNS.items():
+        source_cols = [website_col, company_col, location_col] + ([phone_col] if phone_col else [])
+        table = sa.table(
+            table_name,
+            sa.column("id", sa.Uuid(as_uuid=True)),
+            *(sa.column(name, sa.String) for name in source_cols),
+            *(sa.column(column, sa.String) for column, _length in _KEY_COLUMNS),
+        )
+        stmt = (
+            table.update()
+            .where(table.c.id == sa.bindparam("row_id"))
+            .values({column: sa.bindparam(f"k_{column}") for column, _length in _KEY_COLUMNS})
+        )
+        last_id = None
+        while True:
+            query = sa.select(table.c.id, *(table.c[name] for name in source_cols))
+            if last_id is not None:
+                query = query.where(table.c.id > last_id)
+            rows = bind.execute(query.order_by(table.c.id).limit(_BATCH_SIZE)).all()
+            if not rows:
+                break
+            params = []
+            for row in rows:
+                website, company, location = row[1], row[2], row[3]
+                phone = row[4] if phone_col else None
+                params.append(
+                    {
+                        "row_id": row[0],
+                        "k_name_key": _name_key(company),
+                        "k_phone_key": _phone_key(phone),
+                        "k_domain_key": _domain_key(website),
+                        "k_locality_block_key": _locality_block_key(company, location),
+                    }
+                )
+            bind.execute(stmt, params)
+            last_id = rows[-1][0]
+
+
+
+def upgrade() -> None:
+    for table in _TABLES:
+        for column, length in _KEY_COLUMNS:
+            op.add_column(table, sa.Column(column, sa.String(length), nullable=True))
+
+    _backfill_keys(op.get_bind())
+
+    for table in _TABLES:
+        for column, _length in _KEY_COLUMNS:
+            op.create_index(f"ix_{table}_ws_{column}", table, ["workspace_id", column])
+
+    op.create_table(
+        "duplicate_candidates",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("workspace_id", UUID(as_uuid=True), sa.ForeignKey("workspaces.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("left_type", sa.String(30), nullable=False),
+        sa.Column("left_id", UUID(as_uuid=True), nullable=False),
+        sa.Column("right_type", sa.String(30), nullable=False),
+        sa.Column("right_id", UUID(as_uuid=True), nullable=False),
+        sa.Column("score", sa.Float, nullable=False),
+        sa.Column("reasons", sa.JSON, nullable=False),
+        sa.Column("status", sa.String(20), nullable=False, server_default="open"),
+        sa.Column("resolved_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.UniqueConstraint(
+            "workspace_id", "left_type", "left_id", "right_type", "right_id", name="uq_duplicate_candidates_pair"
+        ),
+    )
+    op.create_index(
+        "ix_duplicate_candidates_ws_status_score", "duplicate_candidates", ["workspace_id", "status", "score"]
+    )
+    op.create_index("ix_duplicate_candidates_right", "duplicate_candidates", ["right_type", "right_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_duplicate_candidates_right", table_name="duplicate_candidates")
+    op.drop_index("ix_duplicate_candidates_ws_status_score", table_name="duplicate_candidates")
+    op.drop_table("duplicate_candidates")
+    for table in _TABLES:
+        for column, _length in reversed(_KEY_COLUMNS):
+            op.drop_index(f"ix_{table}_ws_{column}", table_name=table)
+            op.drop_column(table, column)
@@ -0,0 +1,32 @@
+"""Add the shared Google Places response cache and index prospects by external id."""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0023_places_cache"
+down_revision = "0022_duplicate_detection"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "places_cache_entries",
+        sa.Column("cache_key", sa.String(64), primary_key=True),
+        sa.Column("kind", sa.String(20), nullable=False),
+        sa.Column("payload", sa.JSON, nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_places_cache_entries_expires_at", "places_cache_entries", ["expires_at"])
+    op.create_index(
+        "ix_prospects_ws_source_external_id", "prospects", ["workspace_id", "source", "external_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_prospects_ws_source_external_id", table_name="prospects")
+    op.drop_index("ix_places_cache_entries_expires_at", table_name="places_cache_entries")
+    op.drop_table("places_cache_entries")
@@ -0,0 +1,44 @@
+"""Add the background job queue behind ?async=true endpoints."""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "0024_background_jobs"
+down_revision = "0023_places_cache"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "background_jobs",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("workspace_id", UUID(as_uuid=True), sa.ForeignKey("workspaces.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("kind", sa.String(100), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False, server_default="queued"),
+        sa.Column("params", sa.JSON, nullable=False),
+        sa.Column("result", sa.JSON, nullable=True),
+        sa.Column("error", sa.Text, nullable=True),
+        sa.Column("progress_current", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("progress_total", sa.Integer, nullable=True),
+        sa.Column("progress_message", sa.String(500), nullable=True),
+        sa.Column("cancel_requested", sa.Boolean, nullable=False, server_default=sa.false()),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_background_jobs_status_created", "background_jobs", ["status", "created_at"])
+    op.create_index("ix_background_jobs_ws_created", "background_jobs", ["workspace_id", "created_at"])
+    op.create_index("ix_background_jobs_finished_at", "background_jobs", ["finished_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_background_jobs_finished_at", table_name="background_jobs")
+    op.drop_index("ix_background_jobs_ws_created", table_name="background_jobs")
+    op.drop_index("ix_background_jobs_status_created", table_name="background_jobs")
+    op.drop_table("background_jobs")
@@ -0,0 +1,165 @@
+"""Move page, snapshot and partner crawled text into a shared content-addressed store."""
+from __future__ import annotations
+
+import hashlib
+import zlib
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0025_text_store"
+down_revision = "0024_background_jobs"
+branch_labels = None
+depends_on = None
+
+
+# The backfill as this revision shipped it: blob ids, compression and the partner signal
+# layout must not follow later changes to the application's text store.
+_BATCH_SIZE = 500
+_COMPRESSION_LEVEL = 6
+
+_blobs = sa.table("text_blobs", sa.column("id"), sa.column("size"), sa.column("data", sa.LargeBinary))
+
+
+def _blob_id(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _write_blobs(bind, texts: dict[str, str]) -> None:
+    if not texts:
+        return
+    existing = set(bind.scalars(sa.select(_blobs.c.id).where(_blobs.c.id.in_(list(texts)))).all())
+    rows = [
+        {"id": blob_id, "size": len(encoded), "data": zlib.compress(encoded, _COMPRESSION_LEVEL)}
+        for blob_id, text in texts.items()
+        if blob_id not in existing
+        for encoded in (text.encode("utf-8"),)
+    ]
+    if rows:
+        bind.execute(sa.insert(_blobs), rows)
+
+
+def _backfill_text_store(bind) -> None:
+    for table_name in ("website_pages", "website_snapshots"):
+        legacy = sa.table(table_name, sa.column("id"), sa.column("raw_text"), sa.column("text_id"))
+        stmt = (
+            sa.update(legacy)
+            .where(legacy.c.id == sa.bindparam("row_id"))
+            .values(text_id=sa.bindparam("blob_id"))
+        )
+        while True:
+            rows = bind.execute(
+                sa.select(legacy.c.id, legacy.c.raw_text).where(legacy.c.text_id.is_(None)).limit(_BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+            _write_blobs(bind, {_blob_id(raw_text or ""): raw_text or "" for _row_id, raw_text in rows})
+            bind.execute(
+                stmt,
+                [{"row_id": row_id, "blob_id": _blob_id(raw_text or "")} for row_id, raw_text in rows],
+            )
+
+    partners = sa.table(
+        "partner_candidates",
+        sa.column("id"),
+        sa.column("extracted_signals", sa.JSON),
+        sa.column("crawled_text_id"),
+    )
+    stmt = (
+        sa.update(partners)
+        .where(partners.c.id == sa.bindparam("row_id"))
+        .values(crawled_text_id=sa.bindparam("blob_id"), extracted_signals=sa.bindparam("signals", type_=sa.JSON))
+    )
+    last_id = None
+    while True:
+        query = sa.select(partners.c.id, partners.c.extracted_signals).where(partners.c.crawled_text_id.is_(None))
+        if last_id is not None:
+            query = query.where(partners.c.id > last_id)
+        rows = bind.execute(query.order_by(partners.c.id).limit(_BATCH_SIZE)).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        texts: dict[str, str] = {}
+        params = []
+        for row_id, signals in rows:
+            if not isinstance(signals, dict) or "crawled_text" not in signals:
+                continue
+            crawled_text = signals.pop("crawled_text")
+            blob_id = _blob_id(crawled_text) if crawled_text else None
+            if blob_id is not None:
+                texts[blob_id] = crawled_text
+            params.append({"row_id": row_id, "blob_id": blob_id, "signals": signals})
+        _write_blobs(bind, texts)
+        if params:
+            bind.execute(stmt, params)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "text_blobs",
+        sa.Column("id", sa.String(64), primary_key=True),
+        sa.Column("size", sa.Integer, nullable=False),
+        sa.Column("data", sa.LargeBinary, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.add_column("website_pages", sa.Column("text_id", sa.String(64), sa.ForeignKey("text_blobs.id"), nullable=True))
+    op.add_column("website_snapshots", sa.Column("text_id", sa.String(64), sa.ForeignKey("text_blobs.id"), nullable=True))
+    op.add_column(
+        "partner_candidates",
+        sa.Column("crawled_text_id", sa.String(64), sa.ForeignKey("text_blobs.id"), nullable=True),
+    )
+
+    _backfill_text_store(op.get_bind())
+
+    op.alter_column("website_pages", "text_id", nullable=False)
+    op.alter_column("website_snapshots", "text_id", nullable=False)
+    op.drop_column("website_pages", "raw_text")
+    op.drop_column("website_snapshots", "raw_text")
+    op.create_index("ix_website_pages_text_id", "website_pages", ["text_id"])
+    op.create_index("ix_website_snapshots_text_id", "website_snapshots", ["text_id"])
+    op.create_index("ix_partner_candidates_crawled_text_id", "partner_candidates", ["crawled_text_id"])
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    blobs = sa.table("text_blobs", sa.column("id"), sa.column("data", sa.LargeBinary))
+
+    def texts_for(ids: set[str]) -> dict[str, str]:
+        if not ids:
+            return {}
+        rows = bind.execute(sa.select(blobs.c.id, blobs.c.data).where(blobs.c.id.in_(ids))).all()
+        return {row.id: zlib.decompress(row.data).decode("utf-8") for row in rows}
+
+    for table_name in ("website_pages", "website_snapshots"):
+        op.add_column(table_name, sa.Column("raw_text", sa.Text, nullable=True))
+        table = sa.table(table_name, sa.column("id"), sa.column("text_id"), sa.column("raw_text"))
+        rows = bind.execute(sa.select(table.c.id, table.c.text_id)).all()
+        texts = texts_for({row.text_id for row in rows})
+        for row in rows:
+            bind.execute(sa.update(table).where(table.c.id == row.id).values(raw_text=texts.get(row.text_id, "")))
+        op.alter_column(table_name, "raw_text", nullable=False)
+
+    partners = sa.table(
+        "partner_candidates",
+        sa.column("id"),
+        sa.column("crawled_text_id"),
+        sa.column("extracted_signals", sa.JSON),
+    )
+    rows = bind.execute(
+        sa.select(partners.c.id, partners.c.crawled_text_id, partners.c.extracted_signals).where(
+            partners.c.crawled_text_id.is_not(None)
+        )
+    ).all()
+    texts = texts_for({row.crawled_text_id for row in rows})
+    for row in rows:
+        signals = dict(row.extracted_signals or {})
+        signals["crawled_text"] = texts.get(row.crawled_text_id)
+        bind.execute(sa.update(partners).where(partners.c.id == row.id).values(extracted_signals=signals))
+
+    op.drop_index("ix_partner_candidates_crawled_text_id", table_name="partner_candidates")
+    op.drop_index("ix_website_snapshots_text_id", table_name="website_snapshots")
+    op.drop_index("ix_website_pages_text_id", table_name="website_pages")
+    op.drop_column("partner_candidates", "crawled_text_id")
+    op.drop_column("website_snapshots", "text_id")
+    op.drop_column("website_pages", "text_id")
+    op.drop_table("text_blobs")
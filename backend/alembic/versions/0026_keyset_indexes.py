@@ -0,0 +1,40 @@
+"""Composite indexes matching the keyset sort of each list endpoint."""
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0026_keyset_indexes"
+down_revision = "0025_text_store"
+branch_labels = None
+depends_on = None
+
+_INDEXES: list[tuple[str, str, list[str]]] = [
+    ("ix_leads_ws_created", "leads", ["workspace_id", "created_at", "id"]),
+    ("ix_leads_ws_status_created", "leads", ["workspace_id", "status", "created_at", "id"]),
+    ("ix_leads_ws_lead_type_created", "leads", ["workspace_id", "lead_type", "created_at", "id"]),
+    ("ix_prospects_ws_created", "prospects", ["workspace_id", "created_at", "id"]),
+    ("ix_prospects_ws_import_status_created", "prospects", ["workspace_id", "import_status", "created_at", "id"]),
+    ("ix_jobs_ws_created", "jobs", ["workspace_id", "created_at", "id"]),
+    ("ix_jobs_ws_status_created", "jobs", ["workspace_id", "status", "created_at", "id"]),
+    ("ix_partner_candidates_ws_created", "partner_candidates", ["workspace_id", "created_at", "id"]),
+    ("ix_partner_candidates_ws_status_created", "partner_candidates", ["workspace_id", "status", "created_at", "id"]),
+    ("ix_website_snapshots_lead_fetched", "website_snapshots", ["lead_id", "fetched_at", "id"]),
+    ("ix_website_pages_lead_created", "website_pages", ["lead_id", "created_at", "id"]),
+    ("ix_email_drafts_lead_created", "email_drafts", ["lead_id", "created_at", "id"]),
+    (
+        "ix_email_drafts_ws_review_status_updated",
+        "email_drafts",
+        ["workspace_id", "review_status", "updated_at", "id"],
+    ),
+    ("ix_outbound_emails_ws_next_attempt", "outbound_emails", ["workspace_id", "next_attempt_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    for name, table_name, columns in _INDEXES:
+        op.create_index(name, table_name, columns)
+
+
+def downgrade() -> None:
+    for name, table_name, _columns in reversed(_INDEXES):
+        op.drop_index(name, table_name=table_name)
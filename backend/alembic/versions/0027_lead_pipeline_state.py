@@ -0,0 +1,206 @@
+"""Materialized pipeline state columns on leads."""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0027_lead_pipeline_state"
+down_revision = "0026_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+_FLAG_COLUMNS = ("has_snapshot", "has_agent1_output", "has_draft", "has_agent3_verdict")
+_STATE_COLUMNS = (*_FLAG_COLUMNS, "final_decision", "pipeline_stage")
+_BATCH_SIZE = 500
+
+# The state computation as this revision shipped it; the application's copy may change.
+_AGENT1_SUBJECT_PREFIX = "Agent1 draft for "
+_AGENT1_BODY_PREFIX = "Auto-generated Agent1 analysis"
+_STATUSES = {
+    "discovered", "imported", "researching", "researched", "drafting", "draft_ready",
+    "needs_review", "approved", "sent", "replied", "converted", "archived",
+}
+_LEGACY_STATUSES = {
+    "new": "imported",
+    "ingested": "researched",
+    "enriched": "researched",
+    "agent1": "researched",
+    "agent2": "draft_ready",
+    "agent3": "draft_ready",
+    "verified": "draft_ready",
+    "draft": "draft_ready",
+    "drafted": "draft_ready",
+    "ready": "approved",
+    "ready_to_send": "approved",
+    "send": "approved",
+    "hold": "needs_review",
+}
+
+_leads = sa.table(
+    "leads",
+    sa.column("id", sa.Uuid(as_uuid=True)),
+    sa.column("status"),
+    *(sa.column(column) for column in _STATE_COLUMNS),
+)
+_snapshots = sa.table("website_snapshots", sa.column("lead_id", sa.Uuid(as_uuid=True)))
+_drafts = sa.table(
+    "email_drafts",
+    sa.column("lead_id", sa.Uuid(as_uuid=True)),
+    sa.column("subject", sa.String),
+    sa.column("body", sa.Text),
+    sa.column("decision"),
+    sa.column("agent1_output", sa.JSON),
+    sa.column("agent3_verdict", sa.JSON),
+    sa.column("created_at"),
+    sa.column("updated_at"),
+)
+
+
+def _normalize_status(value: str | None) -> str:
+    normalized = (value or "").strip().lower()
+    normalized = _LEGACY_STATUSES.get(normalized, normalized)
+    return normalized if normalized in _STATUSES else "imported"
+
+
+def _stage(status: str | None, *, has_snapshot, has_agent1_output, has_draft, has_agent3_verdict, final_decision) -> str:
+    status_norm = _normalize_status(status)
+    if status_norm in {"archived", "converted", "replied", "sent"}:
+        return status_norm
+    if final_decision == "send":
+        return "approved"
+    if final_decision == "hold":
+        return "needs_review"
+    if has_agent3_verdict:
+        return status_norm if status_norm in {"approved", "needs_review"} else "draft_ready"
+    if has_draft:
+        return status_norm if status_norm == "drafting" else "draft_ready"
+    if has_agent1_output or has_snapshot:
+        return status_norm if status_norm == "researching" else "researched"
+    return status_norm if status_norm in {"imported", "discovered"} else "imported"
+
+
+def _state(status: str | None, drafts, *, has_snapshot: bool) -> dict:
+    has_agent1_output = has_draft = has_agent3_verdict = False
+    final_decision = None
+    for _lead_id, decision, has_output, has_verdict, verdict_source, verdict_decision, is_placeholder in drafts:
+        verdict_source = (verdict_source or "").strip().lower() if has_verdict else ""
+        verdict_decision = verdict_decision if has_verdict else None
+        draft_decision = (decision or "").strip().lower()
+        if has_output:
+            has_agent1_output = True
+        if verdict_source == "agent2" or draft_decision in {"send", "hold"} or not is_placeholder:
+            has_draft = True
+        if isinstance(verdict_decision, str) and verdict_decision in {"send", "hold"}:
+            has_agent3_verdict = True
+            if final_decision is None:
+                final_decision = verdict_decision
+        if draft_decision in {"send", "hold"}:
+            if has_verdict:
+                has_agent3_verdict = True
+            if final_decision is None:
+                final_decision = draft_decision
+
+    if final_decision is None:
+        status_norm = (status or "").strip().lower()
+        if status_norm in {"send", "approved"}:
+            final_decision = "send"
+        elif status_norm in {"hold", "needs_review"}:
+            final_decision = "hold"
+
+    flags = {
+        "has_snapshot": has_snapshot,
+        "has_agent1_output": has_agent1_output,
+        "has_draft": has_draft,
+        "has_agent3_verdict": has_agent3_verdict,
+        "final_decision": final_decision,
+    }
+    return {**flags, "pipeline_stage": _stage(status, **flags)}
+
+
+def _draft_columns(dialect_name: str) -> tuple:
+    json_type = sa.func.json_typeof if dialect_name == "postgresql" else sa.func.json_type
+    return (
+        _drafts.c.lead_id,
+        _drafts.c.decision,
+        sa.and_(_drafts.c.agent1_output.is_not(None), sa.cast(_drafts.c.agent1_output, sa.String) != "null"),
+        json_type(_drafts.c.agent3_verdict) == "object",
+        _drafts.c.agent3_verdict["source"].as_string(),
+        _drafts.c.agent3_verdict["decision"].as_string(),
+        sa.and_(
+            _drafts.c.subject.startswith(_AGENT1_SUBJECT_PREFIX, autoescape=True),
+            _drafts.c.body.startswith(_AGENT1_BODY_PREFIX, autoescape=True),
+        ),
+    )
+
+
+def _backfill_states(bind) -> None:
+    write = (
+        sa.update(_leads)
+        .where(_leads.c.id == sa.bindparam("lead_id"))
+        .values({column: sa.bindparam(f"s_{column}") for column in _STATE_COLUMNS})
+    )
+    last_id = None
+    while True:
+        query = sa.select(_leads.c.id, _leads.c.status).order_by(_leads.c.id).limit(_BATCH_SIZE)
+        if last_id is not None:
+            query = query.where(_leads.c.id > last_id)
+        rows = bind.execute(query).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        ids = [row.id for row in rows]
+        with_snapshot = set(
+            bind.scalars(sa.select(_snapshots.c.lead_id).where(_snapshots.c.lead_id.in_(ids)).distinct()).all()
+        )
+        drafts_by_lead: dict = {}
+        for draft in bind.execute(
+            sa.select(*_draft_columns(bind.dialect.name))
+            .where(_drafts.c.lead_id.in_(ids))
+            .order_by(_drafts.c.created_at.desc(), _drafts.c.updated_at.desc())
+        ).all():
+            drafts_by_lead.setdefault(draft[0], []).append(draft)
+        bind.execute(
+            write,
+            [
+                {
+                    "lead_id": row.id,
+                    **{
+                        f"s_{column}": value
+                        for column, value in _state(
+                            row.status, drafts_by_lead.get(row.id, ()), has_snapshot=row.id in with_snapshot
+                        ).items()
+                    },
+                }
+                for row in rows
+            ],
+        )
+
+
+def upgrade() -> None:
+    for column in _FLAG_COLUMNS:
+        op.add_column("leads", sa.Column(column, sa.Boolean, nullable=False, server_default=sa.false()))
+    op.add_column("leads", sa.Column("final_decision", sa.String(10), nullable=True))
+    op.add_column(
+        "leads",
+        sa.Column("pipeline_stage", sa.String(30), nullable=False, server_default=sa.text("'imported'")),
+    )
+
+    _backfill_states(op.get_bind())
+
+    op.create_index(
+        "ix_leads_ws_pipeline_stage_created",
+        "leads",
+        ["workspace_id", "pipeline_stage", "created_at", "id"],
+    )
+    op.create_index(
+        "ix_leads_ws_draft_verdict_created",
+        "leads",
+        ["workspace_id", "has_draft", "has_agent3_verdict", "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_leads_ws_draft_verdict_created", table_name="leads")
+    op.drop_index("ix_leads_ws_pipeline_stage_created", table_name="leads")
+    for column in ("pipeline_stage", "final_decision", *reversed(_FLAG_COLUMNS)):
+        op.drop_column("leads", column)
@@ -0,0 +1,147 @@
+"""Search documents with trigram and full-text indexes."""
+from __future__ import annotations
+
+import zlib
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0028_search_documents"
+down_revision = "0027_lead_pipeline_state"
+branch_labels = None
+depends_on = None
+
+# The indexes and documents as this revision shipped them; later revisions change both.
+_BATCH_SIZE = 500
+_SNAPSHOT_EXCERPT_CHARS = 4000
+_SQLITE_INDEX_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_documents_fts USING fts5("
+    "title, body, content='search_documents', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_fts_ai AFTER INSERT ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_fts_ad AFTER DELETE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_fts_au AFTER UPDATE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+)
+_POSTGRES_INDEX_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_search_documents_title_trgm ON search_documents USING gin (title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_search_documents_body_fts "
+    "ON search_documents USING gin (to_tsvector('simple'::regconfig, body))",
+)
+# Entity type -> (table, title fields in order).
+_ENTITY_FIELDS = {
+    "lead": ("leads", ("company", "name", "industry", "location", "email", "website_url")),
+    "prospect": ("prospects", ("company_name", "category", "address", "website_url")),
+}
+
+_documents = sa.table(
+    "search_documents",
+    sa.column("workspace_id", sa.Uuid(as_uuid=True)),
+    sa.column("entity_type"),
+    sa.column("entity_id", sa.Uuid(as_uuid=True)),
+    sa.column("title"),
+    sa.column("body"),
+)
+_snapshots = sa.table(
+    "website_snapshots",
+    sa.column("lead_id", sa.Uuid(as_uuid=True)),
+    sa.column("text_id"),
+    sa.column("fetched_at"),
+)
+_blobs = sa.table("text_blobs", sa.column("id"), sa.column("data", sa.LargeBinary))
+
+
+def _join_fields(values) -> str:
+    return " ".join(str(value).strip() for value in values if value is not None and str(value).strip())
+
+
+def _snapshot_excerpts(bind, lead_ids: list) -> dict:
+    latest: dict = {}
+    rows = bind.execute(
+        sa.select(_snapshots.c.lead_id, _snapshots.c.text_id)
+        .where(_snapshots.c.lead_id.in_(lead_ids))
+        .order_by(_snapshots.c.fetched_at.desc())
+    ).all()
+    for lead_id, text_id in rows:
+        latest.setdefault(lead_id, text_id)
+    if not latest:
+        return {}
+    blobs = dict(bind.execute(sa.select(_blobs.c.id, _blobs.c.data).where(_blobs.c.id.in_(set(latest.values())))).all())
+    return {
+        lead_id: zlib.decompress(blobs[text_id]).decode("utf-8")[:_SNAPSHOT_EXCERPT_CHARS]
+        for lead_id, text_id in latest.items()
+        if text_id in blobs
+    }
+
+
+def _build_documents(bind) -> None:
+    for entity_type, (table_name, fields) in _ENTITY_FIELDS.items():
+        entities = sa.table(
+            table_name,
+            sa.column("id", sa.Uuid(as_uuid=True)),
+            sa.column("workspace_id", sa.Uuid(as_uuid=True)),
+            *(sa.column(field) for field in fields),
+        )
+        last_id = None
+        while True:
+            query = sa.select(entities).order_by(entities.c.id).limit(_BATCH_SIZE)
+            if last_id is not None:
+                query = query.where(entities.c.id > last_id)
+            rows = bind.execute(query).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            ids = [row.id for row in rows]
+            excerpts = _snapshot_excerpts(bind, ids) if entity_type == "lead" else {}
+            documents = []
+            for row in rows:
+                title = _join_fields(getattr(row, field) for field in fields)
+                documents.append(
+                    {
+                        "workspace_id": row.workspace_id,
+                        "entity_type": entity_type,
+                        "entity_id": row.id,
+                        "title": title,
+                        "body": _join_fields((title, excerpts.get(row.id))),
+                    }
+                )
+            bind.execute(sa.insert(_documents), documents)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "search_documents",
+        sa.Column("id", sa.BigInteger().with_variant(sa.Integer, "sqlite"), primary_key=True, autoincrement=True),
+        sa.Column(
+            "workspace_id",
+            sa.Uuid(as_uuid=True),
+            sa.ForeignKey("workspaces.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("entity_type", sa.String(30), nullable=False),
+        sa.Column("entity_id", sa.Uuid(as_uuid=True), nullable=False),
+        sa.Column("title", sa.Text, nullable=False),
+        sa.Column("body", sa.Text, nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.UniqueConstraint("entity_type", "entity_id", name="uq_search_documents_entity"),
+    )
+    op.create_index("ix_search_documents_ws_type", "search_documents", ["workspace_id", "entity_type"])
+
+    bind = op.get_bind()
+    # The table is new and empty, so the SQLite triggers index every document written below.
+    for statement in _POSTGRES_INDEX_DDL if bind.dialect.name == "postgresql" else _SQLITE_INDEX_DDL:
+        op.execute(statement)
+    _build_documents(bind)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_search_documents_body_fts")
+    op.execute("DROP INDEX IF EXISTS ix_search_documents_title_trgm")
+    op.drop_index("ix_search_documents_ws_type", table_name="search_documents")
+    op.drop_table("search_documents")
+    op.execute("DROP TABLE IF EXISTS search_documents_fts")
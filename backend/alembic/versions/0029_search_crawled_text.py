@@ -0,0 +1,228 @@
+"""Index crawled pages, snapshots and email messages in search_documents."""
+from __future__ import annotations
+
+import zlib
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0029_search_crawled_text"
+down_revision = "0028_search_documents"
+branch_labels = None
+depends_on = None
+
+# The indexes and documents as this revision shipped them; later revisions change both.
+_BATCH_SIZE = 500
+_SNAPSHOT_EXCERPT_CHARS = 4000
+_DOCUMENT_TEXT_CHARS = 50_000
+# 0028 created the FTS5 table; its triggers already index every document written below.
+_SQLITE_INDEX_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_documents_fts USING fts5("
+    "title, body, content='search_documents', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_fts_ai AFTER INSERT ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_fts_ad AFTER DELETE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_fts_au AFTER UPDATE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+)
+_POSTGRES_INDEX_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_search_documents_title_trgm ON search_documents USING gin (title gin_trgm_ops)",
+    "ALTER TABLE search_documents ADD COLUMN IF NOT EXISTS body_tsv tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('simple'::regconfig, body)) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_search_documents_body_tsv ON search_documents USING gin (body_tsv)",
+)
+# Entity type -> (table, title fields in order).
+_RECORD_FIELDS = {
+    "lead": ("leads", ("company", "name", "industry", "location", "email", "website_url")),
+    "prospect": ("prospects", ("company_name", "category", "address", "website_url")),
+}
+_CRAWL_TABLES = {"website_page": "website_pages", "website_snapshot": "website_snapshots"}
+
+_documents = sa.table(
+    "search_documents",
+    sa.column("workspace_id", sa.Uuid(as_uuid=True)),
+    sa.column("entity_type"),
+    sa.column("entity_id", sa.Uuid(as_uuid=True)),
+    sa.column("parent_id", sa.Uuid(as_uuid=True)),
+    sa.column("title"),
+    sa.column("body"),
+)
+_snapshots = sa.table(
+    "website_snapshots",
+    sa.column("lead_id", sa.Uuid(as_uuid=True)),
+    sa.column("text_id"),
+    sa.column("fetched_at"),
+)
+_blobs = sa.table("text_blobs", sa.column("id"), sa.column("data", sa.LargeBinary))
+_messages = sa.table(
+    "email_messages",
+    sa.column("id", sa.Uuid(as_uuid=True)),
+    sa.column("thread_id", sa.Uuid(as_uuid=True)),
+    sa.column("subject"),
+    sa.column("sender"),
+    sa.column("body"),
+)
+_threads = sa.table(
+    "email_threads",
+    sa.column("id", sa.Uuid(as_uuid=True)),
+    sa.column("workspace_id", sa.Uuid(as_uuid=True)),
+)
+
+
+def _join_fields(values) -> str:
+    return " ".join(str(value).strip() for value in values if value is not None and str(value).strip())
+
+
+def _document(entity_type: str, entity_id, workspace_id, parent_id, title: str, body: str) -> dict:
+    return {
+        "workspace_id": workspace_id,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "parent_id": parent_id,
+        "title": title,
+        "body": body,
+    }
+
+
+def _blob_texts(bind, text_ids) -> dict:
+    text_ids = set(text_ids)
+    if not text_ids:
+        return {}
+    rows = bind.execute(sa.select(_blobs.c.id, _blobs.c.data).where(_blobs.c.id.in_(text_ids))).all()
+    return {blob_id: zlib.decompress(data).decode("utf-8") for blob_id, data in rows}
+
+
+def _snapshot_excerpts(bind, lead_ids: list) -> dict:
+    latest: dict = {}
+    rows = bind.execute(
+        sa.select(_snapshots.c.lead_id, _snapshots.c.text_id)
+        .where(_snapshots.c.lead_id.in_(lead_ids))
+        .order_by(_snapshots.c.fetched_at.desc())
+    ).all()
+    for lead_id, text_id in rows:
+        latest.setdefault(lead_id, text_id)
+    texts = _blob_texts(bind, latest.values())
+    return {
+        lead_id: texts[text_id][:_SNAPSHOT_EXCERPT_CHARS]
+        for lead_id, text_id in latest.items()
+        if text_id in texts
+    }
+
+
+def _batches(bind, query, key):
+    last_id = None
+    while True:
+        page = query.order_by(key).limit(_BATCH_SIZE)
+        if last_id is not None:
+            page = page.where(key > last_id)
+        rows = bind.execute(page).all()
+        if not rows:
+            return
+        last_id = rows[-1].id
+        yield rows
+
+
+def _record_documents(bind):
+    for entity_type, (table_name, fields) in _RECORD_FIELDS.items():
+        entities = sa.table(
+            table_name,
+            sa.column("id", sa.Uuid(as_uuid=True)),
+            sa.column("workspace_id", sa.Uuid(as_uuid=True)),
+            *(sa.column(field) for field in fields),
+        )
+        for rows in _batches(bind, sa.select(entities), entities.c.id):
+            excerpts = _snapshot_excerpts(bind, [row.id for row in rows]) if entity_type == "lead" else {}
+            documents = []
+            for row in rows:
+                title = _join_fields(getattr(row, field) for field in fields)
+                body = _join_fields((title, excerpts.get(row.id)))
+                documents.append(_document(entity_type, row.id, row.workspace_id, None, title, body))
+            yield documents
+
+
+def _crawl_documents(bind):
+    for entity_type, table_name in _CRAWL_TABLES.items():
+        entities = sa.table(
+            table_name,
+            sa.column("id", sa.Uuid(as_uuid=True)),
+            sa.column("workspace_id", sa.Uuid(as_uuid=True)),
+            sa.column("lead_id", sa.Uuid(as_uuid=True)),
+            sa.column("url"),
+            sa.column("text_id"),
+        )
+        for rows in _batches(bind, sa.select(entities), entities.c.id):
+            texts = _blob_texts(bind, (row.text_id for row in rows))
+            yield [
+                _document(
+                    entity_type,
+                    row.id,
+                    row.workspace_id,
+                    row.lead_id,
+                    row.url,
+                    texts.get(row.text_id, "")[:_DOCUMENT_TEXT_CHARS],
+                )
+                for row in rows
+            ]
+
+
+def _email_message_documents(bind):
+    query = sa.select(
+        _messages.c.id,
+        _threads.c.workspace_id,
+        _messages.c.thread_id,
+        _messages.c.subject,
+        _messages.c.sender,
+        _messages.c.body,
+    ).join(_threads, _threads.c.id == _messages.c.thread_id)
+    for rows in _batches(bind, query, _messages.c.id):
+        yield [
+            _document(
+                "email_message",
+                row.id,
+                row.workspace_id,
+                row.thread_id,
+                _join_fields((row.subject, row.sender)),
+                (row.body or "")[:_DOCUMENT_TEXT_CHARS],
+            )
+            for row in rows
+        ]
+
+
+def _build_documents(bind) -> None:
+    # Rewritten from scratch, which also drops documents whose record is gone.
+    bind.execute(sa.delete(_documents))
+    for build in (_record_documents, _crawl_documents, _email_message_documents):
+        for documents in build(bind):
+            bind.execute(sa.insert(_documents), documents)
+
+
+def upgrade() -> None:
+    op.add_column("search_documents", sa.Column("parent_id", sa.Uuid(as_uuid=True), nullable=True))
+    op.create_index("ix_search_documents_parent", "search_documents", ["parent_id"])
+
+    bind = op.get_bind()
+    # The body is now matched through a stored tsvector instead of an expression index.
+    op.execute("DROP INDEX IF EXISTS ix_search_documents_body_fts")
+    for statement in _POSTGRES_INDEX_DDL if bind.dialect.name == "postgresql" else _SQLITE_INDEX_DDL:
+        op.execute(statement)
+    _build_documents(bind)
+
+
+def downgrade() -> None:
+    op.execute(
+        "DELETE FROM search_documents WHERE entity_type IN ('website_page', 'website_snapshot', 'email_message')"
+    )
+    op.drop_index("ix_search_documents_parent", table_name="search_documents")
+    op.drop_column("search_documents", "parent_id")
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_search_documents_body_tsv")
+        op.execute("ALTER TABLE search_documents DROP COLUMN IF EXISTS body_tsv")
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_search_documents_body_fts "
+            "ON search_documents USING gin (to_tsvector('simple'::regconfig, body))"
+        )
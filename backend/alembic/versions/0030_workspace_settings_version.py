@@ -0,0 +1,21 @@
+"""Version stamp for cached workspace configuration."""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0030_workspace_settings_version"
+down_revision = "0029_search_crawled_text"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "workspaces",
+        sa.Column("settings_version", sa.Integer, nullable=False, server_default=sa.text("0")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("workspaces", "settings_version")
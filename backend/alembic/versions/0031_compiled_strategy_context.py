@@ -0,0 +1,208 @@
+"""Compiled agent strategy contexts stored on workspace_ai_strategy."""
+from __future__ import annotations
+
+import re
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0031_compiled_strategy_context"
+down_revision = "0030_workspace_settings_version"
+branch_labels = None
+depends_on = None
+
+# The compiled context as this revision shipped it (format 1); the application recompiles
+# stored contexts of any other format on load, so later formats need no migration.
+_CONTEXT_FORMAT = 1
+_NO_CATEGORY = ""
+_CATEGORY_ALIASES = {
+    "brewing": ["restaurant", "hospitality", "food_beverage"],
+    "brewery": ["restaurant", "hospitality", "food_beverage"],
+    "beverage": ["restaurant", "hospitality", "food_beverage"],
+    "bar": ["restaurant", "hospitality"],
+    "pub": ["restaurant", "hospitality"],
+    "food": ["restaurant", "hospitality"],
+}
+
+_strategies = sa.table(
+    "workspace_ai_strategy",
+    sa.column("workspace_id", sa.Uuid(as_uuid=True)),
+    sa.column("generated_strategy", sa.JSON),
+    sa.column("selected_target_categories", sa.JSON),
+    sa.column("selected_priority_pain_points", sa.JSON),
+    sa.column("selected_cta_style", sa.String),
+    sa.column("compiled_context", sa.JSON),
+)
+
+
+def _normalize_identifier(value: str) -> str:
+    return re.sub(r"_+", "_", re.sub(r"[^a-z0-9]+", "_", value.lower())).strip("_")
+
+
+def _string_list(values) -> list:
+    normalized: list = []
+    for raw in values or ():
+        value = raw.strip() if isinstance(raw, str) else ""
+        if value and value not in normalized:
+            normalized.append(value)
+    return normalized
+
+
+def _object_list(container, key: str) -> list:
+    value = container.get(key) if isinstance(container, dict) else None
+    return [item for item in value if isinstance(item, dict)] if isinstance(value, list) else []
+
+
+def _match_selected(items: list, key_field: str, selected_keys: list) -> list:
+    index = {
+        item[key_field].strip(): item
+        for item in items
+        if isinstance(item.get(key_field), str) and item[key_field].strip()
+    }
+    return [index[key] for key in selected_keys if key in index]
+
+
+def _first_matching(items: list, key_field: str, key):
+    if not key:
+        return None
+    return next(
+        (item for item in items if isinstance(item.get(key_field), str) and item[key_field].strip() == key),
+        None,
+    )
+
+
+def _alias_target(candidates: list, target_norms: dict, target_categories: list) -> str:
+    for cand in candidates:
+        c_norm = _normalize_identifier(cand)
+        if c_norm in target_norms:
+            return target_norms[c_norm]
+        for tn, t in target_norms.items():
+            if c_norm in tn or cand in tn or tn in c_norm:
+                return t
+    return target_categories[0]
+
+
+def _category_context(
+    matched_category,
+    *,
+    pain_points,
+    rapport_points,
+    pain_points_by_cat,
+    service_angles_by_cat,
+    rapport_hooks_by_cat,
+) -> dict:
+    fallback_pain_points: list = []
+    fallback_service_angles: list = []
+    fallback_rapport_hooks: list = []
+    if matched_category:
+        fallback_pain_points = pain_points_by_cat.get(matched_category, pain_points)
+        fallback_service_angles = service_angles_by_cat.get(matched_category, [])
+        fallback_rapport_hooks = list(rapport_hooks_by_cat.get(matched_category, []))
+        if not fallback_rapport_hooks:
+            rp = next((r for r in rapport_points if r.get("category") == matched_category), None)
+            if rp and rp.get("hooks"):
+                fallback_rapport_hooks = rp["hooks"]
+    if not fallback_pain_points and pain_points:
+        fallback_pain_points = pain_points
+    if not fallback_rapport_hooks and rapport_points:
+        for rp in rapport_points:
+            if isinstance(rp, dict) and rp.get("hooks"):
+                fallback_rapport_hooks.extend(rp["hooks"])
+        fallback_rapport_hooks = list(dict.fromkeys(fallback_rapport_hooks))
+    return {
+        "matched_workspace_category": matched_category,
+        "matched_category": matched_category,
+        "fallback_pain_points_for_category": fallback_pain_points,
+        "fallback_service_angles_for_category": fallback_service_angles,
+        "fallback_rapport_hooks_for_category": fallback_rapport_hooks,
+    }
+
+
+def _compile(generated_strategy, selected_target_categories, selected_priority_pain_points, selected_cta_style) -> dict:
+    generated = generated_strategy if isinstance(generated_strategy, dict) else None
+    ideal_customers = _object_list(generated, "ideal_customers")
+    pain_points = _object_list(generated, "priority_pain_points")
+    rapport_points = _object_list(generated, "rapport_points")
+    ctas = _object_list(generated, "cta_recommendations")
+    raw_target = (generated or {}).get("target_categories")
+    target_categories = [str(c) for c in (raw_target or []) if isinstance(c, str)]
+    if not target_categories:
+        target_categories = [item.get("category") for item in ideal_customers if item.get("category")]
+
+    pain_points_by_cat = (generated or {}).get("pain_points_by_category") or {}
+    service_angles_by_cat = (generated or {}).get("service_angles_by_category") or {}
+    rapport_hooks_by_cat = (generated or {}).get("rapport_hooks_by_category") or {}
+
+    selected_categories = _string_list(selected_target_categories)
+    selected_pains = _string_list(selected_priority_pain_points)
+    selected_cta = (selected_cta_style or "").strip() or None
+
+    core_positioning = (generated or {}).get("core_positioning")
+    core_positioning = str(core_positioning).strip() if core_positioning else None
+
+    base = {
+        "generated_strategy": generated,
+        "core_positioning": core_positioning,
+        "selected_target_categories": selected_categories,
+        "selected_priority_pain_points": selected_pains,
+        "selected_cta_style": selected_cta,
+        "selected_target_category_details": _match_selected(ideal_customers, "category", selected_categories),
+        "selected_priority_pain_point_details": _match_selected(pain_points, "key", selected_pains),
+        "selected_cta_recommendation": _first_matching(ctas, "key", selected_cta),
+        "rapport_points": rapport_points,
+        "strategy_available": generated is not None,
+        "selection_mode": "selected_only" if (selected_categories or selected_pains or selected_cta) else "open",
+        "target_categories": target_categories,
+        "pain_points_by_category": (
+            {str(k): v for k, v in pain_points_by_cat.items()} if isinstance(pain_points_by_cat, dict) else {}
+        ),
+    }
+    sources = {
+        "pain_points": pain_points,
+        "rapport_points": rapport_points,
+        "pain_points_by_cat": pain_points_by_cat,
+        "service_angles_by_cat": service_angles_by_cat,
+        "rapport_hooks_by_cat": rapport_hooks_by_cat,
+    }
+    categories = {_NO_CATEGORY: _category_context(None, **sources)}
+    for tc in target_categories:
+        categories.setdefault(tc, _category_context(tc, **sources))
+
+    target_norms = {_normalize_identifier(tc): tc for tc in target_categories}
+    return {
+        "format": _CONTEXT_FORMAT,
+        "base": base,
+        "categories": categories,
+        "targets": [[_normalize_identifier(tc), tc] for tc in target_categories],
+        "aliases": [
+            [alias, _alias_target(candidates, target_norms, target_categories)]
+            for alias, candidates in _CATEGORY_ALIASES.items()
+        ] if target_categories else [],
+    }
+
+
+def _compile_contexts(bind) -> None:
+    rows = bind.execute(
+        sa.select(
+            _strategies.c.workspace_id,
+            _strategies.c.generated_strategy,
+            _strategies.c.selected_target_categories,
+            _strategies.c.selected_priority_pain_points,
+            _strategies.c.selected_cta_style,
+        )
+    ).all()
+    for workspace_id, *fields in rows:
+        bind.execute(
+            sa.update(_strategies)
+            .where(_strategies.c.workspace_id == workspace_id)
+            .values(compiled_context=_compile(*fields))
+        )
+
+
+def upgrade() -> None:
+    op.add_column("workspace_ai_strategy", sa.Column("compiled_context", sa.JSON, nullable=True))
+    _compile_contexts(op.get_bind())
+
+
+def downgrade() -> None:
+    op.drop_column("workspace_ai_strategy", "compiled_context")
@@ -0,0 +1,23 @@
+"""Retry failed inbound classifications with backoff."""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0032_inbound_processing_retries"
+down_revision = "0031_compiled_strategy_context"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "email_messages",
+        sa.Column("processing_attempts", sa.Integer, nullable=False, server_default=sa.text("0")),
+    )
+    op.add_column("email_messages", sa.Column("processing_retry_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("email_messages", "processing_retry_at")
+    op.drop_column("email_messages", "processing_attempts")
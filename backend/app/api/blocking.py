@@ -0,0 +1,53 @@
+"""Routes that block for a long time, kept off the threads the other sync routes share.
+
+FastAPI runs every ``def`` route (and sync dependency) on one anyio thread limiter, 40
+threads by default. Agent runs, reply suggestions and website ingestion wait tens of
+seconds on LLM APIs or remote sites, so a burst of them used to take every token and leave
+list, detail and health requests queued behind them. ``blocking_route`` registers such a
+route as an ``async def`` endpoint that runs the unchanged sync function on a separate
+limiter of ``blocking_route_concurrency`` threads. The sync function itself is returned
+as-is, so the pipeline worker can keep calling it directly.
+"""
+from __future__ import annotations
+
+import inspect
+from collections.abc import Callable
+from functools import partial
+from typing import Any, TypeVar
+
+import anyio
+import anyio.to_thread
+
+from app.core.config import settings
+
+RouteFunction = TypeVar("RouteFunction", bound=Callable[..., Any])
+
+_limiter: anyio.CapacityLimiter | None = None
+
+
+def _blocking_limiter() -> anyio.CapacityLimiter:
+    # Created on first use: a limiter belongs to the event loop it is created in.
+    global _limiter
+    if _limiter is None:
+        _limiter = anyio.CapacityLimiter(settings.blocking_route_concurrency)
+    return _limiter
+
+
+def blocking_route(register: Callable[[Callable[..., Any]], Any]) -> Callable[[RouteFunction], RouteFunction]:
+    """Register a slow sync route through ``register`` (e.g. ``router.post(...)``)."""
+
+    def decorator(route: RouteFunction) -> RouteFunction:
+        async def endpoint(*args: Any, **kwargs: Any) -> Any:
+            return await anyio.to_thread.run_sync(partial(route, *args, **kwargs), limiter=_blocking_limiter())
+
+        # Not functools.wraps: FastAPI follows __wrapped__ and would treat the endpoint as sync.
+        endpoint.__name__ = route.__name__
+        endpoint.__qualname__ = route.__qualname__
+        endpoint.__doc__ = route.__doc__
+        endpoint.__module__ = route.__module__
+        # Annotations resolved against the route's module, not this one.
+        endpoint.__signature__ = inspect.signature(route, eval_str=True)  # type: ignore[attr-defined]
+        register(endpoint)
+        return route
+
+    return decorator
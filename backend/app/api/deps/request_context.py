@@ -12,7 +12,8 @@ class RequestContext:
     user_id: UUID
 
 
-def get_request_context(request: Request) -> RequestContext:
+# async: it does no I/O, so it should not take a threadpool token on every request.
+async def get_request_context(request: Request) -> RequestContext:
     workspace_id = getattr(request.state, "workspace_id", None)
     user_id = getattr(request.state, "user_id", None)
 
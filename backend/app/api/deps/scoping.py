@@ -4,7 +4,8 @@ import logging
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.lead import Lead
@@ -12,20 +13,38 @@ from app.models.lead import Lead
 logger = logging.getLogger(__name__)
 
 
-def get_scoped_lead(db: Session, lead_id: UUID, workspace_id: UUID) -> Lead | None:
-    lead = db.scalar(select(Lead).where(Lead.id == lead_id, Lead.workspace_id == workspace_id).limit(1))
+def _scoped_lead_statement(lead_id: UUID, workspace_id: UUID) -> Select[tuple[Lead]]:
+    return select(Lead).where(Lead.id == lead_id, Lead.workspace_id == workspace_id).limit(1)
+
+
+def _log_lookup(lead: Lead | None, lead_id: UUID, workspace_id: UUID) -> None:
     logger.info(
         "Scoped lead lookup workspace_id=%s lead_id=%s found=%s",
         workspace_id,
         lead_id,
         bool(lead),
     )
-    return lead
 
 
-def require_scoped_lead(db: Session, lead_id: UUID, workspace_id: UUID) -> Lead:
-    lead = get_scoped_lead(db=db, lead_id=lead_id, workspace_id=workspace_id)
+def _found(lead: Lead | None, lead_id: UUID, workspace_id: UUID) -> Lead:
     if lead is None:
         logger.warning("Scoped lead missing workspace_id=%s lead_id=%s", workspace_id, lead_id)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lead not found")
     return lead
+
+
+def get_scoped_lead(db: Session, lead_id: UUID, workspace_id: UUID) -> Lead | None:
+    lead = db.scalar(_scoped_lead_statement(lead_id, workspace_id))
+    _log_lookup(lead, lead_id, workspace_id)
+    return lead
+
+
+def require_scoped_lead(db: Session, lead_id: UUID, workspace_id: UUID) -> Lead:
+    lead = get_scoped_lead(db=db, lead_id=lead_id, workspace_id=workspace_id)
+    return _found(lead, lead_id, workspace_id)
+
+
+async def require_scoped_lead_async(db: AsyncSession, lead_id: UUID, workspace_id: UUID) -> Lead:
+    lead = await db.scalar(_scoped_lead_statement(lead_id, workspace_id))
+    _log_lookup(lead, lead_id, workspace_id)
+    return _found(lead, lead_id, workspace_id)
@@ -0,0 +1,219 @@
+"""Keyset (cursor) pagination and optional row counts for list endpoints.
+
+Every list endpoint orders by a sort key ending in the primary key, so a page can resume
+"after" the last row it returned: ``?cursor=`` carries that row's key, opaquely encoded.
+Unlike ``OFFSET`` this costs the same at any depth and does not skip or repeat rows when
+the worker updates statuses between pages. ``offset`` is still accepted for older
+clients but ignored once a cursor is given.
+
+Counts are a separate, optional query (``?count=``): ``exact`` (default), ``cached``
+(exact, reused for ``list_count_cache_seconds``), ``estimated`` (planner estimate on
+PostgreSQL, ``cached`` elsewhere) or ``none``.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Literal
+from uuid import UUID
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import DateTime, Select, String, TypeDecorator, and_, func, literal, or_, select, tuple_
+from sqlalchemy.engine import Dialect
+from sqlalchemy.orm import InstrumentedAttribute, Session, aliased
+from sqlalchemy.types import TypeEngine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CountMode = Literal["exact", "estimated", "cached", "none"]
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+_COUNT_CACHE_MAX_ENTRIES = 1024
+
+
+@dataclass(frozen=True)
+class Keyset:
+    """Sort key of a list endpoint: ``columns`` in order, the last one unique (the id).
+
+    Only the first column may be NULL (``nullable``); NULLs sort last in both directions.
+    ``name`` is embedded in cursors so one endpoint's cursor is rejected by another.
+    """
+
+    name: str
+    columns: tuple[InstrumentedAttribute[Any], ...]
+    descending: bool = True
+    nullable: bool = False
+
+    def order_by(self) -> list[Any]:
+        ordered = [column.desc() if self.descending else column.asc() for column in self.columns]
+        if self.nullable:
+            ordered[0] = ordered[0].nulls_last()
+        return ordered
+
+    def paginate(self, stmt: Select[Any], *, cursor: str | None, offset: int, limit: int) -> Select[Any]:
+        """Order ``stmt`` by the key and fetch one row past ``limit`` to detect a next page."""
+        stmt = stmt.order_by(*self.order_by()).limit(limit + 1)
+        if cursor:
+            return stmt.where(self._after(self.decode(cursor)))
+        return stmt.offset(offset) if offset else stmt
+
+    def page(
+        self,
+        rows: Sequence[Any],
+        limit: int,
+        *,
+        entity: Callable[[Any], Any] = lambda row: row,
+    ) -> tuple[list[Any], str | None]:
+        """Trim the extra row fetched by ``paginate`` and return ``(rows, next_cursor)``."""
+        items = list(rows[:limit])
+        if len(rows) <= limit or not items:
+            return items, None
+        last = entity(items[-1])
+        return items, self.encode([getattr(last, column.key) for column in self.columns])
+
+    def encode(self, values: Sequence[Any]) -> str:
+        payload = json.dumps({"k": self.name, "v": [_dump_value(value) for value in values]}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+    def decode(self, cursor: str) -> list[Any]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            if payload.get("k") != self.name or len(payload.get("v", ())) != len(self.columns):
+                raise ValueError("cursor belongs to another list")
+            return [_load_value(column, value) for column, value in zip(self.columns, payload["v"])]
+        except (ValueError, TypeError, AttributeError, binascii.Error, UnicodeError) as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+    def _after(self, values: list[Any]) -> Any:
+        values = [self._bound(column, value, values[-1]) for column, value in zip(self.columns, values)]
+
+        def beyond(columns: Sequence[Any], bounds: Sequence[Any]) -> Any:
+            if len(columns) == 1:
+                return columns[0] < bounds[0] if self.descending else columns[0] > bounds[0]
+            left, right = tuple_(*columns), tuple_(*bounds)
+            return left < right if self.descending else left > right
+
+        if not self.nullable:
+            return beyond(self.columns, values)
+        first = self.columns[0]
+        if values[0] is None:
+            # Already inside the trailing NULL block: continue on the remaining columns.
+            return and_(first.is_(None), beyond(self.columns[1:], values[1:]))
+        return or_(beyond(self.columns, values), first.is_(None))
+
+    def _bound(self, column: InstrumentedAttribute[Any], value: Any, row_id: Any) -> Any:
+        if not isinstance(value, datetime) or value.microsecond:
+            return value
+        # SQLite stores datetimes as text, and a whole-second timestamp may have been written
+        # with or without a ".000000" suffix. Compare against the value as the cursor row
+        # stores it, falling back to the decoded value if that row is gone.
+        source = aliased(column.class_)
+        stored = (
+            select(getattr(source, column.key))
+            .where(getattr(source, self.columns[-1].key) == row_id)
+            .scalar_subquery()
+        )
+        return func.coalesce(stored, literal(value, _CursorDateTime()))
+
+
+class _CursorDateTime(TypeDecorator[datetime]):
+    """Binds a whole-second cursor timestamp as SQLite's ``server_default`` writes it."""
+
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect: Dialect) -> TypeEngine[Any]:
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(String())
+        return dialect.type_descriptor(DateTime(timezone=True))
+
+    def process_bind_param(self, value: datetime | None, dialect: Dialect) -> Any:
+        if value is not None and dialect.name == "sqlite":
+            return value.strftime("%Y-%m-%d %H:%M:%S")
+        return value
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _load_value(column: InstrumentedAttribute[Any], value: Any) -> Any:
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is UUID:
+        return UUID(value)
+    if not isinstance(value, python_type):
+        raise TypeError(f"cursor value for {column.key} has the wrong type")
+    return value
+
+
+def set_next_cursor_header(response: Response, next_cursor: str | None) -> None:
+    """For endpoints whose body is a bare list, expose the next cursor as a header."""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
+_count_cache: OrderedDict[str, tuple[float, int]] = OrderedDict()
+_count_cache_lock = threading.Lock()
+
+
+def count_rows(db: Session, model: type[Any], filters: Sequence[Any], mode: CountMode) -> int | None:
+    """Row count for ``model`` under ``filters`` according to ``mode`` (``None`` for ``none``)."""
+    if mode == "none":
+        return None
+    stmt = select(func.count()).select_from(model).where(*filters)
+    if mode == "exact":
+        return db.scalar(stmt) or 0
+    if mode == "estimated" and db.get_bind().dialect.name == "postgresql":
+        estimate = _planner_estimate(db, select(model).where(*filters))
+        if estimate is not None:
+            return estimate
+    return _cached_count(db, stmt)
+
+
+def _cached_count(db: Session, stmt: Select[Any]) -> int:
+    compiled = stmt.compile(dialect=db.get_bind().dialect)
+    key = f"{compiled}|{sorted((name, repr(value)) for name, value in compiled.params.items())}"
+    now = time.monotonic()
+    with _count_cache_lock:
+        cached = _count_cache.get(key)
+        if cached is not None and cached[0] > now:
+            _count_cache.move_to_end(key)
+            return cached[1]
+    total = db.scalar(stmt) or 0
+    with _count_cache_lock:
+        _count_cache[key] = (now + settings.list_count_cache_seconds, total)
+        _count_cache.move_to_end(key)
+        while len(_count_cache) > _COUNT_CACHE_MAX_ENTRIES:
+            _count_cache.popitem(last=False)
+    return total
+
+
+def _planner_estimate(db: Session, stmt: Select[Any]) -> int | None:
+    try:
+        sql = stmt.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True})
+        with db.begin_nested():
+            plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception:  # noqa: BLE001 — an estimate is best-effort; callers fall back to a count
+        logger.debug("Planner row estimate failed", exc_info=True)
+        return None
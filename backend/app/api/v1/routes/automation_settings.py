@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.api.deps.request_context import RequestContext, get_request_context
@@ -15,6 +17,7 @@ from app.services.automation_policy import (
     AUTOMATION_MODE_AUTO_SEND,
     get_or_create_automation_settings,
     normalize_automation_mode,
+    normalize_inbox_reply_mode,
 )
 
 router = APIRouter(prefix="/automation-settings", tags=["Automation Settings"])
@@ -34,6 +37,12 @@ def get_automation_settings(
             auto_create_gmail_draft=False,
             auto_send_approved_emails=False,
             pause_pipeline=False,
+            inbox_reply_mode="suggest_only",
+            daily_send_limit=None,
+            send_window_start_hour=None,
+            send_window_end_hour=None,
+            send_timezone=None,
+            send_weekdays_only=False,
             created_at=None,
             updated_at=None,
         )
@@ -60,6 +69,34 @@ def patch_automation_settings(
         row.auto_send_approved_emails = bool(updates["auto_send_approved_emails"])
     if "pause_pipeline" in updates and updates["pause_pipeline"] is not None:
         row.pause_pipeline = bool(updates["pause_pipeline"])
+    if "inbox_reply_mode" in updates and updates["inbox_reply_mode"] is not None:
+        row.inbox_reply_mode = normalize_inbox_reply_mode(updates["inbox_reply_mode"])
+
+    # Send-queue limits are nullable: an explicit null clears the override.
+    if "daily_send_limit" in updates:
+        row.daily_send_limit = updates["daily_send_limit"]
+    if "send_window_start_hour" in updates:
+        row.send_window_start_hour = updates["send_window_start_hour"]
+    if "send_window_end_hour" in updates:
+        row.send_window_end_hour = updates["send_window_end_hour"]
+    if "send_timezone" in updates:
+        tz_name = (updates["send_timezone"] or "").strip() or None
+        if tz_name is not None:
+            try:
+                ZoneInfo(tz_name)
+            except (ZoneInfoNotFoundError, ValueError):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown send_timezone: {tz_name}",
+                )
+        row.send_timezone = tz_name
+    if "send_weekdays_only" in updates and updates["send_weekdays_only"] is not None:
+        row.send_weekdays_only = bool(updates["send_weekdays_only"])
+    if (row.send_window_start_hour is None) != (row.send_window_end_hour is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="send_window_start_hour and send_window_end_hour must be set together.",
+        )
 
     mode = normalize_automation_mode(row.automation_mode)
     if mode == AUTOMATION_MODE_AUTO_DRAFT:
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.deps.request_context import RequestContext, get_request_context
+from app.api.pagination import CountMode, Keyset, count_rows
+from app.core.config import settings
+from app.db.session import SessionLocal, get_db
+from app.models.background_job import BACKGROUND_JOB_FINISHED_STATUSES, BACKGROUND_JOB_STATUS_VALUES, BackgroundJob
+from app.schemas.background_job import BackgroundJobListResponse, BackgroundJobRead
+from app.services.background_jobs import request_background_job_cancel, submit_background_job
+
+router = APIRouter(prefix="/background-jobs", tags=["Background Jobs"])
+
+BACKGROUND_JOB_LIST_KEYSET = Keyset("background_jobs", (BackgroundJob.created_at, BackgroundJob.id))
+EVENT_POLL_SECONDS = 1.0
+# Comment lines keep idle SSE connections open through proxies.
+EVENT_KEEPALIVE_SECONDS = 15.0
+
+ACCEPTED_JOB_RESPONSE: dict[int | str, dict[str, Any]] = {
+    status.HTTP_202_ACCEPTED: {"model": BackgroundJobRead, "description": "Queued as a background job (?async=true)."}
+}
+
+
+def submit_job_response(
+    db: Session,
+    ctx: RequestContext,
+    *,
+    kind: str,
+    params: dict[str, Any],
+) -> JSONResponse:
+    """Queue ``kind`` for the worker and answer 202 with the job, for ``?async=true`` endpoints."""
+    job = submit_background_job(db, workspace_id=ctx.workspace_id, user_id=ctx.user_id, kind=kind, params=params)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=jsonable_encoder(BackgroundJobRead.model_validate(job)),
+        headers={"Location": f"{settings.api_prefix}{router.prefix}/{job.id}"},
+    )
+
+
+def _require_scoped_job(db: Session, *, job_id: UUID, workspace_id: UUID) -> BackgroundJob:
+    job = db.get(BackgroundJob, job_id)
+    if job is None or job.workspace_id != workspace_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Background job not found")
+    return job
+
+
+@router.get("", response_model=BackgroundJobListResponse)
+def list_background_jobs(
+    db: Session = Depends(get_db),
+    ctx: RequestContext = Depends(get_request_context),
+    status_filter: str | None = Query(default=None, alias="status"),
+    kind: str | None = Query(default=None),
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = Query(default=None),
+    count: CountMode = Query(default="exact"),
+) -> BackgroundJobListResponse:
+    if status_filter is not None and status_filter not in BACKGROUND_JOB_STATUS_VALUES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown status: {status_filter}")
+
+    filters = [BackgroundJob.workspace_id == ctx.workspace_id]
+    if status_filter is not None:
+        filters.append(BackgroundJob.status == status_filter)
+    if kind:
+        filters.append(BackgroundJob.kind == kind)
+
+    total = count_rows(db, BackgroundJob, filters, count)
+    stmt = BACKGROUND_JOB_LIST_KEYSET.paginate(
+        select(BackgroundJob).where(*filters),
+        cursor=cursor,
+        offset=offset,
+        limit=limit,
+    )
+    rows, next_cursor = BACKGROUND_JOB_LIST_KEYSET.page(db.scalars(stmt).all(), limit)
+    return BackgroundJobListResponse(
+        items=[BackgroundJobRead.model_validate(row) for row in rows],
+        total=total,
+        offset=offset,
+        limit=limit,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/{job_id}", response_model=BackgroundJobRead)
+def get_background_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    ctx: RequestContext = Depends(get_request_context),
+) -> BackgroundJobRead:
+    return BackgroundJobRead.model_validate(_require_scoped_job(db, job_id=job_id, workspace_id=ctx.workspace_id))
+
+
+@router.post("/{job_id}/cancel", response_model=BackgroundJobRead)
+def cancel_background_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    ctx: RequestContext = Depends(get_request_context),
+) -> BackgroundJobRead:
+    job = _require_scoped_job(db, job_id=job_id, workspace_id=ctx.workspace_id)
+    if job.status in BACKGROUND_JOB_FINISHED_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Only queued or running jobs can be cancelled (status is {job.status}).",
+        )
+    return BackgroundJobRead.model_validate(request_background_job_cancel(db, job))
+
+
+def _load_job_snapshot(job_id: UUID, workspace_id: UUID) -> BackgroundJobRead | None:
+    with SessionLocal() as db:
+        job = db.get(BackgroundJob, job_id)
+        if job is None or job.workspace_id != workspace_id:
+            return None
+        return BackgroundJobRead.model_validate(job)
+
+
+@router.get("/{job_id}/events")
+async def stream_background_job_events(
+    job_id: UUID,
+    request: Request,
+    ctx: RequestContext = Depends(get_request_context),
+) -> StreamingResponse:
+    """Server-sent events: a ``progress`` event per change and a final ``done`` event."""
+    first = await asyncio.to_thread(_load_job_snapshot, job_id, ctx.workspace_id)
+    if first is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Background job not found")
+
+    async def events() -> AsyncIterator[str]:
+        snapshot: BackgroundJobRead | None = first
+        last_sent: str | None = None
+        last_write = time.monotonic()
+        while snapshot is not None:
+            finished = snapshot.status in BACKGROUND_JOB_FINISHED_STATUSES
+            data = json.dumps(jsonable_encoder(snapshot))
+            if data != last_sent:
+                yield f"event: {'done' if finished else 'progress'}\ndata: {data}\n\n"
+                last_sent = data
+                last_write = time.monotonic()
+            elif time.monotonic() - last_write >= EVENT_KEEPALIVE_SECONDS:
+                yield ": keepalive\n\n"
+                last_write = time.monotonic()
+            if finished or await request.is_disconnected():
+                return
+            await asyncio.sleep(EVENT_POLL_SECONDS)
+            snapshot = await asyncio.to_thread(_load_job_snapshot, job_id, ctx.workspace_id)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
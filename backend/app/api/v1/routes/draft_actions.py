@@ -3,12 +3,13 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy import func, or_, select
 from sqlalchemy.orm import Session
 
 from app.api.deps.request_context import RequestContext, get_request_context
-from app.db.session import get_db
+from app.api.pagination import CountMode, Keyset, count_rows, set_next_cursor_header
+from app.db.session import get_db, get_read_db
 from app.models.email_draft import EmailDraft
 from app.models.lead import Lead
 from app.models.lead_status import LEAD_STATUS_APPROVED, LEAD_STATUS_NEEDS_REVIEW
@@ -18,6 +19,8 @@ from app.schemas.email_draft import (
     DraftReviewUpdateResponse,
     GmailDraftActionResponse,
     GmailSendResponse,
+    OutboundEmailRead,
+    OutboundSendQueueResponse,
 )
 from app.services.draft_delivery import (
     REVIEW_STATUS_APPROVED,
@@ -26,10 +29,28 @@ from app.services.draft_delivery import (
     ensure_gmail_draft_for_email_draft,
     send_email_draft_via_gmail,
 )
+from app.models.outbound_email import (
+    OUTBOUND_STATUS_CANCELLED,
+    OUTBOUND_STATUS_FAILED,
+    OUTBOUND_STATUS_QUEUED,
+    OUTBOUND_STATUS_SENDING,
+    OUTBOUND_STATUS_VALUES,
+    OutboundEmail,
+)
+from app.services.automation_policy import resolve_automation_policy
 from app.services.gmail_service import GmailApiError
+from app.services.outbound_send_queue import (
+    daily_send_limit,
+    enqueue_draft_send,
+    get_active_send_for_draft,
+    sent_today_count,
+)
 
 router = APIRouter(prefix="/drafts", tags=["Draft Actions"])
 
+REVIEW_QUEUE_KEYSET = Keyset("review_queue", (EmailDraft.updated_at, EmailDraft.id), descending=False)
+SEND_QUEUE_KEYSET = Keyset("send_queue", (OutboundEmail.next_attempt_at, OutboundEmail.id), descending=False)
+
 
 def _require_scoped_draft(db: Session, draft_id: UUID, workspace_id: UUID) -> tuple[EmailDraft, Lead]:
     row = db.execute(
@@ -49,27 +70,31 @@ def _require_scoped_draft(db: Session, draft_id: UUID, workspace_id: UUID) -> tu
 
 @router.get("/review-queue", response_model=list[DraftReviewQueueItem])
 def list_review_queue(
-    db: Session = Depends(get_db),
+    response: Response,
+    db: Session = Depends(get_read_db),
     ctx: RequestContext = Depends(get_request_context),
     offset: int = Query(default=0, ge=0),
     limit: int = Query(default=25, ge=1, le=200),
+    cursor: str | None = Query(default=None),
     include_approved: bool = Query(default=False),
 ) -> list[DraftReviewQueueItem]:
     statuses = [REVIEW_STATUS_PENDING]
     if include_approved:
         statuses.append(REVIEW_STATUS_APPROVED)
-    rows = db.execute(
+    stmt = REVIEW_QUEUE_KEYSET.paginate(
         select(EmailDraft, Lead)
         .join(Lead, Lead.id == EmailDraft.lead_id)
         .where(
             EmailDraft.workspace_id == ctx.workspace_id,
             Lead.workspace_id == ctx.workspace_id,
             EmailDraft.review_status.in_(statuses),
-        )
-        .order_by(EmailDraft.updated_at.asc(), EmailDraft.created_at.asc())
-        .offset(offset)
-        .limit(limit)
-    ).all()
+        ),
+        cursor=cursor,
+        offset=offset,
+        limit=limit,
+    )
+    rows, next_cursor = REVIEW_QUEUE_KEYSET.page(db.execute(stmt).all(), limit, entity=lambda row: row[0])
+    set_next_cursor_header(response, next_cursor)
 
     items: list[DraftReviewQueueItem] = []
     for draft, lead in rows:
@@ -97,7 +122,7 @@ def list_review_queue(
 
 @router.get("/review-queue-summary", response_model=DraftReviewQueueSummary)
 def review_queue_summary(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     ctx: RequestContext = Depends(get_request_context),
 ) -> DraftReviewQueueSummary:
     filters = [EmailDraft.workspace_id == ctx.workspace_id]
@@ -139,6 +164,98 @@ def review_queue_summary(
     )
 
 
+def _require_scoped_send_item(db: Session, item_id: UUID, workspace_id: UUID) -> OutboundEmail:
+    item = db.scalar(
+        select(OutboundEmail).where(OutboundEmail.id == item_id, OutboundEmail.workspace_id == workspace_id)
+    )
+    if item is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Send queue item not found")
+    return item
+
+
+@router.get("/send-queue", response_model=OutboundSendQueueResponse)
+def list_send_queue(
+    db: Session = Depends(get_read_db),
+    ctx: RequestContext = Depends(get_request_context),
+    status_filter: str | None = Query(default=None, alias="status"),
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = Query(default=None),
+    count: CountMode = Query(default="exact"),
+) -> OutboundSendQueueResponse:
+    filters = [OutboundEmail.workspace_id == ctx.workspace_id]
+    if status_filter:
+        if status_filter not in OUTBOUND_STATUS_VALUES:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown status: {status_filter}")
+        filters.append(OutboundEmail.status == status_filter)
+
+    total = count_rows(db, OutboundEmail, filters, count)
+    stmt = SEND_QUEUE_KEYSET.paginate(select(OutboundEmail).where(*filters), cursor=cursor, offset=offset, limit=limit)
+    rows, next_cursor = SEND_QUEUE_KEYSET.page(db.scalars(stmt).all(), limit)
+    policy = resolve_automation_policy(db, ctx.workspace_id)
+    return OutboundSendQueueResponse(
+        items=[OutboundEmailRead.model_validate(row) for row in rows],
+        total=total,
+        next_cursor=next_cursor,
+        sent_today=sent_today_count(db, ctx.workspace_id, datetime.now(timezone.utc), policy),
+        daily_limit=daily_send_limit(policy),
+    )
+
+
+@router.post("/send-queue/{item_id}/cancel", response_model=OutboundEmailRead)
+def cancel_send_queue_item(
+    item_id: UUID,
+    db: Session = Depends(get_db),
+    ctx: RequestContext = Depends(get_request_context),
+) -> OutboundEmailRead:
+    item = _require_scoped_send_item(db, item_id=item_id, workspace_id=ctx.workspace_id)
+    if item.status != OUTBOUND_STATUS_QUEUED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Only queued items can be cancelled (status is {item.status}).",
+        )
+    item.status = OUTBOUND_STATUS_CANCELLED
+    db.commit()
+    return OutboundEmailRead.model_validate(item)
+
+
+@router.post("/send-queue/{item_id}/retry", response_model=OutboundEmailRead)
+def retry_send_queue_item(
+    item_id: UUID,
+    db: Session = Depends(get_db),
+    ctx: RequestContext = Depends(get_request_context),
+) -> OutboundEmailRead:
+    item = _require_scoped_send_item(db, item_id=item_id, workspace_id=ctx.workspace_id)
+    if item.status not in {OUTBOUND_STATUS_FAILED, OUTBOUND_STATUS_CANCELLED}:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Only failed or cancelled items can be retried (status is {item.status}).",
+        )
+    item.status = OUTBOUND_STATUS_QUEUED
+    item.attempts = 0
+    item.next_attempt_at = datetime.now(timezone.utc)
+    db.commit()
+    return OutboundEmailRead.model_validate(item)
+
+
+@router.post("/{draft_id}/queue-send", response_model=OutboundEmailRead)
+def queue_draft_send(
+    draft_id: UUID,
+    db: Session = Depends(get_db),
+    ctx: RequestContext = Depends(get_request_context),
+) -> OutboundEmailRead:
+    draft, lead = _require_scoped_draft(db, draft_id=draft_id, workspace_id=ctx.workspace_id)
+    if draft.review_status == REVIEW_STATUS_REJECTED:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Draft is rejected and cannot be sent.")
+    if draft.sent_at is not None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Draft has already been sent.")
+    if not lead.email or not lead.email.strip():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Lead email is required before sending.")
+    item = enqueue_draft_send(db, draft=draft)
+    db.commit()
+    return OutboundEmailRead.model_validate(item)
+
+
 @router.post("/{draft_id}/approve", response_model=DraftReviewUpdateResponse)
 def approve_draft(
     draft_id: UUID,
@@ -219,6 +336,9 @@ def send_draft(
     ctx: RequestContext = Depends(get_request_context),
 ) -> GmailSendResponse:
     draft, lead = _require_scoped_draft(db, draft_id=draft_id, workspace_id=ctx.workspace_id)
+    queued = get_active_send_for_draft(db, draft.id)
+    if queued is not None and queued.status == OUTBOUND_STATUS_SENDING:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Draft is being sent by the send queue.")
     try:
         send_email_draft_via_gmail(db=db, draft=draft, lead=lead)
     except ValueError as exc:
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.api.deps.request_context import RequestContext, get_request_context
+from app.api.pagination import CountMode, Keyset, count_rows
+from app.db.session import get_db, get_read_db
+from app.models.duplicate_candidate import (
+    DUPLICATE_ENTITY_VALUES,
+    DUPLICATE_STATUS_DISMISSED,
+    DUPLICATE_STATUS_OPEN,
+    DUPLICATE_STATUS_VALUES,
+    DuplicateCandidate,
+)
+from app.schemas.duplicate_candidate import (
+    DuplicateCandidateListResponse,
+    DuplicateCandidateRead,
+    DuplicateEntitySummary,
+    DuplicateMergeRequest,
+    DuplicateScanResponse,
+)
+from app.services.background_jobs import BackgroundJobContext, background_job_handler, submit_background_job
+from app.services.duplicate_detection import (
+    DuplicateMergeError,
+    entity_summary,
+    load_duplicate_entities,
+    merge_duplicate,
+    scan_workspace_duplicates,
+)
+
+router = APIRouter(prefix="/duplicates", tags=["Duplicates"])
+
+DUPLICATE_SCAN_JOB = "duplicates.scan"
+DUPLICATE_LIST_KEYSET = Keyset(
+    "duplicates",
+    (DuplicateCandidate.score, DuplicateCandidate.created_at, DuplicateCandidate.id),
+)
+
+
+def _require_scoped_candidate(db: Session, *, candidate_id: UUID, workspace_id: UUID) -> DuplicateCandidate:
+    candidate = db.get(DuplicateCandidate, candidate_id)
+    if candidate is None or candidate.workspace_id != workspace_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Duplicate candidate not found")
+    return candidate
+
+
+def _to_read_models(db: Session, workspace_id: UUID, rows: list[DuplicateCandidate]) -> list[DuplicateCandidateRead]:
+    refs = {(row.left_type, row.left_id) for row in rows} | {(row.right_type, row.right_id) for row in rows}
+    entities = load_duplicate_entities(db, workspace_id=workspace_id, refs=refs)
+
+    def summary(entity_type: str, entity_id: UUID) -> DuplicateEntitySummary | None:
+        entity = entities.get((entity_type, entity_id))
+        if entity is None:
+            return None
+        return DuplicateEntitySummary.model_validate(entity_summary(entity_type, entity))
+
+    return [
+        DuplicateCandidateRead(
+            id=row.id,
+            left_type=row.left_type,
+            left_id=row.left_id,
+            right_type=row.right_type,
+            right_id=row.right_id,
+            score=row.score,
+            reasons=row.reasons or [],
+            status=row.status,
+            resolved_at=row.resolved_at,
+            created_at=row.created_at,
+            left=summary(row.left_type, row.left_id),
+            right=summary(row.right_type, row.right_id),
+        )
+        for row in rows
+    ]
+
+
+@router.get("", response_model=DuplicateCandidateListResponse)
+def list_duplicates(
+    db: Session = Depends(get_read_db),
+    ctx: RequestContext = Depends(get_request_context),
+    status_filter: str = Query(default=DUPLICATE_STATUS_OPEN, alias="status"),
+    entity_type: str | None = Query(default=None),
+    min_score: float = Query(default=0.0, ge=0.0, le=1.0),
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = Query(default=None),
+    count: CountMode = Query(default="exact"),
+) -> DuplicateCandidateListResponse:
+    if status_filter not in DUPLICATE_STATUS_VALUES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown status: {status_filter}")
+    filters = [
+        DuplicateCandidate.workspace_id == ctx.workspace_id,
+        DuplicateCandidate.status == status_filter,
+    ]
+    if min_score > 0:
+        filters.append(DuplicateCandidate.score >= min_score)
+    if entity_type:
+        if entity_type not in DUPLICATE_ENTITY_VALUES:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown entity_type: {entity_type}")
+        filters.append(or_(DuplicateCandidate.left_type == entity_type, DuplicateCandidate.right_type == entity_type))
+
+    total = count_rows(db, DuplicateCandidate, filters, count)
+    stmt = DUPLICATE_LIST_KEYSET.paginate(
+        select(DuplicateCandidate).where(*filters),
+        cursor=cursor,
+        offset=offset,
+        limit=limit,
+    )
+    rows, next_cursor = DUPLICATE_LIST_KEYSET.page(db.scalars(stmt).all(), limit)
+    return DuplicateCandidateListResponse(
+        items=_to_read_models(db, ctx.workspace_id, rows),
+        total=total,
+        offset=offset,
+        limit=limit,
+        next_cursor=next_cursor,
+    )
+
+
+@router.post("/scan", response_model=DuplicateScanResponse, status_code=status.HTTP_202_ACCEPTED)
+def scan_duplicates(
+    db: Session = Depends(get_db),
+    ctx: RequestContext = Depends(get_request_context),
+) -> DuplicateScanResponse:
+    job = submit_background_job(
+        db,
+        workspace_id=ctx.workspace_id,
+        user_id=ctx.user_id,
+        kind=DUPLICATE_SCAN_JOB,
+        params={},
+    )
+    return DuplicateScanResponse(job_id=job.id)
+
+
+@background_job_handler(DUPLICATE_SCAN_JOB)
+def _run_scan_job(db: Session, job: BackgroundJobContext) -> dict[str, int]:
+    job.report_progress(message="Scanning for duplicates", force=True)
+
+    def on_progress(scanned: int) -> None:
+        job.report_progress(current=scanned, message=f"Scanned {scanned} records")
+
+    return {"flagged": scan_workspace_duplicates(db, job.workspace_id, on_progress=on_progress)}
+
+
+@router.post("/{candidate_id}/merge", response_model=DuplicateCandidateRead)
+def merge_duplicate_candidate(
+    candidate_id: UUID,
+    payload: DuplicateMergeRequest,
+    db: Session = Depends(get_db),
+    ctx: RequestContext = Depends(get_request_context),
+) -> DuplicateCandidateRead:
+    candidate = _require_scoped_candidate(db, candidate_id=candidate_id, workspace_id=ctx.workspace_id)
+    try:
+        merge_duplicate(db, candidate, keep=payload.keep)
+    except DuplicateMergeError as exc:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    db.commit()
+    return _to_read_models(db, ctx.workspace_id, [candidate])[0]
+
+
+@router.post("/{candidate_id}/dismiss", response_model=DuplicateCandidateRead)
+def dismiss_duplicate_candidate(
+    candidate_id: UUID,
+    db: Session = Depends(get_db),
+    ctx: RequestContext = Depends(get_request_context),
+) -> DuplicateCandidateRead:
+    candidate = _require_scoped_candidate(db, candidate_id=candidate_id, workspace_id=ctx.workspace_id)
+    if candidate.status != DUPLICATE_STATUS_OPEN:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Only open duplicates can be dismissed (status is {candidate.status}).",
+        )
+    candidate.status = DUPLICATE_STATUS_DISMISSED
+    candidate.resolved_at = datetime.now(timezone.utc)
+    db.commit()
+    return _to_read_models(db, ctx.workspace_id, [candidate])[0]
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+from datetime import datetime, timezone
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy import Select, and_, case, func, select
+from sqlalchemy.orm import Session, aliased
 
+from app.api.blocking import blocking_route
 from app.api.deps.request_context import RequestContext, get_request_context
-from app.db.session import get_db
+from app.api.pagination import CountMode, Keyset, count_rows
+from app.api.v1.routes.background_jobs import ACCEPTED_JOB_RESPONSE, submit_job_response
+from app.core.config import settings
+from app.db.session import get_db, get_read_db
 from app.models.email_message import EmailMessageRecord
 from app.models.email_thread import EmailThread
 from app.models.lead import Lead
@@ -21,112 +27,148 @@ from app.schemas.inbox import (
     InboxReviewQueueResponse,
     InboxSyncResponse,
     ReclassifyRequest,
+    ThreadSummaryRebuildResponse,
     SendReplyRequest,
 )
+from app.services.background_jobs import BackgroundJobContext, background_job_handler
+from app.services.inbox_processing import (
+    NEXT_ACTION_MAP,
+    apply_classification,
+    apply_suggested_reply,
+    build_thread_context,
+    load_reply_context,
+    process_pending_inbound_for_workspace,
+)
 
 router = APIRouter(prefix="/inbox", tags=["Inbox"])
 
-NEXT_ACTION_MAP = {
-    "meeting_request": "schedule_meeting",
-    "pricing_request": "provide_quote",
-    "interested": "follow_up",
-    "question": "follow_up",
-}
+INBOX_SYNC_JOB = "inbox.sync"
+THREAD_LIST_KEYSET = Keyset("threads", (EmailThread.last_message_at, EmailThread.id), nullable=True)
+
+
+def _entity_name_column():
+    return case(
+        (EmailThread.related_entity_type == "lead", Lead.company),
+        (EmailThread.related_entity_type == "partner_candidate", PartnerCandidate.company_name),
+        else_=None,
+    )
 
 
-def _resolve_entity_name(db: Session, entity_type: str | None, entity_id: UUID | None) -> str | None:
-    if not entity_type or not entity_id:
-        return None
-    if entity_type == "lead":
-        lead = db.get(Lead, entity_id)
-        return lead.company if lead else None
-    if entity_type == "partner_candidate":
-        partner = db.get(PartnerCandidate, entity_id)
-        return partner.company_name if partner else None
-    return None
+def _with_entity_joins(q: Select) -> Select:
+    return q.outerjoin(
+        Lead,
+        and_(EmailThread.related_entity_type == "lead", Lead.id == EmailThread.related_entity_id),
+    ).outerjoin(
+        PartnerCandidate,
+        and_(
+            EmailThread.related_entity_type == "partner_candidate",
+            PartnerCandidate.id == EmailThread.related_entity_id,
+        ),
+    )
 
 
-@router.post("/sync", response_model=InboxSyncResponse)
+@router.post("/sync", response_model=InboxSyncResponse, responses=ACCEPTED_JOB_RESPONSE)
 def sync_inbox(
+    background_tasks: BackgroundTasks,
     ctx: RequestContext = Depends(get_request_context),
     db: Session = Depends(get_db),
     max_results: int = Query(default=20, ge=1, le=100),
+    run_async: bool = Query(default=False, alias="async"),
 ):
     from app.services.inbox_service import sync_inbox as do_sync
 
+    if run_async:
+        return submit_job_response(db, ctx, kind=INBOX_SYNC_JOB, params={"max_results": max_results})
+
     try:
         stats = do_sync(db, ctx.workspace_id, max_results=max_results)
     except Exception as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
 
+    if stats["new_inbound"] and settings.inbox_processing_enabled:
+        background_tasks.add_task(process_pending_inbound_for_workspace, ctx.workspace_id)
+
     return InboxSyncResponse(**stats)
 
 
+@background_job_handler(INBOX_SYNC_JOB)
+def _run_sync_job(db: Session, job: BackgroundJobContext) -> InboxSyncResponse:
+    from app.services.inbox_service import sync_inbox as do_sync
+
+    job.report_progress(message="Syncing Gmail", force=True)
+    stats = do_sync(db, job.workspace_id, max_results=int(job.params.get("max_results", 20)))
+    if stats["new_inbound"] and settings.inbox_processing_enabled:
+        # Already off the request thread, so classify the new messages as part of the job.
+        job.report_progress(message="Processing new inbound messages", force=True)
+        process_pending_inbound_for_workspace(job.workspace_id)
+    return InboxSyncResponse(**stats)
+
+
+@router.post("/threads/rebuild-summaries", response_model=ThreadSummaryRebuildResponse)
+def rebuild_summaries(
+    ctx: RequestContext = Depends(get_request_context),
+    db: Session = Depends(get_db),
+):
+    from app.services.inbox_service import rebuild_thread_summaries
+
+    rebuilt = rebuild_thread_summaries(db, ctx.workspace_id)
+    return ThreadSummaryRebuildResponse(threads_rebuilt=rebuilt)
+
+
 @router.get("/threads", response_model=EmailThreadListResponse)
 def list_threads(
     ctx: RequestContext = Depends(get_request_context),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None),
+    count: CountMode = Query(default="exact"),
     status_filter: str | None = Query(default=None, alias="status"),
     classification: str | None = Query(default=None),
     needs_reply: bool | None = Query(default=None),
 ):
-    q = select(EmailThread).where(EmailThread.workspace_id == ctx.workspace_id)
-    count_q = select(func.count()).select_from(EmailThread).where(EmailThread.workspace_id == ctx.workspace_id)
-
+    filters = [EmailThread.workspace_id == ctx.workspace_id]
     if status_filter:
-        q = q.where(EmailThread.status == status_filter)
-        count_q = count_q.where(EmailThread.status == status_filter)
-
-    total = db.scalar(count_q) or 0
-    threads = db.scalars(q.order_by(EmailThread.last_message_at.desc().nullslast()).offset(offset).limit(limit)).all()
-
-    items: list[EmailThreadListItem] = []
-    for thread in threads:
-        latest_msg = db.scalar(
-            select(EmailMessageRecord)
-            .where(EmailMessageRecord.thread_id == thread.id)
-            .order_by(EmailMessageRecord.received_at.desc().nullslast())
-            .limit(1)
-        )
-        latest_inbound = db.scalar(
-            select(EmailMessageRecord)
-            .where(
-                EmailMessageRecord.thread_id == thread.id,
-                EmailMessageRecord.direction == "inbound",
-            )
-            .order_by(EmailMessageRecord.received_at.desc().nullslast())
-            .limit(1)
-        )
-        msg_classification = latest_inbound.classification if latest_inbound else None
-
-        if classification and msg_classification != classification:
-            continue
-        if needs_reply and (not latest_inbound or latest_msg == latest_inbound):
-            pass
-        elif needs_reply is False:
-            continue
-
-        entity_name = _resolve_entity_name(db, thread.related_entity_type, thread.related_entity_id)
+        filters.append(EmailThread.status == status_filter)
+    if classification:
+        filters.append(EmailThread.latest_inbound_classification == classification)
+    if needs_reply is not None:
+        filters.append(EmailThread.needs_reply.is_(needs_reply))
+
+    total = count_rows(db, EmailThread, filters, count)
+
+    latest_msg = aliased(EmailMessageRecord)
+    q = (
+        select(EmailThread, latest_msg, _entity_name_column())
+        .outerjoin(latest_msg, latest_msg.id == EmailThread.latest_message_id)
+        .where(*filters)
+    )
+    rows, next_cursor = THREAD_LIST_KEYSET.page(
+        db.execute(THREAD_LIST_KEYSET.paginate(_with_entity_joins(q), cursor=cursor, offset=offset, limit=limit)).all(),
+        limit,
+        entity=lambda row: row[0],
+    )
 
-        items.append(EmailThreadListItem(
+    items = [
+        EmailThreadListItem(
             **EmailThreadListItem.model_validate(thread).model_dump(
                 exclude={"latest_message", "classification", "related_entity_name"}
             ),
-            latest_message=EmailMessageRead.model_validate(latest_msg) if latest_msg else None,
-            classification=msg_classification,
+            latest_message=EmailMessageRead.model_validate(message) if message else None,
+            classification=thread.latest_inbound_classification,
             related_entity_name=entity_name,
-        ))
+        )
+        for thread, message, entity_name in rows
+    ]
 
-    return EmailThreadListResponse(items=items, total=total)
+    return EmailThreadListResponse(items=items, total=total, next_cursor=next_cursor)
 
 
 @router.get("/threads/{thread_id}", response_model=EmailThreadWithMessages)
 def get_thread(
     thread_id: UUID,
     ctx: RequestContext = Depends(get_request_context),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     thread = db.get(EmailThread, thread_id)
     if not thread or thread.workspace_id != ctx.workspace_id:
@@ -144,7 +186,7 @@ def get_thread(
     )
 
 
-@router.post("/threads/{thread_id}/classify")
+@blocking_route(router.post("/threads/{thread_id}/classify"))
 def classify_thread(
     thread_id: UUID,
     ctx: RequestContext = Depends(get_request_context),
@@ -168,10 +210,7 @@ def classify_thread(
         raise HTTPException(status_code=400, detail="No inbound messages to classify")
 
     latest = inbound_msgs[-1]
-    thread_context = "\n---\n".join(
-        f"[{m.direction}] {m.subject or ''}\n{(m.body or '')[:1000]}"
-        for m in messages[:-1]
-    ) if len(messages) > 1 else None
+    thread_context = build_thread_context(list(messages), latest)
 
     api_key, _src = resolve_openai_api_key(db, ctx.workspace_id)
     result = classify_email(
@@ -181,21 +220,15 @@ def classify_thread(
         api_key=api_key,
     )
 
-    latest.classification = result.get("classification", "unknown")
-    cls = latest.classification
-
-    if result.get("meeting_intent"):
-        thread.status = "meeting_requested"
-    if cls in NEXT_ACTION_MAP:
-        thread.next_action = NEXT_ACTION_MAP[cls]
-
-    thread.reply_review_status = "needs_review"
+    apply_classification(thread=thread, message=latest, result=result)
+    latest.processed_at = latest.processed_at or datetime.now(timezone.utc)
+    latest.processing_error = None
     db.commit()
 
     return {"classification": result, "message_id": str(latest.id)}
 
 
-@router.post("/threads/{thread_id}/suggest-reply")
+@blocking_route(router.post("/threads/{thread_id}/suggest-reply"))
 def suggest_reply(
     thread_id: UUID,
     ctx: RequestContext = Depends(get_request_context),
@@ -203,9 +236,6 @@ def suggest_reply(
 ):
     from app.services.response_draft_agent import generate_response_draft
     from app.services.workspace_credentials import resolve_openai_api_key
-    from app.models.workspace_profile import WorkspaceProfile
-    from app.models.workspace_ai_strategy import WorkspaceAIStrategy
-    from app.services.sender_signature import get_sender_info, replace_placeholders
 
     thread = db.get(EmailThread, thread_id)
     if not thread or thread.workspace_id != ctx.workspace_id:
@@ -222,26 +252,8 @@ def suggest_reply(
         raise HTTPException(status_code=400, detail="No inbound messages to reply to")
 
     latest = inbound_msgs[-1]
-    thread_history = "\n---\n".join(
-        f"[{m.direction}] {m.subject or ''}\n{(m.body or '')[:1000]}"
-        for m in messages[:-1]
-    ) if len(messages) > 1 else None
-
-    profile = db.get(WorkspaceProfile, ctx.workspace_id)
-    profile_dict = None
-    if profile:
-        profile_dict = {
-            "business_name": profile.business_name,
-            "business_description": profile.business_description,
-            "preferred_tone": profile.preferred_tone,
-        }
-
-    sender_info = get_sender_info(db, ctx.workspace_id)
-
-    strategy = db.get(WorkspaceAIStrategy, ctx.workspace_id)
-    strategy_dict = None
-    if strategy and strategy.generated_strategy:
-        strategy_dict = {"generated_strategy": strategy.generated_strategy}
+    thread_history = build_thread_context(list(messages), latest)
+    reply_ctx = load_reply_context(db, ctx.workspace_id)
 
     api_key, _src = resolve_openai_api_key(db, ctx.workspace_id)
     result = generate_response_draft(
@@ -249,19 +261,13 @@ def suggest_reply(
         inbound_subject=latest.subject,
         thread_history=thread_history,
         classification=latest.classification,
-        workspace_profile=profile_dict,
-        ai_strategy=strategy_dict,
-        sender_info=sender_info,
+        workspace_profile=reply_ctx.workspace_profile,
+        ai_strategy=reply_ctx.ai_strategy,
+        sender_info=reply_ctx.sender_info,
         api_key=api_key,
     )
 
-    if result.get("subject"):
-        result["subject"] = replace_placeholders(result["subject"], sender_info)
-    if result.get("reply_body"):
-        result["reply_body"] = replace_placeholders(result["reply_body"], sender_info)
-
-    latest.suggested_response = result
-    thread.reply_review_status = "suggested"
+    apply_suggested_reply(thread=thread, message=latest, result=result, sender_info=reply_ctx.sender_info)
     db.commit()
 
     return {"suggested_response": result, "message_id": str(latest.id)}
@@ -341,38 +347,34 @@ def create_gmail_draft_for_thread(
 @router.get("/review-queue", response_model=InboxReviewQueueResponse)
 def get_review_queue(
     ctx: RequestContext = Depends(get_request_context),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     limit: int = Query(default=50, ge=1, le=200),
 ):
-    threads = db.scalars(
-        select(EmailThread)
-        .where(
-            EmailThread.workspace_id == ctx.workspace_id,
-            EmailThread.reply_review_status.in_(["needs_review", "suggested"]),
-        )
-        .order_by(EmailThread.last_message_at.desc().nullslast())
+    filters = [
+        EmailThread.workspace_id == ctx.workspace_id,
+        EmailThread.reply_review_status.in_(["needs_review", "suggested"]),
+    ]
+    total = db.scalar(select(func.count()).select_from(EmailThread).where(*filters)) or 0
+
+    latest_inbound = aliased(EmailMessageRecord)
+    q = (
+        select(EmailThread, latest_inbound.suggested_response, _entity_name_column())
+        .outerjoin(latest_inbound, latest_inbound.id == EmailThread.latest_inbound_message_id)
+        .where(*filters)
+    )
+    rows = db.execute(
+        _with_entity_joins(q)
+        .order_by(EmailThread.last_message_at.desc(), EmailThread.id.desc())
         .limit(limit)
     ).all()
 
     items: list[InboxReviewQueueItem] = []
-    for thread in threads:
-        latest_inbound = db.scalar(
-            select(EmailMessageRecord)
-            .where(
-                EmailMessageRecord.thread_id == thread.id,
-                EmailMessageRecord.direction == "inbound",
-            )
-            .order_by(EmailMessageRecord.received_at.desc().nullslast())
-            .limit(1)
-        )
-        suggested = latest_inbound.suggested_response if latest_inbound else None
-        entity_name = _resolve_entity_name(db, thread.related_entity_type, thread.related_entity_id)
-
+    for thread, suggested, entity_name in rows:
         items.append(InboxReviewQueueItem(
             thread_id=thread.id,
             gmail_thread_id=thread.gmail_thread_id,
             related_entity_name=entity_name,
-            classification=latest_inbound.classification if latest_inbound else None,
+            classification=thread.latest_inbound_classification,
             next_action=thread.next_action,
             reply_review_status=thread.reply_review_status,
             suggested_subject=suggested.get("subject") if isinstance(suggested, dict) else None,
@@ -380,7 +382,7 @@ def get_review_queue(
             last_message_at=thread.last_message_at,
         ))
 
-    return InboxReviewQueueResponse(items=items, total=len(items))
+    return InboxReviewQueueResponse(items=items, total=total)
 
 
 @router.post("/messages/{message_id}/reclassify", response_model=EmailMessageRead)
@@ -400,6 +402,8 @@ def reclassify_message(
 
     msg.classification = payload.classification
     cls = payload.classification
+    if thread.latest_inbound_message_id == msg.id:
+        thread.latest_inbound_classification = cls
     if cls == "meeting_request":
         thread.status = "meeting_requested"
     if cls in NEXT_ACTION_MAP:
@@ -3,16 +3,19 @@ from __future__ import annotations
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.api.deps.request_context import RequestContext, get_request_context
+from app.api.pagination import CountMode, Keyset, count_rows
 from app.db.session import get_db
 from app.models.job import Job
 from app.schemas.job import JobCreate, JobListResponse, JobRead, JobUpdate
 
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
 
+JOB_LIST_KEYSET = Keyset("jobs", (Job.created_at, Job.id))
+
 
 @router.get("", response_model=JobListResponse)
 def list_jobs(
@@ -20,18 +23,18 @@ def list_jobs(
     db: Session = Depends(get_db),
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None),
+    count: CountMode = Query(default="exact"),
     status_filter: str | None = Query(default=None, alias="status"),
 ):
-    q = select(Job).where(Job.workspace_id == ctx.workspace_id)
-    count_q = select(func.count()).select_from(Job).where(Job.workspace_id == ctx.workspace_id)
-
+    filters = [Job.workspace_id == ctx.workspace_id]
     if status_filter:
-        q = q.where(Job.status == status_filter)
-        count_q = count_q.where(Job.status == status_filter)
+        filters.append(Job.status == status_filter)
 
-    total = db.scalar(count_q) or 0
-    rows = db.scalars(q.order_by(Job.created_at.desc()).offset(offset).limit(limit)).all()
-    return JobListResponse(items=[JobRead.model_validate(r) for r in rows], total=total)
+    q = JOB_LIST_KEYSET.paginate(select(Job).where(*filters), cursor=cursor, offset=offset, limit=limit)
+    rows, next_cursor = JOB_LIST_KEYSET.page(db.scalars(q).all(), limit)
+    total = count_rows(db, Job, filters, count)
+    return JobListResponse(items=[JobRead.model_validate(r) for r in rows], total=total, next_cursor=next_cursor)
 
 
 @router.get("/{job_id}", response_model=JobRead)
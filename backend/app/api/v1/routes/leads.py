@@ -1,37 +1,41 @@
 from __future__ import annotations
 
-from collections import defaultdict
 import logging
 from datetime import datetime, timezone
+from pathlib import Path
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
+from fastapi.responses import FileResponse, JSONResponse
 from pydantic import HttpUrl, TypeAdapter, ValidationError
 from sqlalchemy import delete, func, select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
 
+from app.api.blocking import blocking_route
 from app.api.deps.request_context import RequestContext, get_request_context
-from app.api.deps.scoping import require_scoped_lead
-from app.db.session import get_db
+from app.api.deps.scoping import require_scoped_lead, require_scoped_lead_async
+from app.api.pagination import CountMode, Keyset, count_rows
+from app.api.v1.routes.background_jobs import ACCEPTED_JOB_RESPONSE, submit_job_response
+from app.db.session import get_async_read_db, get_db, get_read_db
+from app.models.duplicate_candidate import DUPLICATE_ENTITY_LEAD
 from app.models.email_draft import EmailDraft
 from app.models.lead import Lead
+from app.models.lead_pipeline import AGENT1_BODY_PREFIX, AGENT1_SUBJECT_PREFIX, PIPELINE_STATE_COLUMNS
 from app.models.lead_status import (
     DEFAULT_LEAD_STATUS,
-    LEAD_STATUS_APPROVED,
-    LEAD_STATUS_ARCHIVED,
-    LEAD_STATUS_CONVERTED,
-    LEAD_STATUS_DISCOVERED,
     LEAD_STATUS_DRAFT_READY,
     LEAD_STATUS_DRAFTING,
-    LEAD_STATUS_IMPORTED,
-    LEAD_STATUS_NEEDS_REVIEW,
-    LEAD_STATUS_REPLIED,
     LEAD_STATUS_RESEARCHED,
     LEAD_STATUS_RESEARCHING,
-    LEAD_STATUS_SENT,
     LEAD_STATUS_SET,
     normalize_lead_status,
 )
+from app.models.search_document import (
+    SEARCH_ENTITY_LEAD,
+    SEARCH_ENTITY_WEBSITE_PAGE,
+    SEARCH_ENTITY_WEBSITE_SNAPSHOT,
+)
 from app.models.website_page import WebsitePage
 from app.models.website_snapshot import WebsiteSnapshot
 from app.schemas.agent1 import Agent1RunResponse, LatestContextResponse, LatestContextSnapshot
@@ -43,15 +47,30 @@ from app.schemas.lead import (
     LeadCreate,
     LeadImportDuplicate,
     LeadImportError,
+    LeadImportJobRead,
     LeadImportRequest,
     LeadImportResponse,
+    LeadListItem,
     LeadListResponse,
     LeadPipelineSummary,
     LeadRead,
+    LeadSearchItem,
+    LeadSearchResponse,
+    LeadStatus,
+    LeadType,
     LeadUpdate,
 )
 from app.schemas.website_snapshot import WebsiteSnapshotIngestRead
+from app.models.lead_import_job import LeadImportJob
+from app.services.background_jobs import BackgroundJobContext, background_job_handler, submit_background_job
+from app.services.duplicate_detection import forget_duplicate_candidates
 from app.services.lead_import import LeadImportCandidate, import_leads_for_workspace
+from app.services.lead_import_jobs import (
+    LeadImportFileError,
+    create_lead_import_job,
+    detect_import_format,
+    run_lead_import_job,
+)
 from app.services.lead_context import build_prepared_lead_context
 from app.services.openai_client import (
     OpenAIClientError,
@@ -62,130 +81,39 @@ from app.services.openai_client import (
     run_agent2_with_claude,
 )
 from app.services.scrape import WebsiteFetchError
+from app.services.search import facet_counts, forget_search_documents, match_documents
 from app.services.website_ingestion import ingest_website_pages
-from app.services.workspace_credentials import resolve_email_generation_provider, resolve_openai_api_key
-from app.services.workspace_ai_strategy import build_strategy_context, ensure_workspace_strategy_generated
+from app.services.workspace_ai_strategy import ensure_workspace_strategy_generated
+from app.services.workspace_context import get_workspace_context
 
 router = APIRouter(prefix="/leads", tags=["Leads"])
 logger = logging.getLogger(__name__)
 http_url_adapter = TypeAdapter(HttpUrl)
-AGENT1_SUBJECT_PREFIX = "Agent1 draft for "
-AGENT1_BODY_PREFIX = "Auto-generated Agent1 analysis"
-
-
-def _compute_stage(
-    *,
-    lead_status: str | None,
-    has_snapshot: bool,
-    has_agent1_output: bool,
-    has_draft: bool,
-    has_agent3_verdict: bool,
-    final_decision: str | None,
-) -> str:
-    status_norm = normalize_lead_status(lead_status, fallback=DEFAULT_LEAD_STATUS)
-    if status_norm in {LEAD_STATUS_ARCHIVED, LEAD_STATUS_CONVERTED, LEAD_STATUS_REPLIED, LEAD_STATUS_SENT}:
-        return status_norm
-    if final_decision == "send":
-        return LEAD_STATUS_APPROVED
-    if final_decision == "hold":
-        return LEAD_STATUS_NEEDS_REVIEW
-    if has_agent3_verdict:
-        return status_norm if status_norm in {LEAD_STATUS_APPROVED, LEAD_STATUS_NEEDS_REVIEW} else LEAD_STATUS_DRAFT_READY
-    if has_draft:
-        return status_norm if status_norm == LEAD_STATUS_DRAFTING else LEAD_STATUS_DRAFT_READY
-    if has_agent1_output or has_snapshot:
-        return status_norm if status_norm == LEAD_STATUS_RESEARCHING else LEAD_STATUS_RESEARCHED
-    return status_norm if status_norm in {LEAD_STATUS_IMPORTED, LEAD_STATUS_DISCOVERED} else DEFAULT_LEAD_STATUS
-
-
-def _is_non_agent1_placeholder_draft(draft: EmailDraft) -> bool:
-    subject = draft.subject or ""
-    body = draft.body or ""
-    return not (subject.startswith(AGENT1_SUBJECT_PREFIX) and body.startswith(AGENT1_BODY_PREFIX))
-
-
-def _build_pipeline_summary_map(db: Session, workspace_id: UUID, leads: list[Lead]) -> dict[UUID, LeadPipelineSummary]:
-    if not leads:
-        return {}
-
-    lead_ids = [lead.id for lead in leads]
-    snapshot_lead_ids = set(
-        db.scalars(
-            select(WebsiteSnapshot.lead_id)
-            .where(WebsiteSnapshot.workspace_id == workspace_id, WebsiteSnapshot.lead_id.in_(lead_ids))
-            .distinct()
-        ).all()
-    )
+LEAD_IMPORT_JSON_JOB = "leads.import"
+LEAD_IMPORT_FILE_JOB = "leads.import_file"
+LEAD_LIST_KEYSET = Keyset("leads", (Lead.created_at, Lead.id))
+# Columns behind LeadListItem; partnership_context and the dedupe keys stay unloaded.
+LEAD_LIST_COLUMNS = tuple(
+    getattr(Lead, name)
+    for name in (*LeadListItem.model_fields, *PIPELINE_STATE_COLUMNS)
+    if name != "pipeline_summary"
+)
 
-    drafts = db.scalars(
-        select(EmailDraft)
-        .where(EmailDraft.workspace_id == workspace_id, EmailDraft.lead_id.in_(lead_ids))
-        .order_by(EmailDraft.created_at.desc(), EmailDraft.updated_at.desc())
-    ).all()
-    drafts_by_lead: dict[UUID, list[EmailDraft]] = defaultdict(list)
-    for draft in drafts:
-        drafts_by_lead[draft.lead_id].append(draft)
 
-    pipeline_map: dict[UUID, LeadPipelineSummary] = {}
-    for lead in leads:
-        has_snapshot = lead.id in snapshot_lead_ids
-        has_agent1_output = False
-        has_draft = False
-        has_agent3_verdict = False
-        final_decision: str | None = None
-
-        for draft in drafts_by_lead.get(lead.id, []):
-            verdict = draft.agent3_verdict if isinstance(draft.agent3_verdict, dict) else None
-            verdict_source = (str(verdict.get("source", "")).strip().lower() if verdict else "")
-            verdict_decision = verdict.get("decision") if verdict else None
-            draft_decision = (draft.decision or "").strip().lower()
-
-            if draft.agent1_output is not None:
-                has_agent1_output = True
-
-            if verdict_source == "agent2" or draft_decision in {"send", "hold"} or _is_non_agent1_placeholder_draft(draft):
-                has_draft = True
-
-            if isinstance(verdict_decision, str) and verdict_decision in {"send", "hold"}:
-                has_agent3_verdict = True
-                if final_decision is None:
-                    final_decision = verdict_decision
-
-            if draft_decision in {"send", "hold"}:
-                if verdict is not None:
-                    has_agent3_verdict = True
-                if final_decision is None:
-                    final_decision = draft_decision
-
-        if final_decision is None:
-            status_norm = (lead.status or "").strip().lower()
-            if status_norm in {"send", LEAD_STATUS_APPROVED}:
-                final_decision = "send"
-            elif status_norm in {"hold", LEAD_STATUS_NEEDS_REVIEW}:
-                final_decision = "hold"
-
-        pipeline_map[lead.id] = LeadPipelineSummary(
-            has_snapshot=has_snapshot,
-            has_agent1_output=has_agent1_output,
-            has_draft=has_draft,
-            has_agent3_verdict=has_agent3_verdict,
-            final_decision=final_decision,
-            computed_stage=_compute_stage(
-                lead_status=lead.status,
-                has_snapshot=has_snapshot,
-                has_agent1_output=has_agent1_output,
-                has_draft=has_draft,
-                has_agent3_verdict=has_agent3_verdict,
-                final_decision=final_decision,
-            ),
-        )
-
-    return pipeline_map
+def _pipeline_summary(lead: Lead) -> LeadPipelineSummary:
+    return LeadPipelineSummary(
+        has_snapshot=lead.has_snapshot,
+        has_agent1_output=lead.has_agent1_output,
+        has_draft=lead.has_draft,
+        has_agent3_verdict=lead.has_agent3_verdict,
+        final_decision=lead.final_decision,
+        computed_stage=lead.pipeline_stage,
+    )
 
 
-def _with_pipeline_summary(lead: Lead, summary: LeadPipelineSummary | None) -> LeadRead:
+def _with_pipeline_summary(lead: Lead) -> LeadRead:
     payload = LeadRead.model_validate(lead, from_attributes=True)
-    return payload.model_copy(update={"pipeline_summary": summary})
+    return payload.model_copy(update={"pipeline_summary": _pipeline_summary(lead)})
 
 
 @router.post("", response_model=LeadRead, status_code=status.HTTP_201_CREATED)
@@ -200,16 +128,110 @@ def create_lead(
     db.add(lead)
     db.commit()
     db.refresh(lead)
-    summary = _build_pipeline_summary_map(db, ctx.workspace_id, [lead]).get(lead.id)
-    return _with_pipeline_summary(lead, summary)
+    return _with_pipeline_summary(lead)
+
+
+def _require_scoped_import_job(db: Session, job_id: UUID, workspace_id: UUID) -> LeadImportJob:
+    job = db.get(LeadImportJob, job_id)
+    if job is None or job.workspace_id != workspace_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import job not found")
+    return job
+
+
+@router.post("/imports/files", response_model=LeadImportJobRead, status_code=status.HTTP_202_ACCEPTED)
+def import_leads_file(
+    file: UploadFile = File(...),
+    source: str = Form(default="crawler", min_length=1, max_length=100),
+    file_format: str | None = Form(default=None, alias="format"),
+    dedupe_by_website: bool = Form(default=True),
+    dedupe_by_company_location: bool = Form(default=True),
+    db: Session = Depends(get_db),
+    ctx: RequestContext = Depends(get_request_context),
+) -> LeadImportJobRead:
+    """Accept a CSV/JSONL upload of any size and import it as a background job."""
+    try:
+        resolved_format = detect_import_format(file.filename, file_format)
+        job = create_lead_import_job(
+            db,
+            workspace_id=ctx.workspace_id,
+            upload=file.file,
+            filename=file.filename,
+            file_format=resolved_format,
+            source=source.strip(),
+            dedupe_by_website=dedupe_by_website,
+            dedupe_by_company_location=dedupe_by_company_location,
+        )
+    except LeadImportFileError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    submit_background_job(
+        db,
+        workspace_id=ctx.workspace_id,
+        user_id=ctx.user_id,
+        kind=LEAD_IMPORT_FILE_JOB,
+        params={"import_job_id": job.id},
+    )
+    return LeadImportJobRead.model_validate(job)
+
+
+@background_job_handler(LEAD_IMPORT_FILE_JOB)
+def _run_import_file_job(db: Session, job: BackgroundJobContext) -> LeadImportJobRead | None:
+    def on_progress(processed_bytes: int, total_bytes: int) -> None:
+        job.report_progress(current=processed_bytes, total=total_bytes, message="Importing leads")
+
+    import_job = run_lead_import_job(db, UUID(job.params["import_job_id"]), on_progress=on_progress)
+    return LeadImportJobRead.model_validate(import_job) if import_job is not None else None
+
+
+@router.get("/imports/jobs", response_model=list[LeadImportJobRead])
+def list_lead_import_jobs(
+    db: Session = Depends(get_db),
+    ctx: RequestContext = Depends(get_request_context),
+    limit: int = Query(default=20, ge=1, le=100),
+) -> list[LeadImportJobRead]:
+    jobs = db.scalars(
+        select(LeadImportJob)
+        .where(LeadImportJob.workspace_id == ctx.workspace_id)
+        .order_by(LeadImportJob.created_at.desc())
+        .limit(limit)
+    ).all()
+    return [LeadImportJobRead.model_validate(job) for job in jobs]
+
+
+@router.get("/imports/jobs/{job_id}", response_model=LeadImportJobRead)
+def get_lead_import_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    ctx: RequestContext = Depends(get_request_context),
+) -> LeadImportJobRead:
+    return LeadImportJobRead.model_validate(_require_scoped_import_job(db, job_id, ctx.workspace_id))
 
 
-@router.post("/imports", response_model=LeadImportResponse)
+@router.get("/imports/jobs/{job_id}/report")
+def download_lead_import_report(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    ctx: RequestContext = Depends(get_request_context),
+) -> FileResponse:
+    job = _require_scoped_import_job(db, job_id, ctx.workspace_id)
+    if not job.report_path or not Path(job.report_path).exists():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import report is not available yet")
+    return FileResponse(
+        path=job.report_path,
+        media_type="text/csv",
+        filename=f"lead-import-{job.id}.csv",
+    )
+
+
+@router.post("/imports", response_model=LeadImportResponse, responses=ACCEPTED_JOB_RESPONSE)
 def import_leads(
     payload: LeadImportRequest,
     db: Session = Depends(get_db),
     ctx: RequestContext = Depends(get_request_context),
-) -> LeadImportResponse:
+    run_async: bool = Query(default=False, alias="async"),
+) -> LeadImportResponse | JSONResponse:
+    if run_async:
+        return submit_job_response(db, ctx, kind=LEAD_IMPORT_JSON_JOB, params=payload.model_dump(mode="json"))
     candidates = [
         LeadImportCandidate(
             row_index=index,
@@ -265,16 +287,30 @@ def import_leads(
     )
 
 
+@background_job_handler(LEAD_IMPORT_JSON_JOB)
+def _run_import_job(db: Session, job: BackgroundJobContext) -> LeadImportResponse:
+    payload = LeadImportRequest.model_validate(job.params)
+    job.report_progress(total=len(payload.items), message="Importing leads", force=True)
+    return import_leads(payload, db=db, ctx=job.request_context, run_async=False)
+
+
 @router.get("", response_model=LeadListResponse)
-def list_leads(
-    db: Session = Depends(get_db),
+async def list_leads(
+    db: AsyncSession = Depends(get_async_read_db),
     ctx: RequestContext = Depends(get_request_context),
     offset: int = Query(default=0, ge=0),
     limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None),
+    count: CountMode = Query(default="exact"),
     status_filter: str | None = Query(default=None, alias="status"),
     exclude_status: str | None = Query(default=None, alias="exclude_status"),
     lead_type_filter: str | None = Query(default=None, alias="lead_type"),
     query: str | None = Query(default=None, alias="q", min_length=1),
+    stage: LeadStatus | None = Query(default=None),
+    has_snapshot: bool | None = Query(default=None),
+    has_agent1_output: bool | None = Query(default=None),
+    has_draft: bool | None = Query(default=None),
+    has_agent3_verdict: bool | None = Query(default=None),
 ) -> LeadListResponse:
     filters = [Lead.workspace_id == ctx.workspace_id]
 
@@ -293,16 +329,85 @@ def list_leads(
     if lead_type_filter and lead_type_filter in ("local_business", "partnership"):
         filters.append(Lead.lead_type == lead_type_filter)
     if query:
-        filters.append(Lead.company.ilike(f"%{query}%"))
+        hits = await db.run_sync(
+            match_documents, workspace_id=ctx.workspace_id, entity_type=SEARCH_ENTITY_LEAD, query=query
+        )
+        filters.append(Lead.id.in_(select(hits.c.entity_id)))
+    if stage:
+        filters.append(Lead.pipeline_stage == stage)
+    for column, wanted in (
+        (Lead.has_snapshot, has_snapshot),
+        (Lead.has_agent1_output, has_agent1_output),
+        (Lead.has_draft, has_draft),
+        (Lead.has_agent3_verdict, has_agent3_verdict),
+    ):
+        if wanted is not None:
+            filters.append(column.is_(wanted))
+
+    list_stmt = LEAD_LIST_KEYSET.paginate(
+        select(Lead).options(load_only(*LEAD_LIST_COLUMNS)).where(*filters),
+        cursor=cursor,
+        offset=offset,
+        limit=limit,
+    )
+    items, next_cursor = LEAD_LIST_KEYSET.page((await db.scalars(list_stmt)).all(), limit)
+    lead_items = [
+        LeadListItem.model_validate(item).model_copy(update={"pipeline_summary": _pipeline_summary(item)})
+        for item in items
+    ]
+    total = await db.run_sync(count_rows, Lead, filters, count)
+    return LeadListResponse(items=lead_items, total=total, offset=offset, limit=limit, next_cursor=next_cursor)
 
-    list_stmt = select(Lead).where(*filters).order_by(Lead.created_at.desc()).offset(offset).limit(limit)
-    count_stmt = select(func.count()).select_from(Lead).where(*filters)
 
-    items = db.scalars(list_stmt).all()
-    pipeline_map = _build_pipeline_summary_map(db, ctx.workspace_id, items)
-    lead_items = [_with_pipeline_summary(item, pipeline_map.get(item.id)) for item in items]
-    total = db.scalar(count_stmt) or 0
-    return LeadListResponse(items=lead_items, total=total, offset=offset, limit=limit)
+@router.get("/search", response_model=LeadSearchResponse)
+def search_leads(
+    db: Session = Depends(get_read_db),
+    ctx: RequestContext = Depends(get_request_context),
+    query: str = Query(..., alias="q", min_length=1, max_length=200),
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=20, ge=1, le=100),
+    status_filter: LeadStatus | None = Query(default=None, alias="status"),
+    industry: str | None = Query(default=None),
+    source: str | None = Query(default=None),
+    lead_type_filter: LeadType | None = Query(default=None, alias="lead_type"),
+) -> LeadSearchResponse:
+    """Leads matching ``q`` across their fields and latest snapshot text, best match first."""
+    hits = match_documents(db, workspace_id=ctx.workspace_id, entity_type=SEARCH_ENTITY_LEAD, query=query)
+    scope = (
+        select(Lead.id)
+        .join(hits, hits.c.entity_id == Lead.id)
+        .where(Lead.workspace_id == ctx.workspace_id)
+    )
+    facets = {
+        "status": (Lead.status, status_filter),
+        "industry": (Lead.industry, industry),
+        "source": (Lead.source, source),
+        "lead_type": (Lead.lead_type, lead_type_filter),
+    }
+    selected = [column == value for column, value in facets.values() if value is not None]
+
+    rows = db.execute(
+        scope.with_only_columns(Lead, hits.c.rank)
+        .options(load_only(*LEAD_LIST_COLUMNS))
+        .where(*selected)
+        .order_by(hits.c.rank.desc(), Lead.created_at.desc(), Lead.id.desc())
+        .offset(offset)
+        .limit(limit)
+    ).all()
+    items = [
+        LeadSearchItem.model_validate(lead).model_copy(
+            update={"rank": rank, "pipeline_summary": _pipeline_summary(lead)}
+        )
+        for lead, rank in rows
+    ]
+    total, facet_values = facet_counts(db, scope, facets)
+    return LeadSearchResponse(
+        items=items,
+        total=total,
+        offset=offset,
+        limit=limit,
+        facets=facet_values,
+    )
 
 
 @router.post("/bulk-delete", response_model=LeadBulkDeleteResponse)
@@ -324,6 +429,26 @@ def bulk_delete_leads(
     ).all()
 
     _release_source_records_for_deleted_leads(db, ctx.workspace_id, leads_to_delete)
+    forget_duplicate_candidates(
+        db,
+        workspace_id=ctx.workspace_id,
+        entity_type=DUPLICATE_ENTITY_LEAD,
+        ids=[lead.id for lead in leads_to_delete],
+    )
+    forget_search_documents(
+        db,
+        workspace_id=ctx.workspace_id,
+        entity_type=SEARCH_ENTITY_LEAD,
+        ids=[lead.id for lead in leads_to_delete],
+    )
+    # Pages and snapshots go with their lead through ON DELETE CASCADE.
+    for entity_type in (SEARCH_ENTITY_WEBSITE_PAGE, SEARCH_ENTITY_WEBSITE_SNAPSHOT):
+        forget_search_documents(
+            db,
+            workspace_id=ctx.workspace_id,
+            entity_type=entity_type,
+            parent_ids=[lead.id for lead in leads_to_delete],
+        )
 
     stmt = delete(Lead).where(
         Lead.workspace_id == ctx.workspace_id,
@@ -343,7 +468,7 @@ def _release_source_records_for_deleted_leads(
     were the source of the leads being deleted.
 
     There is no FK between Lead and Prospect/PartnerCandidate, so we match
-    heuristically by normalized website_url first, then by lower-cased
+    heuristically by the stored website_key first, then by lower-cased
     company name. This mirrors the dedupe logic used during conversion.
     """
     if not leads:
@@ -351,14 +476,10 @@ def _release_source_records_for_deleted_leads(
 
     from app.models.partner_candidate import PartnerCandidate
     from app.models.prospect import Prospect
-    from app.services.lead_import import normalize_website_url
 
-    websites: set[str] = set()
+    websites = {lead.website_key for lead in leads if lead.website_key}
     companies: set[str] = set()
     for lead in leads:
-        normalized = normalize_website_url(lead.website_url) if lead.website_url else None
-        if normalized:
-            websites.add(normalized.lower())
         if lead.company:
             companies.add(lead.company.strip().lower())
 
@@ -367,7 +488,7 @@ def _release_source_records_for_deleted_leads(
             select(Prospect).where(
                 Prospect.workspace_id == workspace_id,
                 Prospect.import_status == "imported",
-                func.lower(Prospect.website_url).in_(websites),
+                Prospect.website_key.in_(websites),
             )
         ).all()
         for prospect in prospects_by_url:
@@ -377,7 +498,7 @@ def _release_source_records_for_deleted_leads(
             select(PartnerCandidate).where(
                 PartnerCandidate.workspace_id == workspace_id,
                 PartnerCandidate.status == "converted",
-                func.lower(PartnerCandidate.website).in_(websites),
+                PartnerCandidate.website_key.in_(websites),
             )
         ).all()
         for partner in partners_by_url:
@@ -406,14 +527,13 @@ def _release_source_records_for_deleted_leads(
 
 
 @router.get("/{lead_id}", response_model=LeadRead)
-def get_lead(
+async def get_lead(
     lead_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     ctx: RequestContext = Depends(get_request_context),
 ) -> LeadRead:
-    lead = require_scoped_lead(db=db, lead_id=lead_id, workspace_id=ctx.workspace_id)
-    summary = _build_pipeline_summary_map(db, ctx.workspace_id, [lead]).get(lead.id)
-    return _with_pipeline_summary(lead, summary)
+    lead = await require_scoped_lead_async(db=db, lead_id=lead_id, workspace_id=ctx.workspace_id)
+    return _with_pipeline_summary(lead)
 
 
 @router.patch("/{lead_id}", response_model=LeadRead)
@@ -431,14 +551,15 @@ def update_lead(
 
     db.commit()
     db.refresh(lead)
-    summary = _build_pipeline_summary_map(db, ctx.workspace_id, [lead]).get(lead.id)
-    return _with_pipeline_summary(lead, summary)
+    return _with_pipeline_summary(lead)
 
 
-@router.post(
-    "/{lead_id}/ingest-website",
-    response_model=WebsiteSnapshotIngestRead,
-    status_code=status.HTTP_201_CREATED,
+@blocking_route(
+    router.post(
+        "/{lead_id}/ingest-website",
+        response_model=WebsiteSnapshotIngestRead,
+        status_code=status.HTTP_201_CREATED,
+    )
 )
 def ingest_website(
     lead_id: UUID,
@@ -473,6 +594,12 @@ def ingest_website(
             detail=f"Website fetch failed: {exc}",
         ) from exc
 
+    forget_search_documents(
+        db,
+        workspace_id=ctx.workspace_id,
+        entity_type=SEARCH_ENTITY_WEBSITE_PAGE,
+        parent_ids=[lead.id],
+    )
     db.execute(
         delete(WebsitePage).where(
             WebsitePage.lead_id == lead.id,
@@ -526,10 +653,12 @@ def ingest_website(
     )
 
 
-@router.post(
-    "/{lead_id}/run-agent1",
-    response_model=Agent1RunResponse,
-    status_code=status.HTTP_201_CREATED,
+@blocking_route(
+    router.post(
+        "/{lead_id}/run-agent1",
+        response_model=Agent1RunResponse,
+        status_code=status.HTTP_201_CREATED,
+    )
 )
 def run_agent1_for_lead(
     lead_id: UUID,
@@ -552,7 +681,8 @@ def run_agent1_for_lead(
             detail="No website snapshots found for lead. Run /ingest-website first.",
         )
 
-    openai_api_key, key_source = resolve_openai_api_key(db=db, workspace_id=ctx.workspace_id)
+    workspace_context = get_workspace_context(db, ctx.workspace_id)
+    openai_api_key, key_source = workspace_context.openai_api_key, workspace_context.openai_key_source
     logger.info(
         "Agent1 OpenAI key resolution workspace_id=%s lead_id=%s key_source=%s",
         ctx.workspace_id,
@@ -577,8 +707,8 @@ def run_agent1_for_lead(
     draft = EmailDraft(
         workspace_id=ctx.workspace_id,
         lead_id=lead_id,
-        subject=f"Agent1 draft for {lead.company}",
-        body=f"Auto-generated Agent1 analysis from website snapshot {latest_snapshot.id}.",
+        subject=f"{AGENT1_SUBJECT_PREFIX}{lead.company}",
+        body=f"{AGENT1_BODY_PREFIX} from website snapshot {latest_snapshot.id}.",
         agent1_output=agent1_output,
         decision="draft",
     )
@@ -594,10 +724,12 @@ def run_agent1_for_lead(
     )
 
 
-@router.post(
-    "/{lead_id}/run-agent2",
-    response_model=EmailDraftRead,
-    status_code=status.HTTP_201_CREATED,
+@blocking_route(
+    router.post(
+        "/{lead_id}/run-agent2",
+        response_model=EmailDraftRead,
+        status_code=status.HTTP_201_CREATED,
+    )
 )
 def run_agent2_for_lead(
     lead_id: UUID,
@@ -644,7 +776,8 @@ def run_agent2_for_lead(
         latest_agent1_draft.id,
     )
 
-    email_provider, email_api_key = resolve_email_generation_provider(db=db, workspace_id=ctx.workspace_id)
+    workspace_context = get_workspace_context(db, ctx.workspace_id)
+    email_provider, email_api_key = workspace_context.email_generation_provider
     if not email_api_key:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -662,15 +795,16 @@ def run_agent2_for_lead(
     db.commit()
     db.refresh(lead)
 
-    openai_api_key_for_strategy, _ = resolve_openai_api_key(db=db, workspace_id=ctx.workspace_id)
-    strategy = ensure_workspace_strategy_generated(
-        db=db,
-        workspace_id=ctx.workspace_id,
-        api_key=openai_api_key_for_strategy,
-    )
-    strategy_context = build_strategy_context(strategy, lead_category=lead.industry)
-    from app.services.sender_signature import get_sender_info, replace_placeholders
-    sender_info = get_sender_info(db, ctx.workspace_id)
+    if workspace_context.needs_strategy_generation:
+        ensure_workspace_strategy_generated(
+            db=db,
+            workspace_id=ctx.workspace_id,
+            api_key=workspace_context.openai_api_key,
+        )
+        workspace_context = get_workspace_context(db, ctx.workspace_id)
+    strategy_context = workspace_context.strategy_context(lead.industry)
+    from app.services.sender_signature import replace_placeholders
+    sender_info = workspace_context.sender_info
 
     try:
         if email_provider == "anthropic":
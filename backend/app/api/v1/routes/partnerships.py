@@ -1,13 +1,25 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import logging
+import threading
+from collections.abc import AsyncIterator
+from typing import Any
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, select
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.api.blocking import blocking_route
 from app.api.deps.request_context import RequestContext, get_request_context
-from app.db.session import get_db
+from app.api.pagination import CountMode, Keyset, count_rows
+from app.api.v1.routes.background_jobs import ACCEPTED_JOB_RESPONSE, EVENT_KEEPALIVE_SECONDS, submit_job_response
+from app.db.session import SessionLocal, get_db, get_read_db
+from app.models.duplicate_candidate import DUPLICATE_ENTITY_PARTNER_CANDIDATE
 from app.models.partner_candidate import PartnerCandidate
 from app.schemas.partner_candidate import (
     ConvertPartnersRequest,
@@ -22,35 +34,46 @@ from app.schemas.partner_candidate import (
     PartnerSearchProgress,
     PartnerSearchResponse,
 )
+from app.services.background_jobs import BackgroundJobContext, background_job_handler
+from app.services.duplicate_detection import forget_duplicate_candidates
 
 router = APIRouter(prefix="/partnerships", tags=["Partnerships"])
+logger = logging.getLogger(__name__)
+
+PARTNER_SEARCH_JOB = "partnerships.search"
+PARTNER_CONVERT_JOB = "partnerships.convert_to_leads"
+PARTNER_LIST_KEYSET = Keyset("partnerships", (PartnerCandidate.created_at, PartnerCandidate.id))
 
 
 @router.get("", response_model=PartnerCandidateListResponse)
 def list_candidates(
     ctx: RequestContext = Depends(get_request_context),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None),
+    count: CountMode = Query(default="exact"),
     status_filter: str | None = Query(default=None, alias="status"),
 ):
-    q = select(PartnerCandidate).where(PartnerCandidate.workspace_id == ctx.workspace_id)
-    count_q = select(func.count()).select_from(PartnerCandidate).where(PartnerCandidate.workspace_id == ctx.workspace_id)
-
+    filters = [PartnerCandidate.workspace_id == ctx.workspace_id]
     if status_filter:
-        q = q.where(PartnerCandidate.status == status_filter)
-        count_q = count_q.where(PartnerCandidate.status == status_filter)
-
-    total = db.scalar(count_q) or 0
-    rows = db.scalars(q.order_by(PartnerCandidate.created_at.desc()).offset(offset).limit(limit)).all()
-    return PartnerCandidateListResponse(items=[PartnerCandidateRead.model_validate(r) for r in rows], total=total)
+        filters.append(PartnerCandidate.status == status_filter)
+
+    q = PARTNER_LIST_KEYSET.paginate(select(PartnerCandidate).where(*filters), cursor=cursor, offset=offset, limit=limit)
+    rows, next_cursor = PARTNER_LIST_KEYSET.page(db.scalars(q).all(), limit)
+    total = count_rows(db, PartnerCandidate, filters, count)
+    return PartnerCandidateListResponse(
+        items=[PartnerCandidateRead.model_validate(r) for r in rows],
+        total=total,
+        next_cursor=next_cursor,
+    )
 
 
 @router.get("/{candidate_id}", response_model=PartnerCandidateRead)
 def get_candidate(
     candidate_id: UUID,
     ctx: RequestContext = Depends(get_request_context),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     row = db.get(PartnerCandidate, candidate_id)
     if not row or row.workspace_id != ctx.workspace_id:
@@ -107,21 +130,31 @@ def delete_candidate(
     row = db.get(PartnerCandidate, candidate_id)
     if not row or row.workspace_id != ctx.workspace_id:
         raise HTTPException(status_code=404, detail="Partner candidate not found")
+    forget_duplicate_candidates(
+        db,
+        workspace_id=ctx.workspace_id,
+        entity_type=DUPLICATE_ENTITY_PARTNER_CANDIDATE,
+        ids=[row.id],
+    )
     db.delete(row)
     db.commit()
 
 
-@router.post("/convert-to-leads", response_model=ConvertPartnersResponse)
+@router.post("/convert-to-leads", response_model=ConvertPartnersResponse, responses=ACCEPTED_JOB_RESPONSE)
 def convert_partners_to_leads(
     payload: ConvertPartnersRequest,
     ctx: RequestContext = Depends(get_request_context),
     db: Session = Depends(get_db),
+    run_async: bool = Query(default=False, alias="async"),
 ):
+    if run_async:
+        return submit_job_response(db, ctx, kind=PARTNER_CONVERT_JOB, params=payload.model_dump(mode="json"))
     from app.models.lead import Lead
     from app.models.lead_status import DEFAULT_LEAD_STATUS, LEAD_STATUS_RESEARCHING
     from app.models.website_snapshot import WebsiteSnapshot
+    from app.models.dedupe_keys import company_address_key, website_match_keys
     from app.services.lead_import import normalize_website_url
-    from app.services.prospect_service import _clean_text, _website_variants, _company_address_key
+    from app.services.prospect_service import _clean_text
 
     rows = db.scalars(
         select(PartnerCandidate).where(
@@ -132,39 +165,34 @@ def convert_partners_to_leads(
     by_id = {r.id: r for r in rows}
     partners = [by_id[pid] for pid in payload.partner_ids if pid in by_id]
 
-    candidate_websites = {
-        n for p in partners for n in [normalize_website_url(p.website)] if n
+    candidate_website_keys = {
+        k for p in partners for k in website_match_keys(normalize_website_url(p.website))
     }
-    website_match_set = {v for w in candidate_websites for v in _website_variants(w)}
-    candidate_companies = {
-        cn.casefold() for p in partners for cn in [_clean_text(p.company_name)] if cn
+    candidate_company_location_keys = {
+        k for p in partners for k in [company_address_key(p.company_name, p.location)] if k
     }
 
     existing_websites: set[str] = set()
-    if website_match_set:
-        existing_websites = {
-            w.casefold()
-            for w in db.scalars(
-                select(Lead.website_url).where(
+    if candidate_website_keys:
+        existing_websites = set(
+            db.scalars(
+                select(Lead.website_key).where(
                     Lead.workspace_id == ctx.workspace_id,
-                    Lead.website_url.is_not(None),
-                    func.lower(Lead.website_url).in_(website_match_set),
+                    Lead.website_key.in_(candidate_website_keys),
                 )
             ).all()
-            if w
-        }
+        )
 
     existing_company_locations: set[str] = set()
-    if candidate_companies:
-        ca_rows = db.execute(
-            select(Lead.company, Lead.location).where(
-                Lead.workspace_id == ctx.workspace_id,
-                func.lower(Lead.company).in_(candidate_companies),
-            )
-        ).all()
-        existing_company_locations = {
-            k for c, l in ca_rows for k in [_company_address_key(c, l)] if k
-        }
+    if candidate_company_location_keys:
+        existing_company_locations = set(
+            db.scalars(
+                select(Lead.company_location_key).where(
+                    Lead.workspace_id == ctx.workspace_id,
+                    Lead.company_location_key.in_(candidate_company_location_keys),
+                )
+            ).all()
+        )
 
     converted_leads: list[Lead] = []
     skipped: list[ConvertPartnersSkipped] = []
@@ -185,15 +213,13 @@ def convert_partners_to_leads(
             ))
             continue
 
+        w_keys = website_match_keys(website_url)
+        cl_key = company_address_key(partner.company_name, partner.location)
         dup_reason: str | None = None
-        if website_url:
-            variants = _website_variants(website_url)
-            if variants & existing_websites or variants & seen_websites:
-                dup_reason = "duplicate_website"
-        if not dup_reason:
-            cl_key = _company_address_key(partner.company_name, partner.location)
-            if cl_key and (cl_key in existing_company_locations or cl_key in seen_company_locations):
-                dup_reason = "duplicate_company_location"
+        if w_keys & existing_websites or w_keys & seen_websites:
+            dup_reason = "duplicate_website"
+        if not dup_reason and cl_key and (cl_key in existing_company_locations or cl_key in seen_company_locations):
+            dup_reason = "duplicate_company_location"
 
         if dup_reason:
             skipped.append(ConvertPartnersSkipped(
@@ -203,8 +229,7 @@ def convert_partners_to_leads(
 
         email = partner.contact_emails[0] if partner.contact_emails else None
         signals = partner.extracted_signals or {}
-        crawled_text = signals.get("crawled_text")
-        has_snapshot = bool(crawled_text and website_url)
+        has_snapshot = bool(partner.crawled_text_id and website_url)
 
         partnership_context = {
             "fit_score": partner.fit_score,
@@ -235,7 +260,7 @@ def convert_partners_to_leads(
                 workspace_id=ctx.workspace_id,
                 lead_id=lead.id,
                 url=website_url,
-                raw_text=crawled_text,
+                text_id=partner.crawled_text_id,
                 fetched_at=partner.created_at,
             )
             db.add(snapshot)
@@ -243,9 +268,7 @@ def convert_partners_to_leads(
         converted_leads.append(lead)
         partner.status = "converted"
 
-        if website_url:
-            seen_websites.update(_website_variants(website_url))
-        cl_key = _company_address_key(partner.company_name, partner.location)
+        seen_websites.update(w_keys)
         if cl_key:
             seen_company_locations.add(cl_key)
 
@@ -260,15 +283,32 @@ def convert_partners_to_leads(
     )
 
 
-@router.post("/search", response_model=PartnerSearchResponse)
+@background_job_handler(PARTNER_CONVERT_JOB)
+def _run_convert_job(db: Session, job: BackgroundJobContext) -> ConvertPartnersResponse:
+    payload = ConvertPartnersRequest.model_validate(job.params)
+    job.report_progress(total=len(payload.partner_ids), message="Converting partners to leads", force=True)
+    return convert_partners_to_leads(payload, ctx=job.request_context, db=db, run_async=False)
+
+
+def _search_response(result: dict) -> PartnerSearchResponse:
+    return PartnerSearchResponse(
+        progress=PartnerSearchProgress(**result["stats"]),
+        candidates=[PartnerCandidateRead.model_validate(c) for c in result["candidates"]],
+    )
+
+
+@router.post("/search", response_model=PartnerSearchResponse, responses=ACCEPTED_JOB_RESPONSE)
 def search_partners(
     payload: PartnerSearchRequest,
     ctx: RequestContext = Depends(get_request_context),
     db: Session = Depends(get_db),
-):
+    run_async: bool = Query(default=False, alias="async"),
+) -> PartnerSearchResponse | JSONResponse:
     """Automated partner search: web search → crawl → AI analysis → store candidates."""
     from app.services.partnership_discovery import search_and_discover
 
+    if run_async:
+        return submit_job_response(db, ctx, kind=PARTNER_SEARCH_JOB, params=payload.model_dump(mode="json"))
     try:
         result = search_and_discover(
             db,
@@ -280,13 +320,100 @@ def search_partners(
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
-    return PartnerSearchResponse(
-        progress=PartnerSearchProgress(**result["stats"]),
-        candidates=[PartnerCandidateRead.model_validate(c) for c in result["candidates"]],
+    return _search_response(result)
+
+
+@background_job_handler(PARTNER_SEARCH_JOB)
+def _run_search_job(db: Session, job: BackgroundJobContext) -> PartnerSearchResponse:
+    from app.services.partnership_discovery import search_and_discover
+
+    payload = PartnerSearchRequest.model_validate(job.params)
+    job.report_progress(message="Searching the web for partners", force=True)
+
+    def on_progress(done: int, total: int) -> None:
+        job.report_progress(current=done, total=total, message=f"Analyzed {done} of {total} companies")
+
+    result = search_and_discover(
+        db,
+        job.workspace_id,
+        search_intent=payload.discovery_intent,
+        max_results=payload.max_results,
+        min_fit_score=payload.min_fit_score,
+        on_progress=on_progress,
+    )
+    return _search_response(result)
+
+
+class _SearchStreamClosed(Exception):
+    """Raised from the progress callback once the streaming client has gone away."""
+
+
+@router.post("/search/stream")
+async def stream_partner_search(
+    payload: PartnerSearchRequest,
+    ctx: RequestContext = Depends(get_request_context),
+) -> StreamingResponse:
+    """Server-sent events for ``/search``: a ``candidate`` event as each qualified partner is
+    stored, ``progress`` events, then ``done`` with the full response (or ``error``)."""
+    from app.services.partnership_discovery import search_and_discover
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
+    closed = threading.Event()
+
+    def emit(event: str, data: Any) -> None:
+        loop.call_soon_threadsafe(queue.put_nowait, (event, data))
+
+    def on_progress(done: int, total: int) -> None:
+        if closed.is_set():
+            raise _SearchStreamClosed()
+        emit("progress", {"done": done, "total": total})
+
+    def on_candidate(candidate: PartnerCandidate) -> None:
+        emit("candidate", PartnerCandidateRead.model_validate(candidate))
+
+    def run() -> None:
+        with SessionLocal() as db:
+            try:
+                result = search_and_discover(
+                    db,
+                    ctx.workspace_id,
+                    search_intent=payload.discovery_intent,
+                    max_results=payload.max_results,
+                    min_fit_score=payload.min_fit_score,
+                    on_progress=on_progress,
+                    on_candidate=on_candidate,
+                )
+                emit("done", _search_response(result))
+            except _SearchStreamClosed:
+                logger.info("Partner search stream closed by client workspace_id=%s", ctx.workspace_id)
+            except Exception as exc:
+                logger.exception("Partner search stream failed workspace_id=%s", ctx.workspace_id)
+                emit("error", {"detail": str(exc)})
+
+    async def events() -> AsyncIterator[str]:
+        loop.run_in_executor(None, run)
+        try:
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), timeout=EVENT_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+                if event in ("done", "error"):
+                    return
+        finally:
+            closed.set()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
-@router.post("/discover", response_model=PartnerCandidateRead)
+@blocking_route(router.post("/discover", response_model=PartnerCandidateRead))
 def discover_partner(
     payload: PartnerDiscoveryRequest,
     ctx: RequestContext = Depends(get_request_context),
@@ -332,7 +459,7 @@ def discover_partner(
     return PartnerCandidateRead.model_validate(candidate)
 
 
-@router.post("/{candidate_id}/re-analyze", response_model=PartnerCandidateRead)
+@blocking_route(router.post("/{candidate_id}/re-analyze", response_model=PartnerCandidateRead))
 def re_analyze_candidate(
     candidate_id: UUID,
     ctx: RequestContext = Depends(get_request_context),
@@ -362,32 +489,32 @@ def re_analyze_candidate(
     return PartnerCandidateRead.model_validate(updated)
 
 
-@router.post("/{candidate_id}/generate-outreach", response_model=PartnerCandidateRead)
+@blocking_route(router.post("/{candidate_id}/generate-outreach", response_model=PartnerCandidateRead))
 def generate_partner_outreach(
     candidate_id: UUID,
     ctx: RequestContext = Depends(get_request_context),
     db: Session = Depends(get_db),
 ):
     from app.services.response_draft_agent import generate_response_draft
-    from app.services.workspace_credentials import resolve_email_generation_provider
-    from app.models.workspace_profile import WorkspaceProfile
-    from app.services.sender_signature import get_sender_info, replace_placeholders
+    from app.services.sender_signature import replace_placeholders
+    from app.services.workspace_context import get_workspace_context
 
     row = db.get(PartnerCandidate, candidate_id)
     if not row or row.workspace_id != ctx.workspace_id:
         raise HTTPException(status_code=404, detail="Partner candidate not found")
 
-    profile = db.get(WorkspaceProfile, ctx.workspace_id)
+    workspace_context = get_workspace_context(db, ctx.workspace_id)
+    profile = workspace_context.profile
     profile_dict: dict | None = None
     if profile:
         profile_dict = {
-            "business_name": profile.business_name,
-            "preferred_tone": profile.preferred_tone,
-            "service_area": profile.service_area,
-            "service_specialties": profile.service_specialties or [],
+            "business_name": profile["business_name"],
+            "preferred_tone": profile["preferred_tone"],
+            "service_area": profile["service_area"],
+            "service_specialties": profile["service_specialties"],
         }
 
-    sender_info = get_sender_info(db, ctx.workspace_id)
+    sender_info = workspace_context.sender_info
 
     signals = row.extracted_signals or {}
 
@@ -410,7 +537,7 @@ def generate_partner_outreach(
 
     context_text = "\n".join(context_lines)
 
-    email_provider, email_api_key = resolve_email_generation_provider(db, ctx.workspace_id)
+    email_provider, email_api_key = workspace_context.email_generation_provider
     if not email_api_key:
         raise HTTPException(
             status_code=400,
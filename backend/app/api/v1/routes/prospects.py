@@ -1,12 +1,21 @@
 from __future__ import annotations
 
+from uuid import UUID
+
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import delete, func, select
-from sqlalchemy.orm import Session
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
 
 from app.api.deps.request_context import RequestContext, get_request_context
-from app.db.session import get_db
+from app.api.pagination import CountMode, Keyset, count_rows
+from app.api.v1.routes.background_jobs import ACCEPTED_JOB_RESPONSE, submit_job_response
+from app.core.config import settings
+from app.db.session import SessionLocal, get_async_read_db, get_db, get_read_db
+from app.models.duplicate_candidate import DUPLICATE_ENTITY_PROSPECT
 from app.models.prospect import Prospect
+from app.models.search_document import SEARCH_ENTITY_PROSPECT
 from app.schemas.prospect import (
     LocationSuggestionItem,
     LocationSuggestionsResponse,
@@ -19,26 +28,39 @@ from app.schemas.prospect import (
     ProspectImportRequest,
     ProspectImportResponse,
     ProspectImportSkipped,
+    ProspectListItem,
     ProspectListResponse,
     ProspectRead,
     ProspectRunSearchRequest,
     ProspectRunSearchResponse,
+    ProspectSearchItem,
+    ProspectSearchResponse,
 )
+from app.services.background_jobs import BackgroundJobContext, background_job_handler
+from app.services.duplicate_detection import forget_duplicate_candidates
 from app.services.importers.google_business_crawler import (
     GooglePlacesCrawlerError,
     discover_google_business_prospects,
 )
 from app.services.lead_sources.google_places import GooglePlacesCrawler
+from app.services.lead_sources.places_cache import SqlPlacesCache
 from app.services.prospect_service import (
     ProspectImportCandidate,
     ProspectImportResult,
     convert_prospects_to_leads,
     import_prospects_for_workspace,
 )
+from app.services.search import facet_counts, forget_search_documents, match_documents
 from app.services.workspace_credentials import resolve_google_places_api_key
 
 router = APIRouter(prefix="/prospects", tags=["Prospects"])
 
+PROSPECT_IMPORT_JOB = "prospects.import"
+PROSPECT_SEARCH_JOB = "prospects.search"
+PROSPECT_CONVERT_JOB = "prospects.convert_to_leads"
+PROSPECT_LIST_KEYSET = Keyset("prospects", (Prospect.created_at, Prospect.id))
+PROSPECT_LIST_COLUMNS = tuple(getattr(Prospect, name) for name in ProspectListItem.model_fields)
+
 
 def _build_import_response(result: ProspectImportResult, total_received: int) -> ProspectImportResponse:
     return ProspectImportResponse(
@@ -73,11 +95,13 @@ def _build_import_response(result: ProspectImportResult, total_received: int) ->
 
 
 @router.get("", response_model=ProspectListResponse)
-def list_prospects(
-    db: Session = Depends(get_db),
+async def list_prospects(
+    db: AsyncSession = Depends(get_async_read_db),
     ctx: RequestContext = Depends(get_request_context),
     offset: int = Query(default=0, ge=0),
     limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None),
+    count: CountMode = Query(default="exact"),
     status_filter: str | None = Query(default=None, alias="status"),
     category_filter: str | None = Query(default=None, alias="category"),
     query: str | None = Query(default=None, alias="q", min_length=1),
@@ -88,22 +112,64 @@ def list_prospects(
     if category_filter:
         filters.append(Prospect.category.ilike(f"%{category_filter}%"))
     if query:
-        filters.append(
-            (Prospect.company_name.ilike(f"%{query}%")) | (Prospect.address.ilike(f"%{query}%"))
+        hits = await db.run_sync(
+            match_documents, workspace_id=ctx.workspace_id, entity_type=SEARCH_ENTITY_PROSPECT, query=query
         )
+        filters.append(Prospect.id.in_(select(hits.c.entity_id)))
+
+    list_stmt = PROSPECT_LIST_KEYSET.paginate(
+        select(Prospect).options(load_only(*PROSPECT_LIST_COLUMNS)).where(*filters),
+        cursor=cursor,
+        offset=offset,
+        limit=limit,
+    )
+    items, next_cursor = PROSPECT_LIST_KEYSET.page((await db.scalars(list_stmt)).all(), limit)
+    total = await db.run_sync(count_rows, Prospect, filters, count)
+    return ProspectListResponse(items=items, total=total, offset=offset, limit=limit, next_cursor=next_cursor)
+
+
+@router.get("/search", response_model=ProspectSearchResponse)
+def search_prospects(
+    db: Session = Depends(get_read_db),
+    ctx: RequestContext = Depends(get_request_context),
+    query: str = Query(..., alias="q", min_length=1, max_length=200),
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=20, ge=1, le=100),
+    status_filter: str | None = Query(default=None, alias="status"),
+    category: str | None = Query(default=None),
+    source: str | None = Query(default=None),
+) -> ProspectSearchResponse:
+    """Prospects matching ``q`` across name, category, address and website, best match first."""
+    hits = match_documents(db, workspace_id=ctx.workspace_id, entity_type=SEARCH_ENTITY_PROSPECT, query=query)
+    scope = (
+        select(Prospect.id)
+        .join(hits, hits.c.entity_id == Prospect.id)
+        .where(Prospect.workspace_id == ctx.workspace_id)
+    )
+    facets = {
+        "status": (Prospect.import_status, status_filter),
+        "category": (Prospect.category, category),
+        "source": (Prospect.source, source),
+    }
+    selected = [column == value for column, value in facets.values() if value is not None]
 
-    list_stmt = (
-        select(Prospect)
-        .where(*filters)
-        .order_by(Prospect.created_at.desc())
+    rows = db.execute(
+        scope.with_only_columns(Prospect, hits.c.rank)
+        .options(load_only(*PROSPECT_LIST_COLUMNS))
+        .where(*selected)
+        .order_by(hits.c.rank.desc(), Prospect.created_at.desc(), Prospect.id.desc())
         .offset(offset)
         .limit(limit)
+    ).all()
+    items = [ProspectSearchItem.model_validate(prospect).model_copy(update={"rank": rank}) for prospect, rank in rows]
+    total, facet_values = facet_counts(db, scope, facets)
+    return ProspectSearchResponse(
+        items=items,
+        total=total,
+        offset=offset,
+        limit=limit,
+        facets=facet_values,
     )
-    count_stmt = select(func.count()).select_from(Prospect).where(*filters)
-
-    items = db.scalars(list_stmt).all()
-    total = db.scalar(count_stmt) or 0
-    return ProspectListResponse(items=items, total=total, offset=offset, limit=limit)
 
 
 @router.post("/bulk-delete", response_model=ProspectBulkDeleteResponse)
@@ -112,6 +178,18 @@ def bulk_delete_prospects(
     db: Session = Depends(get_db),
     ctx: RequestContext = Depends(get_request_context),
 ) -> ProspectBulkDeleteResponse:
+    forget_duplicate_candidates(
+        db,
+        workspace_id=ctx.workspace_id,
+        entity_type=DUPLICATE_ENTITY_PROSPECT,
+        ids=list(payload.prospect_ids),
+    )
+    forget_search_documents(
+        db,
+        workspace_id=ctx.workspace_id,
+        entity_type=SEARCH_ENTITY_PROSPECT,
+        ids=list(payload.prospect_ids),
+    )
     stmt = delete(Prospect).where(
         Prospect.workspace_id == ctx.workspace_id,
         Prospect.id.in_(payload.prospect_ids),
@@ -121,12 +199,20 @@ def bulk_delete_prospects(
     return ProspectBulkDeleteResponse(deleted_count=result.rowcount or 0)
 
 
-@router.post("/import", response_model=ProspectImportResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/import",
+    response_model=ProspectImportResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses=ACCEPTED_JOB_RESPONSE,
+)
 def import_prospects(
     payload: ProspectImportRequest,
     db: Session = Depends(get_db),
     ctx: RequestContext = Depends(get_request_context),
-) -> ProspectImportResponse:
+    run_async: bool = Query(default=False, alias="async"),
+) -> ProspectImportResponse | JSONResponse:
+    if run_async:
+        return submit_job_response(db, ctx, kind=PROSPECT_IMPORT_JOB, params=payload.model_dump(mode="json"))
     candidates = [
         ProspectImportCandidate(
             row_index=index,
@@ -153,6 +239,13 @@ def import_prospects(
     return _build_import_response(result, total_received=len(payload.items))
 
 
+@background_job_handler(PROSPECT_IMPORT_JOB)
+def _run_import_job(db: Session, job: BackgroundJobContext) -> ProspectImportResponse:
+    payload = ProspectImportRequest.model_validate(job.params)
+    job.report_progress(total=len(payload.items), message="Importing prospects", force=True)
+    return import_prospects(payload, db=db, ctx=job.request_context, run_async=False)
+
+
 @router.get("/location-suggestions", response_model=LocationSuggestionsResponse)
 def prospect_location_suggestions(
     q: str = Query(..., min_length=2, max_length=200),
@@ -176,12 +269,21 @@ def prospect_location_suggestions(
     )
 
 
-@router.post("/search", response_model=ProspectRunSearchResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/search",
+    response_model=ProspectRunSearchResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses=ACCEPTED_JOB_RESPONSE,
+)
 def run_google_business_search(
     payload: ProspectRunSearchRequest,
     db: Session = Depends(get_db),
     ctx: RequestContext = Depends(get_request_context),
-) -> ProspectRunSearchResponse:
+    run_async: bool = Query(default=False, alias="async"),
+) -> ProspectRunSearchResponse | JSONResponse:
+    if run_async:
+        return submit_job_response(db, ctx, kind=PROSPECT_SEARCH_JOB, params=payload.model_dump(mode="json"))
+
     google_api_key, _ = resolve_google_places_api_key(db=db, workspace_id=ctx.workspace_id)
     if not google_api_key:
         raise HTTPException(
@@ -189,6 +291,18 @@ def run_google_business_search(
             detail="Google Places API key is missing. Configure workspace settings at /api/v1/settings or set GOOGLE_PLACES_API_KEY.",
         )
 
+    known_place_ids: set[str] = set()
+    if payload.skip_known_places:
+        known_place_ids = set(
+            db.scalars(
+                select(Prospect.external_id).where(
+                    Prospect.workspace_id == ctx.workspace_id,
+                    Prospect.source == "google_business",
+                    Prospect.external_id.is_not(None),
+                )
+            ).all()
+        )
+
     try:
         discovered = discover_google_business_prospects(
             api_key=google_api_key,
@@ -198,6 +312,9 @@ def run_google_business_search(
             keyword=payload.keyword,
             missing_website_only=payload.missing_website_only,
             limit=payload.limit,
+            cache=SqlPlacesCache(SessionLocal) if settings.places_cache_enabled else None,
+            known_place_ids=known_place_ids,
+            sweep_area=payload.sweep_area,
         )
     except GooglePlacesCrawlerError as exc:
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Crawler failed: {exc}") from exc
@@ -230,12 +347,22 @@ def run_google_business_search(
     )
 
 
-@router.post("/convert-to-leads", response_model=ProspectConvertResponse)
+@background_job_handler(PROSPECT_SEARCH_JOB)
+def _run_search_job(db: Session, job: BackgroundJobContext) -> ProspectRunSearchResponse:
+    payload = ProspectRunSearchRequest.model_validate(job.params)
+    job.report_progress(message="Searching Google Places", force=True)
+    return run_google_business_search(payload, db=db, ctx=job.request_context, run_async=False)
+
+
+@router.post("/convert-to-leads", response_model=ProspectConvertResponse, responses=ACCEPTED_JOB_RESPONSE)
 def convert_selected_prospects_to_leads(
     payload: ProspectConvertRequest,
     db: Session = Depends(get_db),
     ctx: RequestContext = Depends(get_request_context),
-) -> ProspectConvertResponse:
+    run_async: bool = Query(default=False, alias="async"),
+) -> ProspectConvertResponse | JSONResponse:
+    if run_async:
+        return submit_job_response(db, ctx, kind=PROSPECT_CONVERT_JOB, params=payload.model_dump(mode="json"))
     result = convert_prospects_to_leads(
         db=db,
         workspace_id=ctx.workspace_id,
@@ -260,3 +387,22 @@ def convert_selected_prospects_to_leads(
             for item in result.skipped
         ],
     )
+
+
+@background_job_handler(PROSPECT_CONVERT_JOB)
+def _run_convert_job(db: Session, job: BackgroundJobContext) -> ProspectConvertResponse:
+    payload = ProspectConvertRequest.model_validate(job.params)
+    job.report_progress(total=len(payload.prospect_ids), message="Converting prospects to leads", force=True)
+    return convert_selected_prospects_to_leads(payload, db=db, ctx=job.request_context, run_async=False)
+
+
+@router.get("/{prospect_id}", response_model=ProspectRead)
+async def get_prospect(
+    prospect_id: UUID,
+    db: AsyncSession = Depends(get_async_read_db),
+    ctx: RequestContext = Depends(get_request_context),
+) -> ProspectRead:
+    prospect = await db.get(Prospect, prospect_id)
+    if prospect is None or prospect.workspace_id != ctx.workspace_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Prospect not found")
+    return ProspectRead.model_validate(prospect)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.deps.request_context import RequestContext, get_request_context
+from app.api.pagination import CountMode, count_rows
+from app.db.session import get_read_db
+from app.models.search_document import SEARCH_ENTITY_TYPES, SearchDocument
+from app.schemas.search import SearchEntityType, SearchHit, SearchResponse
+from app.services.search import document_snippets, match_documents
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@router.get("", response_model=SearchResponse)
+def search(
+    db: Session = Depends(get_read_db),
+    ctx: RequestContext = Depends(get_request_context),
+    query: str = Query(..., alias="q", min_length=1, max_length=200),
+    entity_types: list[SearchEntityType] | None = Query(default=None, alias="type"),
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=20, ge=1, le=100),
+    count: CountMode = Query(default="exact"),
+) -> SearchResponse:
+    """Records of the workspace whose fields, crawled text or email bodies match ``q``.
+
+    Repeat ``type`` to restrict the entity types searched (all by default). Results are
+    ranked best first; every hit carries a highlighted snippet.
+    """
+    hits = match_documents(
+        db,
+        workspace_id=ctx.workspace_id,
+        entity_type=entity_types or SEARCH_ENTITY_TYPES,
+        query=query,
+    )
+    rows = db.execute(
+        select(hits).order_by(hits.c.rank.desc(), hits.c.id.desc()).offset(offset).limit(limit)
+    ).all()
+    snippets = document_snippets(db, query=query, document_ids=[row.id for row in rows])
+    items = [
+        SearchHit(
+            entity_type=row.entity_type,
+            entity_id=row.entity_id,
+            parent_id=row.parent_id,
+            title=row.title,
+            snippet=snippets.get(row.id, ""),
+            rank=row.rank,
+        )
+        for row in rows
+    ]
+    total = count_rows(db, SearchDocument, [SearchDocument.id.in_(select(hits.c.id))], count)
+    return SearchResponse(items=items, total=total, offset=offset, limit=limit)
@@ -2,18 +2,21 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from app.api.deps.request_context import RequestContext, get_request_context
 from app.api.deps.scoping import require_scoped_lead
-from app.db.session import get_db
+from app.api.pagination import Keyset, set_next_cursor_header
+from app.db.session import get_db, get_read_db
 from app.models.website_snapshot import WebsiteSnapshot
 from app.schemas.website_snapshot import WebsiteSnapshotCreate, WebsiteSnapshotRead
 
 router = APIRouter(prefix="/leads/{lead_id}/snapshots", tags=["Website Snapshots"])
 
+SNAPSHOT_LIST_KEYSET = Keyset("snapshots", (WebsiteSnapshot.fetched_at, WebsiteSnapshot.id))
+
 
 @router.post("", response_model=WebsiteSnapshotRead, status_code=status.HTTP_201_CREATED)
 def create_snapshot(
@@ -35,18 +38,23 @@ def create_snapshot(
 @router.get("", response_model=list[WebsiteSnapshotRead])
 def list_snapshots(
     lead_id: UUID,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: Session = Depends(get_read_db),
     ctx: RequestContext = Depends(get_request_context),
     offset: int = Query(default=0, ge=0),
     limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None),
 ) -> list[WebsiteSnapshot]:
     require_scoped_lead(db=db, lead_id=lead_id, workspace_id=ctx.workspace_id)
 
-    stmt = (
+    stmt = SNAPSHOT_LIST_KEYSET.paginate(
         select(WebsiteSnapshot)
-        .where(WebsiteSnapshot.lead_id == lead_id, WebsiteSnapshot.workspace_id == ctx.workspace_id)
-        .order_by(WebsiteSnapshot.fetched_at.desc())
-        .offset(offset)
-        .limit(limit)
+        .options(selectinload(WebsiteSnapshot.text_blob))
+        .where(WebsiteSnapshot.lead_id == lead_id, WebsiteSnapshot.workspace_id == ctx.workspace_id),
+        cursor=cursor,
+        offset=offset,
+        limit=limit,
     )
-    return db.scalars(stmt).all()
+    items, next_cursor = SNAPSHOT_LIST_KEYSET.page(db.scalars(stmt).all(), limit)
+    set_next_cursor_header(response, next_cursor)
+    return items
@@ -7,12 +7,12 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.api.blocking import blocking_route
 from app.api.deps.request_context import RequestContext, get_request_context
 from app.api.deps.scoping import require_scoped_lead
 from app.db.session import get_db
 from app.models.email_draft import EmailDraft
 from app.models.lead_status import LEAD_STATUS_APPROVED, LEAD_STATUS_NEEDS_REVIEW
-from app.models.workspace_ai_strategy import WorkspaceAIStrategy
 from app.models.website_snapshot import WebsiteSnapshot
 from app.schemas.agent3 import Agent3RunResponse, FinalEmailRead
 from app.services.agent3_verifier import (
@@ -22,14 +22,13 @@ from app.services.agent3_verifier import (
     verify_email_with_agent3,
 )
 from app.services.agent_outreach_mode import compute_agent2_outreach_mode, ensure_agent1_canonical_fields
-from app.services.workspace_credentials import resolve_openai_api_key
-from app.services.workspace_ai_strategy import build_strategy_context
+from app.services.workspace_context import get_workspace_context
 
 router = APIRouter(prefix="/leads/{lead_id}", tags=["Agent 3"])
 logger = logging.getLogger(__name__)
 
 
-@router.post("/run-agent3", response_model=Agent3RunResponse, status_code=status.HTTP_200_OK)
+@blocking_route(router.post("/run-agent3", response_model=Agent3RunResponse, status_code=status.HTTP_200_OK))
 def run_agent3_for_lead(
     lead_id: UUID,
     db: Session = Depends(get_db),
@@ -105,7 +104,8 @@ def run_agent3_for_lead(
         latest_agent1_draft.id,
     )
 
-    openai_api_key, key_source = resolve_openai_api_key(db=db, workspace_id=ctx.workspace_id)
+    workspace_context = get_workspace_context(db, ctx.workspace_id)
+    openai_api_key, key_source = workspace_context.openai_api_key, workspace_context.openai_key_source
     logger.info(
         "Agent3 OpenAI key resolution workspace_id=%s lead_id=%s key_source=%s",
         ctx.workspace_id,
@@ -114,10 +114,7 @@ def run_agent3_for_lead(
     )
 
     logger.info("Agent3 run start lead_id=%s draft_id=%s", lead_id, latest_draft.id)
-    strategy_context = build_strategy_context(
-        db.get(WorkspaceAIStrategy, ctx.workspace_id),
-        lead_category=lead.industry,
-    )
+    strategy_context = workspace_context.strategy_context(lead.industry)
     agent1_canon = ensure_agent1_canonical_fields(latest_agent1_draft.agent1_output or {})
     outreach_mode = compute_agent2_outreach_mode(agent1_canon, strategy_context)
     strategy_context = {**strategy_context, "agent2_outreach_mode": outreach_mode}
@@ -144,8 +141,8 @@ def run_agent3_for_lead(
     except Agent3VerifierError as exc:
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Agent3 failed: {exc}") from exc
 
-    from app.services.sender_signature import get_sender_info, replace_placeholders
-    sender_info = get_sender_info(db, ctx.workspace_id)
+    from app.services.sender_signature import replace_placeholders
+    sender_info = workspace_context.sender_info
 
     final_email = verdict["final_email"]
     final_email["subject"] = replace_placeholders(final_email["subject"], sender_info)
@@ -7,6 +7,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.api.blocking import blocking_route
 from app.api.deps.request_context import RequestContext, get_request_context
 from app.db.session import get_db
 from app.models.workspace_ai_strategy import WorkspaceAIStrategy
@@ -18,6 +19,7 @@ from app.services.openai_client import (
     OpenAIRateLimitError,
 )
 from app.services.workspace_ai_strategy import (
+    compile_workspace_strategy,
     generate_workspace_outreach_strategy,
     normalize_string_list,
 )
@@ -74,13 +76,14 @@ def patch_workspace_ai_strategy(
     if "selected_cta_style" in updates:
         cta_style = updates["selected_cta_style"]
         strategy.selected_cta_style = cta_style.strip() if isinstance(cta_style, str) and cta_style.strip() else None
+    compile_workspace_strategy(strategy)
 
     db.commit()
     db.refresh(strategy)
     return WorkspaceAIStrategyRead.model_validate(strategy)
 
 
-@router.post("/generate", response_model=WorkspaceAIStrategyRead)
+@blocking_route(router.post("/generate", response_model=WorkspaceAIStrategyRead))
 def generate_workspace_ai_strategy(
     db: Session = Depends(get_db),
     ctx: RequestContext = Depends(get_request_context),
@@ -115,6 +118,7 @@ def generate_workspace_ai_strategy(
     strategy.generated_strategy = generated_strategy
     strategy.last_generated_at = datetime.now(timezone.utc)
     strategy.updated_at = datetime.now(timezone.utc)
+    compile_workspace_strategy(strategy)
 
     db.commit()
     db.refresh(strategy)
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -19,10 +20,35 @@ class Settings(BaseSettings):
         default="sqlite:///./crm.db",
         alias="DATABASE_URL",
     )
+    # Defaults to DATABASE_URL with its async driver (asyncpg, aiosqlite).
+    async_database_url: str | None = Field(default=None, alias="ASYNC_DATABASE_URL")
+    # Optional replica for read-only list, detail and summary routes (see app.db.session).
+    database_read_replica_url: str | None = Field(default=None, alias="DATABASE_READ_REPLICA_URL")
+    # Connection pool of each PostgreSQL engine; SQLite keeps SQLAlchemy's defaults.
+    db_pool_size: int = Field(default=5, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=10, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout_seconds: float = Field(default=30.0, alias="DB_POOL_TIMEOUT_SECONDS")
+    db_pool_recycle_seconds: int = Field(default=1800, alias="DB_POOL_RECYCLE_SECONDS")
+    # Per-connection PostgreSQL statement_timeout; 0 disables it.
+    db_statement_timeout_ms: int = Field(default=0, alias="DB_STATEMENT_TIMEOUT_MS")
+    # SQLite connection tuning and periodic maintenance (see app.db.sqlite).
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = Field(default="NORMAL", alias="SQLITE_SYNCHRONOUS")
+    sqlite_cache_size_kib: int = Field(default=64 * 1024, alias="SQLITE_CACHE_SIZE_KIB")
+    sqlite_mmap_size_bytes: int = Field(default=256 * 1024 * 1024, alias="SQLITE_MMAP_SIZE_BYTES")
+    sqlite_busy_timeout_ms: int = Field(default=5000, alias="SQLITE_BUSY_TIMEOUT_MS")
+    sqlite_maintenance_interval_seconds: int = Field(default=3600, alias="SQLITE_MAINTENANCE_INTERVAL_SECONDS")
     openai_api_key: str | None = Field(default=None, alias="OPENAI_API_KEY")
     anthropic_api_key: str | None = Field(default=None, alias="ANTHROPIC_API_KEY")
     anthropic_model: str = Field(default="claude-sonnet-4-5", alias="ANTHROPIC_MODEL")
     google_places_api_key: str | None = Field(default=None, alias="GOOGLE_PLACES_API_KEY")
+    google_places_qps: float = Field(default=10.0, alias="GOOGLE_PLACES_QPS")
+    google_places_concurrency: int = Field(default=8, alias="GOOGLE_PLACES_CONCURRENCY")
+    places_cache_enabled: bool = Field(default=True, alias="PLACES_CACHE_ENABLED")
+    places_geocode_ttl_seconds: int = Field(default=30 * 24 * 3600, alias="PLACES_GEOCODE_TTL_SECONDS")
+    places_nearby_ttl_seconds: int = Field(default=24 * 3600, alias="PLACES_NEARBY_TTL_SECONDS")
+    places_details_ttl_seconds: int = Field(default=7 * 24 * 3600, alias="PLACES_DETAILS_TTL_SECONDS")
+    places_sweep_min_radius_meters: int = Field(default=250, alias="PLACES_SWEEP_MIN_RADIUS_METERS")
+    places_sweep_max_radius_meters: int = Field(default=50_000, alias="PLACES_SWEEP_MAX_RADIUS_METERS")
     google_oauth_client_id: str | None = Field(default=None, alias="GOOGLE_OAUTH_CLIENT_ID")
     google_oauth_client_secret: str | None = Field(default=None, alias="GOOGLE_OAUTH_CLIENT_SECRET")
     gmail_oauth_redirect_uri: str = Field(
@@ -54,6 +80,34 @@ class Settings(BaseSettings):
     pipeline_worker_enabled: bool = Field(default=True, alias="PIPELINE_WORKER_ENABLED")
     pipeline_worker_interval_seconds: int = Field(default=45, alias="PIPELINE_WORKER_INTERVAL_SECONDS")
     pipeline_worker_batch_size: int = Field(default=5, alias="PIPELINE_WORKER_BATCH_SIZE")
+    inbox_processing_enabled: bool = Field(default=True, alias="INBOX_PROCESSING_ENABLED")
+    inbox_processing_batch_size: int = Field(default=20, alias="INBOX_PROCESSING_BATCH_SIZE")
+    inbox_processing_concurrency: int = Field(default=4, alias="INBOX_PROCESSING_CONCURRENCY")
+    inbox_processing_max_attempts: int = Field(default=5, alias="INBOX_PROCESSING_MAX_ATTEMPTS")
+    # Delay before the first retry of a failed classification; doubles with each attempt.
+    inbox_processing_retry_seconds: int = Field(default=120, alias="INBOX_PROCESSING_RETRY_SECONDS")
+    outbound_send_enabled: bool = Field(default=True, alias="OUTBOUND_SEND_ENABLED")
+    outbound_send_poll_seconds: int = Field(default=5, alias="OUTBOUND_SEND_POLL_SECONDS")
+    outbound_send_min_interval_seconds: int = Field(default=20, alias="OUTBOUND_SEND_MIN_INTERVAL_SECONDS")
+    outbound_send_daily_limit: int = Field(default=400, alias="OUTBOUND_SEND_DAILY_LIMIT")
+    outbound_send_max_attempts: int = Field(default=6, alias="OUTBOUND_SEND_MAX_ATTEMPTS")
+    outbound_send_backoff_seconds: float = Field(default=30.0, alias="OUTBOUND_SEND_BACKOFF_SECONDS")
+    partnership_crawl_concurrency: int = Field(default=6, alias="PARTNERSHIP_CRAWL_CONCURRENCY")
+    partnership_analysis_concurrency: int = Field(default=3, alias="PARTNERSHIP_ANALYSIS_CONCURRENCY")
+    background_jobs_enabled: bool = Field(default=True, alias="BACKGROUND_JOBS_ENABLED")
+    background_job_workers: int = Field(default=4, alias="BACKGROUND_JOB_WORKERS")
+    background_job_poll_seconds: float = Field(default=2.0, alias="BACKGROUND_JOB_POLL_SECONDS")
+    background_job_retention_days: int = Field(default=7, alias="BACKGROUND_JOB_RETENTION_DAYS")
+    list_count_cache_seconds: int = Field(default=30, alias="LIST_COUNT_CACHE_SECONDS")
+    text_store_purge_interval_seconds: int = Field(default=3600, alias="TEXT_STORE_PURGE_INTERVAL_SECONDS")
+    lead_import_dir: str = Field(default="./data/lead_imports", alias="LEAD_IMPORT_DIR")
+    lead_import_chunk_size: int = Field(default=1000, alias="LEAD_IMPORT_CHUNK_SIZE")
+    lead_import_max_bytes: int = Field(default=512 * 1024 * 1024, alias="LEAD_IMPORT_MAX_BYTES")
+    duplicate_detection_enabled: bool = Field(default=True, alias="DUPLICATE_DETECTION_ENABLED")
+    duplicate_match_threshold: float = Field(default=0.75, alias="DUPLICATE_MATCH_THRESHOLD")
+    duplicate_scan_batch_size: int = Field(default=1000, alias="DUPLICATE_SCAN_BATCH_SIZE")
+    # Threads for routes that wait on LLM calls or website fetches (app.api.blocking).
+    blocking_route_concurrency: int = Field(default=16, alias="BLOCKING_ROUTE_CONCURRENCY")
 
     api_prefix: str = "/api/v1"
 
@@ -1,32 +1,86 @@
+"""Engines and sessions.
+
+The primary database takes every write, the pipeline worker and background jobs. When
+``DATABASE_READ_REPLICA_URL`` is set, read-only list, detail and summary routes use
+``get_read_db``/``get_async_read_db`` and run on the replica; otherwise those resolve to
+the primary too. Each database has a sync engine and an async one (asyncpg, aiosqlite)
+for ``async def`` routes. Pool sizing and the statement timeout apply to PostgreSQL;
+SQLite connections get the pragmas of ``app.db.sqlite``.
+"""
 from __future__ import annotations
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from typing import Any
 
-from sqlalchemy import create_engine, event
+from sqlalchemy import URL, Engine, create_engine, event, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.db.sqlite import sqlite_pragmas
+
+# Async drivers for the same database: asyncpg for PostgreSQL, aiosqlite for SQLite.
+_ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def _async_url(url: URL) -> URL:
+    return url.set(drivername=_ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+
+def _engine_options(url: URL) -> dict[str, Any]:
+    if url.get_backend_name() == "sqlite":
+        # SQLite needs check_same_thread=False for the sync driver.
+        return {"connect_args": {"check_same_thread": False}} if url.get_driver_name() != "aiosqlite" else {}
+
+    options: dict[str, Any] = {
+        "pool_pre_ping": True,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+    }
+    if settings.db_statement_timeout_ms > 0:
+        # A startup parameter rather than SET on connect: the pool's rollback would undo that.
+        timeout = str(settings.db_statement_timeout_ms)
+        if url.get_driver_name() == "asyncpg":
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
+def _create_engine(url: URL) -> Engine:
+    created = create_engine(url, **_engine_options(url))
+    if url.get_backend_name() == "sqlite":
+        event.listen(created, "connect", sqlite_pragmas)
+    return created
 
-_is_sqlite = settings.database_url.startswith("sqlite")
 
-# SQLite needs check_same_thread=False; PostgreSQL uses pool_pre_ping.
-_connect_args: dict = {"check_same_thread": False} if _is_sqlite else {}
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=not _is_sqlite,
-    connect_args=_connect_args,
+def _create_async_engine(url: URL) -> AsyncEngine:
+    created = create_async_engine(url, **_engine_options(url))
+    if url.get_backend_name() == "sqlite":
+        event.listen(created.sync_engine, "connect", sqlite_pragmas)
+    return created
+
+
+_primary_url = make_url(settings.database_url)
+engine = _create_engine(_primary_url)
+async_engine = _create_async_engine(
+    make_url(settings.async_database_url) if settings.async_database_url else _async_url(_primary_url)
 )
 
-# Enable WAL mode and foreign keys for SQLite connections
-if _is_sqlite:
-    @event.listens_for(engine, "connect")
-    def _sqlite_pragmas(dbapi_conn, _connection_record):
-        cursor = dbapi_conn.cursor()
-        cursor.execute("PRAGMA journal_mode=WAL")
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.close()
+if settings.database_read_replica_url:
+    _replica_url = make_url(settings.database_read_replica_url)
+    read_engine = _create_engine(_replica_url)
+    async_read_engine = _create_async_engine(_async_url(_replica_url))
+else:
+    read_engine = engine
+    async_read_engine = async_engine
 
 SessionLocal = sessionmaker(bind=engine, class_=Session, autoflush=False, autocommit=False)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+ReadSessionLocal = sessionmaker(bind=read_engine, class_=Session, autoflush=False, autocommit=False)
+AsyncReadSessionLocal = async_sessionmaker(bind=async_read_engine, autoflush=False, expire_on_commit=False)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -40,3 +94,38 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+
+def get_read_db() -> Generator[Session, None, None]:
+    """
+    FastAPI dependency for read-only routes: a session on the read replica, if configured.
+
+    Replicas lag the primary slightly, so routes that write, or must see their own writes,
+    keep ``get_db``.
+    """
+
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency that yields an async SQLAlchemy session, for ``async def`` routes.
+
+    Sync helpers that take a ``Session`` (counts, search matching) run through
+    ``await db.run_sync(...)`` on the same connection.
+    """
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    ``get_read_db`` for ``async def`` routes.
+    """
+
+    async with AsyncReadSessionLocal() as db:
+        yield db
@@ -0,0 +1,106 @@
+"""SQLite tuning for the single-user (desktop) deployment.
+
+Every connection gets WAL with ``synchronous=NORMAL`` (durable across application
+crashes; only a power loss can drop the last commits), a larger page cache, memory-mapped
+reads, in-memory temp tables and a busy timeout. New database files use incremental
+auto-vacuum, so ``run_sqlite_maintenance`` can hand pages freed by deletes back to the
+file system; files created before that keep their size until a manual ``VACUUM``.
+
+Startup schema checks (``create_all`` plus the column migrations in ``app.main``) are
+skipped when the file's ``PRAGMA user_version`` matches ``sqlite_schema_fingerprint``: a
+hash of the ORM tables, columns and indexes and of ``SQLITE_SCHEMA_REVISION``.
+
+SQLite stores no UTC offset, so timezone-aware columns come back naive; ``as_utc`` restores
+it before such values are compared with aware datetimes.
+"""
+from __future__ import annotations
+
+import logging
+import zlib
+from datetime import datetime, timezone
+from typing import Final
+
+from sqlalchemy import Engine, MetaData
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when startup migration work changes without a model change (a new backfill, or
+# changed FTS index or trigger DDL), so existing files run the checks once more.
+SQLITE_SCHEMA_REVISION: Final[int] = 1
+# auto_vacuum=INCREMENTAL as reported by PRAGMA auto_vacuum.
+_AUTO_VACUUM_INCREMENTAL: Final[int] = 2
+# Pages released per maintenance run, so one run holds the write lock briefly.
+_INCREMENTAL_VACUUM_PAGES: Final[int] = 10_000
+
+
+def as_utc(value: datetime | None) -> datetime | None:
+    """``value`` with UTC attached when the database returned it naive."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def sqlite_pragmas(dbapi_conn, _connection_record):
+    cursor = dbapi_conn.cursor()
+    # Setting auto_vacuum takes the write lock, so only do it for a brand-new file, where
+    # it also only takes effect; it must precede journal_mode, which writes the first page.
+    cursor.execute("PRAGMA page_count")
+    if cursor.fetchone()[0] == 0:
+        cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+    # Negative cache_size is in KiB rather than pages.
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_kib)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size_bytes)}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def sqlite_schema_fingerprint(metadata: MetaData) -> int:
+    """A positive 31-bit stamp of the schema ``metadata`` describes."""
+    dialect = sqlite.dialect()
+    parts = [f"revision:{SQLITE_SCHEMA_REVISION}"]
+    for table in metadata.sorted_tables:
+        parts.append(f"table:{table.name}")
+        parts.extend(
+            f"column:{column.name}:{column.type.compile(dialect=dialect)}:{column.nullable}"
+            for column in table.columns
+        )
+        parts.extend(
+            f"index:{index.name}:{','.join(column.name for column in index.columns)}"
+            for index in sorted(table.indexes, key=lambda index: index.name or "")
+        )
+    return (zlib.crc32("\n".join(parts).encode("utf-8")) & 0x7FFFFFFF) or 1
+
+
+def sqlite_schema_is_current(connection: Connection, metadata: MetaData) -> bool:
+    return connection.exec_driver_sql("PRAGMA user_version").scalar() == sqlite_schema_fingerprint(metadata)
+
+
+def stamp_sqlite_schema(connection: Connection, metadata: MetaData) -> None:
+    connection.exec_driver_sql(f"PRAGMA user_version={sqlite_schema_fingerprint(metadata)}")
+
+
+def run_sqlite_maintenance(engine: Engine) -> int:
+    """Refresh planner statistics and release free pages; returns the pages released."""
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA optimize")
+        conn.commit()
+        released = 0
+        if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() == _AUTO_VACUUM_INCREMENTAL:
+            free_pages = conn.exec_driver_sql("PRAGMA freelist_count").scalar() or 0
+            if free_pages:
+                released = min(free_pages, _INCREMENTAL_VACUUM_PAGES)
+                # The pragma frees one page per step and execute() steps once; a script
+                # runs it to completion.
+                conn.connection.driver_connection.executescript(f"PRAGMA incremental_vacuum({released})")
+        conn.commit()
+    if released:
+        logger.info("SQLite incremental vacuum released pages=%s", released)
+    return released
@@ -4,7 +4,10 @@ from fastapi.responses import JSONResponse
 
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.services.background_jobs import background_job_worker
 from app.services.dev_identity import DevIdentityError, initialize_default_identity_for_dev, resolve_request_identity
+from app.services.maintenance_worker import maintenance_worker
+from app.services.outbound_send_queue import outbound_send_worker
 from app.services.pipeline_worker import pipeline_worker
 
 app = FastAPI(title=settings.app_name)
@@ -47,24 +50,43 @@ async def attach_request_identity(request: Request, call_next):
 
 @app.on_event("startup")
 def init_sqlite_schema() -> None:
-    """Auto-create all tables when running with SQLite (bypasses Alembic)."""
+    """Auto-create all tables when running with SQLite (bypasses Alembic).
+
+    Skipped when the file is stamped with the current schema (see ``app.db.sqlite``).
+    """
     if settings.database_url.startswith("sqlite"):
         import app.models  # noqa: F401 — register all ORM models before create_all
         from app.db.base import Base
         from app.db.session import engine
+        from app.db.sqlite import sqlite_schema_is_current, stamp_sqlite_schema
+
+        with engine.connect() as conn:
+            if sqlite_schema_is_current(conn, Base.metadata):
+                return
         Base.metadata.create_all(bind=engine)
-        _run_sqlite_column_migrations(engine)
+        if _run_sqlite_column_migrations(engine):
+            with engine.begin() as conn:
+                stamp_sqlite_schema(conn, Base.metadata)
 
 
-def _run_sqlite_column_migrations(engine) -> None:  # type: ignore[type-arg]
+def _run_sqlite_column_migrations(engine) -> bool:  # type: ignore[type-arg]
     """Add any columns that exist in ORM models but are missing from the live SQLite schema.
 
     SQLite does not support ALTER TABLE … DROP COLUMN in older versions and
     create_all() never modifies existing tables, so we handle additive
     migrations here.  Each entry is (table, column, SQL type + default).
+    Returns False when any step failed, so the schema is not stamped current and the
+    next startup runs these checks again.
     """
     from sqlalchemy import text
 
+    from app.models.lead_pipeline import PIPELINE_STATE_COLUMNS
+    from app.services.dedupe_keys import DEDUPE_KEY_COLUMNS, backfill_dedupe_keys
+    from app.services.lead_pipeline import rebuild_lead_pipeline_states
+    from app.services.search import ensure_search_index, rebuild_search_documents
+    from app.services.text_store import backfill_text_store
+    from app.services.workspace_ai_strategy import rebuild_compiled_strategy_contexts
+
     migrations: list[tuple[str, str, str]] = [
         # workspace_settings columns added in v2
         ("workspace_settings", "gmail_connected", "INTEGER NOT NULL DEFAULT 0"),
@@ -82,7 +104,121 @@ def _run_sqlite_column_migrations(engine) -> None:  # type: ignore[type-arg]
         ("leads", "partnership_context", "TEXT"),
         # workspace_settings preferred_ai_provider added in v5
         ("workspace_settings", "preferred_ai_provider", "TEXT DEFAULT 'auto'"),
+        # email_messages post-sync processing markers added in v6
+        ("email_messages", "processed_at", "DATETIME"),
+        ("email_messages", "processing_error", "TEXT"),
+        # email_threads denormalized latest-message pointers added in v7
+        ("email_threads", "latest_message_id", "CHAR(32)"),
+        ("email_threads", "latest_inbound_message_id", "CHAR(32)"),
+        ("email_threads", "latest_inbound_classification", "VARCHAR(50)"),
+        # email_threads maintained summary columns added in v8
+        ("email_threads", "last_inbound_at", "DATETIME"),
+        ("email_threads", "last_outbound_at", "DATETIME"),
+        ("email_threads", "message_count", "INTEGER NOT NULL DEFAULT 0"),
+        ("email_threads", "needs_reply", "BOOLEAN NOT NULL DEFAULT 0"),
+        # workspace_automation_settings send-queue limits added in v9
+        ("workspace_automation_settings", "daily_send_limit", "INTEGER"),
+        ("workspace_automation_settings", "send_window_start_hour", "INTEGER"),
+        ("workspace_automation_settings", "send_window_end_hour", "INTEGER"),
+        ("workspace_automation_settings", "send_timezone", "VARCHAR(64)"),
+        ("workspace_automation_settings", "send_weekdays_only", "BOOLEAN NOT NULL DEFAULT 0"),
+        # stored dedupe keys added in v10
+        ("leads", "website_key", "VARCHAR(500)"),
+        ("leads", "company_location_key", "VARCHAR(520)"),
+        ("prospects", "website_key", "VARCHAR(500)"),
+        ("prospects", "company_location_key", "VARCHAR(520)"),
+        ("partner_candidates", "website_key", "VARCHAR(500)"),
+        ("partner_candidates", "company_location_key", "VARCHAR(520)"),
+        # duplicate-detection blocking keys added in v11
+        ("leads", "name_key", "VARCHAR(255)"),
+        ("leads", "phone_key", "VARCHAR(20)"),
+        ("leads", "domain_key", "VARCHAR(255)"),
+        ("leads", "locality_block_key", "VARCHAR(100)"),
+        ("prospects", "name_key", "VARCHAR(255)"),
+        ("prospects", "phone_key", "VARCHAR(20)"),
+        ("prospects", "domain_key", "VARCHAR(255)"),
+        ("prospects", "locality_block_key", "VARCHAR(100)"),
+        ("partner_candidates", "name_key", "VARCHAR(255)"),
+        ("partner_candidates", "phone_key", "VARCHAR(20)"),
+        ("partner_candidates", "domain_key", "VARCHAR(255)"),
+        ("partner_candidates", "locality_block_key", "VARCHAR(100)"),
+        # shared text store references added in v12
+        ("website_pages", "text_id", "VARCHAR(64) REFERENCES text_blobs(id)"),
+        ("website_snapshots", "text_id", "VARCHAR(64) REFERENCES text_blobs(id)"),
+        ("partner_candidates", "crawled_text_id", "VARCHAR(64) REFERENCES text_blobs(id)"),
+        # leads materialized pipeline state added in v13
+        ("leads", "has_snapshot", "BOOLEAN NOT NULL DEFAULT 0"),
+        ("leads", "has_agent1_output", "BOOLEAN NOT NULL DEFAULT 0"),
+        ("leads", "has_draft", "BOOLEAN NOT NULL DEFAULT 0"),
+        ("leads", "has_agent3_verdict", "BOOLEAN NOT NULL DEFAULT 0"),
+        ("leads", "final_decision", "VARCHAR(10)"),
+        ("leads", "pipeline_stage", "VARCHAR(30) NOT NULL DEFAULT 'imported'"),
+        # search_documents parent lead/thread added in v14
+        ("search_documents", "parent_id", "CHAR(32)"),
+        # workspace configuration version stamp added in v15
+        ("workspaces", "settings_version", "INTEGER NOT NULL DEFAULT 0"),
+        # compiled agent strategy contexts added in v16
+        ("workspace_ai_strategy", "compiled_context", "JSON"),
+        # email_messages classification retries added in v17
+        ("email_messages", "processing_attempts", "INTEGER NOT NULL DEFAULT 0"),
+        ("email_messages", "processing_retry_at", "DATETIME"),
+    ]
+    # Indexes on migrated columns; create_all() only indexes brand-new tables.
+    indexes: list[tuple[str, str, str]] = [
+        ("ix_email_threads_latest_inbound_classification", "email_threads", "latest_inbound_classification"),
+        ("ix_email_threads_ws_last_message", "email_threads", "workspace_id, last_message_at, id"),
+        (
+            "ix_email_threads_ws_needs_reply_last_message",
+            "email_threads",
+            "workspace_id, needs_reply, last_message_at, id",
+        ),
+        (
+            "ix_email_threads_ws_review_status_last_message",
+            "email_threads",
+            "workspace_id, reply_review_status, last_message_at, id",
+        ),
+        ("ix_prospects_ws_source_external_id", "prospects", "workspace_id, source, external_id"),
+        ("ix_leads_ws_website_key", "leads", "workspace_id, website_key"),
+        ("ix_leads_ws_company_location_key", "leads", "workspace_id, company_location_key"),
+        ("ix_prospects_ws_website_key", "prospects", "workspace_id, website_key"),
+        ("ix_prospects_ws_company_location_key", "prospects", "workspace_id, company_location_key"),
+        ("ix_partner_candidates_ws_website_key", "partner_candidates", "workspace_id, website_key"),
+        ("ix_partner_candidates_ws_company_location_key", "partner_candidates", "workspace_id, company_location_key"),
+        ("ix_leads_ws_name_key", "leads", "workspace_id, name_key"),
+        ("ix_leads_ws_phone_key", "leads", "workspace_id, phone_key"),
+        ("ix_leads_ws_domain_key", "leads", "workspace_id, domain_key"),
+        ("ix_leads_ws_locality_block_key", "leads", "workspace_id, locality_block_key"),
+        ("ix_prospects_ws_name_key", "prospects", "workspace_id, name_key"),
+        ("ix_prospects_ws_phone_key", "prospects", "workspace_id, phone_key"),
+        ("ix_prospects_ws_domain_key", "prospects", "workspace_id, domain_key"),
+        ("ix_prospects_ws_locality_block_key", "prospects", "workspace_id, locality_block_key"),
+        ("ix_partner_candidates_ws_name_key", "partner_candidates", "workspace_id, name_key"),
+        ("ix_partner_candidates_ws_phone_key", "partner_candidates", "workspace_id, phone_key"),
+        ("ix_partner_candidates_ws_domain_key", "partner_candidates", "workspace_id, domain_key"),
+        ("ix_partner_candidates_ws_locality_block_key", "partner_candidates", "workspace_id, locality_block_key"),
+        ("ix_website_pages_text_id", "website_pages", "text_id"),
+        ("ix_website_snapshots_text_id", "website_snapshots", "text_id"),
+        ("ix_partner_candidates_crawled_text_id", "partner_candidates", "crawled_text_id"),
+        ("ix_leads_ws_created", "leads", "workspace_id, created_at, id"),
+        ("ix_leads_ws_status_created", "leads", "workspace_id, status, created_at, id"),
+        ("ix_leads_ws_lead_type_created", "leads", "workspace_id, lead_type, created_at, id"),
+        ("ix_prospects_ws_created", "prospects", "workspace_id, created_at, id"),
+        ("ix_prospects_ws_import_status_created", "prospects", "workspace_id, import_status, created_at, id"),
+        ("ix_jobs_ws_created", "jobs", "workspace_id, created_at, id"),
+        ("ix_jobs_ws_status_created", "jobs", "workspace_id, status, created_at, id"),
+        ("ix_partner_candidates_ws_created", "partner_candidates", "workspace_id, created_at, id"),
+        ("ix_partner_candidates_ws_status_created", "partner_candidates", "workspace_id, status, created_at, id"),
+        ("ix_website_snapshots_lead_fetched", "website_snapshots", "lead_id, fetched_at, id"),
+        ("ix_website_pages_lead_created", "website_pages", "lead_id, created_at, id"),
+        ("ix_email_drafts_lead_created", "email_drafts", "lead_id, created_at, id"),
+        ("ix_email_drafts_ws_review_status_updated", "email_drafts", "workspace_id, review_status, updated_at, id"),
+        ("ix_outbound_emails_ws_next_attempt", "outbound_emails", "workspace_id, next_attempt_at, id"),
+        ("ix_leads_ws_pipeline_stage_created", "leads", "workspace_id, pipeline_stage, created_at, id"),
+        ("ix_leads_ws_draft_verdict_created", "leads", "workspace_id, has_draft, has_agent3_verdict, created_at, id"),
+        ("ix_search_documents_parent", "search_documents", "parent_id"),
     ]
+    added: set[tuple[str, str]] = set()
+    complete = True
 
     with engine.connect() as conn:
         for table, column, col_def in migrations:
@@ -93,8 +229,9 @@ def _run_sqlite_column_migrations(engine) -> None:  # type: ignore[type-arg]
                 try:
                     conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {col_def}"))
                     conn.commit()
+                    added.add((table, column))
                 except Exception:
-                    pass  # already added by a concurrent process or table doesn't exist yet
+                    complete = False  # already added by a concurrent process or table doesn't exist yet
 
         # Backfill: any lead with source='partnership_discovery' should be lead_type='partnership'
         try:
@@ -103,7 +240,89 @@ def _run_sqlite_column_migrations(engine) -> None:  # type: ignore[type-arg]
             ))
             conn.commit()
         except Exception:
-            pass
+            complete = False
+
+        for index_name, table, columns in indexes:
+            try:
+                conn.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({columns})"))
+                conn.commit()
+            except Exception:
+                complete = False
+
+        # Backfill: messages synced before the inbox pipeline existed count as processed
+        if ("email_messages", "processed_at") in added:
+            try:
+                conn.execute(text(
+                    "UPDATE email_messages SET processed_at = created_at WHERE processed_at IS NULL"
+                ))
+                conn.commit()
+            except Exception:
+                complete = False
+
+        # Backfill: dedupe keys for rows written before the columns existed
+        backfill_columns = {column for _table, column in added} & set(DEDUPE_KEY_COLUMNS)
+        if backfill_columns:
+            try:
+                backfill_dedupe_keys(conn, columns=[c for c in DEDUPE_KEY_COLUMNS if c in backfill_columns])
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                complete = False
+
+        # Backfill: move inline page/snapshot/partner text into the text store, then drop the
+        # legacy NOT NULL raw_text columns so new rows can be written without them.
+        if {("website_pages", "text_id"), ("website_snapshots", "text_id"), ("partner_candidates", "crawled_text_id")} & added:
+            try:
+                backfill_text_store(conn)
+                for table in ("website_pages", "website_snapshots"):
+                    conn.execute(text(f"ALTER TABLE {table} DROP COLUMN raw_text"))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                complete = False
+
+        # Backfill: pipeline state for leads written before the columns existed
+        if any(table == "leads" and column in PIPELINE_STATE_COLUMNS for table, column in added):
+            try:
+                rebuild_lead_pipeline_states(conn)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                complete = False
+
+        # Backfill: compiled strategy contexts for strategies saved before the column existed
+        if ("workspace_ai_strategy", "compiled_context") in added:
+            try:
+                rebuild_compiled_strategy_contexts(conn)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                complete = False
+
+        # Search index: FTS5 table and sync triggers; index existing records the first time
+        # and again once pages, snapshots and messages became searchable (v14)
+        try:
+            ensure_search_index(conn)
+            empty = conn.execute(text("SELECT 1 FROM search_documents LIMIT 1")).first() is None
+            if empty or ("search_documents", "parent_id") in added:
+                rebuild_search_documents(conn)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            complete = False
+
+        # Backfill: thread summary columns for threads synced before they existed
+        if any(table == "email_threads" for table, _column in added):
+            from app.db.session import SessionLocal
+            from app.services.inbox_service import rebuild_thread_summaries
+
+            try:
+                with SessionLocal() as db:
+                    rebuild_thread_summaries(db)
+            except Exception:
+                complete = False
+
+    return complete
 
 
 @app.on_event("startup")
@@ -114,15 +333,21 @@ def bootstrap_dev_identity_defaults() -> None:
 @app.on_event("startup")
 async def start_pipeline_worker() -> None:
     pipeline_worker.start()
+    outbound_send_worker.start()
+    background_job_worker.start()
+    maintenance_worker.start()
 
 
 @app.on_event("shutdown")
 async def stop_pipeline_worker() -> None:
     await pipeline_worker.stop()
+    await outbound_send_worker.stop()
+    await background_job_worker.stop()
+    await maintenance_worker.stop()
 
 
 @app.get("/health")
-def health() -> dict[str, str]:
+async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
@@ -1,13 +1,20 @@
 # Import all models so SQLAlchemy's metadata is fully populated before create_all().
+from app.models.background_job import BackgroundJob  # noqa: F401
+from app.models.duplicate_candidate import DuplicateCandidate  # noqa: F401
 from app.models.email_draft import EmailDraft  # noqa: F401
 from app.models.email_message import EmailMessageRecord  # noqa: F401
 from app.models.email_thread import EmailThread  # noqa: F401
 from app.models.integration_account import IntegrationAccount  # noqa: F401
 from app.models.job import Job  # noqa: F401
 from app.models.lead import Lead  # noqa: F401
+from app.models.lead_import_job import LeadImportJob  # noqa: F401
 from app.models.oauth_token import OAuthToken  # noqa: F401
+from app.models.outbound_email import OutboundEmail  # noqa: F401
 from app.models.partner_candidate import PartnerCandidate  # noqa: F401
+from app.models.places_cache_entry import PlacesCacheEntry  # noqa: F401
 from app.models.prospect import Prospect  # noqa: F401
+from app.models.search_document import SearchDocument  # noqa: F401
+from app.models.text_blob import TextBlob  # noqa: F401
 from app.models.user import User  # noqa: F401
 from app.models.website_page import WebsitePage  # noqa: F401
 from app.models.website_snapshot import WebsiteSnapshot  # noqa: F401
@@ -16,3 +23,8 @@ from app.models.workspace_ai_strategy import WorkspaceAIStrategy  # noqa: F401
 from app.models.workspace_automation_setting import WorkspaceAutomationSetting  # noqa: F401
 from app.models.workspace_profile import WorkspaceProfile  # noqa: F401
 from app.models.workspace_setting import WorkspaceSetting  # noqa: F401
+
+# Not a model: registers the flush listener that maintains Lead pipeline state.
+from app.models import lead_pipeline  # noqa: F401,E402
+# Not a model: registers the flush listener that versions workspace configuration.
+from app.models import workspace_settings_version  # noqa: F401,E402
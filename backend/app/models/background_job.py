@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy import Uuid
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.mixins import TimestampMixin
+
+BACKGROUND_JOB_QUEUED = "queued"
+BACKGROUND_JOB_RUNNING = "running"
+BACKGROUND_JOB_SUCCEEDED = "succeeded"
+BACKGROUND_JOB_FAILED = "failed"
+BACKGROUND_JOB_CANCELLED = "cancelled"
+
+BACKGROUND_JOB_STATUS_VALUES = (
+    BACKGROUND_JOB_QUEUED,
+    BACKGROUND_JOB_RUNNING,
+    BACKGROUND_JOB_SUCCEEDED,
+    BACKGROUND_JOB_FAILED,
+    BACKGROUND_JOB_CANCELLED,
+)
+BACKGROUND_JOB_FINISHED_STATUSES = (BACKGROUND_JOB_SUCCEEDED, BACKGROUND_JOB_FAILED, BACKGROUND_JOB_CANCELLED)
+
+
+class BackgroundJob(TimestampMixin, Base):
+    """A long-running API operation executed by the background job worker.
+
+    ``kind`` selects the registered handler and ``params`` holds its JSON input; ``result`` is
+    the JSON body the synchronous endpoint would have returned. Unrelated to ``Job``, which
+    models a customer job in the CRM.
+    """
+
+    __tablename__ = "background_jobs"
+    __table_args__ = (
+        Index("ix_background_jobs_status_created", "status", "created_at"),
+        Index("ix_background_jobs_ws_created", "workspace_id", "created_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    workspace_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True),
+        ForeignKey("workspaces.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    user_id: Mapped[uuid.UUID | None] = mapped_column(
+        Uuid(as_uuid=True),
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    kind: Mapped[str] = mapped_column(String(100), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default=BACKGROUND_JOB_QUEUED)
+    params: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
+    result: Mapped[Any | None] = mapped_column(JSON, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    progress_current: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    progress_total: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    progress_message: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    cancel_requested: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default="0")
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
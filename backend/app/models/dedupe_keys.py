@@ -0,0 +1,172 @@
+"""Canonical dedupe keys stored on leads, prospects and partner candidates.
+
+Keys are computed once on write so dedupe is an indexed equality lookup rather than
+``lower(column) IN (<every http/https/trailing-slash variant>)`` on every import.
+
+``website_key`` / ``company_location_key`` drive exact dedupe at import time;
+``website_match_keys`` and ``company_address_key`` give converting prospects and partners
+their stricter rules on top of the same stored keys. The remaining
+keys are blocking keys for fuzzy duplicate detection: two records are only ever compared
+when they share at least one of them.
+"""
+from __future__ import annotations
+
+import re
+from typing import Final
+from urllib.parse import urlparse
+
+WEBSITE_KEY_MAX_LENGTH: Final[int] = 500
+COMPANY_LOCATION_KEY_MAX_LENGTH: Final[int] = 520
+NAME_KEY_MAX_LENGTH: Final[int] = 255
+PHONE_KEY_MAX_LENGTH: Final[int] = 20
+DOMAIN_KEY_MAX_LENGTH: Final[int] = 255
+LOCALITY_BLOCK_KEY_MAX_LENGTH: Final[int] = 100
+
+# Tokens that carry no identity: "Joe's Plumbing LLC" and "Joes Plumbing" share a name key.
+_NAME_STOPWORDS: Final[frozenset[str]] = frozenset(
+    {
+        "the", "llc", "inc", "incorporated", "co", "corp", "corporation", "company",
+        "ltd", "limited", "lp", "llp", "pc", "pllc", "plc", "gmbh",
+    }
+)
+# Hosts shared by unrelated businesses; their domain key keeps the path.
+_SHARED_HOSTS: Final[frozenset[str]] = frozenset(
+    {
+        "facebook.com", "m.facebook.com", "instagram.com", "linkedin.com", "twitter.com", "x.com",
+        "yelp.com", "google.com", "sites.google.com", "business.site", "linktr.ee", "nextdoor.com",
+        "wixsite.com", "square.site", "godaddysites.com",
+    }
+)
+_ZIP_RE = re.compile(r"\b(\d{5})(?:-\d{4})?\b")
+_NON_ALNUM_RE = re.compile(r"[^0-9a-z]+")
+
+
+def _fold(value: str | None) -> str | None:
+    if value is None:
+        return None
+    folded = " ".join(value.split()).casefold()
+    return folded or None
+
+
+def website_key(url: str | None) -> str | None:
+    """Scheme-less, lowercase host (without ``www.``) plus path without trailing slash.
+
+    ``https://www.Example.com/About/`` and ``http://example.com/about`` share the key
+    ``example.com/about``.
+    """
+    cleaned = (url or "").strip()
+    if not cleaned:
+        return None
+    parsed = urlparse(cleaned if "://" in cleaned else f"https://{cleaned}")
+    host = (parsed.hostname or "").casefold()
+    if host.startswith("www."):
+        host = host[4:]
+    if not host:
+        return None
+    if parsed.port and parsed.port not in (80, 443):
+        host = f"{host}:{parsed.port}"
+    path = parsed.path.rstrip("/").casefold()
+    return f"{host}{path}"[:WEBSITE_KEY_MAX_LENGTH]
+
+
+def company_location_key(company: str | None, location: str | None) -> str | None:
+    """Case- and whitespace-insensitive ``company::location``; ``None`` without a company."""
+    company_folded = _fold(company)
+    if company_folded is None:
+        return None
+    return f"{company_folded}::{_fold(location) or ''}"[:COMPANY_LOCATION_KEY_MAX_LENGTH]
+
+
+def company_address_key(company: str | None, address: str | None) -> str | None:
+    """``company_location_key``, but ``None`` without an address as well.
+
+    Prospects and partners come from directory listings that often share a name across
+    branches, so a name alone never marks them as duplicates.
+    """
+    if _fold(address) is None:
+        return None
+    return company_location_key(company, address)
+
+
+def company_name_key(company: str | None) -> str | None:
+    """Casefolded name without punctuation, possessives or legal suffixes."""
+    folded = (company or "").casefold().replace("'", "").replace("\u2019", "").replace(".", "").replace("&", " and ")
+    tokens = _NON_ALNUM_RE.sub(" ", folded).split()
+    significant = [token for token in tokens if token not in _NAME_STOPWORDS]
+    return " ".join(significant or tokens)[:NAME_KEY_MAX_LENGTH] or None
+
+
+def phone_key(phone: str | None) -> str | None:
+    """National number digits (last ten); ``None`` when too short to identify anyone."""
+    digits = "".join(ch for ch in phone or "" if ch.isdigit())
+    if len(digits) < 7:
+        return None
+    return digits[-10:]
+
+
+def _is_shared_host(host: str) -> bool:
+    return host in _SHARED_HOSTS or any(host.endswith(f".{shared}") for shared in _SHARED_HOSTS)
+
+
+def domain_key(url: str | None) -> str | None:
+    """Host part of ``website_key``; the full key for shared hosts such as facebook.com."""
+    key = website_key(url)
+    if key is None:
+        return None
+    host = key.split("/", 1)[0]
+    if _is_shared_host(host):
+        return key[:DOMAIN_KEY_MAX_LENGTH]
+    return host[:DOMAIN_KEY_MAX_LENGTH]
+
+
+def website_match_keys(url: str | None) -> set[str]:
+    """``website_key`` plus the bare host it sits on, except for shared hosts.
+
+    A deep link matches a record stored under the site's home page, and two deep links
+    on one site match each other.
+    """
+    key = website_key(url)
+    if key is None:
+        return set()
+    host = key.split("/", 1)[0]
+    return {key} if _is_shared_host(host) else {key, host}
+
+
+def locality_key(location: str | None) -> str | None:
+    """ZIP code when present, otherwise the last two comma-separated parts (``chico ca``)."""
+    if not location:
+        return None
+    match = _ZIP_RE.search(location)
+    if match:
+        return match.group(1)
+    parts = [part for part in location.split(",") if part.strip()]
+    tail = _NON_ALNUM_RE.sub(" ", " ".join(parts[-2:]).casefold())
+    tokens = [token for token in tail.split() if not token.isdigit()]
+    return " ".join(tokens) or None
+
+
+def locality_block_key(company: str | None, location: str | None) -> str | None:
+    """``locality|name prefix`` so near-identical names in one area land in the same block."""
+    name = company_name_key(company)
+    locality = locality_key(location)
+    if not name or not locality:
+        return None
+    return f"{locality}|{name.replace(' ', '')[:4]}"[:LOCALITY_BLOCK_KEY_MAX_LENGTH]
+
+
+def dedupe_key_values(
+    *,
+    website: str | None,
+    company: str | None,
+    location: str | None,
+    phone: str | None,
+) -> dict[str, str | None]:
+    """Every stored key for one record, keyed by column name."""
+    return {
+        "website_key": website_key(website),
+        "company_location_key": company_location_key(company, location),
+        "name_key": company_name_key(company),
+        "phone_key": phone_key(phone),
+        "domain_key": domain_key(website),
+        "locality_block_key": locality_block_key(company, location),
+    }
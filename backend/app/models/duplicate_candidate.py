@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, ForeignKey, Index, JSON, String, UniqueConstraint
+from sqlalchemy import Uuid
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.mixins import TimestampMixin
+
+DUPLICATE_ENTITY_LEAD = "lead"
+DUPLICATE_ENTITY_PROSPECT = "prospect"
+DUPLICATE_ENTITY_PARTNER_CANDIDATE = "partner_candidate"
+DUPLICATE_ENTITY_VALUES = (DUPLICATE_ENTITY_LEAD, DUPLICATE_ENTITY_PROSPECT, DUPLICATE_ENTITY_PARTNER_CANDIDATE)
+
+DUPLICATE_STATUS_OPEN = "open"
+DUPLICATE_STATUS_MERGED = "merged"
+DUPLICATE_STATUS_DISMISSED = "dismissed"
+DUPLICATE_STATUS_VALUES = (DUPLICATE_STATUS_OPEN, DUPLICATE_STATUS_MERGED, DUPLICATE_STATUS_DISMISSED)
+
+
+class DuplicateCandidate(TimestampMixin, Base):
+    """A suspected duplicate pair across leads, prospects and partner candidates.
+
+    Pairs are stored in canonical order (``(left_type, left_id) < (right_type, right_id)``) so
+    the same two records are only ever flagged once; dismissed pairs stay dismissed.
+    """
+
+    __tablename__ = "duplicate_candidates"
+    __table_args__ = (
+        UniqueConstraint("workspace_id", "left_type", "left_id", "right_type", "right_id", name="uq_duplicate_candidates_pair"),
+        Index("ix_duplicate_candidates_ws_status_score", "workspace_id", "status", "score"),
+        Index("ix_duplicate_candidates_right", "right_type", "right_id"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    workspace_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True),
+        ForeignKey("workspaces.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    left_type: Mapped[str] = mapped_column(String(30), nullable=False)
+    left_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), nullable=False)
+    right_type: Mapped[str] = mapped_column(String(30), nullable=False)
+    right_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), nullable=False)
+    score: Mapped[float] = mapped_column(Float, nullable=False)
+    reasons: Mapped[list[str]] = mapped_column(JSON, nullable=False, default=list)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default=DUPLICATE_STATUS_OPEN)
+    resolved_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text
 from sqlalchemy import JSON, Uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -18,6 +18,10 @@ if TYPE_CHECKING:
 
 class EmailDraft(TimestampMixin, Base):
     __tablename__ = "email_drafts"
+    __table_args__ = (
+        Index("ix_email_drafts_lead_created", "lead_id", "created_at", "id"),
+        Index("ix_email_drafts_ws_review_status_updated", "workspace_id", "review_status", "updated_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     workspace_id: Mapped[uuid.UUID] = mapped_column(
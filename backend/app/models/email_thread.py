@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, false
 from sqlalchemy import JSON, Uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -17,6 +17,17 @@ if TYPE_CHECKING:
 
 class EmailThread(TimestampMixin, Base):
     __tablename__ = "email_threads"
+    __table_args__ = (
+        Index("ix_email_threads_ws_last_message", "workspace_id", "last_message_at", "id"),
+        Index("ix_email_threads_ws_needs_reply_last_message", "workspace_id", "needs_reply", "last_message_at", "id"),
+        Index(
+            "ix_email_threads_ws_review_status_last_message",
+            "workspace_id",
+            "reply_review_status",
+            "last_message_at",
+            "id",
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     workspace_id: Mapped[uuid.UUID] = mapped_column(
@@ -33,6 +44,15 @@ class EmailThread(TimestampMixin, Base):
     next_action: Mapped[str | None] = mapped_column(String(50), nullable=True)
     next_action_detail: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
     reply_review_status: Mapped[str | None] = mapped_column(String(30), nullable=True)
+    # Denormalized summary maintained by inbox_service.refresh_thread_summary so list views
+    # never have to scan email_messages per thread.
+    last_inbound_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_outbound_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    message_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    needs_reply: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default=false())
+    latest_message_id: Mapped[uuid.UUID | None] = mapped_column(Uuid(as_uuid=True), nullable=True)
+    latest_inbound_message_id: Mapped[uuid.UUID | None] = mapped_column(Uuid(as_uuid=True), nullable=True)
+    latest_inbound_classification: Mapped[str | None] = mapped_column(String(50), nullable=True, index=True)
 
     messages: Mapped[list["EmailMessageRecord"]] = relationship(
         back_populates="thread",
@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text
 from sqlalchemy import JSON, Uuid
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -16,6 +16,10 @@ JOB_STATUS_VALUES = ("proposed", "approved", "scheduled", "in_progress", "comple
 
 class Job(TimestampMixin, Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_ws_created", "workspace_id", "created_at", "id"),
+        Index("ix_jobs_ws_status_created", "workspace_id", "status", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     workspace_id: Mapped[uuid.UUID] = mapped_column(
@@ -3,11 +3,20 @@ from __future__ import annotations
 import uuid
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Enum, ForeignKey, JSON, String, text
+from sqlalchemy import Boolean, Enum, ForeignKey, Index, JSON, String, event, false, text
 from sqlalchemy import Uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
+from app.models.dedupe_keys import (
+    COMPANY_LOCATION_KEY_MAX_LENGTH,
+    DOMAIN_KEY_MAX_LENGTH,
+    LOCALITY_BLOCK_KEY_MAX_LENGTH,
+    NAME_KEY_MAX_LENGTH,
+    PHONE_KEY_MAX_LENGTH,
+    WEBSITE_KEY_MAX_LENGTH,
+    dedupe_key_values,
+)
 from app.models.lead_status import DEFAULT_LEAD_STATUS, LEAD_STATUS_VALUES
 from app.models.mixins import TimestampMixin
 
@@ -24,6 +33,19 @@ if TYPE_CHECKING:
 
 class Lead(TimestampMixin, Base):
     __tablename__ = "leads"
+    __table_args__ = (
+        Index("ix_leads_ws_website_key", "workspace_id", "website_key"),
+        Index("ix_leads_ws_company_location_key", "workspace_id", "company_location_key"),
+        Index("ix_leads_ws_name_key", "workspace_id", "name_key"),
+        Index("ix_leads_ws_phone_key", "workspace_id", "phone_key"),
+        Index("ix_leads_ws_domain_key", "workspace_id", "domain_key"),
+        Index("ix_leads_ws_locality_block_key", "workspace_id", "locality_block_key"),
+        Index("ix_leads_ws_created", "workspace_id", "created_at", "id"),
+        Index("ix_leads_ws_status_created", "workspace_id", "status", "created_at", "id"),
+        Index("ix_leads_ws_lead_type_created", "workspace_id", "lead_type", "created_at", "id"),
+        Index("ix_leads_ws_pipeline_stage_created", "workspace_id", "pipeline_stage", "created_at", "id"),
+        Index("ix_leads_ws_draft_verdict_created", "workspace_id", "has_draft", "has_agent3_verdict", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     workspace_id: Mapped[uuid.UUID] = mapped_column(
@@ -56,6 +78,26 @@ class Lead(TimestampMixin, Base):
         index=True,
     )
     partnership_context: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    # Maintained from website_url / company + location on every ORM write (see below).
+    website_key: Mapped[str | None] = mapped_column(String(WEBSITE_KEY_MAX_LENGTH), nullable=True)
+    company_location_key: Mapped[str | None] = mapped_column(String(COMPANY_LOCATION_KEY_MAX_LENGTH), nullable=True)
+    name_key: Mapped[str | None] = mapped_column(String(NAME_KEY_MAX_LENGTH), nullable=True)
+    phone_key: Mapped[str | None] = mapped_column(String(PHONE_KEY_MAX_LENGTH), nullable=True)
+    domain_key: Mapped[str | None] = mapped_column(String(DOMAIN_KEY_MAX_LENGTH), nullable=True)
+    locality_block_key: Mapped[str | None] = mapped_column(String(LOCALITY_BLOCK_KEY_MAX_LENGTH), nullable=True)
+    # Pipeline state derived from status, snapshots and drafts; maintained on every ORM
+    # write by app.models.lead_pipeline.
+    has_snapshot: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default=false())
+    has_agent1_output: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default=false())
+    has_draft: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default=false())
+    has_agent3_verdict: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default=false())
+    final_decision: Mapped[str | None] = mapped_column(String(10), nullable=True)
+    pipeline_stage: Mapped[str] = mapped_column(
+        String(30),
+        nullable=False,
+        default=DEFAULT_LEAD_STATUS,
+        server_default=text(f"'{DEFAULT_LEAD_STATUS}'"),
+    )
 
     workspace: Mapped["Workspace"] = relationship(back_populates="leads")
     snapshots: Mapped[list["WebsiteSnapshot"]] = relationship(
@@ -73,3 +115,11 @@ class Lead(TimestampMixin, Base):
         cascade="all, delete-orphan",
         passive_deletes=True,
     )
+
+
+@event.listens_for(Lead, "before_insert")
+@event.listens_for(Lead, "before_update")
+def _set_lead_dedupe_keys(_mapper, _connection, target: Lead) -> None:
+    values = dedupe_key_values(website=target.website_url, company=target.company, location=target.location, phone=target.phone)
+    for column, value in values.items():
+        setattr(target, column, value)
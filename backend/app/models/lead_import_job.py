@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import BigInteger, Uuid
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.mixins import TimestampMixin
+
+LEAD_IMPORT_JOB_PENDING = "pending"
+LEAD_IMPORT_JOB_RUNNING = "running"
+LEAD_IMPORT_JOB_COMPLETED = "completed"
+LEAD_IMPORT_JOB_FAILED = "failed"
+
+
+class LeadImportJob(TimestampMixin, Base):
+    """A streamed CSV/JSONL lead import. Progress counters are updated after every chunk."""
+
+    __tablename__ = "lead_import_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    workspace_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True),
+        ForeignKey("workspaces.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default=LEAD_IMPORT_JOB_PENDING)
+    source: Mapped[str] = mapped_column(String(100), nullable=False)
+    file_format: Mapped[str] = mapped_column(String(10), nullable=False)
+    filename: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    dedupe_by_website: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    dedupe_by_company_location: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    upload_path: Mapped[str | None] = mapped_column(String(1000), nullable=True)
+    report_path: Mapped[str | None] = mapped_column(String(1000), nullable=True)
+    total_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    processed_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    processed_rows: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    imported_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    duplicate_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,277 @@
+"""Materialized pipeline state stored on leads.
+
+``has_snapshot``, ``has_agent1_output``, ``has_draft``, ``has_agent3_verdict``,
+``final_decision`` and ``pipeline_stage`` are derived from the lead's status, website
+snapshots and email drafts. A session listener recomputes them in the same flush whenever
+one of those changes through the ORM, so lists and stage filters read plain indexed
+columns. Bulk ``update()`` / ``delete()`` statements bypass the listener;
+``app.services.lead_pipeline.rebuild_lead_pipeline_states`` repairs any drift.
+"""
+from __future__ import annotations
+
+import uuid
+from collections.abc import Collection, Iterable, Mapping
+from itertools import chain
+from typing import Any, Final
+
+from sqlalchemy import String, and_, bindparam, cast, event, func, inspect, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.email_draft import EmailDraft
+from app.models.lead import Lead
+from app.models.lead_status import (
+    DEFAULT_LEAD_STATUS,
+    LEAD_STATUS_APPROVED,
+    LEAD_STATUS_ARCHIVED,
+    LEAD_STATUS_CONVERTED,
+    LEAD_STATUS_DISCOVERED,
+    LEAD_STATUS_DRAFT_READY,
+    LEAD_STATUS_DRAFTING,
+    LEAD_STATUS_IMPORTED,
+    LEAD_STATUS_NEEDS_REVIEW,
+    LEAD_STATUS_REPLIED,
+    LEAD_STATUS_RESEARCHED,
+    LEAD_STATUS_RESEARCHING,
+    LEAD_STATUS_SENT,
+    normalize_lead_status,
+)
+from app.models.website_snapshot import WebsiteSnapshot
+
+AGENT1_SUBJECT_PREFIX: Final[str] = "Agent1 draft for "
+AGENT1_BODY_PREFIX: Final[str] = "Auto-generated Agent1 analysis"
+PIPELINE_STATE_COLUMNS: Final[tuple[str, ...]] = (
+    "has_snapshot",
+    "has_agent1_output",
+    "has_draft",
+    "has_agent3_verdict",
+    "final_decision",
+    "pipeline_stage",
+)
+
+# Draft attributes the state depends on; edits to anything else (review notes, Gmail ids)
+# leave it unchanged.
+_DRAFT_STATE_ATTRS: Final[tuple[str, ...]] = (
+    "lead_id",
+    "subject",
+    "body",
+    "decision",
+    "agent1_output",
+    "agent3_verdict",
+)
+_LOOKUP_BATCH_SIZE: Final[int] = 500
+
+
+def compute_stage(
+    *,
+    lead_status: str | None,
+    has_snapshot: bool,
+    has_agent1_output: bool,
+    has_draft: bool,
+    has_agent3_verdict: bool,
+    final_decision: str | None,
+) -> str:
+    status_norm = normalize_lead_status(lead_status, fallback=DEFAULT_LEAD_STATUS)
+    if status_norm in {LEAD_STATUS_ARCHIVED, LEAD_STATUS_CONVERTED, LEAD_STATUS_REPLIED, LEAD_STATUS_SENT}:
+        return status_norm
+    if final_decision == "send":
+        return LEAD_STATUS_APPROVED
+    if final_decision == "hold":
+        return LEAD_STATUS_NEEDS_REVIEW
+    if has_agent3_verdict:
+        return status_norm if status_norm in {LEAD_STATUS_APPROVED, LEAD_STATUS_NEEDS_REVIEW} else LEAD_STATUS_DRAFT_READY
+    if has_draft:
+        return status_norm if status_norm == LEAD_STATUS_DRAFTING else LEAD_STATUS_DRAFT_READY
+    if has_agent1_output or has_snapshot:
+        return status_norm if status_norm == LEAD_STATUS_RESEARCHING else LEAD_STATUS_RESEARCHED
+    return status_norm if status_norm in {LEAD_STATUS_IMPORTED, LEAD_STATUS_DISCOVERED} else DEFAULT_LEAD_STATUS
+
+
+def pipeline_state(
+    lead_status: str | None,
+    drafts: Iterable[Any] = (),
+    *,
+    has_snapshot: bool = False,
+) -> dict[str, Any]:
+    """State for one lead from its status and ``_draft_state_columns`` rows (newest first)."""
+    has_agent1_output = False
+    has_draft = False
+    has_agent3_verdict = False
+    final_decision: str | None = None
+
+    for _lead_id, decision, has_output, has_verdict, verdict_source, verdict_decision, is_placeholder in drafts:
+        verdict_source = (verdict_source or "").strip().lower() if has_verdict else ""
+        verdict_decision = verdict_decision if has_verdict else None
+        draft_decision = (decision or "").strip().lower()
+
+        if has_output:
+            has_agent1_output = True
+
+        if verdict_source == "agent2" or draft_decision in {"send", "hold"} or not is_placeholder:
+            has_draft = True
+
+        if isinstance(verdict_decision, str) and verdict_decision in {"send", "hold"}:
+            has_agent3_verdict = True
+            if final_decision is None:
+                final_decision = verdict_decision
+
+        if draft_decision in {"send", "hold"}:
+            if has_verdict:
+                has_agent3_verdict = True
+            if final_decision is None:
+                final_decision = draft_decision
+
+    if final_decision is None:
+        status_norm = (lead_status or "").strip().lower()
+        if status_norm in {"send", LEAD_STATUS_APPROVED}:
+            final_decision = "send"
+        elif status_norm in {"hold", LEAD_STATUS_NEEDS_REVIEW}:
+            final_decision = "hold"
+
+    return {
+        "has_snapshot": has_snapshot,
+        "has_agent1_output": has_agent1_output,
+        "has_draft": has_draft,
+        "has_agent3_verdict": has_agent3_verdict,
+        "final_decision": final_decision,
+        "pipeline_stage": compute_stage(
+            lead_status=lead_status,
+            has_snapshot=has_snapshot,
+            has_agent1_output=has_agent1_output,
+            has_draft=has_draft,
+            has_agent3_verdict=has_agent3_verdict,
+            final_decision=final_decision,
+        ),
+    }
+
+
+def _draft_state_columns(dialect_name: str) -> tuple[Any, ...]:
+    """Columns of ``EmailDraft`` the state needs, without loading bodies or JSON.
+
+    ``agent1_output`` may hold a JSON ``null`` (which loads as ``None``), so it is compared
+    as text; the verdict fields are extracted in the database.
+    """
+    json_type = func.json_typeof if dialect_name == "postgresql" else func.json_type
+    return (
+        EmailDraft.lead_id,
+        EmailDraft.decision,
+        and_(EmailDraft.agent1_output.is_not(None), cast(EmailDraft.agent1_output, String) != "null"),
+        json_type(EmailDraft.agent3_verdict) == "object",
+        EmailDraft.agent3_verdict["source"].as_string(),
+        EmailDraft.agent3_verdict["decision"].as_string(),
+        and_(
+            EmailDraft.subject.startswith(AGENT1_SUBJECT_PREFIX, autoescape=True),
+            EmailDraft.body.startswith(AGENT1_BODY_PREFIX, autoescape=True),
+        ),
+    )
+
+
+def compute_pipeline_states(
+    connection: Connection,
+    lead_statuses: Mapping[uuid.UUID, str | None],
+) -> dict[uuid.UUID, dict[str, Any]]:
+    """Derive the state of each lead in ``lead_statuses`` (lead id -> status)."""
+    lead_ids = list(lead_statuses)
+    snapshot_lead_ids: set[uuid.UUID] = set()
+    drafts_by_lead: dict[uuid.UUID, list[Any]] = {}
+    for start in range(0, len(lead_ids), _LOOKUP_BATCH_SIZE):
+        chunk = lead_ids[start:start + _LOOKUP_BATCH_SIZE]
+        snapshot_lead_ids.update(
+            connection.scalars(
+                select(WebsiteSnapshot.lead_id).where(WebsiteSnapshot.lead_id.in_(chunk)).distinct()
+            ).all()
+        )
+        drafts = connection.execute(
+            select(*_draft_state_columns(connection.dialect.name))
+            .where(EmailDraft.lead_id.in_(chunk))
+            .order_by(EmailDraft.created_at.desc(), EmailDraft.updated_at.desc())
+        ).all()
+        for draft in drafts:
+            drafts_by_lead.setdefault(draft[0], []).append(draft)
+
+    return {
+        lead_id: pipeline_state(
+            lead_status,
+            drafts_by_lead.get(lead_id, ()),
+            has_snapshot=lead_id in snapshot_lead_ids,
+        )
+        for lead_id, lead_status in lead_statuses.items()
+    }
+
+
+def write_pipeline_states(connection: Connection, states: Mapping[uuid.UUID, Mapping[str, Any]]) -> None:
+    """Store ``states`` without touching ``updated_at``: derived state is not a lead edit."""
+    if not states:
+        return
+    leads = Lead.__table__
+    stmt = (
+        update(leads)
+        .where(leads.c.id == bindparam("lead_id"))
+        .values(
+            {
+                **{column: bindparam(f"s_{column}") for column in PIPELINE_STATE_COLUMNS},
+                "updated_at": leads.c.updated_at,
+            }
+        )
+    )
+    connection.execute(
+        stmt,
+        [
+            {"lead_id": lead_id, **{f"s_{column}": state[column] for column in PIPELINE_STATE_COLUMNS}}
+            for lead_id, state in states.items()
+        ],
+    )
+
+
+def refresh_lead_pipeline_states(
+    connection: Connection,
+    lead_ids: Collection[uuid.UUID],
+) -> dict[uuid.UUID, dict[str, Any]]:
+    """Recompute and store the state of ``lead_ids``; unknown ids are ignored."""
+    lead_statuses: dict[uuid.UUID, str | None] = {}
+    ids = list(lead_ids)
+    for start in range(0, len(ids), _LOOKUP_BATCH_SIZE):
+        chunk = ids[start:start + _LOOKUP_BATCH_SIZE]
+        lead_statuses.update(connection.execute(select(Lead.id, Lead.status).where(Lead.id.in_(chunk))).all())
+    states = compute_pipeline_states(connection, lead_statuses)
+    write_pipeline_states(connection, states)
+    return states
+
+
+def _lead_ids_touched(obj: EmailDraft | WebsiteSnapshot, *, changed_only: bool) -> set[uuid.UUID]:
+    attrs = inspect(obj).attrs
+    if changed_only and not any(attrs[name].history.has_changes() for name in _DRAFT_STATE_ATTRS if name in attrs):
+        return set()
+    history = attrs.lead_id.history
+    return {value for value in chain(*history) if isinstance(value, uuid.UUID)}
+
+
+@event.listens_for(Lead, "before_insert")
+def _set_initial_pipeline_state(_mapper: Any, _connection: Any, target: Lead) -> None:
+    for column, value in pipeline_state(target.status).items():
+        if getattr(target, column) is None:
+            setattr(target, column, value)
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_changed_pipeline_states(session: Session, _flush_context: Any) -> None:
+    lead_ids: set[uuid.UUID] = set()
+    for obj in chain(session.new, session.deleted):
+        if isinstance(obj, (EmailDraft, WebsiteSnapshot)):
+            lead_ids |= _lead_ids_touched(obj, changed_only=False)
+    for obj in session.dirty:
+        if isinstance(obj, (EmailDraft, WebsiteSnapshot)):
+            lead_ids |= _lead_ids_touched(obj, changed_only=True)
+        elif isinstance(obj, Lead) and inspect(obj).attrs.status.history.has_changes():
+            lead_ids.add(obj.id)
+    if not lead_ids:
+        return
+
+    states = refresh_lead_pipeline_states(session.connection(), lead_ids)
+    for lead_id, state in states.items():
+        lead = session.identity_map.get(session.identity_key(Lead, lead_id))
+        if lead is None:
+            continue
+        for column, value in state.items():
+            set_committed_value(lead, column, value)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy import Uuid
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.mixins import TimestampMixin
+
+OUTBOUND_STATUS_QUEUED = "queued"
+OUTBOUND_STATUS_SENDING = "sending"
+OUTBOUND_STATUS_SENT = "sent"
+OUTBOUND_STATUS_FAILED = "failed"
+OUTBOUND_STATUS_CANCELLED = "cancelled"
+
+OUTBOUND_STATUS_VALUES = (
+    OUTBOUND_STATUS_QUEUED,
+    OUTBOUND_STATUS_SENDING,
+    OUTBOUND_STATUS_SENT,
+    OUTBOUND_STATUS_FAILED,
+    OUTBOUND_STATUS_CANCELLED,
+)
+
+
+class OutboundEmail(TimestampMixin, Base):
+    """One queued Gmail send. ``idempotency_key`` is unique so a draft is only ever queued once."""
+
+    __tablename__ = "outbound_emails"
+    __table_args__ = (
+        Index("ix_outbound_emails_status_next_attempt", "status", "next_attempt_at"),
+        Index("ix_outbound_emails_ws_status", "workspace_id", "status"),
+        Index("ix_outbound_emails_ws_next_attempt", "workspace_id", "next_attempt_at", "id"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    workspace_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True),
+        ForeignKey("workspaces.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    draft_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True),
+        ForeignKey("email_drafts.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    lead_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True),
+        ForeignKey("leads.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    idempotency_key: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default=OUTBOUND_STATUS_QUEUED)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_attempt_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    gmail_message_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
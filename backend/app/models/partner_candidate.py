@@ -3,18 +3,38 @@ from __future__ import annotations
 import uuid
 from typing import Any
 
-from sqlalchemy import Float, ForeignKey, String, Text
+from sqlalchemy import Float, ForeignKey, Index, String, Text, event
 from sqlalchemy import JSON, Uuid
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
+from app.models.dedupe_keys import (
+    COMPANY_LOCATION_KEY_MAX_LENGTH,
+    DOMAIN_KEY_MAX_LENGTH,
+    LOCALITY_BLOCK_KEY_MAX_LENGTH,
+    NAME_KEY_MAX_LENGTH,
+    PHONE_KEY_MAX_LENGTH,
+    WEBSITE_KEY_MAX_LENGTH,
+    dedupe_key_values,
+)
 from app.models.mixins import TimestampMixin
+from app.models.text_blob import TEXT_BLOB_ID_LENGTH
 
 PARTNER_STATUS_VALUES = ("new", "reviewed", "contacted", "replied", "active_partner", "ignored", "converted")
 
 
 class PartnerCandidate(TimestampMixin, Base):
     __tablename__ = "partner_candidates"
+    __table_args__ = (
+        Index("ix_partner_candidates_ws_website_key", "workspace_id", "website_key"),
+        Index("ix_partner_candidates_ws_company_location_key", "workspace_id", "company_location_key"),
+        Index("ix_partner_candidates_ws_name_key", "workspace_id", "name_key"),
+        Index("ix_partner_candidates_ws_phone_key", "workspace_id", "phone_key"),
+        Index("ix_partner_candidates_ws_domain_key", "workspace_id", "domain_key"),
+        Index("ix_partner_candidates_ws_locality_block_key", "workspace_id", "locality_block_key"),
+        Index("ix_partner_candidates_ws_created", "workspace_id", "created_at", "id"),
+        Index("ix_partner_candidates_ws_status_created", "workspace_id", "status", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     workspace_id: Mapped[uuid.UUID] = mapped_column(
@@ -30,6 +50,13 @@ class PartnerCandidate(TimestampMixin, Base):
     partnership_type: Mapped[str | None] = mapped_column(String(100), nullable=True)
     fit_score: Mapped[float | None] = mapped_column(Float, nullable=True)
     extracted_signals: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    # Website text the fit agent saw, kept in the shared text store rather than in extracted_signals.
+    crawled_text_id: Mapped[str | None] = mapped_column(
+        String(TEXT_BLOB_ID_LENGTH),
+        ForeignKey("text_blobs.id"),
+        nullable=True,
+        index=True,
+    )
     recommended_outreach_angle: Mapped[str | None] = mapped_column(Text, nullable=True)
     contact_emails: Mapped[list[str] | None] = mapped_column(JSON, nullable=True)
     contact_form_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
@@ -38,3 +65,17 @@ class PartnerCandidate(TimestampMixin, Base):
     outreach_subject: Mapped[str | None] = mapped_column(String(500), nullable=True)
     outreach_body: Mapped[str | None] = mapped_column(Text, nullable=True)
     outreach_status: Mapped[str | None] = mapped_column(String(30), nullable=True)
+    website_key: Mapped[str | None] = mapped_column(String(WEBSITE_KEY_MAX_LENGTH), nullable=True)
+    company_location_key: Mapped[str | None] = mapped_column(String(COMPANY_LOCATION_KEY_MAX_LENGTH), nullable=True)
+    name_key: Mapped[str | None] = mapped_column(String(NAME_KEY_MAX_LENGTH), nullable=True)
+    phone_key: Mapped[str | None] = mapped_column(String(PHONE_KEY_MAX_LENGTH), nullable=True)
+    domain_key: Mapped[str | None] = mapped_column(String(DOMAIN_KEY_MAX_LENGTH), nullable=True)
+    locality_block_key: Mapped[str | None] = mapped_column(String(LOCALITY_BLOCK_KEY_MAX_LENGTH), nullable=True)
+
+
+@event.listens_for(PartnerCandidate, "before_insert")
+@event.listens_for(PartnerCandidate, "before_update")
+def _set_partner_candidate_dedupe_keys(_mapper, _connection, target: PartnerCandidate) -> None:
+    values = dedupe_key_values(website=target.website, company=target.company_name, location=target.location, phone=None)
+    for column, value in values.items():
+        setattr(target, column, value)
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.mixins import TimestampMixin
+
+PLACES_CACHE_GEOCODE = "geocode"
+PLACES_CACHE_NEARBY = "nearby"
+PLACES_CACHE_DETAILS = "details"
+
+
+class PlacesCacheEntry(TimestampMixin, Base):
+    """A cached Google Places/Geocoding response, shared by every workspace.
+
+    ``cache_key`` is a digest of the kind and request parameters (never the API key), so a
+    territory searched by one workspace is served from cache for the next.
+    """
+
+    __tablename__ = "places_cache_entries"
+
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)
+    payload: Mapped[object] = mapped_column(JSON, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
@@ -3,11 +3,20 @@ from __future__ import annotations
 import uuid
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy import ForeignKey, Index, Integer, String, event
 from sqlalchemy import JSON, Uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
+from app.models.dedupe_keys import (
+    COMPANY_LOCATION_KEY_MAX_LENGTH,
+    DOMAIN_KEY_MAX_LENGTH,
+    LOCALITY_BLOCK_KEY_MAX_LENGTH,
+    NAME_KEY_MAX_LENGTH,
+    PHONE_KEY_MAX_LENGTH,
+    WEBSITE_KEY_MAX_LENGTH,
+    dedupe_key_values,
+)
 from app.models.mixins import TimestampMixin
 
 if TYPE_CHECKING:
@@ -16,6 +25,17 @@ if TYPE_CHECKING:
 
 class Prospect(TimestampMixin, Base):
     __tablename__ = "prospects"
+    __table_args__ = (
+        Index("ix_prospects_ws_source_external_id", "workspace_id", "source", "external_id"),
+        Index("ix_prospects_ws_website_key", "workspace_id", "website_key"),
+        Index("ix_prospects_ws_company_location_key", "workspace_id", "company_location_key"),
+        Index("ix_prospects_ws_name_key", "workspace_id", "name_key"),
+        Index("ix_prospects_ws_phone_key", "workspace_id", "phone_key"),
+        Index("ix_prospects_ws_domain_key", "workspace_id", "domain_key"),
+        Index("ix_prospects_ws_locality_block_key", "workspace_id", "locality_block_key"),
+        Index("ix_prospects_ws_created", "workspace_id", "created_at", "id"),
+        Index("ix_prospects_ws_import_status_created", "workspace_id", "import_status", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     workspace_id: Mapped[uuid.UUID] = mapped_column(
@@ -35,5 +55,19 @@ class Prospect(TimestampMixin, Base):
     review_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
     raw_source_payload: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
     import_status: Mapped[str] = mapped_column(String(20), nullable=False, default="new", index=True)
+    website_key: Mapped[str | None] = mapped_column(String(WEBSITE_KEY_MAX_LENGTH), nullable=True)
+    company_location_key: Mapped[str | None] = mapped_column(String(COMPANY_LOCATION_KEY_MAX_LENGTH), nullable=True)
+    name_key: Mapped[str | None] = mapped_column(String(NAME_KEY_MAX_LENGTH), nullable=True)
+    phone_key: Mapped[str | None] = mapped_column(String(PHONE_KEY_MAX_LENGTH), nullable=True)
+    domain_key: Mapped[str | None] = mapped_column(String(DOMAIN_KEY_MAX_LENGTH), nullable=True)
+    locality_block_key: Mapped[str | None] = mapped_column(String(LOCALITY_BLOCK_KEY_MAX_LENGTH), nullable=True)
 
     workspace: Mapped["Workspace"] = relationship(back_populates="prospects")
+
+
+@event.listens_for(Prospect, "before_insert")
+@event.listens_for(Prospect, "before_update")
+def _set_prospect_dedupe_keys(_mapper, _connection, target: Prospect) -> None:
+    values = dedupe_key_values(website=target.website_url, company=target.company_name, location=target.address, phone=target.phone)
+    for column, value in values.items():
+        setattr(target, column, value)
@@ -0,0 +1,238 @@
+"""Search documents: one denormalized, indexable text row per searchable record.
+
+A lead's document has its identifying fields in ``title``. Its ``body`` adds an excerpt
+of the latest website snapshot; prospects get the same shape from their own fields.
+Crawled pages, snapshots and email messages are indexed with their full text under their
+URL or subject, and ``parent_id`` points at the lead or thread they belong to. A session
+listener rewrites the documents of records changed through the ORM in the same flush.
+``app.services.search`` owns the dialect-specific indexes (pg_trgm and full-text on
+PostgreSQL, FTS5 on SQLite) and the queries.
+"""
+from __future__ import annotations
+
+import uuid
+import zlib
+from collections.abc import Callable, Collection, Iterable
+from datetime import datetime
+from itertools import chain
+from typing import Any, Final
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint, Uuid
+from sqlalchemy import delete, event, func, insert, inspect, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from app.db.base import Base
+from app.models.email_message import EmailMessageRecord
+from app.models.email_thread import EmailThread
+from app.models.lead import Lead
+from app.models.prospect import Prospect
+from app.models.text_blob import TextBlob
+from app.models.website_page import WebsitePage
+from app.models.website_snapshot import WebsiteSnapshot
+
+SEARCH_ENTITY_LEAD: Final[str] = "lead"
+SEARCH_ENTITY_PROSPECT: Final[str] = "prospect"
+SEARCH_ENTITY_WEBSITE_PAGE: Final[str] = "website_page"
+SEARCH_ENTITY_WEBSITE_SNAPSHOT: Final[str] = "website_snapshot"
+SEARCH_ENTITY_EMAIL_MESSAGE: Final[str] = "email_message"
+SEARCH_ENTITY_TYPES: Final[tuple[str, ...]] = (
+    SEARCH_ENTITY_LEAD,
+    SEARCH_ENTITY_PROSPECT,
+    SEARCH_ENTITY_WEBSITE_PAGE,
+    SEARCH_ENTITY_WEBSITE_SNAPSHOT,
+    SEARCH_ENTITY_EMAIL_MESSAGE,
+)
+SNAPSHOT_EXCERPT_CHARS: Final[int] = 4000
+# Page text is already capped at 20k characters by the scraper, message bodies at 50k.
+DOCUMENT_TEXT_CHARS: Final[int] = 50_000
+
+# Fields that make up each entity's title, in order.
+LEAD_SEARCH_FIELDS: Final[tuple[str, ...]] = ("company", "name", "industry", "location", "email", "website_url")
+PROSPECT_SEARCH_FIELDS: Final[tuple[str, ...]] = ("company_name", "category", "address", "website_url")
+_REFRESH_BATCH_SIZE: Final[int] = 500
+
+
+class SearchDocument(Base):
+    __tablename__ = "search_documents"
+    __table_args__ = (
+        UniqueConstraint("entity_type", "entity_id", name="uq_search_documents_entity"),
+        Index("ix_search_documents_ws_type", "workspace_id", "entity_type"),
+        Index("ix_search_documents_parent", "parent_id"),
+    )
+
+    # Integer key: on SQLite it is the rowid the FTS5 index points at, which must not change.
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    workspace_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True),
+        ForeignKey("workspaces.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    entity_type: Mapped[str] = mapped_column(String(30), nullable=False)
+    entity_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), nullable=False)
+    # Lead of a page or snapshot, thread of an email message.
+    parent_id: Mapped[uuid.UUID | None] = mapped_column(Uuid(as_uuid=True), nullable=True)
+    title: Mapped[str] = mapped_column(Text, nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+
+def _join_fields(values: Iterable[Any]) -> str:
+    return " ".join(str(value).strip() for value in values if value is not None and str(value).strip())
+
+
+def _blob_texts(connection: Connection, text_ids: Iterable[str]) -> dict[str, str]:
+    text_ids = set(text_ids)
+    if not text_ids:
+        return {}
+    rows = connection.execute(select(TextBlob.id, TextBlob.data).where(TextBlob.id.in_(text_ids))).all()
+    return {blob_id: zlib.decompress(data).decode("utf-8") for blob_id, data in rows}
+
+
+def _latest_snapshot_excerpts(connection: Connection, lead_ids: list[uuid.UUID]) -> dict[uuid.UUID, str]:
+    latest: dict[uuid.UUID, str] = {}
+    rows = connection.execute(
+        select(WebsiteSnapshot.lead_id, WebsiteSnapshot.text_id)
+        .where(WebsiteSnapshot.lead_id.in_(lead_ids))
+        .order_by(WebsiteSnapshot.fetched_at.desc())
+    ).all()
+    for lead_id, text_id in rows:
+        latest.setdefault(lead_id, text_id)
+    texts = _blob_texts(connection, latest.values())
+    return {
+        lead_id: texts[text_id][:SNAPSHOT_EXCERPT_CHARS]
+        for lead_id, text_id in latest.items()
+        if text_id in texts
+    }
+
+
+def _document(
+    entity_type: str,
+    entity_id: uuid.UUID,
+    workspace_id: uuid.UUID,
+    parent_id: uuid.UUID | None,
+    title: str,
+    body: str,
+) -> dict[str, Any]:
+    return {
+        "workspace_id": workspace_id,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "parent_id": parent_id,
+        "title": title,
+        "body": body,
+    }
+
+
+def _record_documents(connection: Connection, entity_type: str, ids: list[uuid.UUID]) -> list[dict[str, Any]]:
+    if entity_type == SEARCH_ENTITY_LEAD:
+        model, fields = Lead, LEAD_SEARCH_FIELDS
+    else:
+        model, fields = Prospect, PROSPECT_SEARCH_FIELDS
+    rows = connection.execute(
+        select(model.id, model.workspace_id, *(getattr(model, field) for field in fields)).where(model.id.in_(ids))
+    ).all()
+    excerpts = _latest_snapshot_excerpts(connection, ids) if entity_type == SEARCH_ENTITY_LEAD else {}
+    documents = []
+    for entity_id, workspace_id, *values in rows:
+        title = _join_fields(values)
+        body = _join_fields((title, excerpts.get(entity_id)))
+        documents.append(_document(entity_type, entity_id, workspace_id, None, title, body))
+    return documents
+
+
+def _crawl_documents(connection: Connection, entity_type: str, ids: list[uuid.UUID]) -> list[dict[str, Any]]:
+    model = WebsitePage if entity_type == SEARCH_ENTITY_WEBSITE_PAGE else WebsiteSnapshot
+    rows = connection.execute(
+        select(model.id, model.workspace_id, model.lead_id, model.url, model.text_id).where(model.id.in_(ids))
+    ).all()
+    texts = _blob_texts(connection, (row.text_id for row in rows))
+    return [
+        _document(entity_type, entity_id, workspace_id, lead_id, url, texts.get(text_id, "")[:DOCUMENT_TEXT_CHARS])
+        for entity_id, workspace_id, lead_id, url, text_id in rows
+    ]
+
+
+def _email_message_documents(connection: Connection, entity_type: str, ids: list[uuid.UUID]) -> list[dict[str, Any]]:
+    rows = connection.execute(
+        select(
+            EmailMessageRecord.id,
+            EmailThread.workspace_id,
+            EmailMessageRecord.thread_id,
+            EmailMessageRecord.subject,
+            EmailMessageRecord.sender,
+            EmailMessageRecord.body,
+        )
+        .join(EmailThread, EmailThread.id == EmailMessageRecord.thread_id)
+        .where(EmailMessageRecord.id.in_(ids))
+    ).all()
+    return [
+        _document(
+            entity_type,
+            entity_id,
+            workspace_id,
+            thread_id,
+            _join_fields((subject, sender)),
+            (body or "")[:DOCUMENT_TEXT_CHARS],
+        )
+        for entity_id, workspace_id, thread_id, subject, sender, body in rows
+    ]
+
+
+_DOCUMENT_BUILDERS: Final[dict[str, Callable[[Connection, str, list[uuid.UUID]], list[dict[str, Any]]]]] = {
+    SEARCH_ENTITY_LEAD: _record_documents,
+    SEARCH_ENTITY_PROSPECT: _record_documents,
+    SEARCH_ENTITY_WEBSITE_PAGE: _crawl_documents,
+    SEARCH_ENTITY_WEBSITE_SNAPSHOT: _crawl_documents,
+    SEARCH_ENTITY_EMAIL_MESSAGE: _email_message_documents,
+}
+
+# Model, its entity type, and the attributes whose change rewrites its document.
+_INDEXED_MODELS: Final[tuple[tuple[type[Any], str, tuple[str, ...]], ...]] = (
+    (Lead, SEARCH_ENTITY_LEAD, LEAD_SEARCH_FIELDS),
+    (Prospect, SEARCH_ENTITY_PROSPECT, PROSPECT_SEARCH_FIELDS),
+    (WebsitePage, SEARCH_ENTITY_WEBSITE_PAGE, ("url", "text_id")),
+    (WebsiteSnapshot, SEARCH_ENTITY_WEBSITE_SNAPSHOT, ("url", "text_id")),
+    (EmailMessageRecord, SEARCH_ENTITY_EMAIL_MESSAGE, ("subject", "sender", "body")),
+)
+
+
+def refresh_search_documents(connection: Connection, entity_type: str, ids: Collection[uuid.UUID]) -> None:
+    """Rewrite the documents of ``ids``; records that no longer exist lose theirs."""
+    ids = list(ids)
+    build = _DOCUMENT_BUILDERS[entity_type]
+    for start in range(0, len(ids), _REFRESH_BATCH_SIZE):
+        chunk = ids[start:start + _REFRESH_BATCH_SIZE]
+        connection.execute(
+            delete(SearchDocument).where(SearchDocument.entity_type == entity_type, SearchDocument.entity_id.in_(chunk))
+        )
+        documents = build(connection, entity_type, chunk)
+        if documents:
+            connection.execute(insert(SearchDocument), documents)
+
+
+def _changed(obj: Any, fields: Iterable[str]) -> bool:
+    attrs = inspect(obj).attrs
+    return any(attrs[field].history.has_changes() for field in fields)
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_changed_search_documents(session: Session, _flush_context: Any) -> None:
+    changed: dict[str, set[uuid.UUID]] = {entity_type: set() for entity_type in SEARCH_ENTITY_TYPES}
+    for obj in chain(session.new, session.dirty, session.deleted):
+        is_dirty = obj not in session.new and obj not in session.deleted
+        for model, entity_type, fields in _INDEXED_MODELS:
+            if isinstance(obj, model):
+                if not is_dirty or _changed(obj, fields):
+                    changed[entity_type].add(obj.id)
+                break
+        if isinstance(obj, WebsiteSnapshot) and obj in session.new:
+            changed[SEARCH_ENTITY_LEAD].add(obj.lead_id)
+    for entity_type, ids in changed.items():
+        if ids:
+            refresh_search_documents(session.connection(), entity_type, ids)
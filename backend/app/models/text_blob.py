@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import hashlib
+import zlib
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, ForeignKey, Integer, LargeBinary, String, event, func, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Mapped, Session, declared_attr, mapped_column, relationship
+
+from app.db.base import Base
+
+TEXT_BLOB_ID_LENGTH = 64
+TEXT_BLOB_COMPRESSION_LEVEL = 6
+
+
+def text_blob_id(text: str) -> str:
+    """Content address of ``text``: the hex SHA-256 of its UTF-8 encoding."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class TextBlob(Base):
+    """Immutable, zlib-compressed text shared by every row that stores the same content.
+
+    Rows are never updated: a changed text is a new blob. Pages, snapshots and partner
+    signals reference blobs by ``id``; unreferenced blobs are removed by
+    ``purge_unreferenced_text_blobs``.
+    """
+
+    __tablename__ = "text_blobs"
+
+    id: Mapped[str] = mapped_column(String(TEXT_BLOB_ID_LENGTH), primary_key=True)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+    @property
+    def text(self) -> str:
+        return zlib.decompress(self.data).decode("utf-8")
+
+
+def write_text_blobs(bind: Session | Connection, texts: dict[str, str]) -> None:
+    """Insert the blobs in ``texts`` (id -> text) that are not stored yet. Does not commit."""
+    if not texts:
+        return
+    existing = set(bind.scalars(select(TextBlob.id).where(TextBlob.id.in_(texts))).all())
+    rows = [
+        {
+            "id": blob_id,
+            "size": len(encoded),
+            "data": zlib.compress(encoded, TEXT_BLOB_COMPRESSION_LEVEL),
+        }
+        for blob_id, text in texts.items()
+        if blob_id not in existing
+        for encoded in (text.encode("utf-8"),)
+    ]
+    if not rows:
+        return
+    dialect = bind.get_bind().dialect if isinstance(bind, Session) else bind.dialect
+    insert = postgresql_insert if dialect.name == "postgresql" else sqlite_insert
+    # A concurrent writer may store the same content between the check and the insert.
+    bind.execute(insert(TextBlob).values(rows).on_conflict_do_nothing(index_elements=["id"]))
+
+
+class StoredTextMixin:
+    """``raw_text`` backed by the shared text store through the ``text_id`` column.
+
+    Assigning ``raw_text`` only sets ``text_id``; the blob is written on the next flush.
+    Reading it lazily loads ``text_blob``, so queries that never touch ``raw_text`` stay
+    small, and list endpoints that do can ``selectinload`` it.
+    """
+
+    _text_cache: tuple[str, str] | None = None
+    _text_unwritten: bool = False
+
+    @declared_attr
+    def text_id(cls) -> Mapped[str]:
+        return mapped_column(String(TEXT_BLOB_ID_LENGTH), ForeignKey("text_blobs.id"), nullable=False, index=True)
+
+    @declared_attr
+    def text_blob(cls) -> Mapped[TextBlob]:
+        return relationship(TextBlob, viewonly=True, lazy="select")
+
+    @property
+    def raw_text(self) -> str:
+        if self._text_cache is not None and self._text_cache[0] == self.text_id:
+            return self._text_cache[1]
+        blob = self.text_blob
+        if blob is None or blob.id != self.text_id:
+            session = Session.object_session(self)
+            blob = session.get(TextBlob, self.text_id) if session is not None else None
+        if blob is None:
+            raise LookupError(f"Text blob {self.text_id} for {type(self).__name__} is not available")
+        self._text_cache = (blob.id, blob.text)
+        return self._text_cache[1]
+
+    @raw_text.setter
+    def raw_text(self, value: str) -> None:
+        self.text_id = text_blob_id(value)
+        self._text_cache = (self.text_id, value)
+        self._text_unwritten = True
+
+
+@event.listens_for(Session, "before_flush")
+def _write_pending_text_blobs(session: Session, _flush_context: Any, _instances: Any) -> None:
+    pending = [
+        obj
+        for obj in (*session.new, *session.dirty)
+        if isinstance(obj, StoredTextMixin) and obj._text_unwritten and obj._text_cache is not None
+    ]
+    if not pending:
+        return
+    write_text_blobs(session, dict(obj._text_cache for obj in pending))
+    for obj in pending:
+        obj._text_unwritten = False
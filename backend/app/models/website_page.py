@@ -4,19 +4,23 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, func
 from sqlalchemy import JSON, Uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
+from app.models.text_blob import StoredTextMixin
 
 if TYPE_CHECKING:
     from app.models.lead import Lead
     from app.models.workspace import Workspace
 
 
-class WebsitePage(Base):
+class WebsitePage(StoredTextMixin, Base):
     __tablename__ = "website_pages"
+    __table_args__ = (
+        Index("ix_website_pages_lead_created", "lead_id", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     workspace_id: Mapped[uuid.UUID] = mapped_column(
@@ -33,7 +37,6 @@ class WebsitePage(Base):
     )
     url: Mapped[str] = mapped_column(String(500), nullable=False)
     page_type: Mapped[str] = mapped_column(String(20), nullable=False, default="other", index=True)
-    raw_text: Mapped[str] = mapped_column(Text, nullable=False)
     extracted_emails: Mapped[list[str]] = mapped_column(JSON, nullable=False, default=list)
     extracted_phones: Mapped[list[str]] = mapped_column(JSON, nullable=False, default=list)
     created_at: Mapped[datetime] = mapped_column(
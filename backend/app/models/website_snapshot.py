@@ -4,20 +4,24 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, func
 from sqlalchemy import Uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
 from app.models.mixins import TimestampMixin
+from app.models.text_blob import StoredTextMixin
 
 if TYPE_CHECKING:
     from app.models.lead import Lead
     from app.models.workspace import Workspace
 
 
-class WebsiteSnapshot(TimestampMixin, Base):
+class WebsiteSnapshot(StoredTextMixin, TimestampMixin, Base):
     __tablename__ = "website_snapshots"
+    __table_args__ = (
+        Index("ix_website_snapshots_lead_fetched", "lead_id", "fetched_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     workspace_id: Mapped[uuid.UUID] = mapped_column(
@@ -33,7 +37,6 @@ class WebsiteSnapshot(TimestampMixin, Base):
         index=True,
     )
     url: Mapped[str] = mapped_column(String(500), nullable=False)
-    raw_text: Mapped[str] = mapped_column(Text, nullable=False)
     fetched_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String
+from sqlalchemy import Integer, String
 from sqlalchemy import Uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -29,6 +29,9 @@ class Workspace(TimestampMixin, Base):
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Bumped whenever settings, automation settings, profile or AI strategy change; see
+    # app.models.workspace_settings_version.
+    settings_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
 
     users: Mapped[list["User"]] = relationship(back_populates="workspace", cascade="all, delete-orphan", passive_deletes=True)
     integration_accounts: Mapped[list["IntegrationAccount"]] = relationship(
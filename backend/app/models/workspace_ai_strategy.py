@@ -30,5 +30,8 @@ class WorkspaceAIStrategy(TimestampMixin, Base):
     selected_cta_style: Mapped[str | None] = mapped_column(String(100), nullable=True)
     version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
     last_generated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Agent-ready contexts per matched category, rebuilt on save; see
+    # app.services.workspace_ai_strategy.compile_strategy_context.
+    compiled_context: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
 
     workspace: Mapped["Workspace"] = relationship(back_populates="ai_strategy")
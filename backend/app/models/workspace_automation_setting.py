@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, ForeignKey, String
+from sqlalchemy import Boolean, ForeignKey, Integer, String
 from sqlalchemy import Uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -28,5 +28,11 @@ class WorkspaceAutomationSetting(TimestampMixin, Base):
     auto_send_approved_emails: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     pause_pipeline: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     inbox_reply_mode: Mapped[str] = mapped_column(String(20), nullable=False, default="suggest_only")
+    # Outbound send queue: daily cap (None → server default) and optional business-hours window.
+    daily_send_limit: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    send_window_start_hour: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    send_window_end_hour: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    send_timezone: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    send_weekdays_only: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
 
     workspace: Mapped["Workspace"] = relationship(back_populates="automation_settings")
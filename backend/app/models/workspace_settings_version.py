@@ -0,0 +1,88 @@
+"""Version stamp for everything a workspace is configured with.
+
+``workspaces.settings_version`` is bumped in the same flush whenever a workspace's
+settings (API keys and provider), automation settings, profile or AI strategy change
+through the ORM. ``app.services.workspace_context`` caches those per workspace and reloads
+when the stamp moves. Bulk ``update()`` statements against these tables bypass the
+listener and must call ``bump_workspace_settings_version`` themselves.
+"""
+from __future__ import annotations
+
+import uuid
+from collections.abc import Collection
+from itertools import chain
+from typing import Any, Final
+
+from sqlalchemy import event, inspect, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.workspace import Workspace
+from app.models.workspace_ai_strategy import WorkspaceAIStrategy
+from app.models.workspace_automation_setting import WorkspaceAutomationSetting
+from app.models.workspace_profile import WorkspaceProfile
+from app.models.workspace_setting import WorkspaceSetting
+
+# session.info keys: contexts memoized by the session, and workspaces whose stamp the
+# session's open transaction has bumped (their contexts must not outlive a rollback).
+WORKSPACE_CONTEXTS_INFO_KEY: Final[str] = "workspace_contexts"
+BUMPED_WORKSPACES_INFO_KEY: Final[str] = "workspace_settings_bumped"
+
+# Gmail tokens and connection state churn on WorkspaceSetting without affecting the context.
+_SETTING_ATTRS: Final[tuple[str, ...]] = ("openai_api_key", "anthropic_api_key", "preferred_ai_provider")
+_VERSIONED_MODELS: Final[tuple[type[Any], ...]] = (
+    WorkspaceSetting,
+    WorkspaceAutomationSetting,
+    WorkspaceProfile,
+    WorkspaceAIStrategy,
+)
+
+
+def bump_workspace_settings_version(connection: Connection, workspace_ids: Collection[uuid.UUID]) -> None:
+    """Advance the stamp of ``workspace_ids`` without touching ``updated_at``."""
+    if not workspace_ids:
+        return
+    workspaces = Workspace.__table__
+    connection.execute(
+        update(workspaces)
+        .where(workspaces.c.id.in_(list(workspace_ids)))
+        .values(settings_version=workspaces.c.settings_version + 1, updated_at=workspaces.c.updated_at)
+    )
+
+
+def _changed(session: Session, obj: Any) -> bool:
+    if isinstance(obj, WorkspaceSetting):
+        attrs = inspect(obj).attrs
+        return any(attrs[name].history.has_changes() for name in _SETTING_ATTRS)
+    return session.is_modified(obj, include_collections=False)
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_changed_workspace_settings(session: Session, _flush_context: Any) -> None:
+    workspace_ids: set[uuid.UUID] = set()
+    for obj in chain(session.new, session.deleted):
+        if isinstance(obj, _VERSIONED_MODELS):
+            workspace_ids.add(obj.workspace_id)
+    for obj in session.dirty:
+        if isinstance(obj, _VERSIONED_MODELS) and _changed(session, obj):
+            workspace_ids.add(obj.workspace_id)
+    if not workspace_ids:
+        return
+
+    bump_workspace_settings_version(session.connection(), workspace_ids)
+    contexts = session.info.get(WORKSPACE_CONTEXTS_INFO_KEY, {})
+    for workspace_id in workspace_ids:
+        contexts.pop(workspace_id, None)
+    session.info.setdefault(BUMPED_WORKSPACES_INFO_KEY, set()).update(workspace_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _forget_committed_bumps(session: Session) -> None:
+    session.info.pop(BUMPED_WORKSPACES_INFO_KEY, None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_contexts(session: Session) -> None:
+    contexts = session.info.get(WORKSPACE_CONTEXTS_INFO_KEY, {})
+    for workspace_id in session.info.pop(BUMPED_WORKSPACES_INFO_KEY, ()):
+        contexts.pop(workspace_id, None)
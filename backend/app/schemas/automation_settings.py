@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Literal
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 AutomationMode = Literal["manual", "semi_auto", "auto_draft", "auto_send"]
 
@@ -22,6 +22,11 @@ class WorkspaceAutomationSettingsRead(BaseModel):
     auto_send_approved_emails: bool = False
     pause_pipeline: bool = False
     inbox_reply_mode: InboxReplyMode = "suggest_only"
+    daily_send_limit: int | None = None
+    send_window_start_hour: int | None = None
+    send_window_end_hour: int | None = None
+    send_timezone: str | None = None
+    send_weekdays_only: bool = False
     created_at: datetime | None = None
     updated_at: datetime | None = None
 
@@ -33,3 +38,8 @@ class WorkspaceAutomationSettingsUpdate(BaseModel):
     auto_send_approved_emails: bool | None = None
     pause_pipeline: bool | None = None
     inbox_reply_mode: InboxReplyMode | None = None
+    daily_send_limit: int | None = Field(default=None, ge=1, le=2000)
+    send_window_start_hour: int | None = Field(default=None, ge=0, le=23)
+    send_window_end_hour: int | None = Field(default=None, ge=1, le=24)
+    send_timezone: str | None = Field(default=None, max_length=64)
+    send_weekdays_only: bool | None = None
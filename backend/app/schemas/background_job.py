@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Literal
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+BackgroundJobStatus = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+
+
+class BackgroundJobRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    kind: str
+    status: BackgroundJobStatus
+    progress_current: int = 0
+    progress_total: int | None = None
+    progress_message: str | None = None
+    cancel_requested: bool = False
+    # The response body the synchronous endpoint would have returned, once succeeded.
+    result: Any | None = None
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+
+class BackgroundJobListResponse(BaseModel):
+    items: list[BackgroundJobRead] = Field(default_factory=list)
+    total: int | None = 0
+    offset: int = 0
+    limit: int = 50
+    next_cursor: str | None = None
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+DuplicateEntityType = Literal["lead", "prospect", "partner_candidate"]
+DuplicateStatus = Literal["open", "merged", "dismissed"]
+
+
+class DuplicateEntitySummary(BaseModel):
+    entity_type: DuplicateEntityType
+    id: UUID
+    name: str
+    location: str | None = None
+    phone: str | None = None
+    website: str | None = None
+
+
+class DuplicateCandidateRead(BaseModel):
+    id: UUID
+    left_type: DuplicateEntityType
+    left_id: UUID
+    right_type: DuplicateEntityType
+    right_id: UUID
+    score: float
+    reasons: list[str] = Field(default_factory=list)
+    status: DuplicateStatus
+    resolved_at: datetime | None = None
+    created_at: datetime
+    # ``None`` when the record was deleted after the pair was flagged.
+    left: DuplicateEntitySummary | None = None
+    right: DuplicateEntitySummary | None = None
+
+
+class DuplicateCandidateListResponse(BaseModel):
+    items: list[DuplicateCandidateRead] = Field(default_factory=list)
+    total: int | None = 0
+    offset: int = 0
+    limit: int = 50
+    next_cursor: str | None = None
+
+
+class DuplicateMergeRequest(BaseModel):
+    keep: Literal["left", "right"]
+
+
+class DuplicateScanResponse(BaseModel):
+    status: str = "scheduled"
+    job_id: UUID
@@ -88,3 +88,28 @@ class DraftReviewQueueSummary(BaseModel):
     approved: int = 0
     queued_to_send: int = 0
     sent: int = 0
+
+
+class OutboundEmailRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    draft_id: UUID
+    lead_id: UUID
+    status: str
+    attempts: int = 0
+    next_attempt_at: datetime
+    last_attempt_at: datetime | None = None
+    last_error: str | None = None
+    gmail_message_id: str | None = None
+    sent_at: datetime | None = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class OutboundSendQueueResponse(BaseModel):
+    items: list[OutboundEmailRead] = Field(default_factory=list)
+    total: int | None = 0
+    next_cursor: str | None = None
+    sent_today: int = 0
+    daily_limit: int = 0
@@ -35,6 +35,8 @@ class EmailMessageRead(BaseModel):
     classification: str | None
     suggested_response: dict[str, Any] | None
     gmail_message_id: str | None
+    processed_at: datetime | None = None
+    processing_error: str | None = None
     created_at: datetime
 
 
@@ -51,6 +53,10 @@ class EmailThreadRead(BaseModel):
     next_action: str | None = None
     next_action_detail: dict[str, Any] | None = None
     reply_review_status: str | None = None
+    last_inbound_at: datetime | None = None
+    last_outbound_at: datetime | None = None
+    message_count: int = 0
+    needs_reply: bool = False
     created_at: datetime
     updated_at: datetime
 
@@ -67,7 +73,8 @@ class EmailThreadListItem(EmailThreadRead):
 
 class EmailThreadListResponse(BaseModel):
     items: list[EmailThreadListItem]
-    total: int
+    total: int | None
+    next_cursor: str | None = None
 
 
 class InboxSyncResponse(BaseModel):
@@ -76,6 +83,10 @@ class InboxSyncResponse(BaseModel):
     new_inbound: int
 
 
+class ThreadSummaryRebuildResponse(BaseModel):
+    threads_rebuilt: int
+
+
 class ReclassifyRequest(BaseModel):
     classification: EmailClassification
 
@@ -48,4 +48,5 @@ class JobRead(BaseModel):
 
 class JobListResponse(BaseModel):
     items: list[JobRead]
-    total: int
+    total: int | None
+    next_cursor: str | None = None
@@ -6,6 +6,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 
+from app.schemas.search import SearchFacetValue
+
 LeadStatus = Literal[
     "discovered",
     "imported",
@@ -68,6 +70,16 @@ class LeadPipelineSummary(BaseModel):
     computed_stage: LeadStatus = "imported"
 
 
+def _sanitize_stored_email(v: object) -> str | None:
+    """Strip bracket placeholders and blank strings; return None for invalid-looking values."""
+    if not isinstance(v, str):
+        return None
+    stripped = v.strip()
+    if not stripped or stripped.startswith("[") or "@" not in stripped:
+        return None
+    return stripped
+
+
 class LeadRead(LeadBase):
     model_config = ConfigDict(from_attributes=True)
 
@@ -83,20 +95,56 @@ class LeadRead(LeadBase):
     @field_validator("email", mode="before")
     @classmethod
     def sanitize_email(cls, v: object) -> str | None:
-        """Strip bracket placeholders and blank strings; return None for invalid-looking values."""
-        if not isinstance(v, str):
-            return None
-        stripped = v.strip()
-        if not stripped or stripped.startswith("[") or "@" not in stripped:
-            return None
-        return stripped
+        return _sanitize_stored_email(v)
+
+
+class LeadListItem(BaseModel):
+    """Row of the lead list: ``LeadRead`` without ``partnership_context``, which only the
+    detail endpoint returns."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    workspace_id: UUID
+    name: str
+    title: str | None = None
+    company: str
+    industry: str | None = None
+    location: str | None = None
+    phone: str | None = None
+    website_url: str | None = None
+    email: str | None = None
+    source: str
+    status: LeadStatus = "imported"
+    lead_type: LeadType = "local_business"
+    created_at: datetime
+    updated_at: datetime
+    pipeline_summary: LeadPipelineSummary | None = None
+
+    @field_validator("email", mode="before")
+    @classmethod
+    def sanitize_email(cls, v: object) -> str | None:
+        return _sanitize_stored_email(v)
 
 
 class LeadListResponse(BaseModel):
-    items: list[LeadRead]
+    items: list[LeadListItem]
+    total: int | None
+    offset: int
+    limit: int
+    next_cursor: str | None = None
+
+
+class LeadSearchItem(LeadListItem):
+    rank: float = 0.0
+
+
+class LeadSearchResponse(BaseModel):
+    items: list[LeadSearchItem]
     total: int
     offset: int
     limit: int
+    facets: dict[str, list[SearchFacetValue]]
 
 
 class LeadImportItem(BaseModel):
@@ -145,6 +193,27 @@ class LeadImportResponse(BaseModel):
     errors: list[LeadImportError]
 
 
+class LeadImportJobRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    status: str
+    source: str
+    file_format: str
+    filename: str | None = None
+    total_bytes: int = 0
+    processed_bytes: int = 0
+    processed_rows: int = 0
+    imported_count: int = 0
+    duplicate_count: int = 0
+    error_count: int = 0
+    error: str | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    created_at: datetime
+    updated_at: datetime
+
+
 class LeadBulkDeleteRequest(BaseModel):
     lead_ids: list[UUID] = Field(min_length=1, max_length=500)
 
@@ -54,7 +54,8 @@ class PartnerCandidateRead(BaseModel):
 
 class PartnerCandidateListResponse(BaseModel):
     items: list[PartnerCandidateRead]
-    total: int
+    total: int | None
+    next_cursor: str | None = None
 
 
 class PartnerDiscoveryRequest(BaseModel):
@@ -6,6 +6,7 @@ from uuid import UUID
 from pydantic import BaseModel, ConfigDict, Field
 
 from app.schemas.lead import LeadRead
+from app.schemas.search import SearchFacetValue
 
 
 class ProspectRead(BaseModel):
@@ -28,11 +29,45 @@ class ProspectRead(BaseModel):
     updated_at: datetime
 
 
+class ProspectListItem(BaseModel):
+    """Row of the prospect list: ``ProspectRead`` without ``raw_source_payload``."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    workspace_id: UUID
+    source: str
+    external_id: str | None = None
+    company_name: str
+    category: str | None = None
+    address: str
+    phone: str | None = None
+    website_url: str | None = None
+    rating: float | None = None
+    review_count: int | None = None
+    import_status: str
+    created_at: datetime
+    updated_at: datetime
+
+
 class ProspectListResponse(BaseModel):
-    items: list[ProspectRead]
+    items: list[ProspectListItem]
+    total: int | None
+    offset: int
+    limit: int
+    next_cursor: str | None = None
+
+
+class ProspectSearchItem(ProspectListItem):
+    rank: float = 0.0
+
+
+class ProspectSearchResponse(BaseModel):
+    items: list[ProspectSearchItem]
     total: int
     offset: int
     limit: int
+    facets: dict[str, list[SearchFacetValue]]
 
 
 class ProspectImportItem(BaseModel):
@@ -97,6 +132,11 @@ class ProspectRunSearchRequest(BaseModel):
     keyword: str = Field(default="business", min_length=1, max_length=100)
     missing_website_only: bool = False
     limit: int = Field(default=300, ge=1, le=5000)
+    # Places already imported as prospects are skipped before their details are fetched.
+    skip_known_places: bool = True
+    # Tile the location's geocoded bounds (or the radius box around a lat,lng) and subdivide
+    # tiles that hit Google's 60-result cap, instead of one capped search per category.
+    sweep_area: bool = False
 
 
 class ProspectRunSearchResponse(BaseModel):
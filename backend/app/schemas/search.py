@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel
+
+SearchEntityType = Literal["lead", "prospect", "website_page", "website_snapshot", "email_message"]
+
+
+class SearchFacetValue(BaseModel):
+    value: str | None
+    count: int
+
+
+class SearchHit(BaseModel):
+    entity_type: SearchEntityType
+    entity_id: UUID
+    # Lead of a website page or snapshot, thread of an email message.
+    parent_id: UUID | None = None
+    title: str
+    # HTML-escaped excerpt with matches wrapped in <mark> tags.
+    snippet: str
+    rank: float
+
+
+class SearchResponse(BaseModel):
+    items: list[SearchHit]
+    total: int | None
+    offset: int
+    limit: int
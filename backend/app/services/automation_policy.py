@@ -20,6 +20,16 @@ AUTOMATION_MODE_VALUES = {
     AUTOMATION_MODE_AUTO_SEND,
 }
 
+INBOX_REPLY_MODE_SUGGEST_ONLY = "suggest_only"
+INBOX_REPLY_MODE_AUTO_DRAFT = "auto_draft"
+INBOX_REPLY_MODE_MANUAL_SEND_ONLY = "manual_send_only"
+
+INBOX_REPLY_MODE_VALUES = {
+    INBOX_REPLY_MODE_SUGGEST_ONLY,
+    INBOX_REPLY_MODE_AUTO_DRAFT,
+    INBOX_REPLY_MODE_MANUAL_SEND_ONLY,
+}
+
 
 @dataclass(frozen=True)
 class AutomationPolicy:
@@ -29,6 +39,12 @@ class AutomationPolicy:
     auto_create_gmail_draft: bool = False
     auto_send_approved_emails: bool = False
     pause_pipeline: bool = False
+    inbox_reply_mode: str = INBOX_REPLY_MODE_SUGGEST_ONLY
+    daily_send_limit: int | None = None
+    send_window_start_hour: int | None = None
+    send_window_end_hour: int | None = None
+    send_timezone: str | None = None
+    send_weekdays_only: bool = False
 
     @property
     def allows_pipeline_progression(self) -> bool:
@@ -49,6 +65,13 @@ class AutomationPolicy:
     def effective_auto_send_approved_emails(self) -> bool:
         return self.auto_send_approved_emails or self.automation_mode == AUTOMATION_MODE_AUTO_SEND
 
+    @property
+    def allows_inbox_reply_suggestions(self) -> bool:
+        return self.inbox_reply_mode in {
+            INBOX_REPLY_MODE_SUGGEST_ONLY,
+            INBOX_REPLY_MODE_AUTO_DRAFT,
+        }
+
 
 def normalize_automation_mode(value: str | None) -> str:
     normalized = (value or "").strip().lower()
@@ -57,6 +80,13 @@ def normalize_automation_mode(value: str | None) -> str:
     return AUTOMATION_MODE_MANUAL
 
 
+def normalize_inbox_reply_mode(value: str | None) -> str:
+    normalized = (value or "").strip().lower()
+    if normalized in INBOX_REPLY_MODE_VALUES:
+        return normalized
+    return INBOX_REPLY_MODE_SUGGEST_ONLY
+
+
 def get_or_create_automation_settings(db: Session, workspace_id: UUID) -> WorkspaceAutomationSetting:
     row = db.get(WorkspaceAutomationSetting, workspace_id)
     if row is None:
@@ -66,11 +96,7 @@ def get_or_create_automation_settings(db: Session, workspace_id: UUID) -> Worksp
     return row
 
 
-def resolve_automation_policy(db: Session, workspace_id: UUID) -> AutomationPolicy:
-    try:
-        row = db.get(WorkspaceAutomationSetting, workspace_id)
-    except (ProgrammingError, OperationalError):
-        return AutomationPolicy(workspace_id=workspace_id)
+def automation_policy_from_settings(workspace_id: UUID, row: WorkspaceAutomationSetting | None) -> AutomationPolicy:
     if row is None:
         return AutomationPolicy(workspace_id=workspace_id)
     return AutomationPolicy(
@@ -80,4 +106,18 @@ def resolve_automation_policy(db: Session, workspace_id: UUID) -> AutomationPoli
         auto_create_gmail_draft=bool(row.auto_create_gmail_draft),
         auto_send_approved_emails=bool(row.auto_send_approved_emails),
         pause_pipeline=bool(row.pause_pipeline),
+        inbox_reply_mode=normalize_inbox_reply_mode(row.inbox_reply_mode),
+        daily_send_limit=row.daily_send_limit,
+        send_window_start_hour=row.send_window_start_hour,
+        send_window_end_hour=row.send_window_end_hour,
+        send_timezone=row.send_timezone,
+        send_weekdays_only=bool(row.send_weekdays_only),
     )
+
+
+def resolve_automation_policy(db: Session, workspace_id: UUID) -> AutomationPolicy:
+    try:
+        row = db.get(WorkspaceAutomationSetting, workspace_id)
+    except (ProgrammingError, OperationalError):
+        return AutomationPolicy(workspace_id=workspace_id)
+    return automation_policy_from_settings(workspace_id, row)
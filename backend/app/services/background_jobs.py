@@ -0,0 +1,415 @@
+"""Background jobs — long-running API operations run off the request thread.
+
+Endpoints that can take minutes (crawls, partner discovery, inbox sync, bulk conversions and
+imports) accept ``?async=true``: the request is stored as a queued ``BackgroundJob`` and the
+caller gets its id back immediately. ``BackgroundJobWorker`` claims queued jobs and runs their
+registered handler on a thread pool, each with its own session; with the worker disabled
+(``BACKGROUND_JOBS_ENABLED=false``) each submitted job runs on a thread of its own instead.
+Handlers report progress and check for cancellation through ``BackgroundJobContext``;
+cancellation is cooperative, so a running job stops at its next progress report. A job whose worker died (no heartbeat for
+``STALE_JOB_SECONDS``) is failed rather than re-run, because handlers are not idempotent.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import UUID
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from app.api.deps.request_context import RequestContext
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.background_job import (
+    BACKGROUND_JOB_CANCELLED,
+    BACKGROUND_JOB_FAILED,
+    BACKGROUND_JOB_FINISHED_STATUSES,
+    BACKGROUND_JOB_QUEUED,
+    BACKGROUND_JOB_RUNNING,
+    BACKGROUND_JOB_SUCCEEDED,
+    BackgroundJob,
+)
+
+logger = logging.getLogger(__name__)
+
+# Running jobs whose heartbeat is older than this belong to a worker that is gone.
+STALE_JOB_SECONDS = 300
+# Progress writes (and the cancellation check that rides along) are throttled to this interval.
+PROGRESS_MIN_INTERVAL_SECONDS = 1.0
+
+
+class BackgroundJobCancelled(Exception):
+    """Raised inside a handler when the job's cancellation has been requested."""
+
+
+class BackgroundJobError(RuntimeError):
+    pass
+
+
+@dataclass
+class BackgroundJobContext:
+    job_id: UUID
+    workspace_id: UUID
+    user_id: UUID | None
+    params: dict[str, Any]
+    _last_report: float = field(default=0.0, repr=False)
+
+    @property
+    def request_context(self) -> RequestContext:
+        """The context of the request that submitted the job, for handlers that reuse a route."""
+        if self.user_id is None:
+            raise BackgroundJobError("The user who submitted this job no longer exists.")
+        return RequestContext(workspace_id=self.workspace_id, user_id=self.user_id)
+
+    def report_progress(
+        self,
+        *,
+        current: int | None = None,
+        total: int | None = None,
+        message: str | None = None,
+        force: bool = False,
+    ) -> None:
+        """Record progress and raise ``BackgroundJobCancelled`` if cancellation was requested."""
+        now = time.monotonic()
+        if not force and now - self._last_report < PROGRESS_MIN_INTERVAL_SECONDS:
+            return
+        self._last_report = now
+        values: dict[str, Any] = {"heartbeat_at": datetime.now(timezone.utc)}
+        if current is not None:
+            values["progress_current"] = current
+        if total is not None:
+            values["progress_total"] = total
+        if message is not None:
+            values["progress_message"] = message[:500]
+        with SessionLocal() as db:
+            db.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.id == self.job_id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            cancel_requested = db.scalar(select(BackgroundJob.cancel_requested).where(BackgroundJob.id == self.job_id))
+            db.commit()
+        if cancel_requested:
+            raise BackgroundJobCancelled()
+
+    def raise_if_cancelled(self) -> None:
+        self.report_progress(force=True)
+
+
+BackgroundJobHandler = Callable[[Session, BackgroundJobContext], Any]
+_HANDLERS: dict[str, BackgroundJobHandler] = {}
+
+
+def background_job_handler(kind: str) -> Callable[[BackgroundJobHandler], BackgroundJobHandler]:
+    """Register the function that runs jobs of ``kind``.
+
+    The handler gets a fresh session and the job context and returns the job's result (a
+    pydantic model or anything ``jsonable_encoder`` accepts). ``HTTPException`` details become
+    the job's error, so handlers can reuse route functions unchanged.
+    """
+
+    def register(handler: BackgroundJobHandler) -> BackgroundJobHandler:
+        if kind in _HANDLERS and _HANDLERS[kind] is not handler:
+            raise ValueError(f"Background job handler already registered for {kind!r}")
+        _HANDLERS[kind] = handler
+        return handler
+
+    return register
+
+
+def submit_background_job(
+    db: Session,
+    *,
+    workspace_id: UUID,
+    user_id: UUID | None,
+    kind: str,
+    params: dict[str, Any],
+) -> BackgroundJob:
+    if kind not in _HANDLERS:
+        raise BackgroundJobError(f"No background job handler registered for {kind!r}")
+    job = BackgroundJob(
+        workspace_id=workspace_id,
+        user_id=user_id,
+        kind=kind,
+        status=BACKGROUND_JOB_QUEUED,
+        params=jsonable_encoder(params),
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    if settings.background_jobs_enabled:
+        background_job_worker.notify()
+    else:
+        _run_detached(db, job)
+    return job
+
+
+def _run_detached(db: Session, job: BackgroundJob) -> None:
+    """Claim ``job`` and run it on a thread of its own, for processes without the worker.
+
+    Without this, jobs submitted while ``background_jobs_enabled`` is off would stay queued.
+    """
+    now = datetime.now(timezone.utc)
+    claimed = db.execute(
+        update(BackgroundJob)
+        .where(BackgroundJob.id == job.id, BackgroundJob.status == BACKGROUND_JOB_QUEUED)
+        .values(status=BACKGROUND_JOB_RUNNING, started_at=now, heartbeat_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    db.refresh(job)
+    if claimed.rowcount != 1:
+        return
+    logger.info("Background job started without the worker job_id=%s kind=%s", job.id, job.kind)
+    threading.Thread(target=run_background_job, args=(job.id,), name="background-job", daemon=True).start()
+
+
+def request_background_job_cancel(db: Session, job: BackgroundJob) -> BackgroundJob:
+    """Cancel a queued job outright, or flag a running one to stop at its next progress report."""
+    now = datetime.now(timezone.utc)
+    cancelled = db.execute(
+        update(BackgroundJob)
+        .where(BackgroundJob.id == job.id, BackgroundJob.status == BACKGROUND_JOB_QUEUED)
+        .values(status=BACKGROUND_JOB_CANCELLED, cancel_requested=True, finished_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    if cancelled.rowcount != 1:
+        db.execute(
+            update(BackgroundJob)
+            .where(BackgroundJob.id == job.id, BackgroundJob.status == BACKGROUND_JOB_RUNNING)
+            .values(cancel_requested=True)
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def _claim_next_job(db: Session, now: datetime) -> BackgroundJob | None:
+    job_id = db.scalar(
+        select(BackgroundJob.id)
+        .where(BackgroundJob.status == BACKGROUND_JOB_QUEUED)
+        .order_by(BackgroundJob.created_at.asc())
+        .limit(1)
+    )
+    if job_id is None:
+        return None
+    claimed = db.execute(
+        update(BackgroundJob)
+        .where(BackgroundJob.id == job_id, BackgroundJob.status == BACKGROUND_JOB_QUEUED)
+        .values(status=BACKGROUND_JOB_RUNNING, started_at=now, heartbeat_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    if claimed.rowcount != 1:
+        return None
+    return db.get(BackgroundJob, job_id)
+
+
+def _finish_job(job_id: UUID, *, status: str, result: Any = None, error: str | None = None) -> None:
+    with SessionLocal() as db:
+        db.execute(
+            update(BackgroundJob)
+            .where(BackgroundJob.id == job_id)
+            .values(
+                status=status,
+                result=result,
+                error=error[:2000] if error else None,
+                finished_at=datetime.now(timezone.utc),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+
+def run_background_job(job_id: UUID) -> str:
+    """Run a claimed job to completion and record the outcome. Returns its final status."""
+    with SessionLocal() as db:
+        job = db.get(BackgroundJob, job_id)
+        if job is None or job.status != BACKGROUND_JOB_RUNNING:
+            return job.status if job else BACKGROUND_JOB_FAILED
+        handler = _HANDLERS.get(job.kind)
+        context = BackgroundJobContext(
+            job_id=job.id,
+            workspace_id=job.workspace_id,
+            user_id=job.user_id,
+            params=dict(job.params or {}),
+        )
+        kind = job.kind
+        if handler is None:
+            _finish_job(job_id, status=BACKGROUND_JOB_FAILED, error=f"No handler registered for {kind!r}.")
+            return BACKGROUND_JOB_FAILED
+
+        started = time.monotonic()
+        try:
+            context.raise_if_cancelled()
+            result = handler(db, context)
+        except BackgroundJobCancelled:
+            db.rollback()
+            _finish_job(job_id, status=BACKGROUND_JOB_CANCELLED)
+            return BACKGROUND_JOB_CANCELLED
+        except HTTPException as exc:
+            db.rollback()
+            _finish_job(job_id, status=BACKGROUND_JOB_FAILED, error=str(exc.detail))
+            return BACKGROUND_JOB_FAILED
+        except Exception as exc:
+            db.rollback()
+            logger.exception("Background job failed job_id=%s kind=%s", job_id, kind)
+            _finish_job(job_id, status=BACKGROUND_JOB_FAILED, error=str(exc) or exc.__class__.__name__)
+            return BACKGROUND_JOB_FAILED
+
+    _finish_job(job_id, status=BACKGROUND_JOB_SUCCEEDED, result=jsonable_encoder(result))
+    logger.info("Background job finished job_id=%s kind=%s seconds=%.1f", job_id, kind, time.monotonic() - started)
+    return BACKGROUND_JOB_SUCCEEDED
+
+
+def _fail_stale_jobs(db: Session, now: datetime, running_ids: set[UUID]) -> None:
+    stale = update(BackgroundJob).where(
+        BackgroundJob.status == BACKGROUND_JOB_RUNNING,
+        BackgroundJob.heartbeat_at < now - timedelta(seconds=STALE_JOB_SECONDS),
+    )
+    if running_ids:
+        stale = stale.where(BackgroundJob.id.not_in(running_ids))
+    db.execute(
+        stale.values(
+            status=BACKGROUND_JOB_FAILED,
+            error="The worker running this job stopped before it finished.",
+            finished_at=now,
+        ).execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def _purge_finished_jobs(db: Session, now: datetime) -> None:
+    if settings.background_job_retention_days <= 0:
+        return
+    db.execute(
+        delete(BackgroundJob)
+        .where(
+            BackgroundJob.status.in_(BACKGROUND_JOB_FINISHED_STATUSES),
+            BackgroundJob.finished_at < now - timedelta(days=settings.background_job_retention_days),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+class BackgroundJobWorker:
+    def __init__(self) -> None:
+        self._task: asyncio.Task[None] | None = None
+        self._stop_event = asyncio.Event()
+        self._wake_event = asyncio.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._running: dict[UUID, asyncio.Future[str]] = {}
+
+    def start(self) -> None:
+        if not settings.background_jobs_enabled:
+            logger.info("Background job worker is disabled by configuration")
+            return
+        if self._task and not self._task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.background_job_workers),
+            thread_name_prefix="background-job",
+        )
+        self._stop_event.clear()
+        self._task = asyncio.create_task(self._run_loop(), name="background-job-worker")
+
+    async def stop(self) -> None:
+        self._stop_event.set()
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._task = None
+            # Threads cannot be interrupted; jobs still running are failed once their heartbeat goes stale.
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def notify(self) -> None:
+        """Wake the worker now instead of at its next poll; safe to call from request threads."""
+        if self._loop is not None and self._task is not None and not self._task.done():
+            self._loop.call_soon_threadsafe(self._wake_event.set)
+
+    async def _run_loop(self) -> None:
+        logger.info(
+            "Background job worker started workers=%s poll=%ss",
+            settings.background_job_workers,
+            settings.background_job_poll_seconds,
+        )
+        while not self._stop_event.is_set():
+            self._wake_event.clear()
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Background job worker cycle failed")
+
+            try:
+                await asyncio.wait_for(
+                    self._wake_event.wait(),
+                    timeout=float(settings.background_job_poll_seconds),
+                )
+            except asyncio.TimeoutError:
+                continue
+        logger.info("Background job worker stopped")
+
+    async def run_once(self) -> None:
+        for job_id, future in list(self._running.items()):
+            if future.done():
+                del self._running[job_id]
+        await asyncio.to_thread(self._maintain, set(self._running))
+
+        free_slots = max(1, settings.background_job_workers) - len(self._running)
+        for _ in range(free_slots):
+            job_id = await asyncio.to_thread(self._claim)
+            if job_id is None:
+                break
+            future = asyncio.get_running_loop().run_in_executor(self._executor, run_background_job, job_id)
+            future.add_done_callback(lambda _future: self._wake_event.set())
+            self._running[job_id] = future
+
+    @staticmethod
+    def _claim() -> UUID | None:
+        with SessionLocal() as db:
+            job = _claim_next_job(db, datetime.now(timezone.utc))
+            if job is None:
+                return None
+            logger.info("Background job started job_id=%s kind=%s", job.id, job.kind)
+            return job.id
+
+    @staticmethod
+    def _maintain(running_ids: set[UUID]) -> None:
+        now = datetime.now(timezone.utc)
+        with SessionLocal() as db:
+            # Heartbeat on behalf of this process's jobs, so only jobs of dead workers go stale.
+            if running_ids:
+                db.execute(
+                    update(BackgroundJob)
+                    .where(BackgroundJob.id.in_(running_ids), BackgroundJob.status == BACKGROUND_JOB_RUNNING)
+                    .values(heartbeat_at=now)
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+            _fail_stale_jobs(db, now, running_ids)
+            _purge_finished_jobs(db, now)
+
+
+background_job_worker = BackgroundJobWorker()
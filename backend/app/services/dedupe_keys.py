@@ -0,0 +1,73 @@
+"""Backfill for the stored dedupe keys on leads, prospects and partner candidates.
+
+Runs on a plain connection for the SQLite startup path; Alembic revisions carry their own
+frozen copies.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.engine import Connection
+
+from app.models.dedupe_keys import dedupe_key_values
+from app.models.lead import Lead
+from app.models.partner_candidate import PartnerCandidate
+from app.models.prospect import Prospect
+
+DEDUPE_KEY_COLUMNS = (
+    "website_key",
+    "company_location_key",
+    "name_key",
+    "phone_key",
+    "domain_key",
+    "locality_block_key",
+)
+
+# (table, website column, company column, location column, phone column)
+_KEYED_TABLES = (
+    (Lead.__table__, "website_url", "company", "location", "phone"),
+    (Prospect.__table__, "website_url", "company_name", "address", "phone"),
+    (PartnerCandidate.__table__, "website", "company_name", "location", None),
+)
+
+
+def backfill_dedupe_keys(
+    connection: Connection,
+    *,
+    columns: Iterable[str] = DEDUPE_KEY_COLUMNS,
+    batch_size: int = 1000,
+) -> int:
+    """Compute the given key ``columns`` for every row. Returns rows updated."""
+    columns = tuple(columns)
+    updated = 0
+    for table, website_col, company_col, location_col, phone_col in _KEYED_TABLES:
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("row_id"))
+            .values({column: bindparam(f"k_{column}") for column in columns})
+        )
+        selected = [table.c.id, table.c[website_col], table.c[company_col], table.c[location_col]]
+        if phone_col is not None:
+            selected.append(table.c[phone_col])
+        last_id = None
+        while True:
+            query = select(*selected)
+            if last_id is not None:
+                query = query.where(table.c.id > last_id)
+            rows = connection.execute(query.order_by(table.c.id).limit(batch_size)).all()
+            if not rows:
+                break
+            params = []
+            for row in rows:
+                values = dedupe_key_values(
+                    website=row[1],
+                    company=row[2],
+                    location=row[3],
+                    phone=row[4] if phone_col is not None else None,
+                )
+                params.append({"row_id": row[0], **{f"k_{column}": values[column] for column in columns}})
+            connection.execute(stmt, params)
+            updated += len(rows)
+            last_id = rows[-1][0]
+    return updated
@@ -0,0 +1,506 @@
+"""Fuzzy duplicate detection across leads, prospects and partner candidates.
+
+Records are only compared when they share a stored blocking key (normalized name, phone
+digits, domain, or locality + name prefix), so a batch costs a few indexed ``IN`` lookups per
+entity table regardless of workspace size. Blocked pairs are scored on name trigrams,
+locality and shared phone/domain, and pairs above the threshold are persisted for review.
+"""
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from difflib import SequenceMatcher
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import and_, delete, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.dedupe_keys import locality_key
+from app.models.duplicate_candidate import (
+    DUPLICATE_ENTITY_LEAD,
+    DUPLICATE_ENTITY_PARTNER_CANDIDATE,
+    DUPLICATE_ENTITY_PROSPECT,
+    DUPLICATE_STATUS_MERGED,
+    DUPLICATE_STATUS_OPEN,
+    DuplicateCandidate,
+)
+from app.models.email_draft import EmailDraft
+from app.models.email_thread import EmailThread
+from app.models.lead import Lead
+from app.models.lead_pipeline import refresh_lead_pipeline_states
+from app.models.outbound_email import OutboundEmail
+from app.models.partner_candidate import PartnerCandidate
+from app.models.prospect import Prospect
+from app.models.search_document import SEARCH_ENTITY_LEAD, SearchDocument, refresh_search_documents
+from app.models.website_page import WebsitePage
+from app.models.website_snapshot import WebsiteSnapshot
+
+logger = logging.getLogger(__name__)
+
+BLOCK_KEY_COLUMNS = ("name_key", "phone_key", "domain_key", "locality_block_key")
+
+# Keys shared by more records than this (a call-centre number, a franchise name) do not
+# discriminate between businesses and would turn a batch into a quadratic comparison.
+MAX_BLOCK_SIZE = 200
+
+
+class DuplicateMergeError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class _EntitySpec:
+    model: Any
+    name_column: str
+    location_column: str
+    phone_column: str | None
+    website_column: str
+
+
+_SPECS: dict[str, _EntitySpec] = {
+    DUPLICATE_ENTITY_LEAD: _EntitySpec(Lead, "company", "location", "phone", "website_url"),
+    DUPLICATE_ENTITY_PROSPECT: _EntitySpec(Prospect, "company_name", "address", "phone", "website_url"),
+    DUPLICATE_ENTITY_PARTNER_CANDIDATE: _EntitySpec(PartnerCandidate, "company_name", "location", None, "website"),
+}
+
+
+@dataclass(frozen=True)
+class DedupeRecord:
+    entity_type: str
+    id: UUID
+    name: str
+    location: str | None
+    phone: str | None
+    website: str | None
+    name_key: str | None
+    phone_key: str | None
+    domain_key: str | None
+    locality_block_key: str | None
+
+    @property
+    def ref(self) -> tuple[str, str]:
+        return (self.entity_type, str(self.id))
+
+
+@dataclass(frozen=True)
+class DuplicateMatch:
+    left: DedupeRecord
+    right: DedupeRecord
+    score: float
+    reasons: tuple[str, ...]
+
+
+def _active_filter(entity_type: str) -> Any:
+    # Prospects and partners already converted into a lead are that lead, not a duplicate of it.
+    if entity_type == DUPLICATE_ENTITY_PROSPECT:
+        return Prospect.import_status != "imported"
+    if entity_type == DUPLICATE_ENTITY_PARTNER_CANDIDATE:
+        return PartnerCandidate.status != "converted"
+    return None
+
+
+def _load_records(db: Session, entity_type: str, workspace_id: UUID, *conditions: Any) -> list[DedupeRecord]:
+    spec = _SPECS[entity_type]
+    model = spec.model
+    phone = getattr(model, spec.phone_column) if spec.phone_column else None
+    stmt = select(
+        model.id,
+        getattr(model, spec.name_column),
+        getattr(model, spec.location_column),
+        getattr(model, spec.website_column),
+        model.name_key,
+        model.phone_key,
+        model.domain_key,
+        model.locality_block_key,
+        *([phone] if phone is not None else []),
+    ).where(model.workspace_id == workspace_id, *conditions)
+    active = _active_filter(entity_type)
+    if active is not None:
+        stmt = stmt.where(active)
+
+    records: list[DedupeRecord] = []
+    for row in db.execute(stmt).all():
+        records.append(
+            DedupeRecord(
+                entity_type=entity_type,
+                id=row[0],
+                name=row[1] or "",
+                location=row[2],
+                website=row[3],
+                name_key=row[4],
+                phone_key=row[5],
+                domain_key=row[6],
+                locality_block_key=row[7],
+                phone=row[8] if phone is not None else None,
+            )
+        )
+    return records
+
+
+def load_dedupe_records(db: Session, *, workspace_id: UUID, entity_type: str, ids: list[UUID]) -> list[DedupeRecord]:
+    if not ids:
+        return []
+    return _load_records(db, entity_type, workspace_id, _SPECS[entity_type].model.id.in_(ids))
+
+
+def _trigrams(value: str) -> set[str]:
+    padded = f"  {value} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def name_similarity(left: str | None, right: str | None) -> float:
+    """0..1 similarity of two name keys from trigram overlap, floored by character alignment."""
+    if not left or not right:
+        return 0.0
+    if left == right:
+        return 1.0
+    left_grams, right_grams = _trigrams(left), _trigrams(right)
+    shared = len(left_grams & right_grams)
+    jaccard = shared / len(left_grams | right_grams)
+    containment = shared / min(len(left_grams), len(right_grams))
+    # Character alignment rescues typos that break several trigrams at once.
+    ratio = SequenceMatcher(None, left, right).ratio()
+    return max((jaccard + containment) / 2, ratio * 0.8)
+
+
+def _locality_similarity(left: str | None, right: str | None) -> float | None:
+    left_key, right_key = locality_key(left), locality_key(right)
+    if not left_key or not right_key:
+        return None
+    if left_key == right_key:
+        return 1.0
+    left_tokens, right_tokens = set(left_key.split()), set(right_key.split())
+    return len(left_tokens & right_tokens) / len(left_tokens | right_tokens)
+
+
+def score_pair(left: DedupeRecord, right: DedupeRecord) -> tuple[float, tuple[str, ...]]:
+    """Weighted evidence that two records are the same business, with the reasons that fired."""
+    reasons: list[str] = []
+    name_score = name_similarity(left.name_key, right.name_key)
+    if name_score == 1.0:
+        reasons.append("same_name")
+    elif name_score >= 0.6:
+        reasons.append("similar_name")
+
+    locality = _locality_similarity(left.location, right.location)
+    if locality == 1.0:
+        reasons.append("same_locality")
+
+    same_phone = bool(left.phone_key and left.phone_key == right.phone_key)
+    if same_phone:
+        reasons.append("same_phone")
+    same_domain = bool(left.domain_key and left.domain_key == right.domain_key)
+    if same_domain:
+        reasons.append("same_domain")
+
+    score = 0.6 * name_score
+    # Unknown location is neutral evidence; a different one counts against the pair.
+    score += 0.2 * (0.5 if locality is None else locality)
+    score += 0.25 if same_phone else 0.0
+    score += 0.25 if same_domain else 0.0
+    return round(min(score, 1.0), 4), tuple(reasons)
+
+
+def find_duplicate_matches(
+    db: Session,
+    *,
+    workspace_id: UUID,
+    records: list[DedupeRecord],
+    threshold: float | None = None,
+) -> list[DuplicateMatch]:
+    """Score ``records`` against every record that shares a blocking key with them."""
+    if not records:
+        return []
+    threshold = settings.duplicate_match_threshold if threshold is None else threshold
+
+    keys = {column: {getattr(r, column) for r in records if getattr(r, column)} for column in BLOCK_KEY_COLUMNS}
+    pool: dict[tuple[str, str], DedupeRecord] = {record.ref: record for record in records}
+    for entity_type, spec in _SPECS.items():
+        # One lookup per key column: an OR across columns defeats the (workspace_id, key)
+        # indexes on SQLite and degrades into a workspace scan.
+        for column, values in keys.items():
+            if not values:
+                continue
+            for record in _load_records(db, entity_type, workspace_id, getattr(spec.model, column).in_(values)):
+                pool.setdefault(record.ref, record)
+
+    blocks: dict[tuple[str, str], list[DedupeRecord]] = defaultdict(list)
+    for record in pool.values():
+        for column in BLOCK_KEY_COLUMNS:
+            value = getattr(record, column)
+            if value:
+                blocks[(column, value)].append(record)
+
+    scored: set[tuple[tuple[str, str], tuple[str, str]]] = set()
+    matches: list[DuplicateMatch] = []
+    for record in records:
+        for column in BLOCK_KEY_COLUMNS:
+            value = getattr(record, column)
+            block = blocks.get((column, value)) if value else None
+            if not block or len(block) > MAX_BLOCK_SIZE:
+                continue
+            for other in block:
+                if other.ref == record.ref:
+                    continue
+                left, right = sorted((record, other), key=lambda item: item.ref)
+                pair = (left.ref, right.ref)
+                if pair in scored:
+                    continue
+                scored.add(pair)
+                score, reasons = score_pair(left, right)
+                if score >= threshold:
+                    matches.append(DuplicateMatch(left=left, right=right, score=score, reasons=reasons))
+    return matches
+
+
+def record_duplicate_matches(db: Session, *, workspace_id: UUID, matches: list[DuplicateMatch]) -> int:
+    """Insert pairs not seen before (in any status). Returns the number of new pairs."""
+    if not matches:
+        return 0
+    existing = {
+        (left_type, str(left_id), right_type, str(right_id))
+        for left_type, left_id, right_type, right_id in db.execute(
+            select(
+                DuplicateCandidate.left_type,
+                DuplicateCandidate.left_id,
+                DuplicateCandidate.right_type,
+                DuplicateCandidate.right_id,
+            ).where(
+                DuplicateCandidate.workspace_id == workspace_id,
+                DuplicateCandidate.left_id.in_({match.left.id for match in matches}),
+            )
+        ).all()
+    }
+    rows: list[dict[str, Any]] = []
+    for match in matches:
+        key = (*match.left.ref, *match.right.ref)
+        if key in existing:
+            continue
+        existing.add(key)
+        rows.append(
+            {
+                "workspace_id": workspace_id,
+                "left_type": match.left.entity_type,
+                "left_id": match.left.id,
+                "right_type": match.right.entity_type,
+                "right_id": match.right.id,
+                "score": match.score,
+                "reasons": list(match.reasons),
+                "status": DUPLICATE_STATUS_OPEN,
+            }
+        )
+    if not rows:
+        return 0
+    try:
+        with db.begin_nested():
+            db.execute(insert(DuplicateCandidate), rows)
+    except IntegrityError:
+        # A concurrent batch flagged one of these pairs first; fall back to row-by-row.
+        inserted = 0
+        for row in rows:
+            try:
+                with db.begin_nested():
+                    db.execute(insert(DuplicateCandidate), [row])
+                inserted += 1
+            except IntegrityError:
+                continue
+        return inserted
+    return len(rows)
+
+
+def flag_duplicates(db: Session, *, workspace_id: UUID, entity_type: str, ids: list[UUID]) -> int:
+    """Detect and persist suspected duplicates for freshly written records. Does not commit."""
+    if not settings.duplicate_detection_enabled or not ids:
+        return 0
+    records = load_dedupe_records(db, workspace_id=workspace_id, entity_type=entity_type, ids=ids)
+    matches = find_duplicate_matches(db, workspace_id=workspace_id, records=records)
+    return record_duplicate_matches(db, workspace_id=workspace_id, matches=matches)
+
+
+def scan_workspace_duplicates(
+    db: Session,
+    workspace_id: UUID,
+    *,
+    on_progress: Callable[[int], None] | None = None,
+) -> int:
+    """Re-run detection over every record in a workspace, one committed batch at a time.
+
+    ``on_progress(scanned)`` is called after each batch with the records scanned so far.
+    """
+    batch_size = max(1, settings.duplicate_scan_batch_size)
+    flagged = 0
+    scanned = 0
+    for entity_type, spec in _SPECS.items():
+        model = spec.model
+        last_id: UUID | None = None
+        while True:
+            stmt = select(model.id).where(model.workspace_id == workspace_id)
+            if last_id is not None:
+                stmt = stmt.where(model.id > last_id)
+            ids = list(db.scalars(stmt.order_by(model.id).limit(batch_size)).all())
+            if not ids:
+                break
+            flagged += flag_duplicates(db, workspace_id=workspace_id, entity_type=entity_type, ids=ids)
+            db.commit()
+            last_id = ids[-1]
+            scanned += len(ids)
+            if on_progress is not None:
+                on_progress(scanned)
+    logger.info("Duplicate scan finished workspace_id=%s flagged=%s", workspace_id, flagged)
+    return flagged
+
+
+def forget_duplicate_candidates(db: Session, *, workspace_id: UUID, entity_type: str, ids: list[UUID]) -> None:
+    """Drop open pairs that reference records about to be deleted or suppressed."""
+    if not ids:
+        return
+    db.execute(
+        delete(DuplicateCandidate)
+        .where(
+            DuplicateCandidate.workspace_id == workspace_id,
+            DuplicateCandidate.status == DUPLICATE_STATUS_OPEN,
+            or_(
+                and_(DuplicateCandidate.left_type == entity_type, DuplicateCandidate.left_id.in_(ids)),
+                and_(DuplicateCandidate.right_type == entity_type, DuplicateCandidate.right_id.in_(ids)),
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def load_duplicate_entities(
+    db: Session,
+    *,
+    workspace_id: UUID,
+    refs: set[tuple[str, UUID]],
+) -> dict[tuple[str, UUID], Any]:
+    """Fetch the ORM rows behind ``(entity_type, id)`` refs with one query per entity type."""
+    by_type: dict[str, set[UUID]] = defaultdict(set)
+    for entity_type, entity_id in refs:
+        by_type[entity_type].add(entity_id)
+    loaded: dict[tuple[str, UUID], Any] = {}
+    for entity_type, ids in by_type.items():
+        model = _SPECS[entity_type].model
+        for row in db.scalars(select(model).where(model.workspace_id == workspace_id, model.id.in_(ids))).all():
+            loaded[(entity_type, row.id)] = row
+    return loaded
+
+
+def entity_summary(entity_type: str, entity: Any) -> dict[str, Any]:
+    spec = _SPECS[entity_type]
+    return {
+        "entity_type": entity_type,
+        "id": entity.id,
+        "name": getattr(entity, spec.name_column),
+        "location": getattr(entity, spec.location_column),
+        "phone": getattr(entity, spec.phone_column) if spec.phone_column else None,
+        "website": getattr(entity, spec.website_column),
+    }
+
+
+# Same-type fields copied onto the kept record when it has no value of its own.
+_MERGE_FILL_FIELDS = {
+    DUPLICATE_ENTITY_LEAD: ("title", "industry", "email"),
+    DUPLICATE_ENTITY_PROSPECT: ("category", "rating", "review_count"),
+    DUPLICATE_ENTITY_PARTNER_CANDIDATE: ("industry", "contact_form_url", "contact_emails"),
+}
+
+
+def _fill_missing(keep_type: str, keep: Any, drop_type: str, drop: Any) -> None:
+    keep_spec, drop_spec = _SPECS[keep_type], _SPECS[drop_type]
+    shared = [(keep_spec.location_column, drop_spec.location_column), (keep_spec.website_column, drop_spec.website_column)]
+    if keep_spec.phone_column and drop_spec.phone_column:
+        shared.append((keep_spec.phone_column, drop_spec.phone_column))
+    if keep_type == drop_type:
+        shared.extend((field, field) for field in _MERGE_FILL_FIELDS[keep_type])
+    for keep_field, drop_field in shared:
+        if getattr(keep, keep_field) in (None, "", []) and getattr(drop, drop_field) not in (None, "", []):
+            setattr(keep, keep_field, getattr(drop, drop_field))
+
+
+def _move_lead_dependents(db: Session, *, from_lead_id: UUID, to_lead_id: UUID) -> None:
+    for model in (EmailDraft, WebsiteSnapshot, WebsitePage, OutboundEmail):
+        db.execute(
+            update(model)
+            .where(model.lead_id == from_lead_id)
+            .values(lead_id=to_lead_id)
+            .execution_options(synchronize_session=False)
+        )
+    # Moved pages and snapshots now belong to the kept lead, whose latest snapshot may change.
+    db.execute(
+        update(SearchDocument)
+        .where(SearchDocument.parent_id == from_lead_id)
+        .values(parent_id=to_lead_id)
+        .execution_options(synchronize_session=False)
+    )
+    refresh_search_documents(db.connection(), SEARCH_ENTITY_LEAD, [to_lead_id])
+    # Bulk updates bypass the pipeline-state listener; the moved drafts and snapshots count now.
+    refresh_lead_pipeline_states(db.connection(), [to_lead_id])
+
+
+def merge_duplicate(db: Session, candidate: DuplicateCandidate, *, keep: str) -> None:
+    """Fold one side of ``candidate`` into the other. Does not commit.
+
+    Leads always survive a merge with a prospect or partner candidate: the other record is
+    marked converted so it is not imported again. Same-type merges move the dropped lead's
+    drafts, snapshots, pages, queued sends and threads onto the kept lead before deleting it.
+    """
+    if candidate.status != DUPLICATE_STATUS_OPEN:
+        raise DuplicateMergeError(f"Only open duplicates can be merged (status is {candidate.status}).")
+    if keep not in {"left", "right"}:
+        raise DuplicateMergeError("keep must be 'left' or 'right'.")
+
+    sides = {
+        "left": (candidate.left_type, candidate.left_id),
+        "right": (candidate.right_type, candidate.right_id),
+    }
+    keep_type, keep_id = sides[keep]
+    drop_type, drop_id = sides["right" if keep == "left" else "left"]
+    if drop_type == DUPLICATE_ENTITY_LEAD and keep_type != DUPLICATE_ENTITY_LEAD:
+        raise DuplicateMergeError("A lead can only be merged into another lead; keep the lead instead.")
+
+    entities = load_duplicate_entities(
+        db,
+        workspace_id=candidate.workspace_id,
+        refs={(keep_type, keep_id), (drop_type, drop_id)},
+    )
+    kept = entities.get((keep_type, keep_id))
+    dropped = entities.get((drop_type, drop_id))
+    if kept is None or dropped is None:
+        raise DuplicateMergeError("One of the records no longer exists.")
+
+    _fill_missing(keep_type, kept, drop_type, dropped)
+
+    thread_types = {DUPLICATE_ENTITY_LEAD, DUPLICATE_ENTITY_PARTNER_CANDIDATE}
+    if drop_type in thread_types and keep_type in thread_types:
+        db.execute(
+            update(EmailThread)
+            .where(
+                EmailThread.workspace_id == candidate.workspace_id,
+                EmailThread.related_entity_type == drop_type,
+                EmailThread.related_entity_id == drop_id,
+            )
+            .values(related_entity_type=keep_type, related_entity_id=keep_id)
+            .execution_options(synchronize_session=False)
+        )
+
+    candidate.status = DUPLICATE_STATUS_MERGED
+    candidate.resolved_at = datetime.now(timezone.utc)
+    db.flush()
+    forget_duplicate_candidates(db, workspace_id=candidate.workspace_id, entity_type=drop_type, ids=[drop_id])
+    if keep_type == drop_type:
+        if drop_type == DUPLICATE_ENTITY_LEAD:
+            _move_lead_dependents(db, from_lead_id=drop_id, to_lead_id=keep_id)
+            db.flush()
+            db.expire(dropped)
+        db.delete(dropped)
+    elif drop_type == DUPLICATE_ENTITY_PROSPECT:
+        dropped.import_status = "imported" if keep_type == DUPLICATE_ENTITY_LEAD else "skipped"
+    else:
+        dropped.status = "converted" if keep_type == DUPLICATE_ENTITY_LEAD else "ignored"
@@ -4,6 +4,7 @@ import base64
 import hashlib
 import hmac
 import json
+import threading
 import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
@@ -13,10 +14,11 @@ from urllib.parse import urlencode
 from uuid import UUID
 
 import httpx
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.db.sqlite import as_utc
 from app.models.integration_account import IntegrationAccount
 from app.models.oauth_token import OAuthToken
 from app.models.workspace_setting import WorkspaceSetting
@@ -27,6 +29,7 @@ GOOGLE_OAUTH_TOKEN_URL = "https://oauth2.googleapis.com/token"
 GMAIL_API_ROOT = "https://gmail.googleapis.com/gmail/v1/users/me"
 GMAIL_PROFILE_URL = f"{GMAIL_API_ROOT}/profile"
 STATE_MAX_AGE_SECONDS = 15 * 60
+TOKEN_EXPIRY_MARGIN_SECONDS = 60
 
 
 class GmailIntegrationError(RuntimeError):
@@ -46,9 +49,17 @@ class GmailOAuthExchangeError(GmailIntegrationError):
 
 
 class GmailApiError(GmailIntegrationError):
-    def __init__(self, message: str, *, status_code: int = 502) -> None:
+    def __init__(self, message: str, *, status_code: int = 502, upstream_status: int | None = None) -> None:
         super().__init__(message)
         self.status_code = status_code
+        self.upstream_status = upstream_status
+
+    @property
+    def retryable(self) -> bool:
+        """Rate limits and Gmail-side 5xx are transient; everything else needs attention."""
+        return self.upstream_status is not None and (
+            self.upstream_status == 429 or self.upstream_status >= 500
+        )
 
 
 @dataclass(frozen=True)
@@ -67,6 +78,22 @@ class GmailConnectionStatus:
     last_error: str | None
 
 
+@dataclass(frozen=True)
+class GmailAccessToken:
+    workspace_id: UUID
+    integration_account_id: UUID
+    account_email: str | None
+    access_token: str
+    refresh_token: str | None
+    expires_at: datetime | None
+
+    def is_fresh(self, now: datetime | None = None) -> bool:
+        if self.expires_at is None:
+            return True
+        now = now or datetime.now(timezone.utc)
+        return self.expires_at > now + timedelta(seconds=TOKEN_EXPIRY_MARGIN_SECONDS)
+
+
 # ── Google login state (no workspace_id needed — used before authentication) ──
 
 GOOGLE_LOGIN_SCOPES = "openid email profile"
@@ -424,9 +451,20 @@ def save_oauth_tokens(db: Session, *, workspace_id: UUID, token_payload: dict[st
     )
     db.add(token)
     db.flush()
+    _prune_oauth_tokens(db, account_id=account.id, keep_token_id=token.id)
+    gmail_token_provider.invalidate(workspace_id)
     return token
 
 
+def _prune_oauth_tokens(db: Session, *, account_id: UUID, keep_token_id: UUID) -> None:
+    db.execute(
+        delete(OAuthToken).where(
+            OAuthToken.integration_account_id == account_id,
+            OAuthToken.id != keep_token_id,
+        )
+    )
+
+
 def _refresh_access_token(db: Session, *, account: IntegrationAccount, refresh_token: str) -> OAuthToken:
     client_id, client_secret, _ = resolve_gmail_oauth_config(db, account.workspace_id)
     payload = {
@@ -459,36 +497,111 @@ def _refresh_access_token(db: Session, *, account: IntegrationAccount, refresh_t
     account.status = "connected"
     account.last_error = None
     db.flush()
+    _prune_oauth_tokens(db, account_id=account.id, keep_token_id=token.id)
     return token
 
 
-def get_active_token(db: Session, workspace_id: UUID) -> tuple[IntegrationAccount, OAuthToken]:
-    account = get_gmail_account(db, workspace_id)
-    if account is None:
-        raise GmailApiError("Gmail is not connected for this workspace.", status_code=400)
+class GmailTokenProvider:
+    """In-process, per-workspace cache of Gmail access tokens with single-flight refresh.
 
-    token = db.scalar(
-        select(OAuthToken)
-        .where(OAuthToken.integration_account_id == account.id)
-        .order_by(OAuthToken.created_at.desc())
-        .limit(1)
-    )
-    if token is None:
-        account.status = "disconnected"
-        account.last_error = "No Gmail OAuth token found for this workspace."
-        raise GmailApiError("No Gmail OAuth token found for this workspace.", status_code=400)
+    Cache hits cost no DB round trip. A miss loads the account and latest token once; an
+    expiring token is refreshed under a per-account lock so concurrent callers share one
+    Google OAuth call instead of each inserting their own token row.
+    """
 
-    now = datetime.now(timezone.utc)
-    if token.expires_at and token.expires_at <= now + timedelta(seconds=60):
-        if not token.refresh_token:
-            account.status = "error"
-            account.last_error = "Gmail token expired and no refresh token is available."
-            raise GmailApiError("Gmail token expired and no refresh token is available.", status_code=400)
-        token = _refresh_access_token(db, account=account, refresh_token=token.refresh_token)
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[UUID, GmailAccessToken] = {}
+        self._refresh_locks: dict[UUID, threading.Lock] = {}
+
+    def get(self, db: Session, workspace_id: UUID) -> GmailAccessToken:
+        entry = self._entries.get(workspace_id)
+        if entry is not None and entry.is_fresh():
+            return entry
+
+        account, token = self._load(db, workspace_id)
+        entry = self._entry(account, token)
+        if entry.is_fresh():
+            return self._store(entry)
+        return self.refresh(db, workspace_id, stale=entry)
+
+    def refresh(self, db: Session, workspace_id: UUID, *, stale: GmailAccessToken) -> GmailAccessToken:
+        with self._account_lock(stale.integration_account_id):
+            current = self._entries.get(workspace_id)
+            if current is not None and current.access_token != stale.access_token and current.is_fresh():
+                return current
+
+            account = db.get(IntegrationAccount, stale.integration_account_id)
+            if account is None:
+                self.invalidate(workspace_id)
+                raise GmailApiError("Gmail is not connected for this workspace.", status_code=400)
+            if not stale.refresh_token:
+                account.status = "error"
+                account.last_error = "Gmail token expired and no refresh token is available."
+                self.invalidate(workspace_id)
+                raise GmailApiError("Gmail token expired and no refresh token is available.", status_code=400)
+            try:
+                token = _refresh_access_token(db, account=account, refresh_token=stale.refresh_token)
+            except GmailApiError:
+                self.invalidate(workspace_id)
+                raise
+            return self._store(self._entry(account, token))
+
+    def invalidate(self, workspace_id: UUID) -> None:
+        with self._lock:
+            self._entries.pop(workspace_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _account_lock(self, account_id: UUID) -> threading.Lock:
+        with self._lock:
+            return self._refresh_locks.setdefault(account_id, threading.Lock())
+
+    def _store(self, entry: GmailAccessToken) -> GmailAccessToken:
+        with self._lock:
+            self._entries[entry.workspace_id] = entry
+        return entry
+
+    @staticmethod
+    def _entry(account: IntegrationAccount, token: OAuthToken) -> GmailAccessToken:
+        return GmailAccessToken(
+            workspace_id=account.workspace_id,
+            integration_account_id=account.id,
+            account_email=account.display_name or account.external_account_id,
+            access_token=token.access_token,
+            refresh_token=token.refresh_token,
+            expires_at=as_utc(token.expires_at),
+        )
 
-    account.status = "connected"
-    account.last_error = None
-    return account, token
+    @staticmethod
+    def _load(db: Session, workspace_id: UUID) -> tuple[IntegrationAccount, OAuthToken]:
+        account = get_gmail_account(db, workspace_id)
+        if account is None:
+            raise GmailApiError("Gmail is not connected for this workspace.", status_code=400)
+
+        token = db.scalar(
+            select(OAuthToken)
+            .where(OAuthToken.integration_account_id == account.id)
+            .order_by(OAuthToken.created_at.desc())
+            .limit(1)
+        )
+        if token is None:
+            account.status = "disconnected"
+            account.last_error = "No Gmail OAuth token found for this workspace."
+            raise GmailApiError("No Gmail OAuth token found for this workspace.", status_code=400)
+
+        account.status = "connected"
+        account.last_error = None
+        return account, token
+
+
+gmail_token_provider = GmailTokenProvider()
+
+
+def get_gmail_access_token(db: Session, workspace_id: UUID) -> GmailAccessToken:
+    return gmail_token_provider.get(db, workspace_id)
 
 
 def fetch_gmail_profile(*, access_token: str) -> dict[str, Any]:
@@ -520,6 +633,7 @@ def attach_gmail_profile(
     account.status = "connected"
     account.last_error = None
     db.flush()
+    gmail_token_provider.invalidate(workspace_id)
     return account
 
 
@@ -570,7 +684,7 @@ def _gmail_api_post(
     path: str,
     payload: dict[str, Any],
 ) -> dict[str, Any]:
-    account, token = get_active_token(db, workspace_id)
+    token = get_gmail_access_token(db, workspace_id)
     url = f"{GMAIL_API_ROOT}{path}"
 
     def _request(access_token: str) -> httpx.Response:
@@ -580,22 +694,28 @@ def _gmail_api_post(
 
     response = _request(token.access_token)
     if response.status_code == 401 and token.refresh_token:
-        refreshed = _refresh_access_token(db, account=account, refresh_token=token.refresh_token)
-        response = _request(refreshed.access_token)
+        token = gmail_token_provider.refresh(db, workspace_id, stale=token)
+        response = _request(token.access_token)
 
     if response.status_code >= 400:
         detail = response.text.strip() or "unknown Gmail API error"
-        account.status = "error"
-        account.last_error = f"Gmail API request failed: {detail}"[:2000]
-        raise GmailApiError(f"Gmail API request failed: {detail}", status_code=502)
+        error = GmailApiError(
+            f"Gmail API request failed: {detail}",
+            status_code=502,
+            upstream_status=response.status_code,
+        )
+        # Throttling and Gmail outages are retried by the send queue; don't flag the
+        # integration as broken for them.
+        if not error.retryable:
+            gmail_token_provider.invalidate(workspace_id)
+            set_gmail_integration_error(db, workspace_id=workspace_id, error_message=str(error))
+        raise error
 
     data = response.json()
     if not isinstance(data, dict):
-        account.status = "error"
-        account.last_error = "Gmail API returned invalid JSON payload."
+        gmail_token_provider.invalidate(workspace_id)
+        set_gmail_integration_error(db, workspace_id=workspace_id, error_message="Gmail API returned invalid JSON payload.")
         raise GmailApiError("Gmail API returned invalid JSON payload.", status_code=502)
-    account.status = "connected"
-    account.last_error = None
     return data
 
 
@@ -649,13 +769,13 @@ def create_gmail_draft(
 
 def fetch_send_as_aliases(db: Session, workspace_id: UUID) -> list[dict[str, Any]]:
     """Return the list of send-as addresses for the connected Gmail account."""
-    account, token = get_active_token(db, workspace_id)
+    token = get_gmail_access_token(db, workspace_id)
     url = f"{GMAIL_API_ROOT}/settings/sendAs"
     headers = {"Authorization": f"Bearer {token.access_token}"}
     with httpx.Client(timeout=20.0) as client:
         response = client.get(url, headers=headers)
     if response.status_code == 401 and token.refresh_token:
-        refreshed = _refresh_access_token(db, account=account, refresh_token=token.refresh_token)
+        refreshed = gmail_token_provider.refresh(db, workspace_id, stale=token)
         headers = {"Authorization": f"Bearer {refreshed.access_token}"}
         with httpx.Client(timeout=20.0) as client:
             response = client.get(url, headers=headers)
@@ -668,6 +788,7 @@ def fetch_send_as_aliases(db: Session, workspace_id: UUID) -> list[dict[str, Any
 
 def disconnect_gmail(db: Session, workspace_id: UUID) -> None:
     """Revoke tokens, mark account disconnected, clear workspace gmail_connected flag."""
+    gmail_token_provider.invalidate(workspace_id)
     account = get_gmail_account(db, workspace_id)
     if account is not None:
         # Best-effort token revocation
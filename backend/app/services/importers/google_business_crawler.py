@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Collection
 from dataclasses import dataclass
 
 from app.services.lead_sources.google_places import GooglePlacesCrawler, GooglePlacesCrawlerError
+from app.services.lead_sources.places_cache import PlacesCache
 
 
 @dataclass(frozen=True)
@@ -28,15 +31,30 @@ def discover_google_business_prospects(
     keyword: str = "business",
     missing_website_only: bool = False,
     limit: int = 300,
+    cache: PlacesCache | None = None,
+    known_place_ids: Collection[str] = (),
+    sweep_area: bool = False,
 ) -> list[GoogleBusinessProspect]:
-    crawler = GooglePlacesCrawler(api_key=api_key)
-    places = crawler.discover_businesses(
-        location=location,
-        radius=radius,
-        business_types=categories,
-        keyword=keyword,
-        missing_website_only=missing_website_only,
-    )
+    crawler = GooglePlacesCrawler(api_key=api_key, cache=cache)
+    if sweep_area:
+        discovery = crawler.sweep_area_async(
+            location=location,
+            radius=radius,
+            business_types=categories,
+            keyword=keyword,
+            missing_website_only=missing_website_only,
+            known_place_ids=known_place_ids,
+        )
+    else:
+        discovery = crawler.discover_businesses_async(
+            location=location,
+            radius=radius,
+            business_types=categories,
+            keyword=keyword,
+            missing_website_only=missing_website_only,
+            known_place_ids=known_place_ids,
+        )
+    places = asyncio.run(discovery)
 
     normalized: list[GoogleBusinessProspect] = []
     for place in places[:limit]:
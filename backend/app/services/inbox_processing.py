@@ -0,0 +1,388 @@
+"""Inbox processing — classifies newly synced inbound mail and pre-computes reply suggestions.
+
+LLM calls run in a bounded thread pool on plain data; all DB reads and writes stay on the
+caller's session so results land on the message and thread in one commit per batch. A failed
+classification is retried with backoff until ``inbox_processing_max_attempts``.
+"""
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+from uuid import UUID
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.email_message import EmailMessageRecord
+from app.models.email_thread import EmailThread
+from app.models.workspace import Workspace
+from app.models.workspace_automation_setting import WorkspaceAutomationSetting
+from app.models.workspace_setting import WorkspaceSetting
+from app.services.email_classifier_agent import classify_email
+from app.services.inbox_service import refresh_thread_summary
+from app.services.response_draft_agent import generate_response_draft
+from app.services.sender_signature import replace_placeholders
+from app.services.workspace_context import get_workspace_context
+from app.services.workspace_credentials import usable_api_key
+
+logger = logging.getLogger(__name__)
+
+NEXT_ACTION_MAP = {
+    "meeting_request": "schedule_meeting",
+    "pricing_request": "provide_quote",
+    "interested": "follow_up",
+    "question": "follow_up",
+}
+
+# Classifications that never warrant an automatic reply suggestion.
+NO_REPLY_CLASSIFICATIONS = {"not_interested", "unsubscribe"}
+
+
+@dataclass(frozen=True)
+class _MessageWork:
+    message_id: UUID
+    thread_id: UUID
+    subject: str | None
+    body: str
+    thread_context: str | None
+
+
+@dataclass(frozen=True)
+class ReplyContext:
+    workspace_profile: dict[str, Any] | None
+    ai_strategy: dict[str, Any] | None
+    sender_info: dict[str, str]
+
+
+def build_thread_context(messages: list[EmailMessageRecord], target: EmailMessageRecord) -> str | None:
+    """Render the messages preceding ``target`` the way the classifier and reply agents expect."""
+    previous: list[EmailMessageRecord] = []
+    for message in messages:
+        if message.id == target.id:
+            break
+        previous.append(message)
+    if not previous:
+        return None
+    return "\n---\n".join(
+        f"[{m.direction}] {m.subject or ''}\n{(m.body or '')[:1000]}"
+        for m in previous
+    )
+
+
+def load_reply_context(db: Session, workspace_id: UUID) -> ReplyContext:
+    workspace_context = get_workspace_context(db, workspace_id)
+    profile = workspace_context.profile
+    profile_dict = None
+    if profile:
+        profile_dict = {
+            "business_name": profile["business_name"],
+            "business_description": profile["business_description"],
+            "preferred_tone": profile["preferred_tone"],
+        }
+
+    strategy_dict = None
+    if workspace_context.generated_strategy:
+        strategy_dict = {"generated_strategy": workspace_context.generated_strategy}
+
+    return ReplyContext(
+        workspace_profile=profile_dict,
+        ai_strategy=strategy_dict,
+        sender_info=workspace_context.sender_info,
+    )
+
+
+def apply_classification(
+    *,
+    thread: EmailThread,
+    message: EmailMessageRecord,
+    result: dict[str, Any],
+) -> str:
+    cls = result.get("classification") or "unknown"
+    message.classification = cls
+    if thread.latest_inbound_message_id == message.id:
+        thread.latest_inbound_classification = cls
+    if result.get("meeting_intent"):
+        thread.status = "meeting_requested"
+    if cls in NEXT_ACTION_MAP:
+        thread.next_action = NEXT_ACTION_MAP[cls]
+    thread.reply_review_status = "needs_review"
+    return cls
+
+
+def apply_suggested_reply(
+    *,
+    thread: EmailThread,
+    message: EmailMessageRecord,
+    result: dict[str, Any],
+    sender_info: dict[str, str],
+) -> dict[str, Any]:
+    if result.get("subject"):
+        result["subject"] = replace_placeholders(result["subject"], sender_info)
+    if result.get("reply_body"):
+        result["reply_body"] = replace_placeholders(result["reply_body"], sender_info)
+    message.suggested_response = result
+    thread.reply_review_status = "suggested"
+    return result
+
+
+def _due_for_processing(now: datetime) -> tuple[Any, ...]:
+    """Unprocessed inbound messages, less those waiting out a retry backoff."""
+    return (
+        EmailMessageRecord.direction == "inbound",
+        EmailMessageRecord.processed_at.is_(None),
+        or_(EmailMessageRecord.processing_retry_at.is_(None), EmailMessageRecord.processing_retry_at <= now),
+    )
+
+
+def _record_classification_failure(message: EmailMessageRecord, error: Exception, now: datetime) -> None:
+    # Rate limits and timeouts pass, so the message is retried with backoff; only the last
+    # allowed attempt marks it processed, leaving the error on it.
+    message.processing_attempts = (message.processing_attempts or 0) + 1
+    message.processing_error = str(error)[:2000]
+    if message.processing_attempts >= max(1, settings.inbox_processing_max_attempts):
+        message.processed_at = now
+        message.processing_retry_at = None
+    else:
+        delay = settings.inbox_processing_retry_seconds * 2 ** (message.processing_attempts - 1)
+        message.processing_retry_at = now + timedelta(seconds=delay)
+
+
+def pending_inbound_message_ids(db: Session, workspace_id: UUID, *, limit: int) -> list[UUID]:
+    return list(
+        db.scalars(
+            select(EmailMessageRecord.id)
+            .join(EmailThread, EmailThread.id == EmailMessageRecord.thread_id)
+            .where(
+                EmailThread.workspace_id == workspace_id,
+                *_due_for_processing(datetime.now(timezone.utc)),
+            )
+            .order_by(EmailMessageRecord.received_at.asc().nullsfirst())
+            .limit(limit)
+        ).all()
+    )
+
+
+def _pending_workspace_ids(db: Session) -> list[UUID]:
+    """Workspaces with unprocessed inbound mail that can be classified now.
+
+    Paused workspaces and workspaces without an OpenAI key are left out, so their pending
+    mail is not rescanned every cycle; it is picked up once a key is set or the pipeline
+    resumes. ``process_inbound_messages`` still makes the authoritative check.
+    """
+    has_pending = (
+        select(EmailMessageRecord.id)
+        .join(EmailThread, EmailThread.id == EmailMessageRecord.thread_id)
+        .where(
+            EmailThread.workspace_id == Workspace.id,
+            *_due_for_processing(datetime.now(timezone.utc)),
+        )
+        .exists()
+    )
+    conditions = [
+        has_pending,
+        or_(WorkspaceAutomationSetting.pause_pipeline.is_(None), WorkspaceAutomationSetting.pause_pipeline.is_(False)),
+    ]
+    environment_key, _ = usable_api_key(None, settings.openai_api_key)
+    if environment_key is None:
+        conditions.append(func.trim(WorkspaceSetting.openai_api_key) != "")
+    return list(
+        db.scalars(
+            select(Workspace.id)
+            .outerjoin(WorkspaceSetting, WorkspaceSetting.workspace_id == Workspace.id)
+            .outerjoin(WorkspaceAutomationSetting, WorkspaceAutomationSetting.workspace_id == Workspace.id)
+            .where(*conditions)
+        ).all()
+    )
+
+
+def _run_bounded(fn: Callable[[_MessageWork], dict[str, Any]], work: list[_MessageWork]) -> dict[UUID, dict[str, Any] | Exception]:
+    results: dict[UUID, dict[str, Any] | Exception] = {}
+    if not work:
+        return results
+    max_workers = max(1, min(settings.inbox_processing_concurrency, len(work)))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inbox-processing") as pool:
+        futures = {item.message_id: pool.submit(fn, item) for item in work}
+        for message_id, future in futures.items():
+            try:
+                results[message_id] = future.result()
+            except Exception as exc:  # noqa: BLE001 — recorded on the message below
+                results[message_id] = exc
+    return results
+
+
+def _collect_work(db: Session, workspace_id: UUID, message_ids: list[UUID]) -> list[_MessageWork]:
+    targets = db.scalars(
+        select(EmailMessageRecord)
+        .join(EmailThread, EmailThread.id == EmailMessageRecord.thread_id)
+        .where(
+            EmailThread.workspace_id == workspace_id,
+            EmailMessageRecord.id.in_(message_ids),
+            EmailMessageRecord.direction == "inbound",
+            EmailMessageRecord.processed_at.is_(None),
+        )
+    ).all()
+    if not targets:
+        return []
+
+    thread_ids = {m.thread_id for m in targets}
+    history: dict[UUID, list[EmailMessageRecord]] = {tid: [] for tid in thread_ids}
+    for message in db.scalars(
+        select(EmailMessageRecord)
+        .where(EmailMessageRecord.thread_id.in_(thread_ids))
+        .order_by(EmailMessageRecord.received_at.asc().nullslast())
+    ).all():
+        history[message.thread_id].append(message)
+
+    return [
+        _MessageWork(
+            message_id=m.id,
+            thread_id=m.thread_id,
+            subject=m.subject,
+            body=m.body or "",
+            thread_context=build_thread_context(history[m.thread_id], m),
+        )
+        for m in targets
+    ]
+
+
+def process_inbound_messages(db: Session, workspace_id: UUID, message_ids: list[UUID]) -> dict[str, int]:
+    """Classify (and, where policy allows, draft replies for) the given inbound messages."""
+    stats = {"classified": 0, "suggested": 0, "failed": 0}
+    if not message_ids:
+        return stats
+
+    workspace_context = get_workspace_context(db, workspace_id)
+    policy = workspace_context.automation_policy
+    if policy.pause_pipeline:
+        return stats
+
+    api_key = workspace_context.openai_api_key
+    if not api_key:
+        logger.debug("Inbox processing skipped workspace_id=%s reason=no_openai_key", workspace_id)
+        return stats
+
+    batch_size = max(1, settings.inbox_processing_batch_size)
+    for start in range(0, len(message_ids), batch_size):
+        work = _collect_work(db, workspace_id, message_ids[start:start + batch_size])
+        if not work:
+            continue
+
+        classified = _run_bounded(
+            lambda item: classify_email(
+                email_body=item.body,
+                email_subject=item.subject,
+                thread_context=item.thread_context,
+                api_key=api_key,
+            ),
+            work,
+        )
+
+        now = datetime.now(timezone.utc)
+        messages = {m.id: m for m in db.scalars(
+            select(EmailMessageRecord).where(EmailMessageRecord.id.in_(list(classified)))
+        ).all()}
+        threads = {t.id: t for t in db.scalars(
+            select(EmailThread).where(EmailThread.id.in_({m.thread_id for m in messages.values()}))
+        ).all()}
+
+        for thread in threads.values():
+            if thread.latest_inbound_message_id is None:
+                refresh_thread_summary(db, thread)
+
+        reply_work: list[_MessageWork] = []
+        latest_inbound = (
+            {t.latest_inbound_message_id for t in threads.values()}
+            if policy.allows_inbox_reply_suggestions
+            else set()
+        )
+        for item in work:
+            message = messages[item.message_id]
+            thread = threads[item.thread_id]
+            outcome = classified[item.message_id]
+            if isinstance(outcome, Exception):
+                _record_classification_failure(message, outcome, now)
+                stats["failed"] += 1
+                logger.warning(
+                    "Inbox classify failed message_id=%s attempt=%s detail=%s",
+                    item.message_id,
+                    message.processing_attempts,
+                    outcome,
+                )
+                continue
+            message.processed_at = now
+            message.processing_retry_at = None
+            cls = apply_classification(thread=thread, message=message, result=outcome)
+            message.processing_error = None
+            stats["classified"] += 1
+            if item.message_id in latest_inbound and cls not in NO_REPLY_CLASSIFICATIONS:
+                reply_work.append(item)
+
+        if reply_work:
+            reply_ctx = load_reply_context(db, workspace_id)
+            suggested = _run_bounded(
+                lambda item: generate_response_draft(
+                    inbound_body=item.body,
+                    inbound_subject=item.subject,
+                    thread_history=item.thread_context,
+                    classification=messages[item.message_id].classification,
+                    workspace_profile=reply_ctx.workspace_profile,
+                    ai_strategy=reply_ctx.ai_strategy,
+                    sender_info=reply_ctx.sender_info,
+                    api_key=api_key,
+                ),
+                reply_work,
+            )
+            for item in reply_work:
+                outcome = suggested[item.message_id]
+                if isinstance(outcome, Exception):
+                    messages[item.message_id].processing_error = str(outcome)[:2000]
+                    stats["failed"] += 1
+                    logger.warning("Inbox suggest-reply failed message_id=%s detail=%s", item.message_id, outcome)
+                    continue
+                apply_suggested_reply(
+                    thread=threads[item.thread_id],
+                    message=messages[item.message_id],
+                    result=outcome,
+                    sender_info=reply_ctx.sender_info,
+                )
+                stats["suggested"] += 1
+
+        db.commit()
+
+    logger.info(
+        "Inbox processing workspace_id=%s classified=%s suggested=%s failed=%s",
+        workspace_id,
+        stats["classified"],
+        stats["suggested"],
+        stats["failed"],
+    )
+    return stats
+
+
+def process_pending_inbound_for_workspace(workspace_id: UUID) -> dict[str, int]:
+    """Drain one batch of unprocessed inbound mail for a workspace on a fresh session."""
+    with SessionLocal() as db:
+        message_ids = pending_inbound_message_ids(
+            db,
+            workspace_id,
+            limit=max(1, settings.inbox_processing_batch_size),
+        )
+        return process_inbound_messages(db, workspace_id, message_ids)
+
+
+def process_pending_inbound_messages() -> None:
+    """Worker entry point: drain one batch per workspace with pending inbound mail."""
+    if not settings.inbox_processing_enabled:
+        return
+    with SessionLocal() as db:
+        workspace_ids = _pending_workspace_ids(db)
+    for workspace_id in workspace_ids:
+        try:
+            process_pending_inbound_for_workspace(workspace_id)
+        except Exception:
+            logger.exception("Inbox processing failed workspace_id=%s", workspace_id)
@@ -17,7 +17,12 @@ from app.models.email_message import EmailMessageRecord
 from app.models.email_thread import EmailThread
 from app.models.lead import Lead
 from app.models.partner_candidate import PartnerCandidate
-from app.services.gmail_service import get_active_token, GMAIL_API_ROOT, GmailApiError
+from app.services.gmail_service import (
+    GMAIL_API_ROOT,
+    GmailApiError,
+    get_gmail_access_token,
+    gmail_token_provider,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -29,11 +34,15 @@ def _gmail_api_get(
     path: str,
     params: dict[str, str] | None = None,
 ) -> dict[str, Any]:
-    account, token = get_active_token(db, workspace_id)
+    token = get_gmail_access_token(db, workspace_id)
     url = f"{GMAIL_API_ROOT}{path}"
     headers = {"Authorization": f"Bearer {token.access_token}"}
     with httpx.Client(timeout=25.0) as client:
         response = client.get(url, headers=headers, params=params or {})
+        if response.status_code == 401 and token.refresh_token:
+            token = gmail_token_provider.refresh(db, workspace_id, stale=token)
+            headers = {"Authorization": f"Bearer {token.access_token}"}
+            response = client.get(url, headers=headers, params=params or {})
     if response.status_code >= 400:
         detail = response.text.strip() or "unknown Gmail API error"
         raise GmailApiError(f"Gmail API GET failed: {detail}", status_code=502)
@@ -166,12 +175,76 @@ def _find_related_entity(
     return None, None
 
 
+def _message_recency(row: Any) -> tuple[bool, datetime, datetime]:
+    # Mirrors ORDER BY received_at DESC NULLS LAST, created_at DESC.
+    return (
+        row.received_at is not None,
+        row.received_at or datetime.min,
+        row.created_at or datetime.min,
+    )
+
+
+def refresh_thread_summary(db: Session, thread: EmailThread) -> EmailThread:
+    """Recompute the denormalized summary columns for one thread.
+
+    Callers must have added any new messages to the session; pending rows are flushed first
+    so they are counted. Only narrow columns are read, never message bodies.
+    """
+    db.flush()
+    rows = db.execute(
+        select(
+            EmailMessageRecord.id,
+            EmailMessageRecord.direction,
+            EmailMessageRecord.received_at,
+            EmailMessageRecord.created_at,
+            EmailMessageRecord.classification,
+        ).where(EmailMessageRecord.thread_id == thread.id)
+    ).all()
+    inbound = [r for r in rows if r.direction == "inbound"]
+    outbound = [r for r in rows if r.direction == "outbound"]
+    latest = max(rows, key=_message_recency, default=None)
+    latest_inbound = max(inbound, key=_message_recency, default=None)
+
+    thread.message_count = len(rows)
+    thread.last_inbound_at = max((r.received_at for r in inbound if r.received_at), default=None)
+    thread.last_outbound_at = max((r.received_at for r in outbound if r.received_at), default=None)
+    if latest is not None and latest.received_at is not None:
+        thread.last_message_at = latest.received_at
+    if thread.last_message_at is None:
+        thread.last_message_at = datetime.now(timezone.utc)
+    thread.latest_message_id = latest.id if latest else None
+    thread.latest_inbound_message_id = latest_inbound.id if latest_inbound else None
+    thread.latest_inbound_classification = latest_inbound.classification if latest_inbound else None
+    thread.needs_reply = latest_inbound is not None and latest is latest_inbound
+    return thread
+
+
+def rebuild_thread_summaries(
+    db: Session,
+    workspace_id: UUID | None = None,
+    *,
+    batch_size: int = 200,
+) -> int:
+    """Repair summary columns for every thread (optionally one workspace). Returns the count."""
+    q = select(EmailThread.id).order_by(EmailThread.id)
+    if workspace_id is not None:
+        q = q.where(EmailThread.workspace_id == workspace_id)
+    thread_ids = db.scalars(q).all()
+
+    for start in range(0, len(thread_ids), batch_size):
+        chunk = thread_ids[start:start + batch_size]
+        for thread in db.scalars(select(EmailThread).where(EmailThread.id.in_(chunk))).all():
+            refresh_thread_summary(db, thread)
+        db.commit()
+    return len(thread_ids)
+
+
 def sync_inbox(db: Session, workspace_id: UUID, *, max_results: int = 20) -> dict[str, int]:
     thread_refs = fetch_recent_threads(db, workspace_id, max_results=max_results)
     stats = {"threads_synced": 0, "messages_synced": 0, "new_inbound": 0}
 
-    account, token = get_active_token(db, workspace_id)
-    our_email = (account.display_name or account.external_account_id or "").lower()
+    token = get_gmail_access_token(db, workspace_id)
+    our_email = (token.account_email or "").lower()
 
     for ref in thread_refs:
         gmail_tid = ref.get("id")
@@ -243,11 +316,7 @@ def sync_inbox(db: Session, workspace_id: UUID, *, max_results: int = 20) -> dic
             if direction == "inbound":
                 stats["new_inbound"] += 1
 
-        if messages:
-            last_msg = messages[-1]
-            last_date = _parse_timestamp(last_msg.get("internalDate"))
-            if last_date:
-                existing.last_message_at = last_date
+        refresh_thread_summary(db, existing)
 
         if not existing.related_entity_type:
             first_msg_headers = messages[0].get("payload", {}).get("headers", []) if messages else []
@@ -308,6 +377,6 @@ def send_reply(
         gmail_message_id=result.get("id"),
     )
     db.add(record)
-    thread.last_message_at = datetime.now(timezone.utc)
+    refresh_thread_summary(db, thread)
     db.commit()
     return record
@@ -3,20 +3,20 @@ from __future__ import annotations
 from uuid import UUID
 
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from app.models.lead import Lead
-from app.models.workspace_ai_strategy import WorkspaceAIStrategy
 from app.models.website_page import WebsitePage
-from app.models.workspace_profile import WorkspaceProfile
-from app.services.workspace_ai_strategy import build_strategy_context
+from app.services.workspace_ai_strategy import workspace_profile_payload
+from app.services.workspace_context import get_workspace_context
 
 
 def build_prepared_lead_context(*, db: Session, workspace_id: UUID, lead_id: UUID) -> dict[str, object]:
-    profile = db.get(WorkspaceProfile, workspace_id)
-    workspace_ai_strategy = db.get(WorkspaceAIStrategy, workspace_id)
+    workspace_context = get_workspace_context(db, workspace_id)
+    lead = db.get(Lead, lead_id)
     pages = db.scalars(
         select(WebsitePage)
+        .options(selectinload(WebsitePage.text_blob))
         .where(WebsitePage.workspace_id == workspace_id, WebsitePage.lead_id == lead_id)
         .order_by(WebsitePage.created_at.desc())
     ).all()
@@ -39,24 +39,11 @@ def build_prepared_lead_context(*, db: Session, workspace_id: UUID, lead_id: UUI
         phones.update(page.extracted_phones or [])
 
     return {
-        "workspace_profile": {
-            "business_name": profile.business_name if profile else None,
-            "business_description": profile.business_description if profile else None,
-            "industries_served": list(profile.industries_served) if profile else [],
-            "service_specialties": list(profile.service_specialties) if profile else [],
-            "service_area": profile.service_area if profile else None,
-            "preferred_tone": profile.preferred_tone if profile else None,
-            "outreach_style": profile.outreach_style if profile else None,
-            "preferred_cta": profile.preferred_cta if profile else None,
-            "do_not_mention": list(profile.do_not_mention) if profile else [],
-        },
+        "workspace_profile": workspace_context.profile or workspace_profile_payload(None),
         "website_pages": pages_by_type,
         "contact_points": {
             "emails": sorted(emails),
             "phones": sorted(phones),
         },
-        "workspace_ai_strategy": build_strategy_context(
-            workspace_ai_strategy,
-            lead_category=db.get(Lead, lead_id).industry if db.get(Lead, lead_id) else None,
-        ),
+        "workspace_ai_strategy": workspace_context.strategy_context(lead.industry if lead else None),
     }
@@ -2,14 +2,20 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from urllib.parse import urlparse
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from pydantic import EmailStr, TypeAdapter, ValidationError
-from sqlalchemy import func, select
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.models.dedupe_keys import company_location_key, dedupe_key_values, website_key
+from app.models.duplicate_candidate import DUPLICATE_ENTITY_LEAD
 from app.models.lead import Lead
+from app.models.lead_pipeline import pipeline_state
 from app.models.lead_status import DEFAULT_LEAD_STATUS, normalize_lead_status
+from app.models.search_document import SEARCH_ENTITY_LEAD, refresh_search_documents
+from app.services.duplicate_detection import flag_duplicates
 
 email_adapter = TypeAdapter(EmailStr)
 
@@ -81,35 +87,54 @@ def normalize_website_url(value: str | None) -> str | None:
     return f"{scheme}://{host}{path}"
 
 
-def _company_location_key(company: str | None, location: str | None) -> str | None:
-    company_clean = _clean_text(company)
-    if company_clean is None:
-        return None
-    location_clean = _clean_text(location) or ""
-    return f"{company_clean.casefold()}::{location_clean.casefold()}"
+@dataclass(frozen=True)
+class LeadImportRow:
+    row_index: int
+    lead_id: UUID
+    company: str
+    location: str | None
+    website_url: str | None
 
 
-def _website_variants(normalized_url: str) -> set[str]:
-    base = normalized_url.casefold()
-    variants = {base}
-    if base.endswith("/"):
-        variants.add(base.rstrip("/"))
-    else:
-        variants.add(f"{base}/")
+@dataclass
+class LeadImportChunkResult:
+    imported: list[LeadImportRow]
+    duplicates: list[LeadImportDuplicate]
+    errors: list[LeadImportError]
+
 
-    if base.startswith("https://"):
-        http_base = "http://" + base.removeprefix("https://")
-        variants.add(http_base)
-        variants.add(http_base.rstrip("/") if http_base.endswith("/") else f"{http_base}/")
-    elif base.startswith("http://"):
-        https_base = "https://" + base.removeprefix("http://")
-        variants.add(https_base)
-        variants.add(https_base.rstrip("/") if https_base.endswith("/") else f"{https_base}/")
+def _existing_dedupe_keys(
+    db: Session,
+    *,
+    workspace_id: UUID,
+    website_keys: set[str],
+    company_location_keys: set[str],
+) -> tuple[set[str], set[str]]:
+    existing_websites: set[str] = set()
+    if website_keys:
+        existing_websites = set(
+            db.scalars(
+                select(Lead.website_key).where(
+                    Lead.workspace_id == workspace_id,
+                    Lead.website_key.in_(website_keys),
+                )
+            ).all()
+        )
 
-    return variants
+    existing_company_locations: set[str] = set()
+    if company_location_keys:
+        existing_company_locations = set(
+            db.scalars(
+                select(Lead.company_location_key).where(
+                    Lead.workspace_id == workspace_id,
+                    Lead.company_location_key.in_(company_location_keys),
+                )
+            ).all()
+        )
+    return existing_websites, existing_company_locations
 
 
-def import_leads_for_workspace(
+def import_lead_chunk(
     *,
     db: Session,
     workspace_id: UUID,
@@ -117,52 +142,33 @@ def import_leads_for_workspace(
     default_source: str,
     dedupe_by_website: bool = True,
     dedupe_by_company_location: bool = True,
-) -> LeadImportResult:
-    candidate_websites = {
-        normalized
+) -> LeadImportChunkResult:
+    """Validate, dedupe and insert one chunk of candidates without committing.
+
+    Dedupe lookups are bounded by the chunk size. Rows from earlier chunks are already
+    flushed to ``leads``, so cross-chunk duplicates are caught by the same lookups.
+    """
+    candidate_website_keys = {
+        key
         for candidate in candidates
-        for normalized in [normalize_website_url(candidate.website_url)]
-        if normalized
+        for key in [website_key(normalize_website_url(candidate.website_url))]
+        if key
     }
-    candidate_companies = {
-        company.casefold()
+    candidate_company_location_keys = {
+        key
         for candidate in candidates
-        for company in [_clean_text(candidate.company)]
-        if company
+        for key in [company_location_key(candidate.company, candidate.location)]
+        if key
     }
-    website_match_candidates = {
-        variant
-        for website in candidate_websites
-        for variant in _website_variants(website)
-    }
-
-    existing_websites: set[str] = set()
-    if dedupe_by_website and website_match_candidates:
-        rows = db.scalars(
-            select(Lead.website_url).where(
-                Lead.workspace_id == workspace_id,
-                Lead.website_url.is_not(None),
-                func.lower(Lead.website_url).in_(website_match_candidates),
-            )
-        )
-        existing_websites = {row.casefold() for row in rows if row}
-
-    existing_company_locations: set[str] = set()
-    if dedupe_by_company_location and candidate_companies:
-        rows = db.execute(
-            select(Lead.company, Lead.location).where(
-                Lead.workspace_id == workspace_id,
-                func.lower(Lead.company).in_(candidate_companies),
-            )
-        ).all()
-        existing_company_locations = {
-            key
-            for company, location in rows
-            for key in [_company_location_key(company, location)]
-            if key
-        }
+    existing_websites, existing_company_locations = _existing_dedupe_keys(
+        db,
+        workspace_id=workspace_id,
+        website_keys=candidate_website_keys if dedupe_by_website else set(),
+        company_location_keys=candidate_company_location_keys if dedupe_by_company_location else set(),
+    )
 
-    imported: list[Lead] = []
+    imported: list[LeadImportRow] = []
+    rows: list[dict[str, object]] = []
     duplicates: list[LeadImportDuplicate] = []
     errors: list[LeadImportError] = []
 
@@ -214,15 +220,15 @@ def import_leads_for_workspace(
                 )
                 continue
 
-        company_location_key = _company_location_key(company, location)
+        row_website_key = website_key(website_url)
+        row_company_location_key = company_location_key(company, location)
         duplicate_reason: str | None = None
-        if dedupe_by_website and website_url:
-            website_variants = _website_variants(website_url)
-            if website_variants & existing_websites or website_variants & seen_websites:
+        if dedupe_by_website and row_website_key:
+            if row_website_key in existing_websites or row_website_key in seen_websites:
                 duplicate_reason = "website_url"
 
-        if duplicate_reason is None and dedupe_by_company_location and company_location_key:
-            if company_location_key in existing_company_locations or company_location_key in seen_company_locations:
+        if duplicate_reason is None and dedupe_by_company_location and row_company_location_key:
+            if row_company_location_key in existing_company_locations or row_company_location_key in seen_company_locations:
                 duplicate_reason = "company+location"
 
         if duplicate_reason is not None:
@@ -237,29 +243,89 @@ def import_leads_for_workspace(
             )
             continue
 
-        lead = Lead(
+        lead_id = uuid4()
+        lead_status = normalize_lead_status(candidate.status, fallback=DEFAULT_LEAD_STATUS)
+        rows.append(
+            {
+                "id": lead_id,
+                "workspace_id": workspace_id,
+                "name": _clean_text(candidate.name) or company,
+                "title": _clean_text(candidate.title),
+                "company": company,
+                "industry": _clean_text(candidate.industry),
+                "location": location,
+                "website_url": website_url,
+                "email": email,
+                "source": _clean_text(candidate.source) or default_source,
+                "status": lead_status,
+                # Core executemany skips the ORM listeners that maintain these keys and the state.
+                **dedupe_key_values(website=website_url, company=company, location=location, phone=None),
+                **pipeline_state(lead_status),
+            }
+        )
+        imported.append(
+            LeadImportRow(
+                row_index=candidate.row_index,
+                lead_id=lead_id,
+                company=company,
+                location=location,
+                website_url=website_url,
+            )
+        )
+        if dedupe_by_website and row_website_key:
+            seen_websites.add(row_website_key)
+        if dedupe_by_company_location and row_company_location_key:
+            seen_company_locations.add(row_company_location_key)
+
+    if rows:
+        # One executemany round trip instead of per-object ORM flushes.
+        db.execute(insert(Lead), rows)
+        refresh_search_documents(db.connection(), SEARCH_ENTITY_LEAD, [row.lead_id for row in imported])
+        flag_duplicates(
+            db,
+            workspace_id=workspace_id,
+            entity_type=DUPLICATE_ENTITY_LEAD,
+            ids=[row.lead_id for row in imported],
+        )
+
+    return LeadImportChunkResult(imported=imported, duplicates=duplicates, errors=errors)
+
+
+def import_leads_for_workspace(
+    *,
+    db: Session,
+    workspace_id: UUID,
+    candidates: list[LeadImportCandidate],
+    default_source: str,
+    dedupe_by_website: bool = True,
+    dedupe_by_company_location: bool = True,
+) -> LeadImportResult:
+    imported_ids: list[UUID] = []
+    duplicates: list[LeadImportDuplicate] = []
+    errors: list[LeadImportError] = []
+
+    chunk_size = max(1, settings.lead_import_chunk_size)
+    for start in range(0, len(candidates), chunk_size):
+        chunk = import_lead_chunk(
+            db=db,
             workspace_id=workspace_id,
-            name=_clean_text(candidate.name) or company,
-            title=_clean_text(candidate.title),
-            company=company,
-            industry=_clean_text(candidate.industry),
-            location=location,
-            website_url=website_url,
-            email=email,
-            source=_clean_text(candidate.source) or default_source,
-            status=normalize_lead_status(candidate.status, fallback=DEFAULT_LEAD_STATUS),
+            candidates=candidates[start:start + chunk_size],
+            default_source=default_source,
+            dedupe_by_website=dedupe_by_website,
+            dedupe_by_company_location=dedupe_by_company_location,
         )
-        imported.append(lead)
-        if dedupe_by_website and website_url:
-            seen_websites.update(_website_variants(website_url))
-        if dedupe_by_company_location and company_location_key:
-            seen_company_locations.add(company_location_key)
-
-    if imported:
-        db.add_all(imported)
+        imported_ids.extend(row.lead_id for row in chunk.imported)
+        duplicates.extend(chunk.duplicates)
+        errors.extend(chunk.errors)
+
+    imported: list[Lead] = []
+    if imported_ids:
         db.commit()
-        for lead in imported:
-            db.refresh(lead)
+        # Reloaded per chunk so the IN list stays under the driver's bind parameter limit.
+        for start in range(0, len(imported_ids), chunk_size):
+            chunk_ids = imported_ids[start:start + chunk_size]
+            by_id = {lead.id: lead for lead in db.scalars(select(Lead).where(Lead.id.in_(chunk_ids)))}
+            imported.extend(by_id[lead_id] for lead_id in chunk_ids if lead_id in by_id)
 
     return LeadImportResult(
         imported=imported,
@@ -0,0 +1,295 @@
+"""Streaming CSV/JSONL lead imports.
+
+Uploads are spooled to disk, then read row by row and imported in fixed-size chunks so memory
+and dedupe query sizes stay bounded regardless of file size. Each chunk commits its leads and
+the job's progress counters together, and appends its rows to a CSV report on disk.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+import logging
+import shutil
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any, Iterator
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.lead_import_job import (
+    LEAD_IMPORT_JOB_COMPLETED,
+    LEAD_IMPORT_JOB_FAILED,
+    LEAD_IMPORT_JOB_PENDING,
+    LEAD_IMPORT_JOB_RUNNING,
+    LeadImportJob,
+)
+from app.schemas.lead import LeadImportItem
+from app.services.lead_import import (
+    LeadImportCandidate,
+    LeadImportChunkResult,
+    LeadImportError,
+    import_lead_chunk,
+)
+
+logger = logging.getLogger(__name__)
+
+LEAD_IMPORT_FORMATS = ("csv", "jsonl")
+REPORT_COLUMNS = ("row_index", "outcome", "reason", "lead_id", "company", "location", "website_url")
+
+# Header spellings accepted in addition to the LeadImportItem field names.
+_FIELD_ALIASES = {
+    "company_name": "company",
+    "website": "website_url",
+    "url": "website_url",
+    "address": "location",
+    "category": "industry",
+}
+
+
+class LeadImportFileError(ValueError):
+    pass
+
+
+def detect_import_format(filename: str | None, declared: str | None = None) -> str:
+    if declared:
+        normalized = declared.strip().lower()
+        if normalized in {"ndjson", "json"}:
+            normalized = "jsonl"
+        if normalized not in LEAD_IMPORT_FORMATS:
+            raise LeadImportFileError(f"Unsupported import format: {declared}")
+        return normalized
+    suffix = Path(filename or "").suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in {".jsonl", ".ndjson"}:
+        return "jsonl"
+    raise LeadImportFileError("Upload a .csv or .jsonl file, or pass format=csv|jsonl.")
+
+
+def _import_dir() -> Path:
+    path = Path(settings.lead_import_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def create_lead_import_job(
+    db: Session,
+    *,
+    workspace_id: UUID,
+    upload: IO[bytes],
+    filename: str | None,
+    file_format: str,
+    source: str,
+    dedupe_by_website: bool,
+    dedupe_by_company_location: bool,
+) -> LeadImportJob:
+    """Spool ``upload`` to the import directory and record a pending job for it."""
+    job = LeadImportJob(
+        workspace_id=workspace_id,
+        status=LEAD_IMPORT_JOB_PENDING,
+        source=source,
+        file_format=file_format,
+        filename=(filename or "")[:255] or None,
+        dedupe_by_website=dedupe_by_website,
+        dedupe_by_company_location=dedupe_by_company_location,
+    )
+    db.add(job)
+    db.flush()
+
+    upload_path = _import_dir() / f"{job.id}.{file_format}"
+    with upload_path.open("wb") as dst:
+        shutil.copyfileobj(upload, dst, length=1024 * 1024)
+    total_bytes = upload_path.stat().st_size
+    if total_bytes > settings.lead_import_max_bytes:
+        upload_path.unlink(missing_ok=True)
+        db.rollback()
+        raise LeadImportFileError(f"Import file exceeds the {settings.lead_import_max_bytes} byte limit.")
+
+    job.upload_path = str(upload_path)
+    job.report_path = str(_import_dir() / f"{job.id}.report.csv")
+    job.total_bytes = total_bytes
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def _normalize_record(record: dict[str, Any]) -> dict[str, Any]:
+    normalized: dict[str, Any] = {}
+    for key, value in record.items():
+        if key is None:
+            continue
+        field = str(key).strip().lower()
+        field = _FIELD_ALIASES.get(field, field)
+        if field not in LeadImportItem.model_fields or field in normalized:
+            continue
+        if isinstance(value, str):
+            value = value.strip() or None
+        elif value is not None:
+            value = str(value)
+        normalized[field] = value
+    return normalized
+
+
+def _iter_records(handle: IO[bytes], file_format: str) -> Iterator[tuple[int, dict[str, Any] | None, str | None]]:
+    """Yield ``(row_index, record, parse_error)`` lazily from the spooled file."""
+    text = io.TextIOWrapper(handle, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        if file_format == "csv":
+            for index, row in enumerate(csv.DictReader(text)):
+                yield index, row, None
+            return
+
+        index = 0
+        for line in text:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield index, None, f"invalid JSON: {exc.msg}"
+            else:
+                if isinstance(record, dict):
+                    yield index, record, None
+                else:
+                    yield index, None, "row is not a JSON object"
+            index += 1
+    finally:
+        # Leave ``handle`` open for the caller's progress reporting.
+        text.detach()
+
+
+def _to_candidate(row_index: int, record: dict[str, Any]) -> LeadImportCandidate:
+    item = LeadImportItem.model_validate(_normalize_record(record))
+    return LeadImportCandidate(
+        row_index=row_index,
+        name=item.name,
+        title=item.title,
+        company=item.company,
+        industry=item.industry,
+        location=item.location,
+        website_url=item.website_url,
+        email=item.email,
+        source=item.source,
+        status=item.status,
+    )
+
+
+def _validation_reason(exc: ValidationError) -> str:
+    first = exc.errors()[0] if exc.errors() else {}
+    location = ".".join(str(part) for part in first.get("loc", ())) or "row"
+    return f"{location}: {first.get('msg', 'invalid value')}"
+
+
+def _write_report_rows(writer: csv.writer, chunk: LeadImportChunkResult, parse_errors: list[LeadImportError]) -> None:
+    rows: list[tuple[Any, ...]] = []
+    for row in chunk.imported:
+        rows.append((row.row_index, "imported", "", row.lead_id, row.company, row.location or "", row.website_url or ""))
+    for row in chunk.duplicates:
+        rows.append((row.row_index, "duplicate", row.reason, "", row.company or "", row.location or "", row.website_url or ""))
+    for row in [*chunk.errors, *parse_errors]:
+        rows.append((row.row_index, "error", row.reason, "", row.company or "", row.location or "", row.website_url or ""))
+    rows.sort(key=lambda item: item[0])
+    writer.writerows(rows)
+
+
+def run_lead_import_job(
+    db: Session,
+    job_id: UUID,
+    *,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> LeadImportJob | None:
+    """Process a pending import job to completion; returns the job, or None if it was not pending.
+
+    ``on_progress(processed_bytes, total_bytes)`` is called after each committed chunk. A
+    failure, including an exception it raises (e.g. a job cancellation), is recorded on the
+    import job and then re-raised.
+    """
+    job = db.get(LeadImportJob, job_id)
+    if job is None or job.status != LEAD_IMPORT_JOB_PENDING:
+        return None
+    job.status = LEAD_IMPORT_JOB_RUNNING
+    job.started_at = datetime.now(timezone.utc)
+    db.commit()
+
+    try:
+        _process_job(db, job, on_progress)
+    except Exception as exc:
+        db.rollback()
+        job.status = LEAD_IMPORT_JOB_FAILED
+        job.error = (str(exc) or exc.__class__.__name__)[:2000]
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+        raise
+
+    job.status = LEAD_IMPORT_JOB_COMPLETED
+    job.finished_at = datetime.now(timezone.utc)
+    db.commit()
+    if job.upload_path:
+        Path(job.upload_path).unlink(missing_ok=True)
+    logger.info(
+        "Lead import job finished job_id=%s rows=%s imported=%s duplicates=%s errors=%s",
+        job.id,
+        job.processed_rows,
+        job.imported_count,
+        job.duplicate_count,
+        job.error_count,
+    )
+    return job
+
+
+def _process_job(
+    db: Session,
+    job: LeadImportJob,
+    on_progress: Callable[[int, int], None] | None,
+) -> None:
+    chunk_size = max(1, settings.lead_import_chunk_size)
+    with open(job.upload_path or "", "rb") as handle, open(job.report_path or "", "w", newline="", encoding="utf-8") as report:
+        writer = csv.writer(report)
+        writer.writerow(REPORT_COLUMNS)
+
+        candidates: list[LeadImportCandidate] = []
+        parse_errors: list[LeadImportError] = []
+
+        def flush() -> None:
+            chunk = import_lead_chunk(
+                db=db,
+                workspace_id=job.workspace_id,
+                candidates=candidates,
+                default_source=job.source,
+                dedupe_by_website=job.dedupe_by_website,
+                dedupe_by_company_location=job.dedupe_by_company_location,
+            )
+            job.processed_rows += len(candidates) + len(parse_errors)
+            job.imported_count += len(chunk.imported)
+            job.duplicate_count += len(chunk.duplicates)
+            job.error_count += len(chunk.errors) + len(parse_errors)
+            job.processed_bytes = min(handle.tell(), job.total_bytes)
+            db.commit()
+            _write_report_rows(writer, chunk, parse_errors)
+            report.flush()
+            candidates.clear()
+            parse_errors.clear()
+            if on_progress is not None:
+                on_progress(job.processed_bytes, job.total_bytes)
+
+        for row_index, record, parse_error in _iter_records(handle, job.file_format):
+            if record is not None:
+                try:
+                    candidates.append(_to_candidate(row_index, record))
+                except ValidationError as exc:
+                    parse_error = _validation_reason(exc)
+            if parse_error is not None:
+                parse_errors.append(
+                    LeadImportError(row_index=row_index, reason=parse_error, company=None, location=None, website_url=None)
+                )
+            if len(candidates) + len(parse_errors) >= chunk_size:
+                flush()
+
+        if candidates or parse_errors:
+            flush()
+        job.processed_bytes = job.total_bytes
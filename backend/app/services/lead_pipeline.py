@@ -0,0 +1,46 @@
+"""Rebuild of the materialized pipeline state on leads.
+
+Runs on a plain connection so the Alembic migration, the SQLite startup path and
+``scripts/rebuild_lead_pipeline_states.py`` can share it.
+"""
+from __future__ import annotations
+
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.engine import Connection
+
+from app.models.lead import Lead
+from app.models.lead_pipeline import PIPELINE_STATE_COLUMNS, compute_pipeline_states, write_pipeline_states
+
+
+def rebuild_lead_pipeline_states(
+    connection: Connection,
+    workspace_id: UUID | None = None,
+    *,
+    batch_size: int = 500,
+) -> int:
+    """Recompute the state of every lead (optionally one workspace) and store what drifted.
+
+    Returns the number of leads whose stored state was corrected. Does not commit.
+    """
+    leads = Lead.__table__
+    stored_columns = [leads.c[column] for column in PIPELINE_STATE_COLUMNS]
+    corrected = 0
+    last_id = None
+    while True:
+        query = select(leads.c.id, leads.c.status, *stored_columns).order_by(leads.c.id).limit(batch_size)
+        if workspace_id is not None:
+            query = query.where(leads.c.workspace_id == workspace_id)
+        if last_id is not None:
+            query = query.where(leads.c.id > last_id)
+        rows = connection.execute(query).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        states = compute_pipeline_states(connection, {row[0]: row[1] for row in rows})
+        stored = {row[0]: dict(zip(PIPELINE_STATE_COLUMNS, row[2:])) for row in rows}
+        drifted = {lead_id: state for lead_id, state in states.items() if state != stored[lead_id]}
+        write_pipeline_states(connection, drifted)
+        corrected += len(drifted)
+    return corrected
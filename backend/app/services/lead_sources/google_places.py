@@ -1,12 +1,35 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
 import re
+import threading
 import time
-from dataclasses import dataclass
-from typing import Any
+from collections import deque
+from dataclasses import asdict, dataclass
+from collections.abc import AsyncIterator, Collection
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 import httpx
 
+from app.core.config import settings
+from app.models.places_cache_entry import PLACES_CACHE_DETAILS, PLACES_CACHE_GEOCODE, PLACES_CACHE_NEARBY
+from app.services.lead_sources.places_sweep import (
+    NEARBY_RESULT_CAP,
+    BoundingBox,
+    PlacesSweepStateError,
+    SweepArea,
+    SweepState,
+    SweepTile,
+    initial_tiles,
+    sweep_fingerprint,
+    write_sweep_state,
+)
+
+if TYPE_CHECKING:
+    from app.services.lead_sources.places_cache import PlacesCache
+
 logger = logging.getLogger(__name__)
 
 NEARBY_SEARCH_URL = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
@@ -149,12 +172,60 @@ AUTOCOMPLETE_URL = "https://maps.googleapis.com/maps/api/place/autocomplete/json
 
 _LAT_LNG_PATTERN = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
 NEXT_PAGE_TOKEN_DELAY_SECONDS = 2.0
+# A fresh next_page_token is rejected with INVALID_REQUEST until Google activates it.
+NEXT_PAGE_TOKEN_MAX_ATTEMPTS = 4
+PLACE_DETAILS_FIELDS = "name,vicinity,formatted_phone_number,website,rating,user_ratings_total"
+# Minimum spacing between on-disk sweep checkpoints.
+SWEEP_CHECKPOINT_SECONDS = 5.0
 
 
 class GooglePlacesCrawlerError(RuntimeError):
     pass
 
 
+class GooglePlacesStatusError(GooglePlacesCrawlerError):
+    def __init__(self, status: str | None, message: str) -> None:
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+
+class QpsRateLimiter:
+    """Spaces request start times to at most ``qps`` per second across threads and event loops.
+
+    Callers reserve a slot under a plain lock and then sleep outside it, so the same limiter
+    can pace the sync crawler, ``asyncio.run`` calls from worker threads and the CLI.
+    """
+
+    def __init__(self, qps: float) -> None:
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self.set_rate(qps)
+
+    def set_rate(self, qps: float) -> None:
+        self._interval = 1.0 / qps if qps > 0 else 0.0
+
+    def _reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+            return slot - now
+
+    def acquire(self) -> None:
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+# Shared by every crawler in the process: the quota belongs to the API key, not the caller.
+places_rate_limiter = QpsRateLimiter(settings.google_places_qps)
+
+
 @dataclass(frozen=True)
 class GooglePlaceLead:
     place_id: str
@@ -167,27 +238,266 @@ class GooglePlaceLead:
     business_type: str
 
 
+def _parse_payload(response: httpx.Response) -> dict[str, Any]:
+    if response.status_code != 200:
+        raise GooglePlacesCrawlerError(f"Google Places HTTP error {response.status_code}: {response.text[:200]}")
+
+    payload = response.json()
+    status = payload.get("status")
+    if status in {"OK", "ZERO_RESULTS"}:
+        return payload
+
+    error_message = payload.get("error_message") or "Google Places request failed"
+    raise GooglePlacesStatusError(status, error_message)
+
+
+def _lat_lng_from_geocode(payload: dict[str, Any], raw: str) -> str:
+    results = payload.get("results")
+    if not isinstance(results, list) or not results:
+        raise GooglePlacesCrawlerError(f"No geocoding results for: {raw!r}")
+
+    first = results[0]
+    if not isinstance(first, dict):
+        raise GooglePlacesCrawlerError("Geocoding response was invalid.")
+
+    geometry = first.get("geometry")
+    if not isinstance(geometry, dict):
+        raise GooglePlacesCrawlerError("Geocoding result missing geometry.")
+
+    loc = geometry.get("location")
+    if not isinstance(loc, dict):
+        raise GooglePlacesCrawlerError("Geocoding result missing coordinates.")
+
+    lat = loc.get("lat")
+    lng = loc.get("lng")
+    if not isinstance(lat, (int, float)) or not isinstance(lng, (int, float)):
+        raise GooglePlacesCrawlerError("Geocoding returned invalid lat/lng.")
+
+    formatted = GooglePlacesCrawler._format_lat_lng(float(lat), float(lng))
+    logger.info("Geocoded %r -> %s", raw, formatted)
+    return formatted
+
+
+def _bounds_from_geocode(payload: dict[str, Any]) -> BoundingBox | None:
+    results = payload.get("results")
+    if not isinstance(results, list) or not results or not isinstance(results[0], dict):
+        return None
+    geometry = results[0].get("geometry")
+    if not isinstance(geometry, dict):
+        return None
+    # ``bounds`` covers the whole feature; ``viewport`` is only the recommended map view.
+    box = geometry.get("bounds") or geometry.get("viewport")
+    if not isinstance(box, dict):
+        return None
+    try:
+        return BoundingBox(
+            south=float(box["southwest"]["lat"]),
+            west=float(box["southwest"]["lng"]),
+            north=float(box["northeast"]["lat"]),
+            east=float(box["northeast"]["lng"]),
+        )
+    except (KeyError, TypeError, ValueError):
+        # Missing corners, or a box crossing the antimeridian.
+        return None
+
+
+def _page_place_ids(payload: dict[str, Any]) -> list[str]:
+    return [place["place_id"] for place in payload.get("results", []) if isinstance(place.get("place_id"), str)]
+
+
+def _page_places(payload: dict[str, Any]) -> list[list[Any]]:
+    """``[place_id, lat, lng]`` per result; coordinates are ``None`` when Google omits them."""
+    places: list[list[Any]] = []
+    for place in payload.get("results", []):
+        place_id = place.get("place_id")
+        if not isinstance(place_id, str):
+            continue
+        geometry = place.get("geometry")
+        loc = geometry.get("location") if isinstance(geometry, dict) else None
+        lat = loc.get("lat") if isinstance(loc, dict) else None
+        lng = loc.get("lng") if isinstance(loc, dict) else None
+        if isinstance(lat, (int, float)) and isinstance(lng, (int, float)):
+            places.append([place_id, float(lat), float(lng)])
+        else:
+            places.append([place_id, None, None])
+    return places
+
+
+def _places_in_area(places: list[list[Any]], area: SweepArea) -> list[str]:
+    return [
+        place[0]
+        for place in places
+        if isinstance(place, list)
+        and len(place) == 3
+        and isinstance(place[0], str)
+        and (place[1] is None or place[2] is None or area.contains(place[1], place[2]))
+    ]
+
+
+def _place_from_details(place_id: str, payload: dict[str, Any]) -> GooglePlaceLead | None:
+    details = payload.get("result")
+    if not isinstance(details, dict):
+        return None
+
+    company = details.get("name")
+    if not isinstance(company, str) or not company.strip():
+        return None
+
+    location = details.get("vicinity") if isinstance(details.get("vicinity"), str) else None
+    phone = details.get("formatted_phone_number") if isinstance(details.get("formatted_phone_number"), str) else None
+    website_url = details.get("website") if isinstance(details.get("website"), str) else None
+    raw_rating = details.get("rating")
+    rating = None
+    if isinstance(raw_rating, (int, float)):
+        rating = float(raw_rating)
+    raw_review_count = details.get("user_ratings_total")
+    review_count = raw_review_count if isinstance(raw_review_count, int) else None
+
+    return GooglePlaceLead(
+        place_id=place_id,
+        company=company.strip(),
+        location=location.strip() if location else None,
+        phone=phone.strip() if phone else None,
+        website_url=website_url.strip() if website_url else None,
+        rating=rating,
+        review_count=review_count,
+        business_type="",
+    )
+
+
+def _with_business_type(place: GooglePlaceLead, business_type: str) -> GooglePlaceLead:
+    return GooglePlaceLead(
+        place_id=place.place_id,
+        company=place.company,
+        location=place.location,
+        phone=place.phone,
+        website_url=place.website_url,
+        rating=place.rating,
+        review_count=place.review_count,
+        business_type=business_type,
+    )
+
+
 class GooglePlacesCrawler:
-    def __init__(self, *, api_key: str, timeout_seconds: float = 20.0) -> None:
+    def __init__(
+        self,
+        *,
+        api_key: str,
+        timeout_seconds: float = 20.0,
+        max_concurrency: int | None = None,
+        rate_limiter: QpsRateLimiter | None = None,
+        cache: PlacesCache | None = None,
+    ) -> None:
         api_key_clean = api_key.strip()
         if not api_key_clean:
             raise GooglePlacesCrawlerError("Google Places API key is missing")
         self.api_key = api_key_clean
         self.timeout = httpx.Timeout(timeout_seconds)
+        self.max_concurrency = max(1, max_concurrency or settings.google_places_concurrency)
+        self.rate_limiter = rate_limiter or places_rate_limiter
+        self.cache = cache
+
+    # Cache keys never include the API key, so entries are shared across workspaces.
+    @staticmethod
+    def _geocode_cache_key(raw: str) -> str:
+        return " ".join(raw.split()).casefold()
+
+    @staticmethod
+    def _nearby_cache_key(params: dict[str, Any]) -> str:
+        return json.dumps({k: v for k, v in params.items() if k != "key"}, sort_keys=True)
+
+    @staticmethod
+    def _details_cache_key(place_id: str) -> str:
+        return f"{PLACE_DETAILS_FIELDS}:{place_id}"
+
+    # A broken cache costs API calls, never the crawl: failures are logged and treated as misses.
+    def _cache_get_many(self, kind: str, keys: list[str]) -> dict[str, Any]:
+        if self.cache is None or not keys:
+            return {}
+        try:
+            return self.cache.get_many(kind, keys)
+        except Exception:
+            logger.warning("Places cache read failed kind=%s", kind, exc_info=True)
+            return {}
+
+    def _cache_get(self, kind: str, key: str) -> Any | None:
+        return self._cache_get_many(kind, [key]).get(key)
+
+    def _cache_set(self, kind: str, values: dict[str, Any], ttl_seconds: int) -> None:
+        if self.cache is None or not values:
+            return
+        try:
+            self.cache.set_many(kind, values, ttl_seconds)
+        except Exception:
+            logger.warning("Places cache write failed kind=%s", kind, exc_info=True)
 
     def _request_json(self, url: str, params: dict[str, Any]) -> dict[str, Any]:
+        self.rate_limiter.acquire()
         with httpx.Client(timeout=self.timeout) as client:
             response = client.get(url, params=params)
-        if response.status_code != 200:
-            raise GooglePlacesCrawlerError(f"Google Places HTTP error {response.status_code}: {response.text[:200]}")
+        return _parse_payload(response)
+
+    async def _request_json_async(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        url: str,
+        params: dict[str, Any],
+    ) -> dict[str, Any]:
+        async with semaphore:
+            await self.rate_limiter.acquire_async()
+            response = await client.get(url, params=params)
+        return _parse_payload(response)
 
-        payload = response.json()
-        status = payload.get("status")
-        if status in {"OK", "ZERO_RESULTS"}:
-            return payload
+    async def _next_page_async(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        next_page_token: str,
+    ) -> dict[str, Any]:
+        # Wait outside the semaphore so other categories and details keep using the slots.
+        params = {"key": self.api_key, "pagetoken": next_page_token}
+        attempt = 1
+        while True:
+            await asyncio.sleep(NEXT_PAGE_TOKEN_DELAY_SECONDS)
+            try:
+                return await self._request_json_async(client, semaphore, NEARBY_SEARCH_URL, params)
+            except GooglePlacesStatusError as exc:
+                if exc.status != "INVALID_REQUEST" or attempt >= NEXT_PAGE_TOKEN_MAX_ATTEMPTS:
+                    raise
+                attempt += 1
 
-        error_message = payload.get("error_message") or "Google Places request failed"
-        raise GooglePlacesCrawlerError(f"{status}: {error_message}")
+    async def _iter_nearby_pages_async(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        params: dict[str, Any],
+    ) -> AsyncIterator[dict[str, Any]]:
+        payload = await self._request_json_async(client, semaphore, NEARBY_SEARCH_URL, params)
+        yield payload
+        while next_page_token := payload.get("next_page_token"):
+            payload = await self._next_page_async(client, semaphore, next_page_token)
+            yield payload
+
+    async def _resolve_location_async(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        location: str,
+    ) -> str:
+        raw = (location or "").strip()
+        if not raw or _LAT_LNG_PATTERN.match(raw):
+            return self.resolve_location_for_nearby_search(raw)
+        cache_key = self._geocode_cache_key(raw)
+        cached = await asyncio.to_thread(self._cache_get, PLACES_CACHE_GEOCODE, cache_key)
+        if isinstance(cached, str):
+            return cached
+        payload = await self._request_json_async(client, semaphore, GEOCODE_URL, {"key": self.api_key, "address": raw})
+        resolved = _lat_lng_from_geocode(payload, raw)
+        await asyncio.to_thread(
+            self._cache_set, PLACES_CACHE_GEOCODE, {cache_key: resolved}, settings.places_geocode_ttl_seconds
+        )
+        return resolved
 
     @staticmethod
     def _format_lat_lng(lat: float, lng: float) -> str:
@@ -206,32 +516,14 @@ class GooglePlacesCrawler:
             lat_s, lng_s = match.group(1), match.group(2)
             return f"{float(lat_s):.7f},{float(lng_s):.7f}"
 
+        cache_key = self._geocode_cache_key(raw)
+        cached = self._cache_get(PLACES_CACHE_GEOCODE, cache_key)
+        if isinstance(cached, str):
+            return cached
         params = {"key": self.api_key, "address": raw}
-        payload = self._request_json(GEOCODE_URL, params)
-        results = payload.get("results")
-        if not isinstance(results, list) or not results:
-            raise GooglePlacesCrawlerError(f"No geocoding results for: {raw!r}")
-
-        first = results[0]
-        if not isinstance(first, dict):
-            raise GooglePlacesCrawlerError("Geocoding response was invalid.")
-
-        geometry = first.get("geometry")
-        if not isinstance(geometry, dict):
-            raise GooglePlacesCrawlerError("Geocoding result missing geometry.")
-
-        loc = geometry.get("location")
-        if not isinstance(loc, dict):
-            raise GooglePlacesCrawlerError("Geocoding result missing coordinates.")
-
-        lat = loc.get("lat")
-        lng = loc.get("lng")
-        if not isinstance(lat, (int, float)) or not isinstance(lng, (int, float)):
-            raise GooglePlacesCrawlerError("Geocoding returned invalid lat/lng.")
-
-        formatted = self._format_lat_lng(float(lat), float(lng))
-        logger.info("Geocoded %r -> %s", raw, formatted)
-        return formatted
+        resolved = _lat_lng_from_geocode(self._request_json(GEOCODE_URL, params), raw)
+        self._cache_set(PLACES_CACHE_GEOCODE, {cache_key: resolved}, settings.places_geocode_ttl_seconds)
+        return resolved
 
     def place_autocomplete(self, *, input_text: str, max_results: int = 8) -> list[dict[str, str]]:
         """Returns Place Autocomplete predictions (description + place_id)."""
@@ -254,11 +546,11 @@ class GooglePlacesCrawler:
                 out.append({"description": desc.strip(), "place_id": pid.strip()})
         return out
 
-    def get_places(self, *, location: str, radius: int, business_type: str, keyword: str = "business") -> list[str]:
+    def _nearby_params(self, *, location: str, radius: int, business_type: str, keyword: str) -> dict[str, Any]:
         places_type, resolved_keyword = resolve_places_type(business_type)
         # Prefer the category-derived keyword over the generic "business" default
         effective_keyword = resolved_keyword if resolved_keyword != business_type or keyword == "business" else keyword
-        params: dict[str, Any] = {
+        return {
             "key": self.api_key,
             "location": location,
             "radius": radius,
@@ -266,13 +558,18 @@ class GooglePlacesCrawler:
             "keyword": effective_keyword,
         }
 
+    def get_places(self, *, location: str, radius: int, business_type: str, keyword: str = "business") -> list[str]:
+        first_params = self._nearby_params(location=location, radius=radius, business_type=business_type, keyword=keyword)
+        cache_key = self._nearby_cache_key(first_params)
+        cached = self._cache_get(PLACES_CACHE_NEARBY, cache_key)
+        if isinstance(cached, list):
+            return [place_id for place_id in cached if isinstance(place_id, str)]
+        params = first_params
+
         place_ids: list[str] = []
         while True:
             payload = self._request_json(NEARBY_SEARCH_URL, params)
-            for place in payload.get("results", []):
-                place_id = place.get("place_id")
-                if isinstance(place_id, str):
-                    place_ids.append(place_id)
+            place_ids.extend(_page_place_ids(payload))
 
             next_page_token = payload.get("next_page_token")
             if not next_page_token:
@@ -284,46 +581,27 @@ class GooglePlacesCrawler:
                 "pagetoken": next_page_token,
             }
 
-        logger.info("Google Places fetched category=%s type=%s keyword=%s count=%s", business_type, places_type, effective_keyword, len(place_ids))
+        logger.info(
+            "Google Places fetched category=%s type=%s keyword=%s count=%s",
+            business_type,
+            first_params["type"],
+            first_params["keyword"],
+            len(place_ids),
+        )
+        self._cache_set(PLACES_CACHE_NEARBY, {cache_key: place_ids}, settings.places_nearby_ttl_seconds)
         return place_ids
 
     def get_place_details(self, place_id: str) -> GooglePlaceLead | None:
+        cache_key = self._details_cache_key(place_id)
+        cached = self._cache_get(PLACES_CACHE_DETAILS, cache_key)
+        if cached is not None:
+            return _place_from_details(place_id, {"result": cached})
         payload = self._request_json(
             PLACE_DETAILS_URL,
-            {
-                "key": self.api_key,
-                "place_id": place_id,
-                "fields": "name,vicinity,formatted_phone_number,website,rating,user_ratings_total",
-            },
-        )
-        details = payload.get("result")
-        if not isinstance(details, dict):
-            return None
-
-        company = details.get("name")
-        if not isinstance(company, str) or not company.strip():
-            return None
-
-        location = details.get("vicinity") if isinstance(details.get("vicinity"), str) else None
-        phone = details.get("formatted_phone_number") if isinstance(details.get("formatted_phone_number"), str) else None
-        website_url = details.get("website") if isinstance(details.get("website"), str) else None
-        raw_rating = details.get("rating")
-        rating = None
-        if isinstance(raw_rating, (int, float)):
-            rating = float(raw_rating)
-        raw_review_count = details.get("user_ratings_total")
-        review_count = raw_review_count if isinstance(raw_review_count, int) else None
-
-        return GooglePlaceLead(
-            place_id=place_id,
-            company=company.strip(),
-            location=location.strip() if location else None,
-            phone=phone.strip() if phone else None,
-            website_url=website_url.strip() if website_url else None,
-            rating=rating,
-            review_count=review_count,
-            business_type="",
+            {"key": self.api_key, "place_id": place_id, "fields": PLACE_DETAILS_FIELDS},
         )
+        self._cache_set(PLACES_CACHE_DETAILS, {cache_key: payload.get("result")}, settings.places_details_ttl_seconds)
+        return _place_from_details(place_id, payload)
 
     def discover_businesses(
         self,
@@ -333,9 +611,11 @@ class GooglePlacesCrawler:
         business_types: list[str],
         keyword: str = "business",
         missing_website_only: bool = False,
+        known_place_ids: Collection[str] = (),
     ) -> list[GooglePlaceLead]:
+        """Fetch details for every place found per category, skipping ``known_place_ids``."""
         resolved = self.resolve_location_for_nearby_search(location)
-        seen_place_ids: set[str] = set()
+        seen_place_ids: set[str] = set(known_place_ids)
         businesses: list[GooglePlaceLead] = []
 
         for business_type in business_types:
@@ -356,17 +636,446 @@ class GooglePlacesCrawler:
                 if missing_website_only and details.website_url:
                     continue
 
-                businesses.append(
-                    GooglePlaceLead(
-                        place_id=details.place_id,
-                        company=details.company,
-                        location=details.location,
-                        phone=details.phone,
-                        website_url=details.website_url,
-                        rating=details.rating,
-                        review_count=details.review_count,
-                        business_type=business_type,
+                businesses.append(_with_business_type(details, business_type))
+
+        return businesses
+
+    async def _crawl_category_async(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        loader: _PlaceDetailsLoader,
+        fresh_nearby: dict[str, list[str]],
+        *,
+        location: str,
+        radius: int,
+        business_type: str,
+        keyword: str,
+    ) -> list[str]:
+        """All place_ids for one category, handing each page to ``loader`` as it arrives."""
+        params = self._nearby_params(location=location, radius=radius, business_type=business_type, keyword=keyword)
+        cache_key = self._nearby_cache_key(params)
+        cached = await asyncio.to_thread(self._cache_get, PLACES_CACHE_NEARBY, cache_key)
+        if isinstance(cached, list):
+            place_ids = [pid for pid in cached if isinstance(pid, str)]
+            await loader.track(place_ids)
+            return place_ids
+
+        place_ids = []
+        async for payload in self._iter_nearby_pages_async(client, semaphore, params):
+            page = _page_place_ids(payload)
+            place_ids.extend(page)
+            await loader.track(page)
+
+        fresh_nearby[cache_key] = place_ids
+        logger.info(
+            "Google Places fetched category=%s type=%s keyword=%s count=%s",
+            business_type,
+            params["type"],
+            params["keyword"],
+            len(place_ids),
+        )
+        return place_ids
+
+    async def discover_businesses_async(
+        self,
+        *,
+        location: str,
+        radius: int,
+        business_types: list[str],
+        keyword: str = "business",
+        missing_website_only: bool = False,
+        known_place_ids: Collection[str] = (),
+    ) -> list[GooglePlaceLead]:
+        """Concurrent ``discover_businesses``: same results in the same order.
+
+        Categories page concurrently, and each place's details request starts as soon as its
+        id is first seen, so next-page-token waits overlap with details fetching. Every
+        request goes through ``max_concurrency`` and the shared QPS limiter. Cache reads and
+        writes run in worker threads and are batched per page and per crawl respectively.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        known = set(known_place_ids)
+        fresh_nearby: dict[str, list[str]] = {}
+        limits = httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+
+        async with httpx.AsyncClient(timeout=self.timeout, limits=limits) as client:
+            loader = _PlaceDetailsLoader(self, client, semaphore, skip_place_ids=known)
+
+            category_tasks: list[asyncio.Task[list[str]]] = []
+            try:
+                resolved = await self._resolve_location_async(client, semaphore, location)
+                category_tasks = [
+                    asyncio.create_task(
+                        self._crawl_category_async(
+                            client,
+                            semaphore,
+                            loader,
+                            fresh_nearby,
+                            location=resolved,
+                            radius=radius,
+                            business_type=business_type,
+                            keyword=keyword,
+                        )
                     )
+                    for business_type in business_types
+                ]
+                per_category = await asyncio.gather(*category_tasks)
+                details = await loader.gather()
+            finally:
+                # On failure, stop the remaining requests before the client closes under them.
+                for task in category_tasks:
+                    task.cancel()
+                loader.cancel()
+                # Whatever was fetched is paid for; keep it even if the crawl failed.
+                await asyncio.to_thread(
+                    self._cache_set, PLACES_CACHE_NEARBY, fresh_nearby, settings.places_nearby_ttl_seconds
+                )
+                await loader.store_fresh()
+
+        seen_place_ids: set[str] = set(known)
+        businesses: list[GooglePlaceLead] = []
+        for business_type, place_ids in zip(business_types, per_category):
+            for place_id in place_ids:
+                if place_id in seen_place_ids:
+                    continue
+                seen_place_ids.add(place_id)
+                place = details.get(place_id)
+                if place is None:
+                    continue
+                if missing_website_only and place.website_url:
+                    continue
+                businesses.append(_with_business_type(place, business_type))
+        return businesses
+
+    async def stream_businesses_async(
+        self,
+        *,
+        location: str,
+        radius: int,
+        business_types: list[str],
+        keyword: str = "business",
+        missing_website_only: bool = False,
+        known_place_ids: Collection[str] = (),
+    ) -> AsyncIterator[tuple[str, list[GooglePlaceLead]]]:
+        """Yield ``(business_type, places)`` as each category's pages and details finish.
+
+        Categories crawl concurrently as in ``discover_businesses_async`` but are yielded in
+        completion order, so callers can persist results and checkpoint finished categories
+        while the rest are still running. A place found by several categories is yielded once,
+        under whichever category finished first.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        fresh_nearby: dict[str, list[str]] = {}
+        emitted: set[str] = set(known_place_ids)
+        limits = httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+
+        async with httpx.AsyncClient(timeout=self.timeout, limits=limits) as client:
+            loader = _PlaceDetailsLoader(self, client, semaphore, skip_place_ids=emitted)
+
+            async def crawl(resolved: str, business_type: str) -> tuple[str, list[str]]:
+                place_ids = await self._crawl_category_async(
+                    client,
+                    semaphore,
+                    loader,
+                    fresh_nearby,
+                    location=resolved,
+                    radius=radius,
+                    business_type=business_type,
+                    keyword=keyword,
+                )
+                return business_type, place_ids
+
+            category_tasks: list[asyncio.Task[tuple[str, list[str]]]] = []
+            try:
+                resolved = await self._resolve_location_async(client, semaphore, location)
+                category_tasks = [asyncio.create_task(crawl(resolved, business_type)) for business_type in business_types]
+                for next_category in asyncio.as_completed(category_tasks):
+                    business_type, place_ids = await next_category
+                    owned = [pid for pid in dict.fromkeys(place_ids) if pid not in emitted]
+                    emitted.update(owned)
+                    places = await asyncio.gather(*(loader.tasks[pid] for pid in owned))
+                    yield business_type, [
+                        _with_business_type(place, business_type)
+                        for place in places
+                        if place is not None and not (missing_website_only and place.website_url)
+                    ]
+            finally:
+                for task in category_tasks:
+                    task.cancel()
+                loader.cancel()
+                await asyncio.to_thread(
+                    self._cache_set, PLACES_CACHE_NEARBY, fresh_nearby, settings.places_nearby_ttl_seconds
+                )
+                await loader.store_fresh()
+
+    async def _resolve_sweep_area_async(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        location: str,
+        radius: int,
+    ) -> SweepArea:
+        """Use the geocoded bounds of a place name, or the box around ``radius`` for a lat,lng."""
+        raw = (location or "").strip()
+        if raw and not _LAT_LNG_PATTERN.match(raw):
+            cache_key = f"bounds:{self._geocode_cache_key(raw)}"
+            cached = await asyncio.to_thread(self._cache_get, PLACES_CACHE_GEOCODE, cache_key)
+            if isinstance(cached, dict):
+                return SweepArea(bounds=BoundingBox(**cached))
+            payload = await self._request_json_async(client, semaphore, GEOCODE_URL, {"key": self.api_key, "address": raw})
+            bounds = _bounds_from_geocode(payload)
+            if bounds is not None:
+                await asyncio.to_thread(
+                    self._cache_set,
+                    PLACES_CACHE_GEOCODE,
+                    {cache_key: asdict(bounds)},
+                    settings.places_geocode_ttl_seconds,
+                )
+                return SweepArea(bounds=bounds)
+        center = await self._resolve_location_async(client, semaphore, raw)
+        lat_s, lng_s = center.split(",")
+        return SweepArea(bounds=BoundingBox.around(float(lat_s), float(lng_s), radius))
+
+    async def sweep_area_async(
+        self,
+        *,
+        business_types: list[str],
+        area: SweepArea | None = None,
+        location: str = "",
+        radius: int = 15_000,
+        keyword: str = "business",
+        missing_website_only: bool = False,
+        known_place_ids: Collection[str] = (),
+        min_radius_meters: int | None = None,
+        max_radius_meters: int | None = None,
+        state_path: str | Path | None = None,
+    ) -> list[GooglePlaceLead]:
+        """Find every place per category across ``area`` despite the 60-result Nearby cap.
+
+        Without ``area``, sweeps the geocoded bounds of ``location`` (or the box around
+        ``radius`` when it is a lat,lng). Tiles for all categories run concurrently; a tile that
+        returns the cap is replaced by its four quadrants, down to ``min_radius_meters``.
+        Places are deduplicated across tiles and categories and filtered to the area. With
+        ``state_path``, progress is checkpointed there and a rerun resumes from it; a finished
+        state returns its results without calling the API.
+        """
+        min_radius = max(1, min_radius_meters or settings.places_sweep_min_radius_meters)
+        max_radius = max(min_radius, max_radius_meters or settings.places_sweep_max_radius_meters)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        known = set(known_place_ids)
+        category_order = {business_type: index for index, business_type in enumerate(business_types)}
+        fresh_nearby: dict[str, list[list[Any]]] = {}
+        limits = httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+        path = Path(state_path) if state_path is not None else None
+
+        async with httpx.AsyncClient(timeout=self.timeout, limits=limits) as client:
+            if area is None:
+                area = await self._resolve_sweep_area_async(client, semaphore, location, radius)
+            fingerprint = sweep_fingerprint(
+                area=area,
+                categories=business_types,
+                keyword=keyword,
+                min_radius_meters=min_radius,
+                max_radius_meters=max_radius,
+            )
+            try:
+                state = SweepState.load(path, fingerprint) if path is not None else None
+            except PlacesSweepStateError as exc:
+                raise GooglePlacesCrawlerError(str(exc)) from exc
+            if state is None:
+                state = SweepState.start(
+                    fingerprint, initial_tiles(area, business_types, max_radius_meters=max_radius)
+                )
+            else:
+                logger.info(
+                    "Resuming Places sweep pending_tiles=%s places=%s completed=%s",
+                    len(state.pending),
+                    len(state.places),
+                    state.completed,
+                )
+
+            loader = _PlaceDetailsLoader(self, client, semaphore, skip_place_ids=known | set(state.details))
+            last_checkpoint = time.monotonic()
+
+            async def checkpoint() -> None:
+                nonlocal last_checkpoint
+                last_checkpoint = time.monotonic()
+                if path is None:
+                    return
+                state.details.update(
+                    {pid: asdict(place) if place else None for pid, place in loader.finished().items()}
+                )
+                await asyncio.to_thread(write_sweep_state, path, state.dumps())
+
+            async def sweep_tile(tile: SweepTile) -> list[list[Any]]:
+                lat, lng = tile.center
+                params = self._nearby_params(
+                    location=self._format_lat_lng(lat, lng),
+                    radius=tile.radius_meters,
+                    business_type=tile.category,
+                    keyword=keyword,
                 )
+                # Sweep entries keep coordinates, so they live apart from plain nearby entries.
+                cache_key = f"sweep:{self._nearby_cache_key(params)}"
+                cached = await asyncio.to_thread(self._cache_get, PLACES_CACHE_NEARBY, cache_key)
+                if isinstance(cached, list):
+                    await loader.track(_places_in_area(cached, area))
+                    return cached
+
+                places: list[list[Any]] = []
+                async for payload in self._iter_nearby_pages_async(client, semaphore, params):
+                    state.nearby_requests += 1
+                    page = _page_places(payload)
+                    places.extend(page)
+                    await loader.track(_places_in_area(page, area))
+                fresh_nearby[cache_key] = places
+                return places
+
+            def finish_tile(tile: SweepTile, places: list[list[Any]]) -> list[SweepTile]:
+                for place_id in _places_in_area(places, area):
+                    current = state.places.get(place_id)
+                    if current is None or category_order[tile.category] < category_order.get(current, len(business_types)):
+                        state.places[place_id] = tile.category
+                children: list[SweepTile] = []
+                if len(places) >= NEARBY_RESULT_CAP:
+                    if tile.radius_meters > min_radius:
+                        children = [
+                            child
+                            for child in tile.quadrants()
+                            if area.intersects_circle(*child.center, child.radius_meters)
+                        ]
+                    else:
+                        state.truncated_tiles += 1
+                        logger.warning(
+                            "Places sweep tile still capped at minimum radius category=%s center=%s radius=%s",
+                            tile.category,
+                            tile.center,
+                            tile.radius_meters,
+                        )
+                del state.pending[tile.key]
+                state.pending.update({child.key: child for child in children})
+                return children
 
+            backlog = deque(state.pending.values())
+            running: dict[asyncio.Task[list[list[Any]]], SweepTile] = {}
+            try:
+                # Details for places found before an interruption but never fetched.
+                await loader.track([pid for pid, _ in state.places.items() if pid not in state.details])
+                while backlog or running:
+                    while backlog and len(running) < self.max_concurrency:
+                        tile = backlog.popleft()
+                        running[asyncio.create_task(sweep_tile(tile))] = tile
+                    done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        tile = running.pop(task)
+                        backlog.extend(finish_tile(tile, task.result()))
+                    if time.monotonic() - last_checkpoint >= SWEEP_CHECKPOINT_SECONDS:
+                        await checkpoint()
+                details = await loader.gather()
+                state.completed = True
+            finally:
+                for task in running:
+                    task.cancel()
+                loader.cancel()
+                await asyncio.to_thread(
+                    self._cache_set, PLACES_CACHE_NEARBY, fresh_nearby, settings.places_nearby_ttl_seconds
+                )
+                await loader.store_fresh()
+                await checkpoint()
+
+        logger.info(
+            "Places sweep finished categories=%s places=%s nearby_requests=%s truncated_tiles=%s",
+            len(business_types),
+            len(state.places),
+            state.nearby_requests,
+            state.truncated_tiles,
+        )
+        for place_id, raw in state.details.items():
+            details.setdefault(place_id, GooglePlaceLead(**raw) if raw else None)
+
+        businesses: list[GooglePlaceLead] = []
+        ordered = sorted(state.places.items(), key=lambda item: category_order.get(item[1], len(business_types)))
+        for place_id, business_type in ordered:
+            if place_id in known:
+                continue
+            place = details.get(place_id)
+            if place is None:
+                continue
+            if missing_website_only and place.website_url:
+                continue
+            businesses.append(_with_business_type(place, business_type))
         return businesses
+
+
+class _PlaceDetailsLoader:
+    """Starts one details request per new place_id within a crawl, reusing cached details.
+
+    Ids are claimed before any await so concurrent pages never double-fetch, and cache lookups
+    are batched per ``track`` call. Freshly fetched details are kept for ``store_fresh``.
+    """
+
+    def __init__(
+        self,
+        crawler: GooglePlacesCrawler,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        *,
+        skip_place_ids: Collection[str] = (),
+    ) -> None:
+        self._crawler = crawler
+        self._client = client
+        self._semaphore = semaphore
+        self._claimed: set[str] = set(skip_place_ids)
+        self._fresh: dict[str, Any] = {}
+        self.tasks: dict[str, asyncio.Task[GooglePlaceLead | None]] = {}
+
+    async def _fetch(self, place_id: str) -> GooglePlaceLead | None:
+        crawler = self._crawler
+        payload = await crawler._request_json_async(
+            self._client,
+            self._semaphore,
+            PLACE_DETAILS_URL,
+            {"key": crawler.api_key, "place_id": place_id, "fields": PLACE_DETAILS_FIELDS},
+        )
+        self._fresh[crawler._details_cache_key(place_id)] = payload.get("result")
+        return _place_from_details(place_id, payload)
+
+    @staticmethod
+    async def _from_cache(place_id: str, result: Any) -> GooglePlaceLead | None:
+        return _place_from_details(place_id, {"result": result})
+
+    async def track(self, place_ids: list[str]) -> None:
+        pending = [pid for pid in dict.fromkeys(place_ids) if pid not in self._claimed]
+        self._claimed.update(pending)
+        if not pending:
+            return
+        hits: dict[str, Any] = {}
+        if self._crawler.cache is not None:
+            keys = {self._crawler._details_cache_key(pid): pid for pid in pending}
+            cached = await asyncio.to_thread(self._crawler._cache_get_many, PLACES_CACHE_DETAILS, list(keys))
+            hits = {keys[key]: value for key, value in cached.items()}
+        for pid in pending:
+            if pid in hits:
+                self.tasks[pid] = asyncio.create_task(self._from_cache(pid, hits[pid]))
+            else:
+                self.tasks[pid] = asyncio.create_task(self._fetch(pid))
+
+    async def gather(self) -> dict[str, GooglePlaceLead | None]:
+        return dict(zip(self.tasks, await asyncio.gather(*self.tasks.values())))
+
+    def finished(self) -> dict[str, GooglePlaceLead | None]:
+        return {
+            pid: task.result()
+            for pid, task in self.tasks.items()
+            if task.done() and not task.cancelled() and task.exception() is None
+        }
+
+    def cancel(self) -> None:
+        for task in self.tasks.values():
+            task.cancel()
+
+    async def store_fresh(self) -> None:
+        await asyncio.to_thread(
+            self._crawler._cache_set, PLACES_CACHE_DETAILS, self._fresh, settings.places_details_ttl_seconds
+        )
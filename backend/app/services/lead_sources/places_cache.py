@@ -0,0 +1,78 @@
+"""Persistent cache for Google Places responses.
+
+The crawler only sees the ``PlacesCache`` protocol; ``SqlPlacesCache`` stores entries in
+``places_cache_entries`` through whatever session factory it is given, so the API uses the
+app database and ``crawler.py`` can point it at a local SQLite file.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Protocol
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.sqlite import as_utc
+from app.models.places_cache_entry import PlacesCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+class PlacesCache(Protocol):
+    def get_many(self, kind: str, keys: list[str]) -> dict[str, Any]: ...
+
+    def set_many(self, kind: str, values: dict[str, Any], ttl_seconds: int) -> None: ...
+
+
+def places_cache_key(kind: str, key: str) -> str:
+    return hashlib.sha256(f"{kind}:{key}".encode("utf-8")).hexdigest()
+
+
+class SqlPlacesCache:
+    def __init__(self, session_factory: sessionmaker[Session]) -> None:
+        self._session_factory = session_factory
+
+    def get_many(self, kind: str, keys: list[str]) -> dict[str, Any]:
+        if not keys:
+            return {}
+        by_digest = {places_cache_key(kind, key): key for key in keys}
+        now = datetime.now(timezone.utc)
+        with self._session_factory() as db:
+            rows = db.execute(
+                select(PlacesCacheEntry.cache_key, PlacesCacheEntry.payload, PlacesCacheEntry.expires_at).where(
+                    PlacesCacheEntry.cache_key.in_(by_digest)
+                )
+            ).all()
+        hits: dict[str, Any] = {}
+        for digest, payload, expires_at in rows:
+            if as_utc(expires_at) > now:
+                hits[by_digest[digest]] = payload
+        return hits
+
+    def set_many(self, kind: str, values: dict[str, Any], ttl_seconds: int) -> None:
+        if not values or ttl_seconds <= 0:
+            return
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(seconds=ttl_seconds)
+        entries = {places_cache_key(kind, key): value for key, value in values.items()}
+        with self._session_factory() as db:
+            # Replace rather than upsert so the same code runs on SQLite and PostgreSQL;
+            # expired rows are swept on the way.
+            db.execute(
+                delete(PlacesCacheEntry).where(
+                    (PlacesCacheEntry.cache_key.in_(entries)) | (PlacesCacheEntry.expires_at <= now)
+                )
+            )
+            db.add_all(
+                PlacesCacheEntry(cache_key=digest, kind=kind, payload=payload, expires_at=expires_at)
+                for digest, payload in entries.items()
+            )
+            try:
+                db.commit()
+            except IntegrityError:
+                # Another crawler cached the same responses first; theirs are just as good.
+                db.rollback()
+                logger.debug("Places cache write raced kind=%s entries=%s", kind, len(entries))
@@ -0,0 +1,292 @@
+"""Geometry and resumable state for grid-tiled Google Places area sweeps.
+
+Nearby Search returns at most 60 results per query, so one circle over a dense area silently
+truncates. A sweep covers the area's bounding box with square cells, queries each cell's
+circumscribed circle per category, and splits only the cells that hit the cap into quadrants
+until their results fit or they reach the minimum radius. The crawler drives the requests;
+this module holds the tiling and the on-disk progress used to resume interrupted sweeps.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+NEARBY_RESULT_CAP = 60
+MAX_NEARBY_RADIUS_METERS = 50_000
+SWEEP_STATE_VERSION = 1
+
+_METERS_PER_DEGREE_LAT = 111_320.0
+
+
+class PlacesSweepStateError(ValueError):
+    pass
+
+
+def _meters_per_degree_lng(lat: float) -> float:
+    return _METERS_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 1e-6)
+
+
+def _widest_lat(south: float, north: float) -> float:
+    """Latitude in ``[south, north]`` nearest the equator, where a degree of longitude is widest."""
+    return 0.0 if south <= 0 <= north else min(abs(south), abs(north))
+
+
+@dataclass(frozen=True)
+class BoundingBox:
+    south: float
+    west: float
+    north: float
+    east: float
+
+    def __post_init__(self) -> None:
+        if not (-90 <= self.south < self.north <= 90) or not (-180 <= self.west < self.east <= 180):
+            raise ValueError("Bounding box must be south,west,north,east with south < north and west < east.")
+
+    @classmethod
+    def parse(cls, raw: str) -> BoundingBox:
+        """Parse ``"south,west,north,east"`` in decimal degrees."""
+        parts = [part.strip() for part in raw.split(",")]
+        if len(parts) != 4:
+            raise ValueError("Bounding box must be south,west,north,east.")
+        try:
+            south, west, north, east = (float(part) for part in parts)
+        except ValueError as exc:
+            raise ValueError("Bounding box coordinates must be numbers.") from exc
+        return cls(south=south, west=west, north=north, east=east)
+
+    @classmethod
+    def around(cls, lat: float, lng: float, radius_meters: float) -> BoundingBox:
+        dlat = radius_meters / _METERS_PER_DEGREE_LAT
+        dlng = radius_meters / _meters_per_degree_lng(lat)
+        return cls(
+            south=max(lat - dlat, -90.0),
+            west=max(lng - dlng, -180.0),
+            north=min(lat + dlat, 90.0),
+            east=min(lng + dlng, 180.0),
+        )
+
+    @classmethod
+    def enclosing(cls, points: list[tuple[float, float]]) -> BoundingBox:
+        lats = [lat for lat, _ in points]
+        lngs = [lng for _, lng in points]
+        return cls(south=min(lats), west=min(lngs), north=max(lats), east=max(lngs))
+
+    def contains(self, lat: float, lng: float) -> bool:
+        return self.south <= lat <= self.north and self.west <= lng <= self.east
+
+
+def _point_in_polygon(lat: float, lng: float, polygon: tuple[tuple[float, float], ...]) -> bool:
+    inside = False
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
+        lat_i, lng_i = polygon[i]
+        lat_j, lng_j = polygon[j]
+        if (lat_i > lat) != (lat_j > lat):
+            crossing = lng_i + (lat - lat_i) * (lng_j - lng_i) / (lat_j - lat_i)
+            if lng < crossing:
+                inside = not inside
+        j = i
+    return inside
+
+
+def _segment_distance(px: float, py: float, ax: float, ay: float, bx: float, by: float) -> float:
+    dx, dy = bx - ax, by - ay
+    length_sq = dx * dx + dy * dy
+    t = 0.0 if length_sq == 0 else max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / length_sq))
+    return math.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+
+@dataclass(frozen=True)
+class SweepArea:
+    """The region a sweep must cover: a bounding box, optionally narrowed to a ``(lat, lng)`` ring."""
+
+    bounds: BoundingBox
+    polygon: tuple[tuple[float, float], ...] | None = None
+
+    @classmethod
+    def from_polygon(cls, points: list[tuple[float, float]]) -> SweepArea:
+        ring = [(float(lat), float(lng)) for lat, lng in points]
+        if len(ring) > 1 and ring[0] == ring[-1]:
+            ring.pop()
+        if len(ring) < 3:
+            raise ValueError("Polygon needs at least three points.")
+        return cls(bounds=BoundingBox.enclosing(ring), polygon=tuple(ring))
+
+    def contains(self, lat: float, lng: float) -> bool:
+        if not self.bounds.contains(lat, lng):
+            return False
+        return self.polygon is None or _point_in_polygon(lat, lng, self.polygon)
+
+    def intersects_circle(self, lat: float, lng: float, radius_meters: float) -> bool:
+        if self.polygon is None or _point_in_polygon(lat, lng, self.polygon):
+            return True
+        # Project onto a local plane around the circle centre; accurate enough at tile scale.
+        scale_lng = _meters_per_degree_lng(lat)
+        points = [((p_lng - lng) * scale_lng, (p_lat - lat) * _METERS_PER_DEGREE_LAT) for p_lat, p_lng in self.polygon]
+        for index, (ax, ay) in enumerate(points):
+            bx, by = points[(index + 1) % len(points)]
+            if _segment_distance(0.0, 0.0, ax, ay, bx, by) <= radius_meters:
+                return True
+        return False
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"bounds": asdict(self.bounds), "polygon": [list(point) for point in self.polygon or ()] or None}
+
+
+@dataclass(frozen=True)
+class SweepTile:
+    category: str
+    south: float
+    west: float
+    north: float
+    east: float
+    depth: int = 0
+
+    @property
+    def key(self) -> str:
+        return f"{self.category}|{self.depth}|{self.south:.7f},{self.west:.7f}"
+
+    @property
+    def center(self) -> tuple[float, float]:
+        return (self.south + self.north) / 2, (self.west + self.east) / 2
+
+    @property
+    def radius_meters(self) -> int:
+        half_height = (self.north - self.south) / 2 * _METERS_PER_DEGREE_LAT
+        half_width = (self.east - self.west) / 2 * _meters_per_degree_lng(_widest_lat(self.south, self.north))
+        return max(1, min(math.ceil(math.hypot(half_height, half_width)), MAX_NEARBY_RADIUS_METERS))
+
+    def quadrants(self) -> list[SweepTile]:
+        mid_lat, mid_lng = self.center
+        return [
+            SweepTile(self.category, south, west, north, east, self.depth + 1)
+            for south, north in ((self.south, mid_lat), (mid_lat, self.north))
+            for west, east in ((self.west, mid_lng), (mid_lng, self.east))
+        ]
+
+
+def initial_tiles(area: SweepArea, categories: list[str], *, max_radius_meters: int) -> list[SweepTile]:
+    """Cover ``area`` with the coarsest grid whose cells fit in a ``max_radius_meters`` circle."""
+    bounds = area.bounds
+    max_side = min(max_radius_meters, MAX_NEARBY_RADIUS_METERS) * math.sqrt(2)
+    height = (bounds.north - bounds.south) * _METERS_PER_DEGREE_LAT
+    width = (bounds.east - bounds.west) * _meters_per_degree_lng(_widest_lat(bounds.south, bounds.north))
+    rows = max(1, math.ceil(height / max_side))
+    cols = max(1, math.ceil(width / max_side))
+    lat_step = (bounds.north - bounds.south) / rows
+    lng_step = (bounds.east - bounds.west) / cols
+
+    cells = []
+    for row in range(rows):
+        for col in range(cols):
+            cell = SweepTile(
+                "",
+                bounds.south + row * lat_step,
+                bounds.west + col * lng_step,
+                bounds.south + (row + 1) * lat_step if row < rows - 1 else bounds.north,
+                bounds.west + (col + 1) * lng_step if col < cols - 1 else bounds.east,
+            )
+            if area.intersects_circle(*cell.center, cell.radius_meters):
+                cells.append(cell)
+    return [
+        SweepTile(category, cell.south, cell.west, cell.north, cell.east)
+        for category in categories
+        for cell in cells
+    ]
+
+
+def sweep_fingerprint(
+    *,
+    area: SweepArea,
+    categories: list[str],
+    keyword: str,
+    min_radius_meters: int,
+    max_radius_meters: int,
+) -> str:
+    """Identify a sweep by everything that changes which tiles get queried."""
+    raw = json.dumps(
+        {
+            "area": area.to_dict(),
+            "categories": categories,
+            "keyword": keyword,
+            "min_radius_meters": min_radius_meters,
+            "max_radius_meters": max_radius_meters,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SweepState:
+    """Progress of one sweep: tiles still to query, places found so far and their details.
+
+    ``places`` maps each place_id to the first (in request order) category that found it, in
+    discovery order. ``details`` holds fetched place details as plain dicts, ``None`` for places
+    Google returned no usable details for.
+    """
+
+    fingerprint: str
+    pending: dict[str, SweepTile]
+    places: dict[str, str] = field(default_factory=dict)
+    details: dict[str, dict[str, Any] | None] = field(default_factory=dict)
+    completed: bool = False
+    nearby_requests: int = 0
+    truncated_tiles: int = 0
+
+    @classmethod
+    def start(cls, fingerprint: str, tiles: list[SweepTile]) -> SweepState:
+        return cls(fingerprint=fingerprint, pending={tile.key: tile for tile in tiles})
+
+    @classmethod
+    def load(cls, path: Path, fingerprint: str) -> SweepState | None:
+        """Read the state at ``path``; ``None`` when there is nothing to resume."""
+        if not path.exists():
+            return None
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as exc:
+            raise PlacesSweepStateError(f"Could not read sweep state {path}: {exc}") from exc
+        if data.get("version") != SWEEP_STATE_VERSION:
+            raise PlacesSweepStateError(f"Sweep state {path} has an unsupported version.")
+        if data.get("fingerprint") != fingerprint:
+            raise PlacesSweepStateError(
+                f"Sweep state {path} belongs to a different area, category list or keyword; "
+                "use another state file or delete it."
+            )
+        return cls(
+            fingerprint=fingerprint,
+            pending={tile.key: tile for tile in (SweepTile(**raw) for raw in data.get("pending", []))},
+            places=dict(data.get("places", {})),
+            details=dict(data.get("details", {})),
+            completed=bool(data.get("completed")),
+            nearby_requests=int(data.get("nearby_requests", 0)),
+            truncated_tiles=int(data.get("truncated_tiles", 0)),
+        )
+
+    def dumps(self) -> str:
+        return json.dumps(
+            {
+                "version": SWEEP_STATE_VERSION,
+                "fingerprint": self.fingerprint,
+                "completed": self.completed,
+                "nearby_requests": self.nearby_requests,
+                "truncated_tiles": self.truncated_tiles,
+                "pending": [asdict(tile) for tile in self.pending.values()],
+                "places": self.places,
+                "details": self.details,
+            }
+        )
+
+
+def write_sweep_state(path: Path, serialized: str) -> None:
+    """Replace ``path`` atomically so an interrupted write never corrupts the resume point."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_text(serialized, encoding="utf-8")
+    os.replace(tmp_path, path)
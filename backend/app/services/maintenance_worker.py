@@ -0,0 +1,90 @@
+"""Periodic database housekeeping.
+
+Purges text blobs nothing references any more (every ``text_store_purge_interval_seconds``)
+and, on SQLite, refreshes planner statistics and releases free pages (every
+``sqlite_maintenance_interval_seconds``). It runs in every deployment, independently of the
+pipeline and background job workers, so disabling those does not let the database grow.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
+from app.db.sqlite import run_sqlite_maintenance
+from app.services.text_store import purge_unreferenced_text_blobs
+
+logger = logging.getLogger(__name__)
+
+# How often the worker checks whether a task is due; the intervals themselves are longer.
+MAINTENANCE_POLL_SECONDS = 60.0
+
+
+class MaintenanceWorker:
+    def __init__(self) -> None:
+        self._task: asyncio.Task[None] | None = None
+        self._stop_event = asyncio.Event()
+        self._last_text_purge = 0.0
+        self._last_sqlite_maintenance = 0.0
+
+    def start(self) -> None:
+        if self._task and not self._task.done():
+            return
+        self._stop_event.clear()
+        self._task = asyncio.create_task(self._run_loop(), name="maintenance-worker")
+
+    async def stop(self) -> None:
+        self._stop_event.set()
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._task = None
+
+    async def _run_loop(self) -> None:
+        logger.info(
+            "Maintenance worker started text_purge=%ss sqlite_maintenance=%ss",
+            settings.text_store_purge_interval_seconds,
+            settings.sqlite_maintenance_interval_seconds,
+        )
+        # Waits before the first cycle too, so it stays clear of the writes of application startup.
+        while True:
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=MAINTENANCE_POLL_SECONDS)
+                break
+            except asyncio.TimeoutError:
+                pass
+
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Maintenance worker cycle failed")
+        logger.info("Maintenance worker stopped")
+
+    async def run_once(self) -> None:
+        if time.monotonic() - self._last_text_purge >= settings.text_store_purge_interval_seconds:
+            self._last_text_purge = time.monotonic()
+            await asyncio.to_thread(self._purge_text_blobs)
+        if (
+            engine.dialect.name == "sqlite"
+            and time.monotonic() - self._last_sqlite_maintenance >= settings.sqlite_maintenance_interval_seconds
+        ):
+            self._last_sqlite_maintenance = time.monotonic()
+            await asyncio.to_thread(run_sqlite_maintenance, engine)
+
+    @staticmethod
+    def _purge_text_blobs() -> None:
+        # Deleting leads and partners orphans their blobs in the shared text store.
+        with SessionLocal() as db:
+            purged = purge_unreferenced_text_blobs(db)
+        if purged:
+            logger.info("Purged unreferenced text blobs count=%s", purged)
+
+
+maintenance_worker = MaintenanceWorker()
@@ -0,0 +1,411 @@
+"""Outbound send queue — paces approved drafts out through Gmail.
+
+Approved drafts are enqueued once (keyed by draft id) and a background worker sends at most one
+message per workspace per tick, honouring a minimum interval between sends, a daily quota, an
+optional business-hours window and Gmail's 429/5xx back-pressure.
+
+Delivery is at-most-once: the Gmail draft is created and committed before the send call, and every
+retry re-sends that same Gmail draft. Gmail deletes a draft once it is sent, so a retry that gets a
+404 means the earlier attempt may have gone out — the item is failed instead of re-creating the
+draft and risking a duplicate email.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from datetime import datetime, time, timedelta, timezone
+from uuid import UUID
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import httpx
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.db.sqlite import as_utc
+from app.models.email_draft import EmailDraft
+from app.models.lead import Lead
+from app.models.outbound_email import (
+    OUTBOUND_STATUS_CANCELLED,
+    OUTBOUND_STATUS_FAILED,
+    OUTBOUND_STATUS_QUEUED,
+    OUTBOUND_STATUS_SENDING,
+    OUTBOUND_STATUS_SENT,
+    OutboundEmail,
+)
+from app.services.automation_policy import AutomationPolicy, resolve_automation_policy
+from app.services.draft_delivery import (
+    REVIEW_STATUS_REJECTED,
+    ensure_gmail_draft_for_email_draft,
+    send_email_draft_via_gmail,
+)
+from app.services.gmail_service import GmailApiError, GmailIntegrationError
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKOFF_SECONDS = 3600
+# A worker that died mid-send leaves its item in "sending"; after this long it is retried.
+STALE_SENDING_SECONDS = 600
+
+
+def idempotency_key_for_draft(draft_id: UUID) -> str:
+    return f"draft:{draft_id}"
+
+
+def enqueue_draft_send(
+    db: Session,
+    *,
+    draft: EmailDraft,
+    scheduled_for: datetime | None = None,
+) -> OutboundEmail:
+    """Queue ``draft`` for sending. Re-enqueueing the same draft returns the existing item."""
+    key = idempotency_key_for_draft(draft.id)
+    existing = db.scalar(select(OutboundEmail).where(OutboundEmail.idempotency_key == key))
+    if existing is not None:
+        return existing
+
+    item = OutboundEmail(
+        workspace_id=draft.workspace_id,
+        draft_id=draft.id,
+        lead_id=draft.lead_id,
+        idempotency_key=key,
+        status=OUTBOUND_STATUS_QUEUED,
+        next_attempt_at=scheduled_for or datetime.now(timezone.utc),
+    )
+    try:
+        with db.begin_nested():
+            db.add(item)
+    except IntegrityError:
+        # Another worker or request enqueued the same draft concurrently.
+        return db.scalar(select(OutboundEmail).where(OutboundEmail.idempotency_key == key))
+    return item
+
+
+def get_active_send_for_draft(db: Session, draft_id: UUID) -> OutboundEmail | None:
+    return db.scalar(
+        select(OutboundEmail).where(
+            OutboundEmail.idempotency_key == idempotency_key_for_draft(draft_id),
+            OutboundEmail.status.in_([OUTBOUND_STATUS_QUEUED, OUTBOUND_STATUS_SENDING]),
+        )
+    )
+
+
+def _resolve_timezone(name: str | None) -> ZoneInfo:
+    try:
+        return ZoneInfo(name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo("UTC")
+
+
+def _in_send_window(local_now: datetime, policy: AutomationPolicy) -> bool:
+    if policy.send_weekdays_only and local_now.weekday() >= 5:
+        return False
+    start, end = policy.send_window_start_hour, policy.send_window_end_hour
+    if start is None or end is None:
+        return True
+    if start < end:
+        return start <= local_now.hour < end
+    # Overnight window, e.g. 22 → 6.
+    return local_now.hour >= start or local_now.hour < end
+
+
+def next_send_window_open(now: datetime, policy: AutomationPolicy) -> datetime:
+    """Return ``now`` if sending is allowed, else the UTC instant the send window next opens."""
+    tz = _resolve_timezone(policy.send_timezone)
+    local_now = now.astimezone(tz)
+    if _in_send_window(local_now, policy):
+        return now
+    start_hour = policy.send_window_start_hour if policy.send_window_start_hour is not None else 0
+    for day in range(8):
+        candidate = datetime.combine(local_now.date() + timedelta(days=day), time(start_hour), tzinfo=tz)
+        if candidate > local_now and _in_send_window(candidate, policy):
+            return candidate.astimezone(timezone.utc)
+    return now + timedelta(days=1)
+
+
+def _local_day_bounds(now: datetime, policy: AutomationPolicy) -> tuple[datetime, datetime]:
+    tz = _resolve_timezone(policy.send_timezone)
+    local_day = now.astimezone(tz).date()
+    start = datetime.combine(local_day, time(0), tzinfo=tz)
+    end = datetime.combine(local_day + timedelta(days=1), time(0), tzinfo=tz)
+    return start.astimezone(timezone.utc), end.astimezone(timezone.utc)
+
+
+def daily_send_limit(policy: AutomationPolicy) -> int:
+    return policy.daily_send_limit or settings.outbound_send_daily_limit
+
+
+def sent_today_count(db: Session, workspace_id: UUID, now: datetime, policy: AutomationPolicy) -> int:
+    # Counts every Gmail send for the workspace (manual sends included) against the quota.
+    day_start, _ = _local_day_bounds(now, policy)
+    return int(
+        db.scalar(
+            select(func.count())
+            .select_from(EmailDraft)
+            .where(EmailDraft.workspace_id == workspace_id, EmailDraft.sent_at >= day_start)
+        )
+        or 0
+    )
+
+
+def _backoff_seconds(attempts: int) -> float:
+    base = max(1.0, settings.outbound_send_backoff_seconds)
+    delay = min(MAX_BACKOFF_SECONDS, base * (2 ** max(0, attempts - 1)))
+    return delay + random.uniform(0, base)
+
+
+def _defer_due_items(db: Session, workspace_id: UUID, now: datetime, until: datetime) -> None:
+    db.execute(
+        update(OutboundEmail)
+        .where(
+            OutboundEmail.workspace_id == workspace_id,
+            OutboundEmail.status == OUTBOUND_STATUS_QUEUED,
+            OutboundEmail.next_attempt_at < until,
+        )
+        .values(next_attempt_at=until)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def _due_workspace_ids(db: Session, now: datetime) -> list[UUID]:
+    return list(
+        db.scalars(
+            select(OutboundEmail.workspace_id)
+            .where(
+                OutboundEmail.status == OUTBOUND_STATUS_QUEUED,
+                OutboundEmail.next_attempt_at <= now,
+            )
+            .distinct()
+        ).all()
+    )
+
+
+def _requeue_stale_sending(db: Session, now: datetime) -> None:
+    db.execute(
+        update(OutboundEmail)
+        .where(
+            OutboundEmail.status == OUTBOUND_STATUS_SENDING,
+            OutboundEmail.last_attempt_at < now - timedelta(seconds=STALE_SENDING_SECONDS),
+        )
+        .values(status=OUTBOUND_STATUS_QUEUED, next_attempt_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def _claim_next_item(db: Session, workspace_id: UUID, now: datetime) -> OutboundEmail | None:
+    item_id = db.scalar(
+        select(OutboundEmail.id)
+        .where(
+            OutboundEmail.workspace_id == workspace_id,
+            OutboundEmail.status == OUTBOUND_STATUS_QUEUED,
+            OutboundEmail.next_attempt_at <= now,
+        )
+        .order_by(OutboundEmail.next_attempt_at.asc(), OutboundEmail.created_at.asc())
+        .limit(1)
+    )
+    if item_id is None:
+        return None
+    claimed = db.execute(
+        update(OutboundEmail)
+        .where(OutboundEmail.id == item_id, OutboundEmail.status == OUTBOUND_STATUS_QUEUED)
+        .values(
+            status=OUTBOUND_STATUS_SENDING,
+            attempts=OutboundEmail.attempts + 1,
+            last_attempt_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    if claimed.rowcount != 1:
+        return None
+    return db.get(OutboundEmail, item_id)
+
+
+def _finish(db: Session, item: OutboundEmail, *, status: str, error: str | None = None) -> None:
+    item.status = status
+    item.last_error = error[:2000] if error else None
+    db.commit()
+
+
+def _retry_later(db: Session, item: OutboundEmail, error: str, now: datetime) -> None:
+    if item.attempts >= settings.outbound_send_max_attempts:
+        _finish(db, item, status=OUTBOUND_STATUS_FAILED, error=f"Gave up after {item.attempts} attempts: {error}")
+        return
+    item.status = OUTBOUND_STATUS_QUEUED
+    item.last_error = error[:2000]
+    item.next_attempt_at = now + timedelta(seconds=_backoff_seconds(item.attempts))
+    db.commit()
+
+
+def deliver_outbound_item(db: Session, item: OutboundEmail, now: datetime) -> str:
+    """Send one claimed item and record the outcome. Returns the item's final status."""
+    draft = db.get(EmailDraft, item.draft_id)
+    lead = db.get(Lead, item.lead_id)
+    if draft is None or lead is None:
+        _finish(db, item, status=OUTBOUND_STATUS_CANCELLED, error="Draft or lead no longer exists.")
+        return item.status
+    if draft.sent_at is not None:
+        item.gmail_message_id = draft.gmail_message_id
+        item.sent_at = draft.sent_at
+        _finish(db, item, status=OUTBOUND_STATUS_SENT)
+        return item.status
+    if draft.review_status == REVIEW_STATUS_REJECTED:
+        _finish(db, item, status=OUTBOUND_STATUS_CANCELLED, error="Draft was rejected.")
+        return item.status
+
+    try:
+        # Persist the Gmail draft id before sending so retries re-send the same draft.
+        ensure_gmail_draft_for_email_draft(db=db, draft=draft, lead=lead)
+        db.commit()
+        send_email_draft_via_gmail(db=db, draft=draft, lead=lead)
+    except GmailApiError as exc:
+        # Keep the integration error recorded by the Gmail client, as the send route does.
+        db.commit()
+        if exc.upstream_status == 404 and draft.gmail_draft_id:
+            _finish(
+                db,
+                item,
+                status=OUTBOUND_STATUS_FAILED,
+                error="Gmail draft no longer exists; it may already have been sent. Check Sent mail before resending.",
+            )
+        elif exc.retryable:
+            _retry_later(db, item, str(exc), now)
+            if exc.upstream_status == 429:
+                cooldown = now + timedelta(seconds=_backoff_seconds(item.attempts))
+                _defer_due_items(db, item.workspace_id, now, cooldown)
+        else:
+            _finish(db, item, status=OUTBOUND_STATUS_FAILED, error=str(exc))
+        return item.status
+    except httpx.TransportError as exc:
+        # The request may or may not have reached Gmail; retrying the same draft id is safe.
+        db.rollback()
+        _retry_later(db, item, f"Gmail request failed: {exc}", now)
+        return item.status
+    except (GmailIntegrationError, ValueError) as exc:
+        db.rollback()
+        _finish(db, item, status=OUTBOUND_STATUS_FAILED, error=str(exc))
+        return item.status
+
+    item.status = OUTBOUND_STATUS_SENT
+    item.sent_at = draft.sent_at
+    item.gmail_message_id = draft.gmail_message_id
+    item.last_error = None
+    db.commit()
+    return item.status
+
+
+def process_workspace_send_queue(workspace_id: UUID, now: datetime | None = None) -> str | None:
+    """Send at most one due item for the workspace if pacing, window and quota allow it."""
+    now = now or datetime.now(timezone.utc)
+    with SessionLocal() as db:
+        policy = resolve_automation_policy(db, workspace_id)
+        if policy.pause_pipeline:
+            return None
+
+        last_attempt = as_utc(
+            db.scalar(
+                select(func.max(OutboundEmail.last_attempt_at)).where(OutboundEmail.workspace_id == workspace_id)
+            )
+        )
+        if last_attempt and now - last_attempt < timedelta(seconds=settings.outbound_send_min_interval_seconds):
+            return None
+
+        window_open = next_send_window_open(now, policy)
+        if window_open > now:
+            _defer_due_items(db, workspace_id, now, window_open)
+            return None
+
+        if sent_today_count(db, workspace_id, now, policy) >= daily_send_limit(policy):
+            _, day_end = _local_day_bounds(now, policy)
+            _defer_due_items(db, workspace_id, now, next_send_window_open(day_end, policy))
+            logger.info("Send queue daily limit reached workspace_id=%s", workspace_id)
+            return None
+
+        item = _claim_next_item(db, workspace_id, now)
+        if item is None:
+            return None
+        outcome = deliver_outbound_item(db, item, now)
+        logger.info(
+            "Send queue item=%s workspace_id=%s draft_id=%s attempt=%s status=%s",
+            item.id,
+            workspace_id,
+            item.draft_id,
+            item.attempts,
+            outcome,
+        )
+        return outcome
+
+
+class OutboundSendWorker:
+    def __init__(self) -> None:
+        self._task: asyncio.Task[None] | None = None
+        self._stop_event = asyncio.Event()
+        self._cycle_lock = asyncio.Lock()
+
+    def start(self) -> None:
+        if not settings.outbound_send_enabled:
+            logger.info("Outbound send worker is disabled by configuration")
+            return
+        if self._task and not self._task.done():
+            return
+        self._stop_event.clear()
+        self._task = asyncio.create_task(self._run_loop(), name="outbound-send-worker")
+
+    async def stop(self) -> None:
+        self._stop_event.set()
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._task = None
+
+    async def _run_loop(self) -> None:
+        logger.info(
+            "Outbound send worker started poll=%ss min_interval=%ss daily_limit=%s",
+            settings.outbound_send_poll_seconds,
+            settings.outbound_send_min_interval_seconds,
+            settings.outbound_send_daily_limit,
+        )
+        while not self._stop_event.is_set():
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Outbound send worker cycle failed")
+
+            try:
+                await asyncio.wait_for(
+                    self._stop_event.wait(),
+                    timeout=float(settings.outbound_send_poll_seconds),
+                )
+            except asyncio.TimeoutError:
+                continue
+        logger.info("Outbound send worker stopped")
+
+    async def run_once(self) -> None:
+        if self._cycle_lock.locked():
+            return
+        async with self._cycle_lock:
+            await asyncio.to_thread(self._run_once_sync)
+
+    def _run_once_sync(self) -> None:
+        now = datetime.now(timezone.utc)
+        with SessionLocal() as db:
+            _requeue_stale_sending(db, now)
+            workspace_ids = _due_workspace_ids(db, now)
+        for workspace_id in workspace_ids:
+            try:
+                process_workspace_send_queue(workspace_id, now)
+            except Exception:
+                logger.exception("Send queue failed workspace_id=%s", workspace_id)
+
+
+outbound_send_worker = OutboundSendWorker()
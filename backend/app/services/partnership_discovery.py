@@ -2,20 +2,29 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from typing import Any
 from uuid import UUID
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.models.duplicate_candidate import DUPLICATE_ENTITY_PARTNER_CANDIDATE
 from app.models.partner_candidate import PartnerCandidate
 from app.models.workspace_profile import WorkspaceProfile
+from app.services.duplicate_detection import flag_duplicates
 from app.services.partnership_agent import run_partnership_fit_agent
-from app.services.website_ingestion import ingest_website_pages
+from app.services.text_store import store_text
+from app.services.website_ingestion import WebsiteIngestionResult, ingest_website_pages
 from app.services.workspace_credentials import resolve_openai_api_key
 
 logger = logging.getLogger(__name__)
 
+CRAWLED_TEXT_MAX_CHARS = 50000
+
 
 def _get_workspace_profile(db: Session, workspace_id: UUID) -> dict[str, Any] | None:
     profile = db.get(WorkspaceProfile, workspace_id)
@@ -68,8 +77,8 @@ def discover_and_analyze(
         extracted_signals={
             "company_summary": result.get("company_summary"),
             "reasons": result.get("reasons", []),
-            "crawled_text": combined_text[:50000] if combined_text else None,
         },
+        crawled_text_id=store_text(db, combined_text[:CRAWLED_TEXT_MAX_CHARS]),
         recommended_outreach_angle=result.get("recommended_outreach_angle"),
         contact_emails=contact_emails if contact_emails else None,
         contact_form_url=result.get("contact_form_url"),
@@ -82,6 +91,64 @@ def discover_and_analyze(
     return candidate
 
 
+@dataclass
+class _PartnerWork:
+    company: dict[str, Any]
+    name: str
+    website: str
+    ingestion: WebsiteIngestionResult | None = None
+    combined_text: str = ""
+
+
+def _crawl_partner(work: _PartnerWork) -> None:
+    work.ingestion = ingest_website_pages(work.website)
+    work.combined_text = work.ingestion.combined_text
+    if not work.combined_text.strip():
+        work.combined_text = (
+            f"Company: {work.name}\n"
+            f"Website: {work.website}\n"
+            f"Description: {work.company.get('description', '')}\n"
+            f"Relevance: {work.company.get('relevance_reason', '')}"
+        )
+
+
+def _build_search_candidate(
+    workspace_id: UUID,
+    work: _PartnerWork,
+    result: dict[str, Any],
+    *,
+    crawled_text_id: str | None,
+) -> PartnerCandidate:
+    contact_emails = result.get("contact_emails") or []
+    if work.ingestion is not None and work.ingestion.unique_emails:
+        for email in work.ingestion.unique_emails:
+            if email not in contact_emails:
+                contact_emails.append(email)
+
+    name = work.name
+    return PartnerCandidate(
+        workspace_id=workspace_id,
+        company_name=result.get("company_summary", name)[:255] if not name or name == "Unknown" else name,
+        website=work.website,
+        industry=result.get("industry"),
+        location=None,
+        partnership_type=result.get("partnership_type"),
+        fit_score=result.get("fit_score", 0),
+        extracted_signals={
+            "company_summary": result.get("company_summary"),
+            "reasons": result.get("reasons", []),
+            "search_description": work.company.get("description"),
+            "search_relevance": work.company.get("relevance_reason"),
+        },
+        crawled_text_id=crawled_text_id,
+        recommended_outreach_angle=result.get("recommended_outreach_angle"),
+        contact_emails=contact_emails if contact_emails else None,
+        contact_form_url=result.get("contact_form_url"),
+        source="web_search",
+        status="new",
+    )
+
+
 def search_and_discover(
     db: Session,
     workspace_id: UUID,
@@ -89,10 +156,19 @@ def search_and_discover(
     search_intent: str,
     max_results: int = 10,
     min_fit_score: float = 0.0,
+    on_progress: Callable[[int, int], None] | None = None,
+    on_candidate: Callable[[PartnerCandidate], None] | None = None,
 ) -> dict[str, Any]:
     """
     Automated pipeline: web search -> crawl each website -> run fit agent -> store candidates.
     Returns progress stats and the list of created candidates.
+
+    Crawls run on a bounded pool (``partnership_crawl_concurrency``) and each finished crawl
+    feeds a second bounded pool running the fit agent (``partnership_analysis_concurrency``);
+    the session is only used from the calling thread. Qualified candidates are committed as
+    they complete and passed to ``on_candidate``. ``on_progress(done, total)`` is called at
+    the start and after each company; an exception it raises (e.g. a job cancellation)
+    aborts the search, keeping the candidates stored so far.
     """
     from app.services.partner_search_agent import search_for_partners
 
@@ -115,85 +191,100 @@ def search_and_discover(
     }
     created: list[PartnerCandidate] = []
 
+    work_items: list[_PartnerWork] = []
     for company in companies:
         website = company.get("website", "").strip()
-        name = company.get("company_name", "Unknown").strip()
-
         if not website or not website.startswith(("http://", "https://")):
             stats["skipped_no_website"] += 1
             continue
+        work_items.append(
+            _PartnerWork(company=company, name=company.get("company_name", "Unknown").strip(), website=website)
+        )
 
-        existing = db.scalar(
-            select(PartnerCandidate).where(
-                PartnerCandidate.workspace_id == workspace_id,
-                PartnerCandidate.website == website,
-            ).limit(1)
+    known_websites: set[str] = set()
+    if work_items:
+        known_websites.update(
+            db.scalars(
+                select(PartnerCandidate.website).where(
+                    PartnerCandidate.workspace_id == workspace_id,
+                    PartnerCandidate.website.in_({work.website for work in work_items}),
+                )
+            ).all()
         )
-        if existing:
+    queued: list[_PartnerWork] = []
+    for work in work_items:
+        if work.website in known_websites:
             stats["skipped_duplicate"] += 1
             continue
+        known_websites.add(work.website)
+        queued.append(work)
 
-        try:
-            ingestion = ingest_website_pages(website)
-            combined_text = ingestion.combined_text
-            if not combined_text.strip():
-                combined_text = (
-                    f"Company: {name}\n"
-                    f"Website: {website}\n"
-                    f"Description: {company.get('description', '')}\n"
-                    f"Relevance: {company.get('relevance_reason', '')}"
-                )
+    total = len(companies)
+    done = total - len(queued)
+    if on_progress is not None:
+        on_progress(done, total)
 
-            result = run_partnership_fit_agent(
-                website_text=combined_text,
-                discovery_intent=search_intent,
-                workspace_profile=profile_dict,
-                api_key=api_key,
-            )
-            stats["analyzed"] += 1
-
-            fit_score = result.get("fit_score", 0)
-            if fit_score < min_fit_score:
-                continue
-
-            contact_emails = result.get("contact_emails") or []
-            if ingestion.unique_emails:
-                for email in ingestion.unique_emails:
-                    if email not in contact_emails:
-                        contact_emails.append(email)
-
-            candidate = PartnerCandidate(
-                workspace_id=workspace_id,
-                company_name=result.get("company_summary", name)[:255] if not name or name == "Unknown" else name,
-                website=website,
-                industry=result.get("industry"),
-                location=None,
-                partnership_type=result.get("partnership_type"),
-                fit_score=fit_score,
-                extracted_signals={
-                    "company_summary": result.get("company_summary"),
-                    "reasons": result.get("reasons", []),
-                    "search_description": company.get("description"),
-                    "search_relevance": company.get("relevance_reason"),
-                    "crawled_text": combined_text[:50000] if combined_text else None,
-                },
-                recommended_outreach_angle=result.get("recommended_outreach_angle"),
-                contact_emails=contact_emails if contact_emails else None,
-                contact_form_url=result.get("contact_form_url"),
-                source="web_search",
-                status="new",
-            )
-            db.add(candidate)
-            db.flush()
-            created.append(candidate)
-            stats["qualified"] += 1
-
-        except Exception:
-            logger.exception("Failed to analyze partner: %s (%s)", name, website)
-            stats["errors"] += 1
+    def analyze(work: _PartnerWork) -> dict[str, Any]:
+        return run_partnership_fit_agent(
+            website_text=work.combined_text,
+            discovery_intent=search_intent,
+            workspace_profile=profile_dict,
+            api_key=api_key,
+        )
 
-    db.commit()
-    for c in created:
-        db.refresh(c)
+    crawl_pool = ThreadPoolExecutor(
+        max_workers=max(1, min(settings.partnership_crawl_concurrency, len(queued) or 1)),
+        thread_name_prefix="partner-crawl",
+    )
+    analysis_pool = ThreadPoolExecutor(
+        max_workers=max(1, min(settings.partnership_analysis_concurrency, len(queued) or 1)),
+        thread_name_prefix="partner-analysis",
+    )
+    try:
+        pending: dict[Future[Any], tuple[_PartnerWork, bool]] = {
+            crawl_pool.submit(_crawl_partner, work): (work, False) for work in queued
+        }
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                work, analyzed = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception:
+                    logger.exception("Failed to analyze partner: %s (%s)", work.name, work.website)
+                    stats["errors"] += 1
+                else:
+                    if not analyzed:
+                        pending[analysis_pool.submit(analyze, work)] = (work, True)
+                        continue
+                    stats["analyzed"] += 1
+                    if result.get("fit_score", 0) >= min_fit_score:
+                        candidate = _build_search_candidate(
+                            workspace_id,
+                            work,
+                            result,
+                            crawled_text_id=store_text(db, work.combined_text[:CRAWLED_TEXT_MAX_CHARS]),
+                        )
+                        db.add(candidate)
+                        db.flush()
+                        flag_duplicates(
+                            db,
+                            workspace_id=workspace_id,
+                            entity_type=DUPLICATE_ENTITY_PARTNER_CANDIDATE,
+                            ids=[candidate.id],
+                        )
+                        db.commit()
+                        db.refresh(candidate)
+                        created.append(candidate)
+                        stats["qualified"] += 1
+                        if on_candidate is not None:
+                            on_candidate(candidate)
+
+                done += 1
+                if on_progress is not None:
+                    on_progress(done, total)
+    finally:
+        crawl_pool.shutdown(wait=False, cancel_futures=True)
+        analysis_pool.shutdown(wait=False, cancel_futures=True)
 
     return {"stats": stats, "candidates": created}
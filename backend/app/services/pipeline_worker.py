@@ -23,14 +23,17 @@ from app.models.lead_status import (
     normalize_lead_status,
 )
 from app.models.user import User
-from app.services.automation_policy import resolve_automation_policy
+from app.services.automation_policy import AutomationPolicy
 from app.services.draft_delivery import (
+    REVIEW_STATUS_APPROVED,
     REVIEW_STATUS_REJECTED,
     ensure_gmail_draft_for_email_draft,
     get_latest_agent3_draft,
-    send_email_draft_via_gmail,
 )
 from app.services.gmail_service import GmailApiError, set_gmail_integration_error
+from app.services.inbox_processing import process_pending_inbound_messages
+from app.services.outbound_send_queue import enqueue_draft_send
+from app.services.workspace_context import get_workspace_context
 
 logger = logging.getLogger(__name__)
 
@@ -98,6 +101,11 @@ class LeadPipelineWorker:
             await asyncio.to_thread(self._run_once_sync)
 
     def _run_once_sync(self) -> None:
+        try:
+            process_pending_inbound_messages()
+        except Exception:
+            logger.exception("Inbox processing stage failed")
+
         with SessionLocal() as db:
             candidate_ids = db.scalars(
                 select(Lead.id)
@@ -122,7 +130,7 @@ class LeadPipelineWorker:
             if lead_status not in WORKER_STATUSES:
                 return
 
-            policy = resolve_automation_policy(db, lead.workspace_id)
+            policy = get_workspace_context(db, lead.workspace_id).automation_policy
             if policy.pause_pipeline:
                 logger.debug(
                     "Pipeline worker skipped lead_id=%s workspace_id=%s reason=pipeline_paused",
@@ -195,11 +203,11 @@ class LeadPipelineWorker:
                         result.decision,
                     )
                     db.refresh(lead)
-                    self._maybe_process_approved_delivery(db=db, lead=lead)
+                    self._maybe_process_approved_delivery(db=db, lead=lead, policy=policy)
                     return
 
                 if lead_status == LEAD_STATUS_APPROVED:
-                    self._maybe_process_approved_delivery(db=db, lead=lead)
+                    self._maybe_process_approved_delivery(db=db, lead=lead, policy=policy)
                     return
             except HTTPException as exc:
                 db.rollback()
@@ -254,8 +262,7 @@ class LeadPipelineWorker:
                     lead_status,
                 )
 
-    def _maybe_process_approved_delivery(self, *, db, lead: Lead) -> None:
-        policy = resolve_automation_policy(db, lead.workspace_id)
+    def _maybe_process_approved_delivery(self, *, db, lead: Lead, policy: AutomationPolicy) -> None:
         if lead.status != LEAD_STATUS_APPROVED:
             return
         if policy.pause_pipeline:
@@ -298,14 +305,17 @@ class LeadPipelineWorker:
                 )
                 db.commit()
                 return
-            send_email_draft_via_gmail(db=db, draft=latest_draft, lead=lead)
-            logger.info(
-                "Pipeline worker step=gmail_sent lead_id=%s workspace_id=%s draft_id=%s message_id=%s",
-                lead.id,
-                lead.workspace_id,
-                latest_draft.id,
-                latest_draft.gmail_message_id,
-            )
+            if latest_draft.sent_at is None:
+                # Sending is paced by the outbound send queue; enqueueing is idempotent per draft.
+                item = enqueue_draft_send(db, draft=latest_draft)
+                logger.info(
+                    "Pipeline worker step=send_queued lead_id=%s workspace_id=%s draft_id=%s queue_item=%s status=%s",
+                    lead.id,
+                    lead.workspace_id,
+                    latest_draft.id,
+                    item.id,
+                    item.status,
+                )
 
         db.commit()
 
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from urllib.parse import urlparse
 from uuid import UUID
 
 from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
+from app.models.dedupe_keys import company_address_key, website_match_keys
+from app.models.duplicate_candidate import DUPLICATE_ENTITY_PROSPECT
 from app.models.lead import Lead
 from app.models.lead_status import DEFAULT_LEAD_STATUS
 from app.models.prospect import Prospect
+from app.services.duplicate_detection import flag_duplicates
 from app.services.lead_import import normalize_website_url
 
 
@@ -80,38 +82,6 @@ def _clean_text(value: str | None) -> str | None:
     return normalized or None
 
 
-def _company_address_key(company_name: str | None, address: str | None) -> str | None:
-    company = _clean_text(company_name)
-    address_clean = _clean_text(address)
-    if company is None or address_clean is None:
-        return None
-    return f"{company.casefold()}::{address_clean.casefold()}"
-
-
-def _website_variants(normalized_url: str) -> set[str]:
-    parsed = urlparse(normalized_url)
-    scheme = parsed.scheme.casefold()
-    host = parsed.netloc.casefold()
-    path = parsed.path.rstrip("/").casefold()
-    canonical = f"{scheme}://{host}{path}"
-
-    variants = {canonical, canonical.rstrip("/") or canonical}
-    no_path = f"{scheme}://{host}"
-    variants.add(no_path)
-    variants.add(f"{no_path}/")
-
-    if canonical.startswith("https://"):
-        alt = "http://" + canonical.removeprefix("https://")
-        variants.add(alt)
-        variants.add(alt.rstrip("/") or alt)
-    elif canonical.startswith("http://"):
-        alt = "https://" + canonical.removeprefix("http://")
-        variants.add(alt)
-        variants.add(alt.rstrip("/") or alt)
-
-    return {variant for variant in variants if variant}
-
-
 def import_prospects_for_workspace(
     *,
     db: Session,
@@ -129,7 +99,7 @@ def import_prospects_for_workspace(
         (source, company_address)
         for candidate in candidates
         for source in [_clean_text(candidate.source)]
-        for company_address in [_company_address_key(candidate.company_name, candidate.address)]
+        for company_address in [company_address_key(candidate.company_name, candidate.address)]
         if source and company_address
     }
 
@@ -154,24 +124,16 @@ def import_prospects_for_workspace(
     existing_source_company_address: set[tuple[str, str]] = set()
     if source_company_address_keys:
         candidate_sources = {source.casefold() for source, _ in source_company_address_keys}
-        candidate_companies = {
-            company.casefold()
-            for _, company_address in source_company_address_keys
-            for company in [company_address.split("::", 1)[0]]
-            if company
-        }
         rows = db.execute(
-            select(Prospect.source, Prospect.company_name, Prospect.address).where(
+            select(Prospect.source, Prospect.company_location_key).where(
                 Prospect.workspace_id == workspace_id,
-                func.lower(Prospect.source).in_(candidate_sources),
-                func.lower(Prospect.company_name).in_(candidate_companies),
+                Prospect.company_location_key.in_({key for _, key in source_company_address_keys}),
             )
         ).all()
         existing_source_company_address = {
-            (source.casefold(), company_address)
-            for source, company_name, address in rows
-            for company_address in [_company_address_key(company_name, address)]
-            if source and company_address
+            (source.casefold(), key)
+            for source, key in rows
+            if source and key and source.casefold() in candidate_sources
         }
 
     imported: list[Prospect] = []
@@ -256,9 +218,9 @@ def import_prospects_for_workspace(
         else:
             source_external_key = None
 
-        company_address_key = _company_address_key(company_name, address)
-        if company_address_key:
-            source_company_address_key = (source.casefold(), company_address_key)
+        company_address = company_address_key(company_name, address)
+        if company_address:
+            source_company_address_key = (source.casefold(), company_address)
             if (
                 source_company_address_key in existing_source_company_address
                 or source_company_address_key in seen_source_company_address
@@ -300,6 +262,13 @@ def import_prospects_for_workspace(
 
     if imported:
         db.add_all(imported)
+        db.flush()
+        flag_duplicates(
+            db,
+            workspace_id=workspace_id,
+            entity_type=DUPLICATE_ENTITY_PROSPECT,
+            ids=[prospect.id for prospect in imported],
+        )
         db.commit()
         for prospect in imported:
             db.refresh(prospect)
@@ -329,52 +298,39 @@ def convert_prospects_to_leads(
     by_id = {prospect.id: prospect for prospect in rows}
     prospects = [by_id[prospect_id] for prospect_id in prospect_ids if prospect_id in by_id]
 
-    candidate_websites = {
-        normalized
+    candidate_website_keys = {
+        key
         for prospect in prospects
-        for normalized in [normalize_website_url(prospect.website_url)]
-        if normalized
+        for key in website_match_keys(normalize_website_url(prospect.website_url))
     }
-    website_match_candidates = {
-        variant
-        for website in candidate_websites
-        for variant in _website_variants(website)
-    }
-    candidate_companies = {
-        company_name.casefold()
+    candidate_company_location_keys = {
+        key
         for prospect in prospects
-        for company_name in [_clean_text(prospect.company_name)]
-        if company_name
+        for key in [company_address_key(prospect.company_name, prospect.address)]
+        if key
     }
 
     existing_websites: set[str] = set()
-    if website_match_candidates:
-        existing_websites = {
-            website.casefold()
-            for website in db.scalars(
-                select(Lead.website_url).where(
+    if candidate_website_keys:
+        existing_websites = set(
+            db.scalars(
+                select(Lead.website_key).where(
                     Lead.workspace_id == workspace_id,
-                    Lead.website_url.is_not(None),
-                    func.lower(Lead.website_url).in_(website_match_candidates),
+                    Lead.website_key.in_(candidate_website_keys),
                 )
             ).all()
-            if website
-        }
+        )
 
     existing_company_addresses: set[str] = set()
-    if candidate_companies:
-        rows = db.execute(
-            select(Lead.company, Lead.location).where(
-                Lead.workspace_id == workspace_id,
-                func.lower(Lead.company).in_(candidate_companies),
-            )
-        ).all()
-        existing_company_addresses = {
-            key
-            for company, address in rows
-            for key in [_company_address_key(company, address)]
-            if key
-        }
+    if candidate_company_location_keys:
+        existing_company_addresses = set(
+            db.scalars(
+                select(Lead.company_location_key).where(
+                    Lead.workspace_id == workspace_id,
+                    Lead.company_location_key.in_(candidate_company_location_keys),
+                )
+            ).all()
+        )
 
     converted_leads: list[Lead] = []
     skipped: list[ProspectConvertSkipped] = []
@@ -397,7 +353,8 @@ def convert_prospects_to_leads(
         prospect.import_status = "selected"
 
         website_url = normalize_website_url(prospect.website_url)
-        company_address_key = _company_address_key(prospect.company_name, prospect.address)
+        lead_website_keys = website_match_keys(website_url)
+        company_address = company_address_key(prospect.company_name, prospect.address)
 
         if require_website and not website_url:
             prospect.import_status = "skipped"
@@ -413,12 +370,10 @@ def convert_prospects_to_leads(
             continue
 
         duplicate_reason: str | None = None
-        if website_url:
-            variants = _website_variants(website_url)
-            if variants & existing_websites or variants & seen_websites:
-                duplicate_reason = "duplicate_website_url"
-        if duplicate_reason is None and company_address_key:
-            if company_address_key in existing_company_addresses or company_address_key in seen_company_addresses:
+        if lead_website_keys & existing_websites or lead_website_keys & seen_websites:
+            duplicate_reason = "duplicate_website_url"
+        if duplicate_reason is None and company_address:
+            if company_address in existing_company_addresses or company_address in seen_company_addresses:
                 duplicate_reason = "duplicate_company_address"
 
         if duplicate_reason:
@@ -448,10 +403,9 @@ def convert_prospects_to_leads(
         converted_leads.append(lead)
         prospect.import_status = "imported"
 
-        if website_url:
-            seen_websites.update(_website_variants(website_url))
-        if company_address_key:
-            seen_company_addresses.add(company_address_key)
+        seen_websites.update(lead_website_keys)
+        if company_address:
+            seen_company_addresses.add(company_address)
 
     if converted_leads:
         db.add_all(converted_leads)
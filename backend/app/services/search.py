@@ -0,0 +1,323 @@
+"""Ranked, faceted search over ``search_documents``.
+
+PostgreSQL matches titles by substring through a ``pg_trgm`` GIN index (ranked by trigram
+similarity) and bodies through a stored ``simple`` tsvector with a GIN index. SQLite uses an
+FTS5 table with the trigram tokenizer, kept in sync with ``search_documents`` by triggers.
+Both paths return the same hits subquery, so routes filter, facet, rank and paginate the
+entity tables the same way on either database, and ``document_snippets`` highlights the
+page of results being returned.
+"""
+from __future__ import annotations
+
+import html
+from collections import Counter
+from collections.abc import Collection, Mapping
+from typing import Any, Final
+from uuid import UUID
+
+from sqlalchemy import and_, column, delete, exists, false, func, literal, literal_column, or_, select, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select, Subquery
+
+from app.models.email_message import EmailMessageRecord
+from app.models.email_thread import EmailThread
+from app.models.lead import Lead
+from app.models.prospect import Prospect
+from app.models.search_document import (
+    SEARCH_ENTITY_EMAIL_MESSAGE,
+    SEARCH_ENTITY_LEAD,
+    SEARCH_ENTITY_PROSPECT,
+    SEARCH_ENTITY_WEBSITE_PAGE,
+    SEARCH_ENTITY_WEBSITE_SNAPSHOT,
+    SearchDocument,
+    refresh_search_documents,
+)
+from app.models.website_page import WebsitePage
+from app.models.website_snapshot import WebsiteSnapshot
+
+FACET_VALUE_LIMIT: Final[int] = 20
+# FTS5's trigram tokenizer cannot match terms shorter than one trigram.
+_MIN_FTS_TERM_LENGTH: Final[int] = 3
+SNIPPET_WORDS: Final[int] = 24
+# snippet() counts trigram tokens, roughly one per character; 64 is FTS5's maximum.
+_FTS_SNIPPET_TOKENS: Final[int] = 64
+_ENTITY_MODELS: Final[dict[str, Any]] = {
+    SEARCH_ENTITY_LEAD: Lead,
+    SEARCH_ENTITY_PROSPECT: Prospect,
+    SEARCH_ENTITY_WEBSITE_PAGE: WebsitePage,
+    SEARCH_ENTITY_WEBSITE_SNAPSHOT: WebsiteSnapshot,
+    SEARCH_ENTITY_EMAIL_MESSAGE: EmailMessageRecord,
+}
+_FTS_TABLE: Final[str] = "search_documents_fts"
+# Highlight delimiters the database wraps around matches; swapped for <mark> tags once the
+# snippet is HTML-escaped, so stored text can never inject markup.
+_MARK_START: Final[str] = "\x02"
+_MARK_END: Final[str] = "\x03"
+_SNIPPET_ELLIPSIS: Final[str] = "\u2026"
+
+_SQLITE_INDEX_DDL: Final[tuple[str, ...]] = (
+    f"CREATE VIRTUAL TABLE {_FTS_TABLE} USING fts5("
+    "title, body, content='search_documents', content_rowid='id', tokenize='trigram')",
+    f"INSERT INTO {_FTS_TABLE}({_FTS_TABLE}) VALUES ('rebuild')",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_fts_ai AFTER INSERT ON search_documents BEGIN "
+    f"INSERT INTO {_FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_fts_ad AFTER DELETE ON search_documents BEGIN "
+    f"INSERT INTO {_FTS_TABLE}({_FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_fts_au AFTER UPDATE ON search_documents BEGIN "
+    f"INSERT INTO {_FTS_TABLE}({_FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+    f"INSERT INTO {_FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+)
+_POSTGRES_INDEX_DDL: Final[tuple[str, ...]] = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_search_documents_title_trgm "
+    "ON search_documents USING gin (title gin_trgm_ops)",
+    "ALTER TABLE search_documents ADD COLUMN IF NOT EXISTS body_tsv tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('simple'::regconfig, body)) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_search_documents_body_tsv ON search_documents USING gin (body_tsv)",
+)
+
+
+def ensure_search_index(connection: Connection) -> None:
+    """Create the dialect's text indexes over ``search_documents`` if they are missing.
+
+    On SQLite the FTS5 table is filled from existing documents when it is first created.
+    Requires SQLite 3.34+ (trigram tokenizer) or the ``pg_trgm`` extension.
+    """
+    if connection.dialect.name == "postgresql":
+        for statement in _POSTGRES_INDEX_DDL:
+            connection.execute(text(statement))
+        return
+    fts_exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": _FTS_TABLE},
+    ).first()
+    for statement in _SQLITE_INDEX_DDL[2:] if fts_exists else _SQLITE_INDEX_DDL:
+        connection.execute(text(statement))
+
+
+def _fts_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _hit_columns() -> tuple[Any, ...]:
+    return (
+        SearchDocument.id,
+        SearchDocument.entity_type,
+        SearchDocument.entity_id,
+        SearchDocument.parent_id,
+        SearchDocument.title,
+    )
+
+
+def _pg_ts_query(terms: list[str]) -> Any:
+    return func.plainto_tsquery(literal_column("'simple'::regconfig"), " ".join(terms))
+
+
+def _fts_match(terms: list[str]) -> tuple[list[str], str | None]:
+    """Split ``terms`` into ones FTS5 cannot index and the MATCH expression for the rest."""
+    long_terms = [term for term in terms if len(term) >= _MIN_FTS_TERM_LENGTH]
+    short_terms = [term for term in terms if len(term) < _MIN_FTS_TERM_LENGTH]
+    return short_terms, " ".join(_fts_phrase(term) for term in long_terms) or None
+
+
+def match_documents(
+    db: Session,
+    *,
+    workspace_id: UUID,
+    entity_type: str | Collection[str],
+    query: str,
+) -> Subquery:
+    """Documents matching every term of ``query``, with a ``rank`` (higher is better).
+
+    Columns: ``id``, ``entity_type``, ``entity_id``, ``parent_id``, ``title``, ``rank``.
+    Title hits outrank body-only hits. On SQLite, terms shorter than three characters only
+    match titles.
+    """
+    entity_types = [entity_type] if isinstance(entity_type, str) else list(entity_type)
+    terms = query.split()
+    conditions = [SearchDocument.workspace_id == workspace_id, SearchDocument.entity_type.in_(entity_types)]
+    if not terms:
+        return select(*_hit_columns(), literal(0.0).label("rank")).where(false()).subquery("search_hits")
+
+    if db.get_bind().dialect.name == "postgresql":
+        body_tsvector = literal_column("search_documents.body_tsv")
+        ts_query = _pg_ts_query(terms)
+        title_match = and_(*(SearchDocument.title.icontains(term, autoescape=True) for term in terms))
+        rank = func.greatest(
+            func.similarity(SearchDocument.title, " ".join(terms)),
+            func.ts_rank_cd(body_tsvector, ts_query),
+        )
+        return (
+            select(*_hit_columns(), rank.label("rank"))
+            .where(*conditions, or_(title_match, body_tsvector.op("@@")(ts_query)))
+            .subquery("search_hits")
+        )
+
+    short_terms, fts_query = _fts_match(terms)
+    conditions.extend(SearchDocument.title.icontains(term, autoescape=True) for term in short_terms)
+    if fts_query is None:
+        return select(*_hit_columns(), literal(0.0).label("rank")).where(*conditions).subquery("search_hits")
+
+    fts = table(_FTS_TABLE, column("rowid"))
+    fts_column = literal_column(_FTS_TABLE)
+    # bm25() is lower-is-better; weight title matches ten times body matches. The match is
+    # materialized first: joined directly, SQLite's planner walks every document of the
+    # workspace through the workspace index and re-runs MATCH once per row.
+    fts_hits = (
+        select(fts.c.rowid.label("id"), (-func.bm25(fts_column, 10.0, 1.0)).label("rank"))
+        .where(fts_column.op("MATCH")(fts_query))
+        .cte("fts_hits")
+        .prefix_with("MATERIALIZED")
+    )
+    return (
+        select(*_hit_columns(), fts_hits.c.rank)
+        .join(fts_hits, fts_hits.c.id == SearchDocument.id)
+        .where(*conditions)
+        .subquery("search_hits")
+    )
+
+
+def _highlight(snippet: str) -> str:
+    return html.escape(snippet).replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+def document_snippets(db: Session, *, query: str, document_ids: Collection[int]) -> dict[int, str]:
+    """HTML-safe excerpts of each document's best-matching passage, matches wrapped in ``<mark>``.
+
+    Meant for one page of ``match_documents`` hits; documents matched only through their
+    title (or through short terms on SQLite) get the start of their body instead.
+    """
+    if not document_ids:
+        return {}
+    terms = query.split()
+    if db.get_bind().dialect.name == "postgresql":
+        options = (
+            f"StartSel={_MARK_START}, StopSel={_MARK_END}, MaxWords={SNIPPET_WORDS}, "
+            f"MinWords={SNIPPET_WORDS // 2}, MaxFragments=2, FragmentDelimiter=\" {_SNIPPET_ELLIPSIS} \""
+        )
+        headline = func.ts_headline(
+            literal_column("'simple'::regconfig"), SearchDocument.body, _pg_ts_query(terms), options
+        )
+        rows = db.execute(select(SearchDocument.id, headline).where(SearchDocument.id.in_(document_ids))).all()
+        return {document_id: _highlight(snippet) for document_id, snippet in rows}
+
+    snippets: dict[int, str] = {}
+    _short_terms, fts_query = _fts_match(terms)
+    if fts_query is not None:
+        fts = table(_FTS_TABLE, column("rowid"))
+        fts_column = literal_column(_FTS_TABLE)
+        # Column -1 lets FTS5 pick whichever of title and body matches best.
+        snippet = func.snippet(fts_column, -1, _MARK_START, _MARK_END, _SNIPPET_ELLIPSIS, _FTS_SNIPPET_TOKENS)
+        rows = db.execute(
+            select(fts.c.rowid, snippet).where(fts_column.op("MATCH")(fts_query), fts.c.rowid.in_(document_ids))
+        ).all()
+        snippets.update((document_id, _highlight(text)) for document_id, text in rows)
+    missing = [document_id for document_id in document_ids if document_id not in snippets]
+    if missing:
+        # Approximate SNIPPET_WORDS words of plain text.
+        prefix = func.substr(SearchDocument.body, 1, SNIPPET_WORDS * 8)
+        rows = db.execute(select(SearchDocument.id, prefix).where(SearchDocument.id.in_(missing))).all()
+        snippets.update((document_id, _highlight(text or "")) for document_id, text in rows)
+    return snippets
+
+
+def facet_counts(
+    db: Session,
+    scope: Select[Any],
+    facets: Mapping[str, tuple[Any, Any]],
+    *,
+    limit: int = FACET_VALUE_LIMIT,
+) -> tuple[int, dict[str, list[dict[str, Any]]]]:
+    """Count the rows of ``scope`` that match every selected facet, and tally each facet.
+
+    ``scope`` selects the searched entity joined to its ``match_documents`` hits. ``facets`` maps
+    a facet name to ``(column, selected value or None)``. Each facet is tallied with every
+    other facet's selection applied but not its own, so the values a user could switch to keep
+    their counts; the top ``limit`` values come back as ``{"value", "count"}``. One grouped query
+    over all facet columns serves the total and every facet.
+    """
+    names = list(facets)
+    columns = [facets[name][0] for name in names]
+    wanted = [facets[name][1] for name in names]
+    total = 0
+    tallies: dict[str, Counter[Any]] = {name: Counter() for name in names}
+    for *values, count in db.execute(scope.with_only_columns(*columns, func.count()).group_by(*columns)):
+        mismatched = [i for i, (value, selected) in enumerate(zip(values, wanted)) if selected not in (None, value)]
+        if not mismatched:
+            total += count
+        for i, name in enumerate(names):
+            if not mismatched or mismatched == [i]:
+                tallies[name][values[i]] += count
+    return total, {
+        name: [
+            {"value": value, "count": count}
+            for value, count in sorted(tally.items(), key=lambda item: (-item[1], item[0] is None, item[0] or ""))[:limit]
+        ]
+        for name, tally in tallies.items()
+    }
+
+
+def forget_search_documents(
+    db: Session,
+    *,
+    workspace_id: UUID,
+    entity_type: str,
+    ids: Collection[UUID] = (),
+    parent_ids: Collection[UUID] = (),
+) -> None:
+    """Drop the documents of records about to be removed with a bulk ``delete()``.
+
+    ``ids`` are the removed records; ``parent_ids`` drops every ``entity_type`` document under
+    those leads or threads (pages and snapshots of deleted leads).
+    """
+    if not ids and not parent_ids:
+        return
+    db.execute(
+        delete(SearchDocument).where(
+            SearchDocument.workspace_id == workspace_id,
+            SearchDocument.entity_type == entity_type,
+            or_(SearchDocument.entity_id.in_(ids), SearchDocument.parent_id.in_(parent_ids)),
+        )
+    )
+
+
+def rebuild_search_documents(
+    connection: Connection,
+    workspace_id: UUID | None = None,
+    *,
+    batch_size: int = 500,
+) -> int:
+    """Rewrite every search document (optionally one workspace) and drop orphans.
+
+    Returns the number of documents written. Does not commit.
+    """
+    indexed = 0
+    for entity_type, model in _ENTITY_MODELS.items():
+        entities = model.__table__
+        orphaned = delete(SearchDocument).where(
+            SearchDocument.entity_type == entity_type,
+            ~exists().where(entities.c.id == SearchDocument.entity_id),
+        )
+        if workspace_id is not None:
+            orphaned = orphaned.where(SearchDocument.workspace_id == workspace_id)
+        connection.execute(orphaned)
+
+        last_id = None
+        while True:
+            query = select(entities.c.id).order_by(entities.c.id).limit(batch_size)
+            if workspace_id is not None and model is EmailMessageRecord:
+                query = query.join(EmailThread, EmailThread.id == entities.c.thread_id).where(
+                    EmailThread.workspace_id == workspace_id
+                )
+            elif workspace_id is not None:
+                query = query.where(entities.c.workspace_id == workspace_id)
+            if last_id is not None:
+                query = query.where(entities.c.id > last_id)
+            ids = connection.scalars(query).all()
+            if not ids:
+                break
+            last_id = ids[-1]
+            refresh_search_documents(connection, entity_type, ids)
+            indexed += len(ids)
+    return indexed
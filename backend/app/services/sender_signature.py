@@ -11,7 +11,10 @@ from app.models.workspace_profile import WorkspaceProfile
 
 
 def get_sender_info(db: Session, workspace_id: UUID) -> dict[str, str]:
-    profile = db.get(WorkspaceProfile, workspace_id)
+    return sender_info_from_profile(db.get(WorkspaceProfile, workspace_id))
+
+
+def sender_info_from_profile(profile: WorkspaceProfile | None) -> dict[str, str]:
     if not profile:
         return {}
     return {
@@ -0,0 +1,108 @@
+"""Content-addressed text store shared by website pages, snapshots and partner candidates.
+
+Identical texts are stored once, compressed, in ``text_blobs``; rows hold the blob id.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import JSON, bindparam, column, exists, select, table, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.partner_candidate import PartnerCandidate
+from app.models.text_blob import TextBlob, text_blob_id, write_text_blobs
+from app.models.website_page import WebsitePage
+from app.models.website_snapshot import WebsiteSnapshot
+
+# Blobs younger than this are kept even when unreferenced: the row pointing at them may
+# not have committed yet.
+UNREFERENCED_BLOB_GRACE = timedelta(hours=1)
+
+
+def store_text(db: Session, text: str | None) -> str | None:
+    """Store ``text`` (if not already present) and return its blob id. Does not commit."""
+    if not text:
+        return None
+    blob_id = text_blob_id(text)
+    write_text_blobs(db, {blob_id: text})
+    return blob_id
+
+
+def load_text(db: Session, blob_id: str | None) -> str | None:
+    if not blob_id:
+        return None
+    blob = db.get(TextBlob, blob_id)
+    return blob.text if blob is not None else None
+
+
+def purge_unreferenced_text_blobs(db: Session, *, now: datetime | None = None) -> int:
+    """Delete blobs no page, snapshot or partner candidate points at. Returns rows deleted."""
+    cutoff = (now or datetime.now(timezone.utc)) - UNREFERENCED_BLOB_GRACE
+    result = db.execute(
+        TextBlob.__table__.delete().where(
+            TextBlob.created_at < cutoff,
+            ~exists().where(WebsitePage.text_id == TextBlob.id),
+            ~exists().where(WebsiteSnapshot.text_id == TextBlob.id),
+            ~exists().where(PartnerCandidate.crawled_text_id == TextBlob.id),
+        )
+    )
+    db.commit()
+    return result.rowcount or 0
+
+
+def backfill_text_store(connection: Connection, *, batch_size: int = 500) -> int:
+    """Move inline page/snapshot ``raw_text`` and partner ``crawled_text`` signals into the store.
+
+    Runs on a plain connection so the migration introducing ``text_blobs`` and the SQLite
+    startup path can share it; expects ``text_id`` / ``crawled_text_id`` to exist next to the
+    legacy data. Returns rows moved.
+    """
+    moved = 0
+    for table_name in ("website_pages", "website_snapshots"):
+        legacy = table(table_name, column("id"), column("raw_text"), column("text_id"))
+        stmt = update(legacy).where(legacy.c.id == bindparam("row_id")).values(text_id=bindparam("blob_id"))
+        while True:
+            rows = connection.execute(
+                select(legacy.c.id, legacy.c.raw_text).where(legacy.c.text_id.is_(None)).limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            texts = {text_blob_id(raw_text or ""): raw_text or "" for _row_id, raw_text in rows}
+            write_text_blobs(connection, texts)
+            connection.execute(
+                stmt,
+                [{"row_id": row_id, "blob_id": text_blob_id(raw_text or "")} for row_id, raw_text in rows],
+            )
+            moved += len(rows)
+
+    partners = table("partner_candidates", column("id"), column("extracted_signals", JSON), column("crawled_text_id"))
+    stmt = (
+        update(partners)
+        .where(partners.c.id == bindparam("row_id"))
+        .values(crawled_text_id=bindparam("blob_id"), extracted_signals=bindparam("signals", type_=JSON))
+    )
+    last_id = None
+    while True:
+        query = select(partners.c.id, partners.c.extracted_signals).where(partners.c.crawled_text_id.is_(None))
+        if last_id is not None:
+            query = query.where(partners.c.id > last_id)
+        rows = connection.execute(query.order_by(partners.c.id).limit(batch_size)).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        texts: dict[str, str] = {}
+        params = []
+        for row_id, signals in rows:
+            if not isinstance(signals, dict) or "crawled_text" not in signals:
+                continue
+            crawled_text = signals.pop("crawled_text")
+            blob_id = text_blob_id(crawled_text) if crawled_text else None
+            if blob_id is not None:
+                texts[blob_id] = crawled_text
+            params.append({"row_id": row_id, "blob_id": blob_id, "signals": signals})
+        write_text_blobs(connection, texts)
+        if params:
+            connection.execute(stmt, params)
+            moved += len(params)
+    return moved
@@ -8,12 +8,14 @@ from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Any
 
 import httpx
+from sqlalchemy import select, update
 
 from app.core.config import settings
 from app.models.workspace_ai_strategy import WorkspaceAIStrategy
 from app.models.workspace_profile import WorkspaceProfile
 
 if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
     from sqlalchemy.orm import Session
 from app.services.openai_client import (
     OpenAIClientError,
@@ -230,7 +232,7 @@ def generate_workspace_outreach_strategy(
     if not resolved_api_key:
         raise OpenAIConfigurationError("OpenAI API key is not configured")
 
-    profile_payload = _workspace_profile_payload(workspace_profile)
+    profile_payload = workspace_profile_payload(workspace_profile)
     preclassified_models = _classify_business_model(profile_payload)
     profile_payload["business_model_classification"] = preclassified_models
     payload = _build_strategy_payload(profile_payload, preclassified_models)
@@ -286,7 +288,7 @@ def ensure_workspace_strategy_generated(
     profile = db.get(WorkspaceProfile, workspace_id)
     strategy = db.get(WorkspaceAIStrategy, workspace_id)
 
-    if not _profile_has_content(profile):
+    if not profile_has_content(profile):
         return strategy
 
     if strategy is not None and strategy.generated_strategy is not None:
@@ -312,13 +314,14 @@ def ensure_workspace_strategy_generated(
     strategy.generated_strategy = generated
     strategy.last_generated_at = datetime.now(timezone.utc)
     strategy.updated_at = datetime.now(timezone.utc)
+    compile_workspace_strategy(strategy)
     db.commit()
     db.refresh(strategy)
     logger.info("Auto-generated workspace strategy workspace_id=%s", workspace_id)
     return strategy
 
 
-def _profile_has_content(profile: WorkspaceProfile | None) -> bool:
+def profile_has_content(profile: WorkspaceProfile | None) -> bool:
     if profile is None:
         return False
     if profile.business_name and profile.business_name.strip():
@@ -349,93 +352,81 @@ _CATEGORY_ALIASES: dict[str, list[str]] = {
     "food": ["restaurant", "hospitality"],
 }
 
+# Bumped whenever compile_strategy_context's output changes shape; stored contexts with
+# another format are recompiled on load.
+STRATEGY_CONTEXT_FORMAT = 1
+_NO_CATEGORY = ""
+# Order of the fields in a built context, as the agents' prompts have always seen them.
+_STRATEGY_CONTEXT_FIELDS = (
+    "generated_strategy",
+    "core_positioning",
+    "selected_target_categories",
+    "selected_priority_pain_points",
+    "selected_cta_style",
+    "selected_target_category_details",
+    "selected_priority_pain_point_details",
+    "selected_cta_recommendation",
+    "rapport_points",
+    "strategy_available",
+    "selection_mode",
+    "target_categories",
+    "matched_workspace_category",
+    "matched_category",
+    "pain_points_by_category",
+    "fallback_pain_points_for_category",
+    "fallback_service_angles_for_category",
+    "fallback_rapport_hooks_for_category",
+)
 
-def _resolve_matched_workspace_category(
-    lead_category: str | None,
-    target_categories: list[str],
-) -> str | None:
-    """Map lead/prospect category to a workspace target category if possible."""
-    if not lead_category or not target_categories:
-        return None
-    normalized_lead = _normalize_category_for_match(lead_category)
-    if not normalized_lead:
-        return None
-    target_norms = {_normalize_identifier(tc): tc for tc in target_categories}
-    for tc in target_categories:
-        tc_norm = _normalize_identifier(tc)
-        if tc_norm == normalized_lead:
-            return tc
-        if normalized_lead in tc_norm or tc_norm in normalized_lead:
-            return tc
-    for alias, candidates in _CATEGORY_ALIASES.items():
-        if alias in normalized_lead:
-            for cand in candidates:
-                c_norm = _normalize_identifier(cand)
-                if c_norm in target_norms:
-                    return target_norms[c_norm]
-                for tn, t in target_norms.items():
-                    if c_norm in tn or cand in tn or tn in c_norm:
-                        return t
-            return target_categories[0]
-    return None
-
-
-def build_strategy_context(
-    strategy: WorkspaceAIStrategy | None,
-    *,
-    lead_category: str | None = None,
-) -> dict[str, Any]:
-    if strategy is None:
-        return {
-            "generated_strategy": None,
-            "selected_target_categories": [],
-            "selected_priority_pain_points": [],
-            "selected_cta_style": None,
-            "selected_target_category_details": [],
-            "selected_priority_pain_point_details": [],
-            "selected_cta_recommendation": None,
-            "rapport_points": [],
-            "strategy_available": False,
-            "selection_mode": "open",
-            "target_categories": [],
-            "matched_workspace_category": None,
-            "matched_category": None,
-            "pain_points_by_category": {},
-            "fallback_pain_points_for_category": [],
-            "fallback_service_angles_for_category": [],
-            "fallback_rapport_hooks_for_category": [],
-        }
-
-    generated = strategy.generated_strategy if isinstance(strategy.generated_strategy, dict) else None
-    ideal_customers = _safe_object_list(generated, "ideal_customers")
-    pain_points = _safe_object_list(generated, "priority_pain_points")
-    rapport_points = _safe_object_list(generated, "rapport_points")
-    ctas = _safe_object_list(generated, "cta_recommendations")
-    raw_target = (generated or {}).get("target_categories")
-    target_categories = [str(c) for c in (raw_target or []) if isinstance(c, str)]
-    if not target_categories:
-        target_categories = [item.get("category") for item in ideal_customers if item.get("category")]
+_EMPTY_STRATEGY_CONTEXT: dict[str, Any] = {
+    "generated_strategy": None,
+    "selected_target_categories": [],
+    "selected_priority_pain_points": [],
+    "selected_cta_style": None,
+    "selected_target_category_details": [],
+    "selected_priority_pain_point_details": [],
+    "selected_cta_recommendation": None,
+    "rapport_points": [],
+    "strategy_available": False,
+    "selection_mode": "open",
+    "target_categories": [],
+    "matched_workspace_category": None,
+    "matched_category": None,
+    "pain_points_by_category": {},
+    "fallback_pain_points_for_category": [],
+    "fallback_service_angles_for_category": [],
+    "fallback_rapport_hooks_for_category": [],
+}
 
-    pain_points_by_cat = (generated or {}).get("pain_points_by_category") or {}
-    service_angles_by_cat = (generated or {}).get("service_angles_by_category") or {}
-    rapport_hooks_by_cat = (generated or {}).get("rapport_hooks_by_category") or {}
 
-    selected_categories = normalize_string_list(strategy.selected_target_categories)
-    selected_pains = normalize_string_list(strategy.selected_priority_pain_points)
-    selected_cta = (strategy.selected_cta_style or "").strip() or None
+def _alias_target(candidates: list[str], target_norms: dict[str, str], target_categories: list[str]) -> str:
+    """Target category a lead matching an alias with ``candidates`` resolves to."""
+    for cand in candidates:
+        c_norm = _normalize_identifier(cand)
+        if c_norm in target_norms:
+            return target_norms[c_norm]
+        for tn, t in target_norms.items():
+            if c_norm in tn or cand in tn or tn in c_norm:
+                return t
+    return target_categories[0]
 
-    selected_category_details = _match_selected(ideal_customers, "category", selected_categories)
-    selected_pain_details = _match_selected(pain_points, "key", selected_pains)
-    selected_cta_detail = _first_matching(ctas, "key", selected_cta)
 
-    matched_category = _resolve_matched_workspace_category(lead_category, target_categories)
+def _category_context(
+    matched_category: str | None,
+    *,
+    pain_points: list[dict[str, Any]],
+    rapport_points: list[dict[str, Any]],
+    pain_points_by_cat: dict[str, Any],
+    service_angles_by_cat: dict[str, Any],
+    rapport_hooks_by_cat: dict[str, Any],
+) -> dict[str, Any]:
     fallback_pain_points: list[dict[str, Any]] = []
     fallback_service_angles: list[str] = []
     fallback_rapport_hooks: list[str] = []
     if matched_category:
         fallback_pain_points = pain_points_by_cat.get(matched_category, pain_points)
         fallback_service_angles = service_angles_by_cat.get(matched_category, [])
-        fallback_rapport_hooks = rapport_hooks_by_cat.get(matched_category, [])
+        fallback_rapport_hooks = list(rapport_hooks_by_cat.get(matched_category, []))
         if not fallback_rapport_hooks:
             rp = next((r for r in rapport_points if r.get("category") == matched_category), None)
             if rp and rp.get("hooks"):
@@ -447,6 +438,46 @@ def build_strategy_context(
             if isinstance(rp, dict) and rp.get("hooks"):
                 fallback_rapport_hooks.extend(rp["hooks"])
         fallback_rapport_hooks = list(dict.fromkeys(fallback_rapport_hooks))
+    return {
+        "matched_workspace_category": matched_category,
+        "matched_category": matched_category,
+        "fallback_pain_points_for_category": fallback_pain_points,
+        "fallback_service_angles_for_category": fallback_service_angles,
+        "fallback_rapport_hooks_for_category": fallback_rapport_hooks,
+    }
+
+
+def compile_strategy_context(
+    generated_strategy: dict[str, Any] | None,
+    *,
+    selected_target_categories: list[str] | None,
+    selected_priority_pain_points: list[str] | None,
+    selected_cta_style: str | None,
+) -> dict[str, Any]:
+    """Precompute every strategy context a lead can get, as JSON for ``compiled_context``.
+
+    ``base`` holds the fields shared by all leads, ``categories`` the category-dependent
+    ones for each target category (``""`` when nothing matches), and ``targets`` /
+    ``aliases`` the normalized matching tables ``CompiledStrategyContext`` resolves lead
+    categories with.
+    """
+    generated = generated_strategy if isinstance(generated_strategy, dict) else None
+    ideal_customers = _safe_object_list(generated, "ideal_customers")
+    pain_points = _safe_object_list(generated, "priority_pain_points")
+    rapport_points = _safe_object_list(generated, "rapport_points")
+    ctas = _safe_object_list(generated, "cta_recommendations")
+    raw_target = (generated or {}).get("target_categories")
+    target_categories = [str(c) for c in (raw_target or []) if isinstance(c, str)]
+    if not target_categories:
+        target_categories = [item.get("category") for item in ideal_customers if item.get("category")]
+
+    pain_points_by_cat = (generated or {}).get("pain_points_by_category") or {}
+    service_angles_by_cat = (generated or {}).get("service_angles_by_category") or {}
+    rapport_hooks_by_cat = (generated or {}).get("rapport_hooks_by_category") or {}
+
+    selected_categories = normalize_string_list(selected_target_categories)
+    selected_pains = normalize_string_list(selected_priority_pain_points)
+    selected_cta = (selected_cta_style or "").strip() or None
 
     core_positioning = (generated or {}).get("core_positioning") if isinstance(generated, dict) else None
     core_positioning = str(core_positioning).strip() if core_positioning else None
@@ -455,29 +486,146 @@ def build_strategy_context(
     if isinstance(pain_points_by_cat, dict):
         pbc_dict = {str(k): v for k, v in pain_points_by_cat.items()}
 
-    return {
+    base = {
         "generated_strategy": generated,
         "core_positioning": core_positioning,
         "selected_target_categories": selected_categories,
         "selected_priority_pain_points": selected_pains,
         "selected_cta_style": selected_cta,
-        "selected_target_category_details": selected_category_details,
-        "selected_priority_pain_point_details": selected_pain_details,
-        "selected_cta_recommendation": selected_cta_detail,
+        "selected_target_category_details": _match_selected(ideal_customers, "category", selected_categories),
+        "selected_priority_pain_point_details": _match_selected(pain_points, "key", selected_pains),
+        "selected_cta_recommendation": _first_matching(ctas, "key", selected_cta),
         "rapport_points": rapport_points,
         "strategy_available": generated is not None,
         "selection_mode": "selected_only" if (selected_categories or selected_pains or selected_cta) else "open",
         "target_categories": target_categories,
-        "matched_workspace_category": matched_category,
-        "matched_category": matched_category,
         "pain_points_by_category": pbc_dict,
-        "fallback_pain_points_for_category": fallback_pain_points,
-        "fallback_service_angles_for_category": fallback_service_angles,
-        "fallback_rapport_hooks_for_category": fallback_rapport_hooks,
     }
+    sources = {
+        "pain_points": pain_points,
+        "rapport_points": rapport_points,
+        "pain_points_by_cat": pain_points_by_cat,
+        "service_angles_by_cat": service_angles_by_cat,
+        "rapport_hooks_by_cat": rapport_hooks_by_cat,
+    }
+    categories = {_NO_CATEGORY: _category_context(None, **sources)}
+    for tc in target_categories:
+        categories.setdefault(tc, _category_context(tc, **sources))
+
+    target_norms = {_normalize_identifier(tc): tc for tc in target_categories}
+    return {
+        "format": STRATEGY_CONTEXT_FORMAT,
+        "base": base,
+        "categories": categories,
+        "targets": [[_normalize_identifier(tc), tc] for tc in target_categories],
+        "aliases": [
+            [alias, _alias_target(candidates, target_norms, target_categories)]
+            for alias, candidates in _CATEGORY_ALIASES.items()
+        ] if target_categories else [],
+    }
+
+
+def compile_workspace_strategy(strategy: WorkspaceAIStrategy) -> None:
+    """Store the compiled context of ``strategy``; call after changing its strategy or selections."""
+    strategy.compiled_context = compile_strategy_context(
+        strategy.generated_strategy,
+        selected_target_categories=strategy.selected_target_categories,
+        selected_priority_pain_points=strategy.selected_priority_pain_points,
+        selected_cta_style=strategy.selected_cta_style,
+    )
+
+
+def rebuild_compiled_strategy_contexts(connection: "Connection") -> int:
+    """Recompile the stored context of every workspace strategy; returns how many."""
+    strategies = WorkspaceAIStrategy.__table__
+    rows = connection.execute(
+        select(
+            strategies.c.workspace_id,
+            strategies.c.generated_strategy,
+            strategies.c.selected_target_categories,
+            strategies.c.selected_priority_pain_points,
+            strategies.c.selected_cta_style,
+        )
+    ).all()
+    for workspace_id, generated, selected_categories, selected_pains, selected_cta in rows:
+        connection.execute(
+            update(strategies)
+            .where(strategies.c.workspace_id == workspace_id)
+            .values(
+                compiled_context=compile_strategy_context(
+                    generated,
+                    selected_target_categories=selected_categories,
+                    selected_priority_pain_points=selected_pains,
+                    selected_cta_style=selected_cta,
+                ),
+                updated_at=strategies.c.updated_at,
+            )
+        )
+    return len(rows)
+
+
+class CompiledStrategyContext:
+    """Strategy contexts of one workspace, looked up by lead category.
+
+    Matches are memoized per normalized lead category, so each distinct category is
+    resolved against the target and alias tables once.
+    """
+
+    def __init__(self, compiled: dict[str, Any] | None) -> None:
+        self._compiled = compiled
+        self._matches: dict[str, str | None] = {}
+
+    @classmethod
+    def for_strategy(cls, strategy: WorkspaceAIStrategy | None) -> CompiledStrategyContext:
+        if strategy is None:
+            return cls(None)
+        compiled = strategy.compiled_context
+        if not isinstance(compiled, dict) or compiled.get("format") != STRATEGY_CONTEXT_FORMAT:
+            compiled = compile_strategy_context(
+                strategy.generated_strategy,
+                selected_target_categories=strategy.selected_target_categories,
+                selected_priority_pain_points=strategy.selected_priority_pain_points,
+                selected_cta_style=strategy.selected_cta_style,
+            )
+        return cls(compiled)
+
+    def match_category(self, lead_category: str | None) -> str | None:
+        """Map lead/prospect category to a workspace target category if possible."""
+        if self._compiled is None or not lead_category or not self._compiled["targets"]:
+            return None
+        normalized_lead = _normalize_category_for_match(lead_category)
+        if not normalized_lead:
+            return None
+        if normalized_lead in self._matches:
+            return self._matches[normalized_lead]
+        matched = next(
+            (tc for tc_norm, tc in self._compiled["targets"] if normalized_lead in tc_norm or tc_norm in normalized_lead),
+            None,
+        )
+        if matched is None:
+            matched = next((tc for alias, tc in self._compiled["aliases"] if alias in normalized_lead), None)
+        self._matches[normalized_lead] = matched
+        return matched
+
+    def context(self, lead_category: str | None = None) -> dict[str, Any]:
+        """The strategy context for a lead in ``lead_category``. Nested values are shared; do not mutate them."""
+        if self._compiled is None:
+            return dict(_EMPTY_STRATEGY_CONTEXT)
+        categories = self._compiled["categories"]
+        matched = self.match_category(lead_category)
+        fields = {**self._compiled["base"], **categories.get(matched or _NO_CATEGORY, categories[_NO_CATEGORY])}
+        return {name: fields[name] for name in _STRATEGY_CONTEXT_FIELDS}
+
+
+def build_strategy_context(
+    strategy: WorkspaceAIStrategy | None,
+    *,
+    lead_category: str | None = None,
+) -> dict[str, Any]:
+    return CompiledStrategyContext.for_strategy(strategy).context(lead_category)
 
 
-def _workspace_profile_payload(workspace_profile: WorkspaceProfile | None) -> dict[str, Any]:
+def workspace_profile_payload(workspace_profile: WorkspaceProfile | None) -> dict[str, Any]:
     if workspace_profile is None:
         return {
             "business_name": None,
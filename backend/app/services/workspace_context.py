@@ -0,0 +1,128 @@
+"""Per-workspace configuration resolved once and shared by everything that needs it.
+
+Agent runs, the pipeline worker and inbox processing each need a workspace's API keys,
+automation policy, sender info, profile and AI strategy, often several times per lead.
+``get_workspace_context`` loads all of it in one query and memoizes the result on the
+session (one request, or one worker step). Contexts are also kept per process, keyed by
+``workspaces.settings_version``: a later session only reads the stamp and reuses the cached
+context unless the configuration changed (see ``app.models.workspace_settings_version``).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.workspace import Workspace
+from app.models.workspace_ai_strategy import WorkspaceAIStrategy
+from app.models.workspace_automation_setting import WorkspaceAutomationSetting
+from app.models.workspace_profile import WorkspaceProfile
+from app.models.workspace_setting import WorkspaceSetting
+from app.models.workspace_settings_version import BUMPED_WORKSPACES_INFO_KEY, WORKSPACE_CONTEXTS_INFO_KEY
+from app.services.automation_policy import AutomationPolicy, automation_policy_from_settings
+from app.services.sender_signature import sender_info_from_profile
+from app.services.workspace_ai_strategy import CompiledStrategyContext, profile_has_content, workspace_profile_payload
+from app.services.workspace_credentials import choose_email_generation_provider, usable_api_key
+
+# Workspace id -> latest context loaded by any session of this process.
+_CONTEXTS: dict[UUID, "WorkspaceContext"] = {}
+
+
+@dataclass(frozen=True)
+class WorkspaceContext:
+    workspace_id: UUID
+    settings_version: int
+    openai_api_key: str | None
+    openai_key_source: str
+    anthropic_api_key: str | None
+    anthropic_key_source: str
+    preferred_ai_provider: str | None
+    automation_policy: AutomationPolicy
+    sender_info: dict[str, str]
+    # workspace_profile_payload() of the profile, None when the workspace has none.
+    profile: dict[str, Any] | None
+    has_profile_content: bool
+    generated_strategy: dict[str, Any] | None
+    compiled_strategy: CompiledStrategyContext
+
+    @property
+    def email_generation_provider(self) -> tuple[str, str | None]:
+        return choose_email_generation_provider(
+            self.preferred_ai_provider,
+            anthropic_key=self.anthropic_api_key,
+            openai_key=self.openai_api_key,
+        )
+
+    @property
+    def needs_strategy_generation(self) -> bool:
+        return self.has_profile_content and self.generated_strategy is None
+
+    def strategy_context(self, lead_category: str | None) -> dict[str, Any]:
+        """The strategy context for a lead in ``lead_category``; nested values are shared, do not mutate."""
+        return self.compiled_strategy.context(lead_category)
+
+
+def _load_workspace_context(db: Session, workspace_id: UUID) -> WorkspaceContext:
+    row = db.execute(
+        select(Workspace.settings_version, WorkspaceSetting, WorkspaceAutomationSetting, WorkspaceProfile, WorkspaceAIStrategy)
+        .select_from(Workspace)
+        .outerjoin(WorkspaceSetting, WorkspaceSetting.workspace_id == Workspace.id)
+        .outerjoin(WorkspaceAutomationSetting, WorkspaceAutomationSetting.workspace_id == Workspace.id)
+        .outerjoin(WorkspaceProfile, WorkspaceProfile.workspace_id == Workspace.id)
+        .outerjoin(WorkspaceAIStrategy, WorkspaceAIStrategy.workspace_id == Workspace.id)
+        .where(Workspace.id == workspace_id)
+    ).first()
+    version, workspace_settings, automation_settings, profile, strategy = row if row is not None else (-1, None, None, None, None)
+
+    openai_api_key, openai_key_source = usable_api_key(
+        workspace_settings.openai_api_key if workspace_settings else None,
+        settings.openai_api_key,
+    )
+    anthropic_api_key, anthropic_key_source = usable_api_key(
+        workspace_settings.anthropic_api_key if workspace_settings else None,
+        settings.anthropic_api_key,
+    )
+    return WorkspaceContext(
+        workspace_id=workspace_id,
+        settings_version=version,
+        openai_api_key=openai_api_key,
+        openai_key_source=openai_key_source,
+        anthropic_api_key=anthropic_api_key,
+        anthropic_key_source=anthropic_key_source,
+        preferred_ai_provider=workspace_settings.preferred_ai_provider if workspace_settings else None,
+        automation_policy=automation_policy_from_settings(workspace_id, automation_settings),
+        sender_info=sender_info_from_profile(profile),
+        profile=workspace_profile_payload(profile) if profile is not None else None,
+        has_profile_content=profile_has_content(profile),
+        generated_strategy=strategy.generated_strategy if strategy is not None else None,
+        compiled_strategy=CompiledStrategyContext.for_strategy(strategy),
+    )
+
+
+def get_workspace_context(db: Session, workspace_id: UUID) -> WorkspaceContext:
+    """The configuration of ``workspace_id``, loaded at most once per session.
+
+    Costs one small version query when another session of this process already loaded the
+    current configuration, and one joined query otherwise.
+    """
+    contexts: dict[UUID, WorkspaceContext] = db.info.setdefault(WORKSPACE_CONTEXTS_INFO_KEY, {})
+    context = contexts.get(workspace_id)
+    if context is not None:
+        return context
+
+    cached = _CONTEXTS.get(workspace_id)
+    if cached is not None and cached.settings_version == db.scalar(
+        select(Workspace.settings_version).where(Workspace.id == workspace_id)
+    ):
+        context = cached
+    else:
+        context = _load_workspace_context(db, workspace_id)
+        # Configuration written by this session's open transaction stays private to it.
+        if workspace_id not in db.info.get(BUMPED_WORKSPACES_INFO_KEY, ()):
+            _CONTEXTS[workspace_id] = context
+    contexts[workspace_id] = context
+    return context
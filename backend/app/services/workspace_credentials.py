@@ -8,41 +8,29 @@ from app.core.config import settings
 from app.models.workspace_setting import WorkspaceSetting
 
 
-def resolve_openai_api_key(db: Session, workspace_id: UUID) -> tuple[str | None, str]:
-    workspace_settings = db.get(WorkspaceSetting, workspace_id)
-    if workspace_settings and workspace_settings.openai_api_key and workspace_settings.openai_api_key.strip():
-        return workspace_settings.openai_api_key.strip(), "workspace_settings"
-    if settings.openai_api_key and settings.openai_api_key.strip():
-        return settings.openai_api_key.strip(), "environment"
-    return None, "missing"
-
-
-def resolve_anthropic_api_key(db: Session, workspace_id: UUID) -> tuple[str | None, str]:
-    workspace_settings = db.get(WorkspaceSetting, workspace_id)
-    if workspace_settings and workspace_settings.anthropic_api_key and workspace_settings.anthropic_api_key.strip():
-        return workspace_settings.anthropic_api_key.strip(), "workspace_settings"
-    if settings.anthropic_api_key and settings.anthropic_api_key.strip():
-        return settings.anthropic_api_key.strip(), "environment"
+def usable_api_key(workspace_value: str | None, environment_value: str | None) -> tuple[str | None, str]:
+    """Pick the workspace key over the environment one; returns (key, source)."""
+    if workspace_value and workspace_value.strip():
+        return workspace_value.strip(), "workspace_settings"
+    if environment_value and environment_value.strip():
+        return environment_value.strip(), "environment"
     return None, "missing"
 
 
-def resolve_email_generation_provider(
-    db: Session, workspace_id: UUID
+def choose_email_generation_provider(
+    preference: str | None,
+    *,
+    anthropic_key: str | None,
+    openai_key: str | None,
 ) -> tuple[str, str | None]:
-    """Return (provider, api_key) for email generation.
+    """Return (provider, api_key) for a preferred_ai_provider setting and the resolved keys.
 
-    Respects workspace preferred_ai_provider setting:
     - 'anthropic': force Claude (requires Anthropic key)
     - 'openai': force GPT (requires OpenAI key)
     - 'auto' or None: prefers Anthropic if configured, falls back to OpenAI
     Returns ('none', None) when no key is available.
     """
-    workspace_settings = db.get(WorkspaceSetting, workspace_id)
-    preference = (workspace_settings.preferred_ai_provider if workspace_settings else None) or "auto"
-
-    anthropic_key, _ = resolve_anthropic_api_key(db, workspace_id)
-    openai_key, _ = resolve_openai_api_key(db, workspace_id)
-
+    preference = preference or "auto"
     if preference == "anthropic":
         return ("anthropic", anthropic_key) if anthropic_key else ("none", None)
     if preference == "openai":
@@ -56,10 +44,39 @@ def resolve_email_generation_provider(
     return "none", None
 
 
+def resolve_openai_api_key(db: Session, workspace_id: UUID) -> tuple[str | None, str]:
+    workspace_settings = db.get(WorkspaceSetting, workspace_id)
+    return usable_api_key(workspace_settings.openai_api_key if workspace_settings else None, settings.openai_api_key)
+
+
+def resolve_anthropic_api_key(db: Session, workspace_id: UUID) -> tuple[str | None, str]:
+    workspace_settings = db.get(WorkspaceSetting, workspace_id)
+    return usable_api_key(
+        workspace_settings.anthropic_api_key if workspace_settings else None,
+        settings.anthropic_api_key,
+    )
+
+
+def resolve_email_generation_provider(
+    db: Session, workspace_id: UUID
+) -> tuple[str, str | None]:
+    """Return (provider, api_key) for email generation; see ``choose_email_generation_provider``."""
+    workspace_settings = db.get(WorkspaceSetting, workspace_id)
+    anthropic_key, _ = usable_api_key(
+        workspace_settings.anthropic_api_key if workspace_settings else None,
+        settings.anthropic_api_key,
+    )
+    openai_key, _ = usable_api_key(workspace_settings.openai_api_key if workspace_settings else None, settings.openai_api_key)
+    return choose_email_generation_provider(
+        workspace_settings.preferred_ai_provider if workspace_settings else None,
+        anthropic_key=anthropic_key,
+        openai_key=openai_key,
+    )
+
+
 def resolve_google_places_api_key(db: Session, workspace_id: UUID) -> tuple[str | None, str]:
     workspace_settings = db.get(WorkspaceSetting, workspace_id)
-    if workspace_settings and workspace_settings.google_places_api_key and workspace_settings.google_places_api_key.strip():
-        return workspace_settings.google_places_api_key.strip(), "workspace_settings"
-    if settings.google_places_api_key and settings.google_places_api_key.strip():
-        return settings.google_places_api_key.strip(), "environment"
-    return None, "missing"
+    return usable_api_key(
+        workspace_settings.google_places_api_key if workspace_settings else None,
+        settings.google_places_api_key,
+    )
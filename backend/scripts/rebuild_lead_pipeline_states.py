@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Recompute the materialized pipeline state on leads (has_snapshot, has_draft, ...,
+pipeline_stage) from their status, website snapshots and email drafts.
+
+Use after a bulk import/restore or raw SQL edits, or if list stages look out of sync with
+lead detail. Safe to run repeatedly.
+
+Run from backend dir:
+  python scripts/rebuild_lead_pipeline_states.py [--workspace-id UUID]
+
+With Docker:
+  docker compose exec backend python scripts/rebuild_lead_pipeline_states.py
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from uuid import UUID
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.models  # noqa: F401,E402 — register all ORM models
+from app.db.session import engine  # noqa: E402
+from app.services.lead_pipeline import rebuild_lead_pipeline_states  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workspace-id", type=UUID, default=None, help="Limit the rebuild to one workspace")
+    args = parser.parse_args()
+
+    with engine.begin() as connection:
+        corrected = rebuild_lead_pipeline_states(connection, args.workspace_id)
+    print(f"Corrected pipeline state for {corrected} lead(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Rewrite the search documents of every lead, prospect, crawled page, website snapshot and
+email message, and drop documents whose record no longer exists.
+
+Use after a bulk import/restore or raw SQL edits, or if search results look stale.
+Safe to run repeatedly.
+
+Run from backend dir:
+  python scripts/rebuild_search_documents.py [--workspace-id UUID]
+
+With Docker:
+  docker compose exec backend python scripts/rebuild_search_documents.py
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from uuid import UUID
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.models  # noqa: F401,E402 — register all ORM models
+from app.db.session import engine  # noqa: E402
+from app.services.search import ensure_search_index, rebuild_search_documents  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workspace-id", type=UUID, default=None, help="Limit the rebuild to one workspace")
+    args = parser.parse_args()
+
+    with engine.begin() as connection:
+        ensure_search_index(connection)
+        indexed = rebuild_search_documents(connection, args.workspace_id)
+    print(f"Indexed {indexed} search document(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Recompute the denormalized summary columns on email_threads from email_messages.
+
+Use after a bulk import/restore, or if inbox counts look out of sync with thread detail.
+Safe to run repeatedly.
+
+Run from backend dir:
+  python scripts/rebuild_thread_summaries.py [--workspace-id UUID]
+
+With Docker:
+  docker compose exec backend python scripts/rebuild_thread_summaries.py
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from uuid import UUID
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.models  # noqa: F401,E402 — register all ORM models
+from app.db.session import SessionLocal  # noqa: E402
+from app.services.inbox_service import rebuild_thread_summaries  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workspace-id", type=UUID, default=None, help="Limit the rebuild to one workspace")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rebuilt = rebuild_thread_summaries(db, args.workspace_id)
+        print(f"Rebuilt summaries for {rebuilt} thread(s)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import hashlib
 import json
 import os
 import sys
+from dataclasses import dataclass, field
 from pathlib import Path
 
+import httpx
+
 ROOT_DIR = Path(__file__).resolve().parent
 BACKEND_DIR = ROOT_DIR / "backend"
 if str(BACKEND_DIR) not in sys.path:
@@ -15,7 +20,10 @@ from app.services.lead_sources.google_places import (
     GooglePlaceLead,
     GooglePlacesCrawler,
     GooglePlacesCrawlerError,
+    places_rate_limiter,
 )
+from app.services.lead_sources.places_cache import PlacesCache, SqlPlacesCache
+from app.services.lead_sources.places_sweep import BoundingBox, SweepArea
 
 DEFAULT_LOCATION = "39.727132,-121.843275"
 DEFAULT_RADIUS = 15_000
@@ -78,51 +86,337 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="only include places that do not have a website",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="max in-flight Google Places requests (default: GOOGLE_PLACES_CONCURRENCY or 8)",
+    )
+    parser.add_argument(
+        "--qps",
+        type=float,
+        default=None,
+        help="max Google Places requests per second (default: GOOGLE_PLACES_QPS or 10)",
+    )
+    parser.add_argument(
+        "--cache-db",
+        default="crawler_places_cache.sqlite",
+        help="SQLite file caching geocode, nearby-search and place-details responses between runs",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="always call the API")
+    parser.add_argument(
+        "--sweep",
+        action="store_true",
+        help="tile the area and subdivide tiles that hit the 60-result cap (covers dense areas fully)",
+    )
+    parser.add_argument(
+        "--bbox",
+        default=None,
+        help="sweep area as south,west,north,east (default: geocoded bounds of --location, or --radius around a lat,lng)",
+    )
+    parser.add_argument("--polygon", default=None, help="GeoJSON file whose (first) polygon limits the sweep area")
+    parser.add_argument(
+        "--min-tile-radius",
+        type=int,
+        default=None,
+        help="smallest sweep tile radius in meters (default: PLACES_SWEEP_MIN_RADIUS_METERS or 250)",
+    )
+    parser.add_argument(
+        "--sweep-state",
+        default="crawler_sweep_state.json",
+        help="sweep progress file; rerunning with the same arguments resumes from it",
+    )
     parser.add_argument(
         "--output",
-        default="crawler_output.json",
-        help="output JSON file for /api/v1/prospects/import payload",
+        default="crawler_output.jsonl",
+        help="JSONL file receiving one /api/v1/prospects/import item per line as categories finish",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default="crawler_checkpoint.json",
+        help="progress file recording finished categories and output/post offsets",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue from --checkpoint (and --sweep-state) instead of starting over",
+    )
+    parser.add_argument(
+        "--post-url",
+        default=None,
+        help="API base URL (e.g. http://localhost:8000); items are POSTed to /api/v1/prospects/import in chunks",
+    )
+    parser.add_argument("--workspace-id", default=os.getenv("CRM_WORKSPACE_ID"), help="X-Workspace-Id for --post-url")
+    parser.add_argument("--user-id", default=os.getenv("CRM_USER_ID"), help="X-User-Id for --post-url")
+    parser.add_argument(
+        "--post-chunk-size",
+        type=int,
+        default=500,
+        help="items per import request (the endpoint accepts at most 5000)",
     )
     return parser.parse_args()
 
 
+def build_import_item(place: GooglePlaceLead, *, source: str = "google_business") -> dict[str, object]:
+    return {
+        "source": source,
+        "external_id": place.place_id,
+        "company_name": place.company,
+        "category": place.business_type,
+        "address": place.location or "Unknown address",
+        "phone": place.phone,
+        "website_url": place.website_url,
+        "rating": place.rating,
+        "review_count": place.review_count,
+        "raw_source_payload": {
+            "place_id": place.place_id,
+            "business_type": place.business_type,
+            "company": place.company,
+            "vicinity": place.location,
+            "phone": place.phone,
+            "website": place.website_url,
+            "rating": place.rating,
+            "review_count": place.review_count,
+        },
+        "import_status": "new",
+    }
+
+
 def build_import_payload(
     *,
     places: list[GooglePlaceLead],
     source: str = "google_business",
 ) -> dict[str, object]:
-    items: list[dict[str, str | None]] = []
-    for place in places:
-        items.append(
-            {
-                "source": source,
-                "external_id": place.place_id,
-                "company_name": place.company,
-                "category": place.business_type,
-                "address": place.location or "Unknown address",
-                "phone": place.phone,
-                "website_url": place.website_url,
-                "rating": place.rating,
-                "review_count": place.review_count,
-                "raw_source_payload": {
-                    "place_id": place.place_id,
-                    "business_type": place.business_type,
-                    "company": place.company,
-                    "vicinity": place.location,
-                    "phone": place.phone,
-                    "website": place.website_url,
-                    "rating": place.rating,
-                    "review_count": place.review_count,
-                },
-                "import_status": "new",
-            }
-        )
-
     return {
-        "items": items,
+        "items": [build_import_item(place, source=source) for place in places],
     }
 
 
+@dataclass
+class CrawlCheckpoint:
+    """Resume point for a crawl.
+
+    Categories are the unit of progress: Nearby Search page tokens expire within minutes, so
+    a half-paged category is re-listed on resume (free when the Places cache is on) and only
+    its not-yet-written places are fetched again. ``output_bytes`` is the end of the last
+    checkpointed line; anything after it is truncated on resume. Lines between
+    ``posted_bytes`` and ``output_bytes`` have not been POSTed yet.
+    """
+
+    fingerprint: str
+    completed_categories: list[str] = field(default_factory=list)
+    emitted_place_ids: set[str] = field(default_factory=set)
+    output_bytes: int = 0
+    posted_bytes: int = 0
+
+    @classmethod
+    def load(cls, path: Path, fingerprint: str) -> CrawlCheckpoint | None:
+        if not path.exists():
+            return None
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("fingerprint") != fingerprint:
+            raise ValueError(
+                f"{path} was written for a different location, radius, type list or mode; "
+                "drop --resume to start over."
+            )
+        return cls(
+            fingerprint=fingerprint,
+            completed_categories=list(data.get("completed_categories", [])),
+            emitted_place_ids=set(data.get("emitted_place_ids", [])),
+            output_bytes=int(data.get("output_bytes", 0)),
+            posted_bytes=int(data.get("posted_bytes", 0)),
+        )
+
+    def save(self, path: Path) -> None:
+        data = {
+            "fingerprint": self.fingerprint,
+            "completed_categories": self.completed_categories,
+            "emitted_place_ids": sorted(self.emitted_place_ids),
+            "output_bytes": self.output_bytes,
+            "posted_bytes": self.posted_bytes,
+        }
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+def run_fingerprint(args: argparse.Namespace, business_types: list[str]) -> str:
+    raw = json.dumps(
+        {
+            "location": args.location,
+            "radius": args.radius,
+            "types": business_types,
+            "keyword": args.keyword,
+            "missing_website_only": args.missing_website_only,
+            "sweep": args.sweep,
+            "bbox": args.bbox,
+            "polygon": args.polygon,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ProspectImportPoster:
+    def __init__(self, *, base_url: str, workspace_id: str, user_id: str, timeout_seconds: float = 120.0) -> None:
+        self.url = f"{base_url.rstrip('/')}/api/v1/prospects/import"
+        self.headers = {"X-Workspace-Id": workspace_id, "X-User-Id": user_id}
+        self.timeout = timeout_seconds
+
+    def post(self, items: list[dict[str, object]]) -> dict[str, object]:
+        response = httpx.post(self.url, json={"items": items}, headers=self.headers, timeout=self.timeout)
+        if response.status_code != 201:
+            raise RuntimeError(f"Import POST failed with HTTP {response.status_code}: {response.text[:300]}")
+        return response.json()
+
+
+class ImportItemSink:
+    """Appends import items to the JSONL output and POSTs them in chunks as they accumulate.
+
+    Re-POSTing after a crash is harmless: the import endpoint skips rows whose
+    (source, external_id) already exists in the workspace.
+    """
+
+    def __init__(
+        self,
+        *,
+        path: Path,
+        checkpoint: CrawlCheckpoint,
+        poster: ProspectImportPoster | None,
+        chunk_size: int,
+    ) -> None:
+        self.checkpoint = checkpoint
+        self.poster = poster
+        self.chunk_size = max(1, min(chunk_size, 5000))
+        self.written = 0
+        self.posted = 0
+        self._unposted: list[tuple[int, dict[str, object]]] = []
+
+        with path.open("ab"):
+            pass
+        self._handle = path.open("r+b")
+        # Drop lines written after the last checkpoint; their category is redone on resume.
+        self._handle.truncate(checkpoint.output_bytes)
+        self._handle.seek(checkpoint.posted_bytes)
+        offset = checkpoint.posted_bytes
+        for line in self._handle:
+            offset += len(line)
+            self._unposted.append((offset, json.loads(line)))
+        self._handle.seek(checkpoint.output_bytes)
+
+    def write(self, places: list[GooglePlaceLead]) -> None:
+        for place in places:
+            item = build_import_item(place)
+            self._handle.write(json.dumps(item).encode("utf-8") + b"\n")
+            self._unposted.append((self._handle.tell(), item))
+            self.checkpoint.emitted_place_ids.add(place.place_id)
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self.written += len(places)
+        self.checkpoint.output_bytes = self._handle.tell()
+        if self.poster is None:
+            self.checkpoint.posted_bytes = self.checkpoint.output_bytes
+            self._unposted.clear()
+
+    def post_ready(self, *, final: bool = False) -> None:
+        if self.poster is None:
+            return
+        while len(self._unposted) >= self.chunk_size or (final and self._unposted):
+            chunk = self._unposted[: self.chunk_size]
+            result = self.poster.post([item for _, item in chunk])
+            del self._unposted[: len(chunk)]
+            self.checkpoint.posted_bytes = chunk[-1][0]
+            self.posted += len(chunk)
+            print(
+                f"  posted {len(chunk)} items: imported={result.get('imported_count')} "
+                f"skipped={result.get('skipped_count')} errors={result.get('error_count')}"
+            )
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+def open_places_cache(path: str) -> PlacesCache:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.models.places_cache_entry import PlacesCacheEntry
+
+    engine = create_engine(f"sqlite:///{path}")
+    PlacesCacheEntry.__table__.create(engine, checkfirst=True)
+    return SqlPlacesCache(sessionmaker(bind=engine))
+
+
+def load_geojson_polygon(path: str) -> list[tuple[float, float]]:
+    """Outer ring of the first Polygon/MultiPolygon in a GeoJSON file, as (lat, lng) points."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if data.get("type") == "FeatureCollection":
+        data = (data.get("features") or [{}])[0]
+    if data.get("type") == "Feature":
+        data = data.get("geometry") or {}
+    coordinates = data.get("coordinates")
+    if data.get("type") == "MultiPolygon" and coordinates:
+        coordinates = coordinates[0]
+    if data.get("type") not in {"Polygon", "MultiPolygon"} or not coordinates:
+        raise ValueError(f"{path} does not contain a GeoJSON Polygon.")
+    return [(float(lat), float(lng)) for lng, lat, *_ in coordinates[0]]
+
+
+def resolve_sweep_area(args: argparse.Namespace) -> SweepArea | None:
+    if args.polygon:
+        return SweepArea.from_polygon(load_geojson_polygon(args.polygon))
+    if args.bbox:
+        return SweepArea(bounds=BoundingBox.parse(args.bbox))
+    return None
+
+
+async def crawl(
+    *,
+    args: argparse.Namespace,
+    crawler: GooglePlacesCrawler,
+    business_types: list[str],
+    checkpoint: CrawlCheckpoint,
+    checkpoint_path: Path,
+    sink: ImportItemSink,
+) -> None:
+    if args.sweep:
+        # The sweep checkpoints its own tiles and places; its output is written once it finishes.
+        sweep_state = Path(args.sweep_state)
+        if not args.resume:
+            sweep_state.unlink(missing_ok=True)
+        leads = await crawler.sweep_area_async(
+            area=resolve_sweep_area(args),
+            location=args.location,
+            radius=args.radius,
+            business_types=business_types,
+            keyword=args.keyword,
+            missing_website_only=args.missing_website_only,
+            known_place_ids=checkpoint.emitted_place_ids,
+            min_radius_meters=args.min_tile_radius,
+            state_path=sweep_state,
+        )
+        sink.write(leads)
+        checkpoint.completed_categories = list(business_types)
+        checkpoint.save(checkpoint_path)
+        return
+
+    done = set(checkpoint.completed_categories)
+    remaining = [business_type for business_type in business_types if business_type not in done]
+    async for business_type, leads in crawler.stream_businesses_async(
+        location=args.location,
+        radius=args.radius,
+        business_types=remaining,
+        keyword=args.keyword,
+        missing_website_only=args.missing_website_only,
+        known_place_ids=checkpoint.emitted_place_ids,
+    ):
+        sink.write(leads)
+        await asyncio.to_thread(sink.post_ready)
+        checkpoint.completed_categories.append(business_type)
+        checkpoint.save(checkpoint_path)
+        print(f"[{len(checkpoint.completed_categories)}/{len(business_types)}] {business_type}: {len(leads)} new")
+
+
 def main() -> int:
     args = parse_args()
     if not args.api_key:
@@ -134,26 +428,70 @@ def main() -> int:
         print("No business types provided.")
         return 1
 
-    crawler = GooglePlacesCrawler(api_key=args.api_key)
+    poster = None
+    if args.post_url:
+        if not args.workspace_id or not args.user_id:
+            print("--post-url needs --workspace-id and --user-id (or CRM_WORKSPACE_ID / CRM_USER_ID).")
+            return 1
+        poster = ProspectImportPoster(base_url=args.post_url, workspace_id=args.workspace_id, user_id=args.user_id)
+
+    fingerprint = run_fingerprint(args, business_types)
+    checkpoint_path = Path(args.checkpoint)
+    checkpoint = None
+    if args.resume:
+        try:
+            checkpoint = CrawlCheckpoint.load(checkpoint_path, fingerprint)
+        except ValueError as exc:
+            print(exc)
+            return 1
+        if checkpoint is None:
+            print(f"No checkpoint at {checkpoint_path}; starting a new crawl.")
+        else:
+            print(
+                f"Resuming: {len(checkpoint.completed_categories)}/{len(business_types)} categories done, "
+                f"{len(checkpoint.emitted_place_ids)} places written."
+            )
+    checkpoint = checkpoint or CrawlCheckpoint(fingerprint=fingerprint)
+    checkpoint.save(checkpoint_path)
+
+    if args.qps is not None:
+        places_rate_limiter.set_rate(args.qps)
+    cache = None if args.no_cache else open_places_cache(args.cache_db)
+    crawler = GooglePlacesCrawler(api_key=args.api_key, max_concurrency=args.concurrency, cache=cache)
+    output_path = Path(args.output)
+    sink = ImportItemSink(path=output_path, checkpoint=checkpoint, poster=poster, chunk_size=args.post_chunk_size)
     try:
-        leads = crawler.discover_businesses(
-            location=args.location,
-            radius=args.radius,
-            business_types=business_types,
-            keyword=args.keyword,
-            missing_website_only=args.missing_website_only,
+        # Flush anything a previous run wrote but never managed to POST.
+        sink.post_ready(final=True)
+        checkpoint.save(checkpoint_path)
+        asyncio.run(
+            crawl(
+                args=args,
+                crawler=crawler,
+                business_types=business_types,
+                checkpoint=checkpoint,
+                checkpoint_path=checkpoint_path,
+                sink=sink,
+            )
         )
-    except GooglePlacesCrawlerError as exc:
+        sink.post_ready(final=True)
+        checkpoint.save(checkpoint_path)
+    except (GooglePlacesCrawlerError, ValueError, RuntimeError, httpx.HTTPError) as exc:
         print(f"Crawler failed: {exc}")
+        print(f"Progress saved to {checkpoint_path}; rerun with --resume to continue.")
         return 1
+    except KeyboardInterrupt:
+        print(f"Interrupted. Progress saved to {checkpoint_path}; rerun with --resume to continue.")
+        return 130
+    finally:
+        sink.close()
 
-    payload = build_import_payload(places=leads)
-    output_path = Path(args.output)
-    output_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-
-    print(f"Crawled {len(leads)} candidate prospects.")
-    print(f"Wrote import payload to {output_path}.")
-    print("Next step: POST this JSON to /api/v1/prospects/import with workspace/user headers.")
+    print(f"Crawled {sink.written} new candidate prospects ({len(checkpoint.emitted_place_ids)} in total).")
+    print(f"Wrote import items to {output_path} (one JSON object per line).")
+    if poster is not None:
+        print(f"Posted {sink.posted} items to {poster.url}.")
+    else:
+        print("Next step: rerun with --post-url, or POST the lines as {\"items\": [...]} to /api/v1/prospects/import.")
     return 0
 
 